@@ -1,12 +1,15 @@
 """This module provides configuration values used by the application."""
 import logging
 from logging import config as lc
-from typing import Sequence, final
+from typing import Literal, Sequence, final
 
 import yaml
 from pydantic import EmailStr, HttpUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# The kinds of USFM to HTML renderer, see Settings.USFM_RENDERER.
+UsfmRendererKind = Literal["dotnet", "python"]
+
 
 @final
 class Settings(BaseSettings):
@@ -24,6 +27,10 @@ class Settings(BaseSettings):
     RTL_DIRECTION_HTML: str = "<div style='direction: rtl;'>"
 
     END_OF_CHAPTER_HTML: str = '<div class="end-of-chapter"></div>'
+    # Marks where each book's content, and each language's translation
+    # words section, starts in the assembled HTML so that it can be
+    # rendered to PDF in sections, see RENDER_PDF_IN_SECTIONS.
+    BOOK_BOUNDARY_HTML: str = "<!-- book boundary -->"
     RESOURCE_TYPE_NAME_FMT_STR: str = "<h2>{}</h2>"
     TN_VERSE_NOTES_ENCLOSING_DIV_FMT_STR: str = "<div style='column-count: 2;'>{}</div>"
     TQ_HEADING_AND_QUESTIONS_FMT_STR: str = (
@@ -204,19 +211,90 @@ class Settings(BaseSettings):
 
     LOGGING_CONFIG_FILE_PATH: str = "backend/logging_config.yaml"
 
+    # Git repos, in the data API's format, which DOC supports but which
+    # the data API does not supply. They are added to the data API's
+    # repos whenever the resource catalog is built.
+    SUPPLEMENTAL_REPOS_FILE_PATH: str = "backend/supplemental_repos.json"
+
     # Location where resource assets will be cloned.
     RESOURCE_ASSETS_DIR: str = "assets_download"
 
     # Location where intermediate generated document parts are saved.
     WORKING_DIR: str = "working_temp"
 
+    # Indicate if rendered content, i.e., USFM chapters and Markdown
+    # rendered to HTML, should be cached on disk keyed by a hash of its
+    # source so that document requests sharing books share that work.
+    CONTENT_CACHE_ENABLED: bool = True
+    # Location where rendered content is cached.
+    CONTENT_CACHE_DIR: str = "working_temp/content_cache"
+    # Size in bytes beyond which the least recently used rendered
+    # content is evicted from the cache.
+    CONTENT_CACHE_MAX_BYTES: int = 2_000_000_000
+
     # Location where generated PDFs are written.
     DOCUMENT_OUTPUT_DIR: str = "document_output"
+    # Indicate if identical document requests submitted while the task
+    # of the first is queued or running should get that task's id back
+    # rather than queue a task of their own, see request_coalescing.
+    COALESCE_DOCUMENT_REQUESTS: bool = True
+    # Seconds after which the record of a document request's in-flight
+    # task expires in case the task never finishes, e.g., its worker
+    # was killed.
+    DOCUMENT_REQUEST_IN_FLIGHT_TTL: int = 3600
+    # Seconds between the keep-alive comments sent to clients which
+    # watch a task's state change events while it doesn't change, see
+    # app.task_events.
+    TASK_EVENTS_HEARTBEAT_SECONDS: int = 15
+    # Celery queues by class of work, see task_routing, with the number
+    # of tasks which a worker consuming only that queue runs
+    # concurrently and the multiplier of that number of tasks which it
+    # reserves ahead, see celeryconfig. The light queue's tasks, e.g.,
+    # serving documents from the output cache, are short so they are
+    # reserved ahead. The conversions' tasks can take minutes so each
+    # is reserved only when a worker process is free to run it.
+    WORKER_CONCURRENCY: dict[str, int] = {
+        "light": 4,
+        "html": 4,
+        "pdf": 2,
+        "epub": 2,
+        "docx": 1,
+    }
+    WORKER_PREFETCH_MULTIPLIER: dict[str, int] = {
+        "light": 4,
+        "html": 1,
+        "pdf": 1,
+        "epub": 1,
+        "docx": 1,
+    }
 
     BACKEND_CORS_ORIGINS: list[str]
 
     DOCX_TEMPLATE_PATH: str = "template.docx"
     DOCX_COMPACT_TEMPLATE_PATH: str = "template_compact.docx"
+    # Indicate if each HTML fragment of a Docx document should be
+    # converted straight into the document's body rather than into a
+    # Document of its own which is then merged into it by Composer.
+    APPEND_DOCX_HTML_DIRECTLY: bool = True
+    # Indicate if HTML fragments of a Docx document, other than those
+    # with tables or images, should be converted by
+    # assembly_strategies_docx.ooxml_writer, which writes the same
+    # paragraphs and runs as htmldocx, rather than by htmldocx.
+    USE_DOCX_OOXML_WRITER: bool = True
+
+    # Maximum number of resource asset git repos that are cloned
+    # concurrently when provisioning a document request's assets.
+    ASSET_PROVISIONING_MAX_WORKERS: int = 8
+
+    # Maximum number of processes which parse resource content in
+    # parallel, including in Celery's prefork workers. 1 parses
+    # sequentially in the requesting process. Each parsing process
+    # starts its own pool of USFM_RENDERER_POOL_SIZE USFM parser driver
+    # processes.
+    PARSING_MAX_WORKERS: int = 4
+    # Books with more chapters than this are split into ranges of this
+    # many chapters which are parsed in parallel. 0 never splits books.
+    PARSING_CHAPTERS_PER_TASK: int = 25
 
     # Indicate if generated documents should be cached.
     ASSET_CACHING_ENABLED: bool = True
@@ -225,6 +303,13 @@ class Settings(BaseSettings):
     # the case of resource asset files) or re-generating them (in the
     # case of the final PDF). In hours.
     ASSET_CACHING_PERIOD: int
+    # Indicate if cloned resource asset repos should be refreshed in
+    # the background, via git fetch, once they are older than
+    # ASSET_CACHING_PERIOD. Requires celery beat, e.g., worker -B.
+    ASSET_REFRESH_ENABLED: bool = False
+    # How often, in minutes, to look for stale resource asset repos to
+    # refresh.
+    ASSET_REFRESH_INTERVAL: int = 60
 
     # Return a list of the Markdown section titles that our
     # Python-Markdown remove_section_processor extension should remove.
@@ -257,6 +342,47 @@ class Settings(BaseSettings):
     # Used in assembly_strategy_utils module when zero-filling various strings
     NUM_ZEROS: int = 3
 
+    # The USFM to HTML renderer to use: "dotnet" for the .NET
+    # USFMParserDriver or "python" for the pure Python renderer in
+    # document.domain.usfm_renderer which emits the same markup. Any
+    # other value fails validation at startup.
+    USFM_RENDERER: UsfmRendererKind = "dotnet"
+    # Location of the .NET USFM parser driver which renders USFM to HTML.
+    USFM_PARSER_DLL_PATH: str = (
+        "/app/USFMParserDriver/bin/Release/net8.0/USFMParserDriver.dll"
+    )
+    # Indicate if USFM should be rendered by long-lived USFM parser
+    # driver processes rather than by launching a new dotnet process
+    # (and writing and reading files) for every chapter.
+    USE_PERSISTENT_USFM_RENDERER: bool = True
+    # Maximum number of long-lived USFM parser driver processes per
+    # worker process.
+    USFM_RENDERER_POOL_SIZE: int = 2
+    # Seconds a long-lived USFM parser driver process may take to
+    # render one request before it is killed and replaced.
+    USFM_RENDER_TIMEOUT_SECONDS: int = 60
+    # Indicate if PDFs should be rendered by long-lived WeasyPrint
+    # processes, which keep WeasyPrint and the font configuration
+    # loaded, rather than by launching the weasyprint CLI for every
+    # document. The CLI is still used if they fail.
+    USE_PERSISTENT_PDF_RENDERER: bool = True
+    # Number of long-lived WeasyPrint processes per worker process.
+    # Each one holds several hundred megabytes while rendering.
+    PDF_RENDERER_POOL_SIZE: int = 1
+    # Seconds a long-lived WeasyPrint process may take to render one
+    # PDF before it is killed and replaced.
+    PDF_RENDER_TIMEOUT_SECONDS: int = 1800
+    # Indicate if the assembled HTML should be split at book boundaries
+    # and its sections rendered to PDF in parallel, by up to
+    # PDF_SECTION_MAX_WORKERS long-lived WeasyPrint processes, and then
+    # merged into one PDF. Each book then starts on a new page.
+    RENDER_PDF_IN_SECTIONS: bool = False
+    # Number of sections rendered to PDF in parallel per worker process
+    # if RENDER_PDF_IN_SECTIONS. The pool of long-lived WeasyPrint
+    # processes is grown to this size if PDF_RENDERER_POOL_SIZE is
+    # smaller so that sections aren't rendered one at a time.
+    PDF_SECTION_MAX_WORKERS: int = 2
+
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
 
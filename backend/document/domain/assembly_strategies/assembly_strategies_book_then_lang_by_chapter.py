@@ -1,4 +1,4 @@
-from typing import Mapping, Sequence
+from typing import Iterator, Mapping, Sequence
 
 from document.domain.bible_books import BOOK_NAMES, BOOK_CHAPTERS
 from document.config import settings
@@ -38,13 +38,13 @@ def assemble_content_by_book_then_lang(
     bc_books: Sequence[BCBook],
     assembly_layout_kind: AssemblyLayoutEnum,
     book_names: Mapping[str, str] = BOOK_NAMES,
-) -> str:
+    book_boundary_html: str = settings.BOOK_BOUNDARY_HTML,
+) -> Iterator[str]:
     """
     Assemble by book then by language in alphabetic order before
     delegating more atomic ordering/interleaving to an assembly
     sub-strategy.
     """
-    content = []
     book_id_map = dict((id, pos) for pos, id in enumerate(BOOK_NAMES.keys()))
     # Collect and deduplicate book codes
     all_book_codes = (
@@ -60,6 +60,7 @@ def assemble_content_by_book_then_lang(
         most_book_codes, key=lambda book_code: book_id_map[book_code]
     )
     for book_code in book_codes_sorted:
+        yield book_boundary_html
         selected_usfm_books = [
             usfm_book for usfm_book in usfm_books if usfm_book.book_code == book_code
         ]
@@ -79,14 +80,12 @@ def assemble_content_by_book_then_lang(
             assembly_layout_kind == AssemblyLayoutEnum.ONE_COLUMN
             or assembly_layout_kind == AssemblyLayoutEnum.ONE_COLUMN_COMPACT
         ):
-            content.append(
-                assemble_usfm_by_chapter(
-                    selected_usfm_books,
-                    selected_tn_books,
-                    selected_tq_books,
-                    selected_tw_books,
-                    selected_bc_books,
-                )
+            yield from assemble_usfm_by_chapter(
+                selected_usfm_books,
+                selected_tn_books,
+                selected_tq_books,
+                selected_tw_books,
+                selected_bc_books,
             )
         elif (
             not selected_usfm_books
@@ -96,14 +95,12 @@ def assemble_content_by_book_then_lang(
                 or assembly_layout_kind == AssemblyLayoutEnum.ONE_COLUMN_COMPACT
             )
         ):
-            content.append(
-                assemble_tn_by_chapter(
-                    selected_usfm_books,
-                    selected_tn_books,
-                    selected_tq_books,
-                    selected_tw_books,
-                    selected_bc_books,
-                )
+            yield from assemble_tn_by_chapter(
+                selected_usfm_books,
+                selected_tn_books,
+                selected_tq_books,
+                selected_tw_books,
+                selected_bc_books,
             )
         elif (
             not selected_usfm_books
@@ -114,14 +111,12 @@ def assemble_content_by_book_then_lang(
                 or assembly_layout_kind == AssemblyLayoutEnum.ONE_COLUMN_COMPACT
             )
         ):
-            content.append(
-                assemble_tq_by_chapter(
-                    selected_usfm_books,
-                    selected_tn_books,
-                    selected_tq_books,
-                    selected_tw_books,
-                    selected_bc_books,
-                )
+            yield from assemble_tq_by_chapter(
+                selected_usfm_books,
+                selected_tn_books,
+                selected_tq_books,
+                selected_tw_books,
+                selected_bc_books,
             )
         elif (
             not selected_usfm_books
@@ -133,14 +128,12 @@ def assemble_content_by_book_then_lang(
                 or assembly_layout_kind == AssemblyLayoutEnum.ONE_COLUMN_COMPACT
             )
         ):
-            content.append(
-                assemble_tw_by_chapter(
-                    selected_usfm_books,
-                    selected_tn_books,
-                    selected_tq_books,
-                    selected_tw_books,
-                    selected_bc_books,
-                )
+            yield from assemble_tw_by_chapter(
+                selected_usfm_books,
+                selected_tn_books,
+                selected_tq_books,
+                selected_tw_books,
+                selected_bc_books,
             )
         elif selected_usfm_books and (
             assembly_layout_kind
@@ -148,16 +141,13 @@ def assemble_content_by_book_then_lang(
             or assembly_layout_kind
             == AssemblyLayoutEnum.TWO_COLUMN_SCRIPTURE_LEFT_SCRIPTURE_RIGHT_COMPACT
         ):
-            content.append(
-                assemble_usfm_by_chapter_2c_sl_sr(
-                    selected_usfm_books,
-                    selected_tn_books,
-                    selected_tq_books,
-                    selected_tw_books,
-                    selected_bc_books,
-                )
+            yield from assemble_usfm_by_chapter_2c_sl_sr(
+                selected_usfm_books,
+                selected_tn_books,
+                selected_tq_books,
+                selected_tw_books,
+                selected_bc_books,
             )
-    return "".join(content)
 
 
 def assemble_usfm_by_chapter(
@@ -171,14 +161,12 @@ def assemble_usfm_by_chapter(
     hr: str = "<hr/>",
     book_chapters: Mapping[str, int] = BOOK_CHAPTERS,
     show_tn_book_intro: bool = settings.SHOW_TN_BOOK_INTRO,
-) -> str:
+) -> Iterator[str]:
     """
     Construct the HTML wherein at least one USFM resource exists, one column
     layout.
     """
 
-    content = []
-
     def sort_key(resource: USFMBook) -> str:
         return resource.lang_code
 
@@ -201,18 +189,18 @@ def assemble_usfm_by_chapter(
             for tn_book in [
                 tn_book for tn_book in tn_books if tn_book.book_code == book_code
             ]:
-                content.append(tn_language_direction_html(tn_book))
+                yield tn_language_direction_html(tn_book)
                 book_intro_ = tn_book_intro(tn_book)
                 book_intro_adj = adjust_book_intro_headings(book_intro_)
-                content.append(book_intro_adj)
-                content.append(close_direction_html)
+                yield book_intro_adj
+                yield close_direction_html
         for bc_book in [
             bc_book for bc_book in bc_books if bc_book.book_code == book_code
         ]:
-            content.append(bc_book_intro(bc_book))
+            yield bc_book_intro(bc_book)
         num_chapters = book_chapters[book_code]
         # Add the book title, e.g., 1 Peter
-        content.append(book_title(book_code))
+        yield book_title(book_code)
         for chapter_num in range(1, num_chapters + 1):
             for usfm_book in [
                 usfm_book
@@ -220,23 +208,23 @@ def assemble_usfm_by_chapter(
                 if usfm_book.book_code == book_code
             ]:
                 if chapter_num in usfm_book.chapters:
-                    content.append(usfm_language_direction_html(usfm_book))
-                    content.append(usfm_book.chapters[chapter_num].content)
-                    content.append(close_direction_html)
+                    yield usfm_language_direction_html(usfm_book)
+                    yield usfm_book.chapters[chapter_num].content
+                    yield close_direction_html
                     if not has_footnotes(usfm_book.chapters[chapter_num].content):
-                        content.append(hr)
+                        yield hr
             for tn_book in [
                 tn_book for tn_book in tn_books if tn_book.book_code == book_code
             ]:
                 if chapter_num in tn_book.chapters:
-                    content.append(tn_language_direction_html(tn_book))
-                    content.append(chapter_intro(tn_book, chapter_num))
-                    content.append(close_direction_html)
+                    yield tn_language_direction_html(tn_book)
+                    yield chapter_intro(tn_book, chapter_num)
+                    yield close_direction_html
             for bc_book in [
                 bc_book for bc_book in bc_books if bc_book.book_code == book_code
             ]:
                 if chapter_num in bc_book.chapters:
-                    content.append(chapter_commentary(bc_book, chapter_num))
+                    yield chapter_commentary(bc_book, chapter_num)
             # Add the interleaved tn notes
             tn_verses = None
             for tn_book in [
@@ -245,9 +233,9 @@ def assemble_usfm_by_chapter(
                 if chapter_num in tn_book.chapters:
                     tn_verses = tn_chapter_verses(tn_book, chapter_num)
                     if tn_verses:
-                        content.append(tn_language_direction_html(tn_book))
-                        content.append(tn_verses)
-                        content.append(close_direction_html)
+                        yield tn_language_direction_html(tn_book)
+                        yield tn_verses
+                        yield close_direction_html
             tq_verses = None
             for tq_book in [
                 tq_book for tq_book in tq_books if tq_book.book_code == book_code
@@ -255,11 +243,10 @@ def assemble_usfm_by_chapter(
                 if chapter_num in tq_book.chapters:
                     tq_verses = tq_chapter_verses(tq_book, chapter_num)
                     if tq_verses:
-                        content.append(tq_language_direction_html(tq_book))
-                        content.append(tq_verses)
-                        content.append(close_direction_html)
-            content.append(end_of_chapter_html)
-    return "".join(content)
+                        yield tq_language_direction_html(tq_book)
+                        yield tq_verses
+                        yield close_direction_html
+            yield end_of_chapter_html
 
 
 def assemble_tn_by_chapter(
@@ -272,12 +259,11 @@ def assemble_tn_by_chapter(
     close_direction_html: str = "</div>",
     book_chapters: Mapping[str, int] = BOOK_CHAPTERS,
     show_tn_book_intro: bool = settings.SHOW_TN_BOOK_INTRO,
-) -> str:
+) -> Iterator[str]:
     """
     Construct the HTML for a 'by chapter' strategy wherein at least
     tn_books exists.
     """
-    content = []
 
     def sort_key(resource: TNBook) -> str:
         return resource.lang_code
@@ -298,51 +284,50 @@ def assemble_tn_by_chapter(
             for tn_book in [
                 tn_book for tn_book in tn_books if tn_book.book_code == book_code
             ]:
-                content.append(tn_language_direction_html(tn_book))
+                yield tn_language_direction_html(tn_book)
                 book_intro_ = tn_book_intro(tn_book)
                 book_intro_adj = adjust_book_intro_headings(book_intro_)
-                content.append(book_intro_adj)
-                content.append(close_direction_html)
+                yield book_intro_adj
+                yield close_direction_html
         for bc_book in [
             bc_book for bc_book in bc_books if bc_book.book_code == book_code
         ]:
-            content.append(bc_book_intro(bc_book))
+            yield bc_book_intro(bc_book)
         num_chapters = book_chapters[book_code]
         for chapter_num in range(1, num_chapters + 1):
-            content.append("Chapter {}".format(chapter_num))
+            yield "Chapter {}".format(chapter_num)
             # Add chapter intro
             for tn_book in [
                 tn_book for tn_book in tn_books if tn_book.book_code == book_code
             ]:
                 if chapter_num in tn_book.chapters:
-                    content.append(tn_language_direction_html(tn_book))
-                    content.append(chapter_intro(tn_book, chapter_num))
-                    content.append(close_direction_html)
+                    yield tn_language_direction_html(tn_book)
+                    yield chapter_intro(tn_book, chapter_num)
+                    yield close_direction_html
             for bc_book in [
                 bc_book for bc_book in bc_books if bc_book.book_code == book_code
             ]:
                 if chapter_num in bc_book.chapters:
-                    content.append(chapter_commentary(bc_book, chapter_num))
+                    yield chapter_commentary(bc_book, chapter_num)
             # Add tn notes
             for tn_book in [
                 tn_book for tn_book in tn_books if tn_book.book_code == book_code
             ]:
                 if chapter_num in tn_book.chapters:
                     tn_verses = tn_chapter_verses(tn_book, chapter_num)
-                    content.append(tn_language_direction_html(tn_book))
-                    content.append(tn_verses)
-                    content.append(close_direction_html)
+                    yield tn_language_direction_html(tn_book)
+                    yield tn_verses
+                    yield close_direction_html
             # Add tq questions
             for tq_book in [
                 tq_book for tq_book in tq_books if tq_book.book_code == book_code
             ]:
                 if chapter_num in tq_book.chapters:
                     tq_verses = tq_chapter_verses(tq_book, chapter_num)
-                    content.append(tq_language_direction_html(tq_book))
-                    content.append(tq_verses)
-                    content.append(close_direction_html)
-            content.append(end_of_chapter_html)
-    return "".join(content)
+                    yield tq_language_direction_html(tq_book)
+                    yield tq_verses
+                    yield close_direction_html
+            yield end_of_chapter_html
 
 
 def assemble_tq_by_chapter(
@@ -354,12 +339,11 @@ def assemble_tq_by_chapter(
     end_of_chapter_html: str = settings.END_OF_CHAPTER_HTML,
     close_direction_html: str = "</div>",
     book_chapters: Mapping[str, int] = BOOK_CHAPTERS,
-) -> str:
+) -> Iterator[str]:
     """
     Construct the HTML for a 'by chapter' strategy wherein at least
     tq_books exists.
     """
-    content = []
 
     def sort_key(resource: TQBook) -> str:
         return resource.lang_code
@@ -373,23 +357,22 @@ def assemble_tq_by_chapter(
     for book_code in book_codes:
         num_chapters = book_chapters[book_code]
         for chapter_num in range(1, num_chapters + 1):
-            content.append("Chapter {}".format(chapter_num))
+            yield "Chapter {}".format(chapter_num)
             for bc_book in [
                 bc_book for bc_book in bc_books if bc_book.book_code == book_code
             ]:
                 if chapter_num in bc_book.chapters:
-                    content.append(chapter_commentary(bc_book, chapter_num))
+                    yield chapter_commentary(bc_book, chapter_num)
             for tq_book in [
                 tq_book for tq_book in tq_books if tq_book.book_code == book_code
             ]:
                 if chapter_num in tq_book.chapters:
                     tq_verses = tq_chapter_verses(tq_book, chapter_num)
                     if tq_verses:
-                        content.append(tq_language_direction_html(tq_book))
-                        content.append(tq_verses)
-                        content.append(close_direction_html)
-            content.append(end_of_chapter_html)
-    return "".join(content)
+                        yield tq_language_direction_html(tq_book)
+                        yield tq_verses
+                        yield close_direction_html
+            yield end_of_chapter_html
 
 
 # This function could be a little confusing for newcomers. TW lives at
@@ -406,19 +389,17 @@ def assemble_tw_by_chapter(
     tw_books: Sequence[TWBook],
     bc_books: Sequence[BCBook],
     end_of_chapter_html: str = settings.END_OF_CHAPTER_HTML,
-) -> str:
-    content = []
+) -> Iterator[str]:
 
     def sort_key(resource: BCBook) -> str:
         return resource.lang_code
 
     bc_books = sorted(bc_books, key=sort_key)
     for bc_book in bc_books:
-        content.append(bc_book_intro(bc_book))
+        yield bc_book_intro(bc_book)
         for chapter_num, chapter in bc_book.chapters.items():
-            content.append(chapter_commentary(bc_book, chapter_num))
-            content.append(end_of_chapter_html)
-    return "".join(content)
+            yield chapter_commentary(bc_book, chapter_num)
+            yield end_of_chapter_html
 
 
 def assemble_usfm_by_chapter_2c_sl_sr(
@@ -435,7 +416,7 @@ def assemble_usfm_by_chapter_2c_sl_sr(
     html_row_end: str = settings.HTML_ROW_END,
     close_direction_html: str = "</div>",
     book_chapters: Mapping[str, int] = BOOK_CHAPTERS,
-) -> str:
+) -> Iterator[str]:
     """
     Construct the HTML for the two column scripture left scripture
     right layout.
@@ -534,8 +515,6 @@ def assemble_usfm_by_chapter_2c_sl_sr(
     secondary_lang0     | secondary_lang1
     """
 
-    content = []
-
     def sort_key(resource: USFMBook) -> str:
         return resource.lang_code
 
@@ -561,30 +540,30 @@ def assemble_usfm_by_chapter_2c_sl_sr(
     # Add book intros for each tn_book
     # for tn_book in tn_books:
     #     if tn_book.book_intro:
-    #         content.append(tn_language_direction_html(tn_book))
+    #         yield tn_language_direction_html(tn_book)
     #         book_intro_ = tn_book.book_intro
-    #         content.append(adjust_book_intro_headings(book_intro_))
-    #         content.append(close_direction_html)
+    #         yield adjust_book_intro_headings(book_intro_)
+    #         yield close_direction_html
     for bc_book in bc_books:
-        content.append(bc_book_intro(bc_book))
+        yield bc_book_intro(bc_book)
     # Get unique book codes in usfm_books
     book_codes = {usfm_book.book_code for usfm_book in usfm_books}
     for book_code in book_codes:
         num_chapters = book_chapters[book_code]
         for chapter_num in range(1, num_chapters + 1):
-            content.append(book_title(book_code))
+            yield book_title(book_code)
             for tn_book in [
                 tn_book for tn_book in tn_books if tn_book.book_code == book_code
             ]:
                 if chapter_num in tn_book.chapters:
-                    content.append(tn_language_direction_html(tn_book))
-                    content.append(chapter_intro(tn_book, chapter_num))
-                    content.append(close_direction_html)
+                    yield tn_language_direction_html(tn_book)
+                    yield chapter_intro(tn_book, chapter_num)
+                    yield close_direction_html
             for bc_book in [
                 bc_book for bc_book in bc_books if bc_book.book_code == book_code
             ]:
                 if chapter_num in bc_book.chapters:
-                    content.append(chapter_commentary(bc_book, chapter_num))
+                    yield chapter_commentary(bc_book, chapter_num)
             # Get lang_code of first USFM so that we can use it later
             # to make sure USFMs of the same language are on the same
             # side of the two column layout.
@@ -600,22 +579,22 @@ def assemble_usfm_by_chapter_2c_sl_sr(
                 # in the case when there are 3 non-None items, but 4
                 # total counting the None.
                 if is_even(idx) or idx == 3:
-                    content.append(html_row_begin)
+                    yield html_row_begin
                 if usfm_book and chapter_num in usfm_book.chapters:
                     # lang0's USFM content units should always be on the
                     # left and lang1's should always be on the right.
                     if lang0_code == usfm_book.lang_code:
-                        content.append(html_column_left_begin)
+                        yield html_column_left_begin
                     else:
-                        content.append(html_column_right_begin)
-                    content.append(usfm_language_direction_html(usfm_book))
-                    content.append(usfm_book.chapters[chapter_num].content)
-                    content.append(close_direction_html)
-                content.append(html_column_end)
+                        yield html_column_right_begin
+                    yield usfm_language_direction_html(usfm_book)
+                    yield usfm_book.chapters[chapter_num].content
+                    yield close_direction_html
+                yield html_column_end
                 if not is_even(
                     idx
                 ):  # Non-even indexes signal the end of the current row.
-                    content.append(html_row_end)
+                    yield html_row_end
             # Add the interleaved tn notes, making sure to put lang0
             # notes on the left and lang1 notes on the right.
             tn_verses = None
@@ -623,13 +602,13 @@ def assemble_usfm_by_chapter_2c_sl_sr(
                 tn_verses = tn_chapter_verses(tn_book, chapter_num)
                 if tn_verses:
                     if is_even(idx):
-                        content.append(html_row_begin)
-                    content.append(html_column_begin)
-                    content.append(tn_language_direction_html(tn_book))
-                    content.append(tn_verses)
-                    content.append(close_direction_html)
-                    content.append(html_column_end)
-            content.append(html_row_end)
+                        yield html_row_begin
+                    yield html_column_begin
+                    yield tn_language_direction_html(tn_book)
+                    yield tn_verses
+                    yield close_direction_html
+                    yield html_column_end
+            yield html_row_end
             # Add the interleaved tq questions, making sure to put lang0
             # questions on the left and lang1 questions on the right.
             tq_verses = None
@@ -637,12 +616,11 @@ def assemble_usfm_by_chapter_2c_sl_sr(
                 tq_verses = tq_chapter_verses(tq_book, chapter_num)
                 if tq_verses:
                     if is_even(idx):
-                        content.append(html_row_begin)
-                    content.append(html_column_begin)
-                    content.append(tq_language_direction_html(tq_book))
-                    content.append(tq_verses)
-                    content.append(close_direction_html)
-                    content.append(html_column_end)
-            content.append(html_row_end)
-            content.append(html_row_end)
-    return "".join(content)
+                        yield html_row_begin
+                    yield html_column_begin
+                    yield tq_language_direction_html(tq_book)
+                    yield tq_verses
+                    yield close_direction_html
+                    yield html_column_end
+            yield html_row_end
+            yield html_row_end
@@ -1,4 +1,4 @@
-from typing import Mapping, Optional, Sequence
+from typing import Iterator, Mapping, Optional, Sequence
 
 from document.domain.bible_books import BOOK_NAMES
 from document.config import settings
@@ -36,13 +36,13 @@ def assemble_content_by_lang_then_book(
     bc_books: Sequence[BCBook],
     assembly_layout_kind: AssemblyLayoutEnum,
     book_names: Mapping[str, str] = BOOK_NAMES,
-) -> str:
+    book_boundary_html: str = settings.BOOK_BOUNDARY_HTML,
+) -> Iterator[str]:
     """
     Assemble by language then by book in lexicographical order before
     delegating more atomic ordering/interleaving to an assembly
     sub-strategy.
     """
-    content = []
     # Create map for sorting books in canonical bible book order
     book_id_map = dict((id, pos) for pos, id in enumerate(BOOK_NAMES.keys()))
     # Collect and deduplicate language codes
@@ -69,6 +69,7 @@ def assemble_content_by_lang_then_book(
     )
     for lang_code in most_lang_codes:
         for book_code in book_codes_sorted:
+            yield book_boundary_html
             # logger.debug("lang_code: %s, book_code: %s", lang_code, book_code)
             selected_usfm_books = [
                 usfm_book
@@ -106,37 +107,31 @@ def assemble_content_by_lang_then_book(
             ]
             bc_book = selected_bc_books[0] if selected_bc_books else None
             if usfm_book is not None:
-                content.append(
-                    assemble_usfm_by_book(
-                        usfm_book,
-                        tn_book,
-                        tq_book,
-                        tw_book,
-                        usfm_book2,
-                        bc_book,
-                    )
+                yield from assemble_usfm_by_book(
+                    usfm_book,
+                    tn_book,
+                    tq_book,
+                    tw_book,
+                    usfm_book2,
+                    bc_book,
                 )
             elif usfm_book is None and tn_book is not None:
-                content.append(
-                    assemble_tn_by_book(
-                        usfm_book,
-                        tn_book,
-                        tq_book,
-                        tw_book,
-                        usfm_book2,
-                        bc_book,
-                    )
+                yield from assemble_tn_by_book(
+                    usfm_book,
+                    tn_book,
+                    tq_book,
+                    tw_book,
+                    usfm_book2,
+                    bc_book,
                 )
             elif usfm_book is None and tn_book is None and tq_book is not None:
-                content.append(
-                    assemble_tq_by_book(
-                        usfm_book,
-                        tn_book,
-                        tq_book,
-                        tw_book,
-                        usfm_book2,
-                        bc_book,
-                    )
+                yield from assemble_tq_by_book(
+                    usfm_book,
+                    tn_book,
+                    tq_book,
+                    tw_book,
+                    usfm_book2,
+                    bc_book,
                 )
             elif (
                 usfm_book is None
@@ -144,17 +139,14 @@ def assemble_content_by_lang_then_book(
                 and tq_book is None
                 and (tw_book is not None or bc_book is not None)
             ):
-                content.append(
-                    assemble_tw_by_book(
-                        usfm_book,
-                        tn_book,
-                        tq_book,
-                        tw_book,
-                        usfm_book2,
-                        bc_book,
-                    )
+                yield from assemble_tw_by_book(
+                    usfm_book,
+                    tn_book,
+                    tq_book,
+                    tw_book,
+                    usfm_book2,
+                    bc_book,
                 )
-    return "".join(content)
 
 
 def assemble_usfm_by_book(
@@ -167,37 +159,35 @@ def assemble_usfm_by_book(
     end_of_chapter_html: str = settings.END_OF_CHAPTER_HTML,
     hr: str = "<hr/>",
     close_direction_html: str = "</div>",
-) -> str:
-    content = []
-    content.append(usfm_language_direction_html(usfm_book))
-    content.append(tn_book_intro(tn_book))
-    content.append(bc_book_intro(bc_book))
+) -> Iterator[str]:
+    yield usfm_language_direction_html(usfm_book)
+    yield tn_book_intro(tn_book)
+    yield bc_book_intro(bc_book)
     if usfm_book:
-        content.append(book_title(usfm_book.book_code))
+        yield book_title(usfm_book.book_code)
         for (
             chapter_num,
             chapter,
         ) in usfm_book.chapters.items():
-            content.append(chapter.content)
+            yield chapter.content
             if not has_footnotes(chapter.content) and (
                 usfm_book2 is not None
                 or tn_book is not None
                 or tq_book is not None
                 or tw_book is not None
             ):
-                content.append(hr)
-            content.append(chapter_intro(tn_book, chapter_num))
-            content.append(chapter_commentary(bc_book, chapter_num))
-            content.append(tn_chapter_verses(tn_book, chapter_num))
-            content.append(tq_chapter_verses(tq_book, chapter_num))
+                yield hr
+            yield chapter_intro(tn_book, chapter_num)
+            yield chapter_commentary(bc_book, chapter_num)
+            yield tn_chapter_verses(tn_book, chapter_num)
+            yield tq_chapter_verses(tq_book, chapter_num)
             # If the user chose two USFM resource types for a language. e.g., fr:
             # ulb, f10, show the second USFM content here
             if usfm_book2:
                 if chapter_num in usfm_book2.chapters:
-                    content.append(usfm_book2.chapters[chapter_num].content)
-            content.append(end_of_chapter_html)
-    content.append(close_direction_html)
-    return "".join(content)
+                    yield usfm_book2.chapters[chapter_num].content
+            yield end_of_chapter_html
+    yield close_direction_html
 
 
 def assemble_tn_by_book(
@@ -209,20 +199,18 @@ def assemble_tn_by_book(
     bc_book: Optional[BCBook],
     end_of_chapter_html: str = settings.END_OF_CHAPTER_HTML,
     close_direction_html: str = "</div>",
-) -> str:
-    content = []
-    content.append(tn_language_direction_html(tn_book))
-    content.append(tn_book_intro(tn_book))
+) -> Iterator[str]:
+    yield tn_language_direction_html(tn_book)
+    yield tn_book_intro(tn_book)
     if tn_book:
         for chapter_num in tn_book.chapters:
-            content.append(chapter_heading(chapter_num))
-            content.append(chapter_intro(tn_book, chapter_num))
-            content.append(chapter_commentary(bc_book, chapter_num))
-            content.append(tn_chapter_verses(tn_book, chapter_num))
-            content.append(tq_chapter_verses(tq_book, chapter_num))
-            content.append(end_of_chapter_html)
-    content.append(close_direction_html)
-    return "".join(content)
+            yield chapter_heading(chapter_num)
+            yield chapter_intro(tn_book, chapter_num)
+            yield chapter_commentary(bc_book, chapter_num)
+            yield tn_chapter_verses(tn_book, chapter_num)
+            yield tq_chapter_verses(tq_book, chapter_num)
+            yield end_of_chapter_html
+    yield close_direction_html
 
 
 def assemble_tq_by_book(
@@ -234,17 +222,15 @@ def assemble_tq_by_book(
     bc_book: Optional[BCBook],
     end_of_chapter_html: str = settings.END_OF_CHAPTER_HTML,
     close_direction_html: str = "</div>",
-) -> str:
-    content = []
-    content.append(tq_language_direction_html(tq_book))
+) -> Iterator[str]:
+    yield tq_language_direction_html(tq_book)
     if tq_book:
         for chapter_num in tq_book.chapters:
-            content.append(chapter_commentary(bc_book, chapter_num))
-            content.append(chapter_heading(chapter_num))
-            content.append(tq_chapter_verses(tq_book, chapter_num))
-            content.append(end_of_chapter_html)
-    content.append(close_direction_html)
-    return "".join(content)
+            yield chapter_commentary(bc_book, chapter_num)
+            yield chapter_heading(chapter_num)
+            yield tq_chapter_verses(tq_book, chapter_num)
+            yield end_of_chapter_html
+    yield close_direction_html
 
 
 # It is possible to request only TW, however TW is handled at a
@@ -258,10 +244,8 @@ def assemble_tw_by_book(
     bc_book: Optional[BCBook],
     end_of_chapter_html: str = settings.END_OF_CHAPTER_HTML,
     close_direction_html: str = "</div>",
-) -> str:
-    content = []
+) -> Iterator[str]:
     if bc_book:
         for chapter_num in bc_book.chapters:
-            content.append(chapter_commentary(bc_book, chapter_num))
-            content.append(end_of_chapter_html)
-    return "".join(content)
+            yield chapter_commentary(bc_book, chapter_num)
+            yield end_of_chapter_html
@@ -14,7 +14,7 @@ from document.domain.assembly_strategies_docx.assembly_strategy_utils import (
     add_one_column_section,
     add_two_column_section,
     add_page_break,
-    create_docx_subdoc,
+    append_html,
 )
 from document.domain.model import (
     AssemblyLayoutEnum,
@@ -160,16 +160,15 @@ def assemble_usfm_by_chapter(
             if tn_book.book_intro:
                 book_intro_ = tn_book.book_intro
                 book_intro_adj = adjust_book_intro_headings(book_intro_)
-                subdoc = create_docx_subdoc(
+                append_html(
+                    composer,
                     book_intro_adj,
                     tn_book.lang_code,
                     tn_book and tn_book.lang_direction == LangDirEnum.RTL,
                 )
-                composer.append(subdoc)
     for bc_book in bc_books:
         # Add the commentary book intro
-        subdoc = create_docx_subdoc(bc_book.book_intro, bc_book.lang_code)
-        composer.append(subdoc)
+        append_html(composer, bc_book.book_intro, bc_book.lang_code)
     book_codes = {usfm_book.book_code for usfm_book in usfm_books}
     for book_code in book_codes:
         num_chapters = book_chapters[book_code]
@@ -180,22 +179,22 @@ def assemble_usfm_by_chapter(
                 tn_book for tn_book in tn_books if tn_book.book_code == book_code
             ]:
                 if chapter_num in tn_book.chapters:
-                    subdoc = create_docx_subdoc(
+                    append_html(
+                        composer,
                         chapter_intro(tn_book, chapter_num),
                         tn_book.lang_code,
                         tn_book and tn_book.lang_direction == LangDirEnum.RTL,
                     )
-                    composer.append(subdoc)
             for bc_book in [
                 bc_book for bc_book in bc_books if bc_book.book_code == book_code
             ]:
                 if chapter_num in bc_book.chapters:
                     # Add the chapter commentary.
-                    subdoc = create_docx_subdoc(
+                    append_html(
+                        composer,
                         chapter_commentary(bc_book, chapter_num),
                         bc_book.lang_code,
                     )
-                    composer.append(subdoc)
             # Add the interleaved USFM chapters
             for usfm_book in [
                 usfm_book
@@ -207,12 +206,12 @@ def assemble_usfm_by_chapter(
                     # fmt: off
                     is_rtl = usfm_book and usfm_book.lang_direction == LangDirEnum.RTL
                     # fmt: on
-                    subdoc = create_docx_subdoc(
+                    append_html(
+                        composer,
                         usfm_book.chapters[chapter_num].content,
                         usfm_book.lang_code,
                         is_rtl,
                     )
-                    composer.append(subdoc)
             # Add the interleaved tn notes
             tn_verses = None
             for tn_book in [
@@ -221,12 +220,12 @@ def assemble_usfm_by_chapter(
                 tn_verses = tn_chapter_verses(tn_book, chapter_num)
                 if tn_verses:
                     add_two_column_section(doc)
-                    subdoc = create_docx_subdoc(
+                    append_html(
+                        composer,
                         tn_verses,
                         tn_book.lang_code,
                         tn_book and tn_book.lang_direction == LangDirEnum.RTL,
                     )
-                    composer.append(subdoc)
             # Add the interleaved tq questions
             for tq_book in [
                 tq_book for tq_book in tq_books if tq_book.book_code == book_code
@@ -235,12 +234,12 @@ def assemble_usfm_by_chapter(
                 # Add TQ verse content, if any
                 if tq_verses:
                     add_two_column_section(doc)
-                    subdoc = create_docx_subdoc(
+                    append_html(
+                        composer,
                         tq_verses,
                         tq_book.lang_code,
                         tq_book and tq_book.lang_direction == LangDirEnum.RTL,
                     )
-                    composer.append(subdoc)
             add_page_break(doc)
     return composer
 
@@ -279,18 +278,18 @@ def assemble_tn_by_chapter(
             if tn_book.book_intro:
                 book_intro_ = tn_book.book_intro
                 book_intro_adj = adjust_book_intro_headings(book_intro_)
-                subdoc = create_docx_subdoc(
+                append_html(
+                    composer,
                     book_intro_adj,
                     tn_book.lang_code,
                     tn_book and tn_book.lang_direction == LangDirEnum.RTL,
                 )
-                composer.append(subdoc)
     for bc_book in bc_books:
-        subdoc = create_docx_subdoc(
+        append_html(
+            composer,
             bc_book_intro(bc_book),
             bc_book.lang_code,
         )
-        composer.append(subdoc)
     book_codes = {tn_book.book_code for tn_book in tn_books}
     for book_code in book_codes:
         num_chapters = book_chapters[book_code]
@@ -307,22 +306,22 @@ def assemble_tn_by_chapter(
                     one_column_html.append(chapter_intro(tn_book, chapter_num))
                     one_column_html_ = "".join(one_column_html)
                     if one_column_html_:
-                        subdoc = create_docx_subdoc(
+                        append_html(
+                            composer,
                             one_column_html_,
                             tn_book.lang_code,
                             tn_book and tn_book.lang_direction == LangDirEnum.RTL,
                         )
-                        composer.append(subdoc)
             for bc_book in [
                 bc_book for bc_book in bc_books if bc_book.book_code == book_code
             ]:
                 if chapter_num in bc_book.chapters:
                     # Add the chapter commentary.
-                    subdoc = create_docx_subdoc(
+                    append_html(
+                        composer,
                         chapter_commentary(bc_book, chapter_num),
                         bc_book.lang_code,
                     )
-                    composer.append(subdoc)
             # Add the interleaved tn notes
             for tn_book in [
                 tn_book for tn_book in tn_books if tn_book.book_code == book_code
@@ -331,12 +330,12 @@ def assemble_tn_by_chapter(
                     tn_verses = tn_chapter_verses(tn_book, chapter_num)
                     if tn_verses:
                         add_two_column_section(doc)
-                        subdoc = create_docx_subdoc(
+                        append_html(
+                            composer,
                             tn_verses,
                             tn_book.lang_code,
                             tn_book and tn_book.lang_direction == LangDirEnum.RTL,
                         )
-                        composer.append(subdoc)
             # Add the interleaved tq questions
             for tq_book in [
                 tq_book for tq_book in tq_books if tq_book.book_code == book_code
@@ -345,12 +344,12 @@ def assemble_tn_by_chapter(
                 # Add TQ verse content, if any
                 if tq_verses:
                     add_two_column_section(doc)
-                    subdoc = create_docx_subdoc(
+                    append_html(
+                        composer,
                         tq_verses,
                         tq_book.lang_code,
                         tq_book and tq_book.lang_direction == LangDirEnum.RTL,
                     )
-                    composer.append(subdoc)
             add_page_break(doc)
     return composer
 
@@ -390,8 +389,7 @@ def assemble_tq_by_chapter(
                 one_column_html.append(chapter_commentary(bc_book, chapter_num))
             if one_column_html:
                 add_one_column_section(doc)
-                subdoc = create_docx_subdoc("".join(one_column_html), bc_book.lang_code)
-                composer.append(subdoc)
+                append_html(composer, "".join(one_column_html), bc_book.lang_code)
             # Add the interleaved tq questions
             for tq_book in [
                 tq_book for tq_book in tq_books if tq_book.book_code == book_code
@@ -399,12 +397,12 @@ def assemble_tq_by_chapter(
                 tq_verses = tq_chapter_verses(tq_book, chapter_num)
                 if tq_verses:
                     add_two_column_section(doc)
-                    subdoc = create_docx_subdoc(
+                    append_html(
+                        composer,
                         tq_verses,
                         tq_book.lang_code,
                         tq_book and tq_book.lang_direction == LangDirEnum.RTL,
                     )
-                    composer.append(subdoc)
             add_page_break(doc)
     return composer
 
@@ -432,10 +430,8 @@ def assemble_tw_by_chapter(
 
     bc_books = sorted(bc_books, key=bc_sort_key)
     for bc_book in bc_books:
-        subdoc = create_docx_subdoc(bc_book.book_intro, bc_book.lang_code)
-        composer.append(subdoc)
+        append_html(composer, bc_book.book_intro, bc_book.lang_code)
         for chapter in bc_book.chapters.values():
-            subdoc = create_docx_subdoc(chapter.commentary, bc_book.lang_code)
-            composer.append(subdoc)
+            append_html(composer, chapter.commentary, bc_book.lang_code)
             add_page_break(doc)
     return composer
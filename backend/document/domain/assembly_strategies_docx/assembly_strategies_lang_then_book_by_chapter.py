@@ -12,7 +12,7 @@ from document.domain.assembly_strategies.assembly_strategy_utils import (
 )
 from document.domain.assembly_strategies_docx.assembly_strategy_utils import (
     add_hr,
-    create_docx_subdoc,
+    append_html,
     add_one_column_section,
     add_two_column_section,
     add_page_break,
@@ -186,29 +186,29 @@ def assemble_usfm_by_book(
     doc = Document()
     composer = Composer(doc)
     if show_tn_book_intro and tn_book and tn_book.book_intro:
-        subdoc = create_docx_subdoc(
+        append_html(
+            composer,
             tn_book.book_intro,
             tn_book.lang_code,
             tn_book and tn_book.lang_direction == LangDirEnum.RTL,
         )
-        composer.append(subdoc)
     if bc_book:
         if bc_book.book_intro:
-            subdoc = create_docx_subdoc(
+            append_html(
+                composer,
                 bc_book.book_intro,
                 bc_book.lang_code,
             )
-            composer.append(subdoc)
     if usfm_book:
         # fmt: off
         is_rtl = usfm_book and usfm_book.lang_direction == LangDirEnum.RTL
         # fmt: on
-        subdoc = create_docx_subdoc(
+        append_html(
+            composer,
             book_title(usfm_book.book_code),
             usfm_book.lang_code,
             is_rtl,
         )
-        composer.append(subdoc)
         for (
             chapter_num,
             chapter,
@@ -225,39 +225,35 @@ def assemble_usfm_by_book(
                 chapter_commentary_ = chapter_commentary(bc_book, chapter_num)
             if tq_book:
                 tq_verses = tq_chapter_verses(tq_book, chapter_num)
-            subdoc = create_docx_subdoc(
+            append_html(
+                composer,
                 chapter.content,
                 usfm_book.lang_code,
                 is_rtl,
             )
-            composer.append(subdoc)
             if chapter_intro_:
-                subdoc = create_docx_subdoc(chapter_intro_, usfm_book.lang_code, is_rtl)
-                composer.append(subdoc)
+                append_html(composer, chapter_intro_, usfm_book.lang_code, is_rtl)
             if chapter_commentary_:
-                subdoc = create_docx_subdoc(
-                    chapter_commentary_, usfm_book.lang_code, is_rtl
-                )
-                composer.append(subdoc)
+                append_html(composer, chapter_commentary_, usfm_book.lang_code, is_rtl)
             if tn_verses:
                 add_two_column_section(doc)
-                subdoc = create_docx_subdoc(
+                append_html(
+                    composer,
                     tn_verses,
                     usfm_book.lang_code,
                     is_rtl,
                 )
-                composer.append(subdoc)
                 add_one_column_section(doc)
                 p = doc.add_paragraph()
                 add_hr(p)
             if tq_verses:
                 add_two_column_section(doc)
-                subdoc = create_docx_subdoc(
+                append_html(
+                    composer,
                     tq_verses,
                     usfm_book.lang_code,
                     is_rtl,
                 )
-                composer.append(subdoc)
                 add_one_column_section(doc)
                 p = doc.add_paragraph()
                 add_hr(p)
@@ -269,12 +265,12 @@ def assemble_usfm_by_book(
             if usfm_book2:
                 add_one_column_section(doc)
                 # Here we add the whole chapter's worth of verses for the secondary usfm
-                subdoc = create_docx_subdoc(
+                append_html(
+                    composer,
                     usfm_book2.chapters[chapter_num].content,
                     usfm_book.lang_code,
                     usfm_book2 and usfm_book2.lang_direction == LangDirEnum.RTL,
                 )
-                composer.append(subdoc)
             add_page_break(doc)
     return composer
 
@@ -296,18 +292,18 @@ def assemble_tn_by_book(
     composer = Composer(doc)
     if tn_book:
         if show_tn_book_intro and tn_book.book_intro:
-            subdoc = create_docx_subdoc(
+            append_html(
+                composer,
                 tn_book.book_intro,
                 tn_book.lang_code,
                 tn_book and tn_book.lang_direction == LangDirEnum.RTL,
             )
-            composer.append(subdoc)
         if bc_book and bc_book.book_intro:
-            subdoc = create_docx_subdoc(
+            append_html(
+                composer,
                 bc_book.book_intro,
                 tn_book.lang_code,
             )
-            composer.append(subdoc)
         for chapter_num in tn_book.chapters:
             add_one_column_section(doc)
             one_column_html = []
@@ -315,39 +311,39 @@ def assemble_tn_by_book(
             one_column_html.append(chapter_intro(tn_book, chapter_num))
             one_column_html_ = "".join(one_column_html)
             if one_column_html_:
-                subdoc = create_docx_subdoc(
+                append_html(
+                    composer,
                     one_column_html_,
                     tn_book.lang_code,
                     tn_book and tn_book.lang_direction == LangDirEnum.RTL,
                 )
-                composer.append(subdoc)
             if bc_book:
-                subdoc = create_docx_subdoc(
+                append_html(
+                    composer,
                     chapter_commentary(bc_book, chapter_num),
                     bc_book.lang_code,
                 )
-                composer.append(subdoc)
             tn_verses = tn_chapter_verses(tn_book, chapter_num)
             if tn_verses:
                 add_two_column_section(doc)
-                subdoc = create_docx_subdoc(
+                append_html(
+                    composer,
                     tn_verses,
                     tn_book.lang_code,
                     tn_book and tn_book.lang_direction == LangDirEnum.RTL,
                 )
-                composer.append(subdoc)
                 add_one_column_section(doc)
                 p = doc.add_paragraph()
                 add_hr(p)
             tq_verses = tq_chapter_verses(tq_book, chapter_num)
             if tq_book and tq_verses:
                 add_two_column_section(doc)
-                subdoc = create_docx_subdoc(
+                append_html(
+                    composer,
                     tq_verses,
                     tq_book.lang_code,
                     tq_book and tq_book.lang_direction == LangDirEnum.RTL,
                 )
-                composer.append(subdoc)
                 add_one_column_section(doc)
                 p = doc.add_paragraph()
                 add_hr(p)
@@ -373,26 +369,26 @@ def assemble_tq_by_book(
         for chapter_num in tq_book.chapters:
             add_one_column_section(doc)
             if bc_book:
-                subdoc = create_docx_subdoc(
+                append_html(
+                    composer,
                     chapter_commentary(bc_book, chapter_num),
                     bc_book.lang_code,
                 )
-                composer.append(subdoc)
-            subdoc = create_docx_subdoc(
+            append_html(
+                composer,
                 chapter_heading(chapter_num),
                 tq_book.lang_code,
                 tq_book and tq_book.lang_direction == LangDirEnum.RTL,
             )
-            composer.append(subdoc)
             tq_verses = tq_chapter_verses(tq_book, chapter_num)
             if tq_verses:
                 add_two_column_section(doc)
-                subdoc = create_docx_subdoc(
+                append_html(
+                    composer,
                     tq_verses,
                     tq_book.lang_code,
                     tq_book and tq_book.lang_direction == LangDirEnum.RTL,
                 )
-                composer.append(subdoc)
             add_page_break(doc)
     return composer
 
@@ -405,7 +401,6 @@ def assemble_tw_by_book(
     usfm_book2: Optional[USFMBook],
     bc_book: Optional[BCBook],
 ) -> Composer:
-
     """
     TW is handled outside this module, that is why no
     code for TW is explicitly included here.
@@ -413,10 +408,8 @@ def assemble_tw_by_book(
     doc = Document()
     composer = Composer(doc)
     if bc_book:
-        subdoc = create_docx_subdoc(bc_book.book_intro, bc_book.lang_code)
-        composer.append(subdoc)
+        append_html(composer, bc_book.book_intro, bc_book.lang_code)
         for chapter in bc_book.chapters.values():
-            subdoc = create_docx_subdoc(chapter.commentary, bc_book.lang_code)
-            composer.append(subdoc)
+            append_html(composer, chapter.commentary, bc_book.lang_code)
             add_page_break(doc)
     return composer
@@ -2,19 +2,28 @@
 Utility functions used by assembly_strategies.
 """
 
+from copy import deepcopy
+from typing import Sequence
+
 from document.config import settings
+from document.domain.assembly_strategies_docx import ooxml_writer
 from docx import Document  # type: ignore
+from docx.document import Document as DocxDocument  # type: ignore
 from docx.enum.section import WD_SECTION  # type: ignore
 from docx.enum.text import WD_BREAK  # type: ignore
-from docx.oxml.ns import qn  # type: ignore
+from docx.oxml import parse_xml  # type: ignore
+from docx.oxml.ns import nsdecls, qn  # type: ignore
 from docx.oxml.shared import OxmlElement  # type: ignore
 from docx.text.paragraph import Paragraph  # type: ignore
+from docxcompose.composer import Composer  # type: ignore
 from htmldocx import HtmlToDocx  # type: ignore
 
 logger = settings.logger(__name__)
 
 H1, H2, H3, H4, H5, H6 = "h1", "h2", "h3", "h4", "h5", "h6"
 
+EMPTY_DOCUMENT_XML = "<w:document {}><w:body/></w:document>".format(nsdecls("w"))
+
 
 OXML_LANGUAGE_LIST: list[str] = [
     "ar-SA",
@@ -114,21 +123,94 @@ def create_docx_subdoc(
     lang_code: str,
     is_rtl: bool = False,
     add_hr_p: bool = True,
-    oxml_language_list_lowercase: list[str] = OXML_LANGUAGE_LIST_LOWERCASE,
-    oxml_language_list_lowercase_split: list[str] = OXML_LANGUAGE_LIST_LOWERCASE_SPLIT,
+    use_ooxml_writer: bool = settings.USE_DOCX_OOXML_WRITER,
 ) -> Document:
     """
     Create and return a Document instance from the content parameter.
     """
+    if use_ooxml_writer and ooxml_writer.is_supported(content):
+        subdoc = Document()
+        paragraphs = ooxml_writer.write_html(content, subdoc.element.body, subdoc.part)
+        set_language(paragraphs, lang_code, is_rtl, add_hr_p)
+        return subdoc
     html_to_docx = HtmlToDocx()
     subdoc = html_to_docx.parse_html_string(content)
+    set_language(subdoc.paragraphs, lang_code, is_rtl, add_hr_p)
+    return subdoc
+
+
+def append_html(
+    composer: Composer,
+    content: str,
+    lang_code: str,
+    is_rtl: bool = False,
+    add_hr_p: bool = True,
+    append_html_directly: bool = settings.APPEND_DOCX_HTML_DIRECTLY,
+    use_ooxml_writer: bool = settings.USE_DOCX_OOXML_WRITER,
+) -> None:
+    """
+    Convert the HTML content to Docx and append it to the composer's
+    document. This comes out the same as appending
+    create_docx_subdoc(content, lang_code, is_rtl, add_hr_p) to the
+    composer, but, if append_html_directly is True, the content is
+    converted for the document itself and moved into its body so that
+    no Document is created, and no styles and numbering are merged,
+    per fragment. If use_ooxml_writer is True, content which
+    ooxml_writer supports is converted by it rather than by HtmlToDocx.
+    """
+    if not append_html_directly:
+        composer.append(
+            create_docx_subdoc(content, lang_code, is_rtl, add_hr_p, use_ooxml_writer)
+        )
+        return
+    body = composer.doc.element.body
+    if use_ooxml_writer and ooxml_writer.is_supported(content):
+        # ooxml_writer writes straight into the end of the document's
+        # body.
+        paragraphs = ooxml_writer.write_html(content, body, composer.doc.part)
+        set_language(paragraphs, lang_code, is_rtl, add_hr_p)
+        composer.reset_reference_mapping()
+        for paragraph in paragraphs:
+            composer.restart_first_numbering(composer.doc, paragraph._p)
+        return
+    sect_pr = body.sectPr
+    # Convert the content into a body of its own, which shares the
+    # document's part, and so its styles and relationships, so that
+    # adding each paragraph doesn't search the whole document's body
+    # for where to add it.
+    fragment = DocxDocument(parse_xml(EMPTY_DOCUMENT_XML), composer.doc.part)
+    fragment.element.body.append(deepcopy(sect_pr))
+    html_to_docx = HtmlToDocx()
+    html_to_docx.add_html_to_document(content, fragment)
+    set_language(fragment.paragraphs, lang_code, is_rtl, add_hr_p)
+    # Restart the content's first numbered list as Composer.append
+    # would.
+    composer.reset_reference_mapping()
+    for element in fragment.element.body[:-1]:
+        sect_pr.addprevious(element)
+        composer.restart_first_numbering(composer.doc, element)
+
+
+def set_language(
+    paragraphs: Sequence[Paragraph],
+    lang_code: str,
+    is_rtl: bool = False,
+    add_hr_p: bool = True,
+    oxml_language_list_lowercase: list[str] = OXML_LANGUAGE_LIST_LOWERCASE,
+    oxml_language_list_lowercase_split: list[str] = OXML_LANGUAGE_LIST_LOWERCASE_SPLIT,
+) -> None:
+    """
+    Set the language direction of the paragraphs' runs and the language
+    of the last paragraph, and, if requested, add a horizontal ruler
+    at the end of it.
+    """
     if is_rtl:
         # Setting each run to be RTL language direction
-        for p in subdoc.paragraphs:
+        for p in paragraphs:
             for run in p.runs:
                 run.font.rtl = True
-    if subdoc.paragraphs:
-        p = subdoc.paragraphs[-1]
+    if paragraphs:
+        p = paragraphs[-1]
         # Set the language for this paragraph for the sake of the Word
         # spellchecker.
         p_run = p.add_run()
@@ -181,7 +263,6 @@ def create_docx_subdoc(
         # Add a horizontal ruler at the end of the paragraph if requested.
         if add_hr_p:
             add_hr(p)
-    return subdoc
 
 
 def add_one_column_section(doc: Document) -> None:
@@ -0,0 +1,347 @@
+"""
+This module provides a streaming HTML to WordprocessingML writer for
+the narrow HTML which DOC's assembly emits: headings, paragraphs,
+lists, verse, footnote and styled spans, footnote and column divs,
+inline formatting, links, breaks and horizontal rulers. It writes the
+same paragraphs, runs and properties as htmldocx's HtmlToDocx, which
+create_docx_subdoc otherwise uses, but writes them with lxml straight
+into the document's body as the HTML is tokenized. It doesn't clean
+the HTML with BeautifulSoup first or build the document through
+python-docx's proxy objects, which look up each paragraph's style by
+name and search the body for where to add each paragraph.
+
+The HTML is expected to be well formed, as the assembly's is, since it
+isn't cleaned up first. Content with tables or images, which the
+assembly doesn't emit, is left to HtmlToDocx, see is_supported.
+"""
+
+import re
+import weakref
+from copy import deepcopy
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Any, Optional, final
+
+from docx.enum.style import WD_STYLE_TYPE  # type: ignore
+from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_COLOR  # type: ignore
+from docx.opc.constants import RELATIONSHIP_TYPE  # type: ignore
+from docx.oxml import OxmlElement  # type: ignore
+from docx.oxml.ns import qn  # type: ignore
+from docx.shared import Inches, RGBColor  # type: ignore
+from docx.text.font import Font  # type: ignore
+from docx.text.parfmt import ParagraphFormat  # type: ignore
+from docx.text.paragraph import Paragraph  # type: ignore
+from htmldocx.h2d import (  # type: ignore
+    INDENT,
+    LIST_INDENT,
+    MAX_INDENT,
+    font_names,
+    font_styles,
+    remove_whitespace,
+    styles,
+)
+
+UNSUPPORTED_TAG_REGEX = re.compile(r"<(?:table|img)\b", re.IGNORECASE)
+HEADING_TAG_REGEX = re.compile(r"h[1-9]")
+RUN_CONTENT_SPLIT_REGEX = re.compile(r"([\t\r\n])")
+
+SECT_PR_TAG = qn("w:sectPr")
+
+HYPERLINK_COLOR = "0000EE"
+
+
+def hr_border() -> Any:
+    """
+    Return the w:pBdr element which HtmlToDocx, and add_hr, give the
+    paragraph of a horizontal ruler.
+    """
+    pBdr = OxmlElement("w:pBdr")
+    bottom = OxmlElement("w:bottom")
+    bottom.set(qn("w:val"), "single")
+    bottom.set(qn("w:sz"), "6")
+    bottom.set(qn("w:space"), "1")
+    bottom.set(qn("w:color"), "auto")
+    pBdr.append(bottom)
+    return pBdr
+
+
+# The IDs of the paragraph styles of each document part by style name.
+_style_ids: "weakref.WeakKeyDictionary[Any, dict[str, Optional[str]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def is_supported(content: str) -> bool:
+    """
+    Return True if the HTML content only uses the HTML which the writer
+    supports, i.e., has no tables or images.
+
+    >>> is_supported('<h2 class="chapter">Chapter 1</h2><p>In the beginning</p>')
+    True
+    >>> is_supported('<table><tr><td>1</td></tr></table>')
+    False
+    """
+    return not UNSUPPORTED_TAG_REGEX.search(content)
+
+
+def style_id(part: Any, style_name: str) -> Optional[str]:
+    """
+    Return the ID of the document part's paragraph style named
+    style_name or None if it is the default paragraph style.
+    """
+    style_ids = _style_ids.setdefault(part, {})
+    if style_name not in style_ids:
+        style_ids[style_name] = part.get_style_id(style_name, WD_STYLE_TYPE.PARAGRAPH)
+    return style_ids[style_name]
+
+
+def parse_dict_string(string: str, separator: str = ";") -> dict[str, str]:
+    """
+    Parse a style attribute's value as HtmlToDocx does.
+
+    >>> parse_dict_string("text-align: center; color: #ff0000")
+    {'text-align': 'center', 'color': '#ff0000'}
+    """
+    new_string = string.replace(" ", "").split(separator)
+    return dict([x.split(":") for x in new_string if ":" in x])
+
+
+def color(value: str) -> RGBColor:
+    """
+    Return the color of a CSS color value as HtmlToDocx reads it.
+
+    >>> str(color("#ff0000"))
+    'FF0000'
+    >>> str(color("rgb(0,128,0)"))
+    '008000'
+    """
+    if "rgb" in value:
+        colors = [int(x) for x in re.sub(r"[a-z()]+", "", value).split(",")]
+    elif "#" in value:
+        hex_color = value.lstrip("#")
+        colors = [int(hex_color[i : i + 2], 16) for i in (0, 2, 4)]
+    else:
+        colors = [0, 0, 0]
+    return RGBColor(*colors)
+
+
+@lru_cache(maxsize=256)
+def run_properties(
+    span_styles: tuple[str, ...], tags: tuple[str, ...]
+) -> Optional[Any]:
+    """
+    Return the w:rPr element of a run of text within spans with
+    span_styles, the values of their style attributes, and within
+    tags, in the order they were opened, or None if the run has no
+    properties. The element is shared so it must be copied.
+    """
+    r = OxmlElement("w:r")
+    font = Font(r)
+    for span_style in span_styles:
+        style = parse_dict_string(span_style)
+        if "color" in style:
+            font.color.rgb = color(style["color"])
+        if "background-color" in style:
+            font.highlight_color = WD_COLOR.GRAY_25
+    for tag in tags:
+        if tag in font_styles:
+            setattr(font, font_styles[tag], True)
+        if tag in font_names:
+            font.name = font_names[tag]
+    return r.rPr
+
+
+def append_text(r: Any, text: str) -> None:
+    """
+    Append the text to the w:r element as python-docx does, i.e., tabs
+    as w:tab, line breaks as w:br and all else as w:t elements.
+    """
+    for index, part in enumerate(RUN_CONTENT_SPLIT_REGEX.split(text)):
+        if index % 2 == 0:
+            if part:
+                r.add_t(part)
+        elif part == "\t":
+            r.add_tab()
+        else:
+            r.add_br()
+
+
+@final
+class _Writer(HTMLParser):
+    """
+    Writes the HTML fed to it into the body of a document, in front of
+    its section properties, following the same rules as HtmlToDocx.
+    """
+
+    def __init__(self, body: Any, part: Any):
+        super().__init__()
+        self.body = body
+        self.part = part
+        self.sect_pr = body[-1] if len(body) and body[-1].tag == SECT_PR_TAG else None
+        self.paragraphs: list[Any] = []
+        # The attributes of each open tag, by tag, as HtmlToDocx keeps
+        # them.
+        self.tags: dict[str, Any] = {"span": [], "list": []}
+        self.p: Optional[Any] = None
+        self.r: Optional[Any] = None
+        self.skip = False
+
+    def add_paragraph(self, style_name: Optional[str] = None) -> Any:
+        p = OxmlElement("w:p")
+        if style_name is not None:
+            p.style = style_id(self.part, style_name)
+        if self.sect_pr is not None:
+            self.sect_pr.addprevious(p)
+        else:
+            self.body.append(p)
+        self.paragraphs.append(p)
+        self.p = p
+        return p
+
+    def add_run(self) -> Any:
+        assert self.p is not None
+        r = OxmlElement("w:r")
+        self.p.append(r)
+        return r
+
+    def add_styles_to_paragraph(self, style: dict[str, str]) -> None:
+        paragraph_format = ParagraphFormat(self.p)
+        if "text-align" in style:
+            align = style["text-align"]
+            if align == "center":
+                paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            elif align == "right":
+                paragraph_format.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+            elif align == "justify":
+                paragraph_format.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+        if "margin-left" in style:
+            margin = style["margin-left"]
+            units = re.sub(r"[0-9]+", "", margin)
+            margin_ = int(float(re.sub(r"[a-z]+", "", margin)))
+            if units == "px":
+                paragraph_format.left_indent = Inches(
+                    min(margin_ // 10 * INDENT, MAX_INDENT)
+                )
+
+    def add_link(self, href: str, text: str) -> None:
+        assert self.p is not None
+        rel_id = self.part.relate_to(
+            href, RELATIONSHIP_TYPE.HYPERLINK, is_external=True
+        )
+        hyperlink = OxmlElement("w:hyperlink")
+        hyperlink.set(qn("r:id"), rel_id)
+        r = OxmlElement("w:r")
+        rPr = OxmlElement("w:rPr")
+        c = OxmlElement("w:color")
+        c.set(qn("w:val"), HYPERLINK_COLOR)
+        rPr.append(c)
+        u = OxmlElement("w:u")
+        u.set(qn("w:val"), "single")
+        rPr.append(u)
+        r.append(rPr)
+        append_text(r, text)
+        hyperlink.append(r)
+        self.p.append(hyperlink)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        if self.skip:
+            return
+        if tag == "head":
+            self.skip = True
+            return
+        elif tag == "body":
+            return
+        current_attrs = dict(attrs)
+        if tag == "span":
+            self.tags["span"].append(current_attrs)
+            return
+        elif tag == "ol" or tag == "ul":
+            self.tags["list"].append(tag)
+            return
+        elif tag == "br":
+            if self.r is not None:
+                self.r.add_br()
+            return
+        self.tags[tag] = current_attrs
+        if tag in ["p", "pre"]:
+            self.add_paragraph()
+        elif tag == "li":
+            list_depth = len(self.tags["list"])
+            list_type = self.tags["list"][-1] if list_depth else "ul"
+            p = self.add_paragraph(
+                styles["LIST_NUMBER"] if list_type == "ol" else styles["LIST_BULLET"]
+            )
+            paragraph_format = ParagraphFormat(p)
+            paragraph_format.left_indent = Inches(
+                min(list_depth * LIST_INDENT, MAX_INDENT)
+            )
+            paragraph_format.line_spacing = 1
+        elif tag == "hr":
+            self.add_paragraph().get_or_add_pPr().append(hr_border())
+        elif HEADING_TAG_REGEX.match(tag):
+            self.add_paragraph("Heading {}".format(min(int(tag[1]), 9)))
+        if tag in ["p", "li", "pre"]:
+            self.r = self.add_run()
+        style = current_attrs.get("style")
+        if style is not None and self.p is not None:
+            self.add_styles_to_paragraph(parse_dict_string(style))
+
+    def handle_endtag(self, tag: str) -> None:
+        if self.skip:
+            if tag != "head":
+                return
+            self.skip = False
+            self.p = None
+        if tag == "span":
+            if self.tags["span"]:
+                self.tags["span"].pop()
+                return
+        elif tag == "ol" or tag == "ul":
+            list_tags = self.tags["list"]
+            del list_tags[len(list_tags) - list_tags[::-1].index(tag) - 1]
+            return
+        self.tags.pop(tag, None)
+
+    def handle_data(self, data: str) -> None:
+        if self.skip:
+            return
+        if "pre" not in self.tags:
+            data = remove_whitespace(data, True, True)
+        if self.p is None:
+            self.add_paragraph()
+        link = self.tags.get("a")
+        if link:
+            self.add_link(link["href"], data)
+            return
+        r = self.add_run()
+        rPr = run_properties(
+            tuple(span["style"] for span in self.tags["span"] if "style" in span),
+            tuple(self.tags),
+        )
+        if rPr is not None:
+            r.append(deepcopy(rPr))
+        append_text(r, data)
+        self.r = r
+
+
+def write_html(content: str, body: Any, part: Any) -> list[Paragraph]:
+    """
+    Write the HTML content to the end of the document body, whose
+    document part is part, and return the paragraphs written.
+    """
+    writer = _Writer(body, part)
+    writer.feed(content)
+    return [Paragraph(p, None) for p in writer.paragraphs]
+
+
+if __name__ == "__main__":
+
+    # To run the doctests in the this module, in the root of the project do:
+    # python backend/document/domain/assembly_strategies_docx/ooxml_writer.py
+    # or
+    # python backend/document/domain/assembly_strategies_docx/ooxml_writer.py -v
+    # See https://docs.python.org/3/library/doctest.html
+    # for more details.
+    import doctest
+
+    doctest.testmod()
@@ -1,4 +1,8 @@
 import os
+from datetime import timedelta
+
+from document.config import settings
+from kombu import Queue
 
 ## Broker settings.
 broker_url = os.environ.get("CELERY_BROKER_URL", "redis://")
@@ -9,19 +13,36 @@ result_backend = os.environ.get("CELERY_RESULT_BACKEND", "redis://")
 # List of modules to import when the Celery worker starts.
 imports = ("document.domain.document_generator",)
 
+# Periodically refresh stale resource asset repos, see
+# document_generator.refresh_resource_assets.
+if settings.ASSET_REFRESH_ENABLED:
+    beat_schedule = {
+        "refresh-resource-assets": {
+            "task": "document.domain.document_generator.refresh_resource_assets",
+            "schedule": timedelta(minutes=settings.ASSET_REFRESH_INTERVAL),
+        },
+    }
+
+# Queues by class of work. Document tasks are routed by the formats
+# they have yet to produce, see task_routing, and other tasks go to the
+# light queue.
+task_queues = [Queue(queue, routing_key=queue) for queue in settings.WORKER_CONCURRENCY]
+task_default_queue = "light"
+task_routes = ("document.domain.task_routing.route_task",)
+
+# A worker started to consume only one of the queues, by the
+# CELERY_WORKER_QUEUES environment variable which the celery worker
+# command reads as its --queues option, is sized for that queue's class
+# of work, see docker-compose.yml. A worker which consumes each of the
+# queues, e.g., make local-run-celery, keeps Celery's defaults.
+if os.environ.get("CELERY_WORKER_QUEUES") in settings.WORKER_CONCURRENCY:
+    worker_concurrency = settings.WORKER_CONCURRENCY[os.environ["CELERY_WORKER_QUEUES"]]
+    worker_prefetch_multiplier = settings.WORKER_PREFETCH_MULTIPLIER[
+        os.environ["CELERY_WORKER_QUEUES"]
+    ]
 
 # task_annotations = {"document.domain.document_generator.main": {"rate_limit": "10/s"}}
 
-# task_queues = {
-#     'test-queue': {
-#         'exchange': 'test-queue',
-#     }
-# }
-# task_routes = {
-#     "worker.celery_worker.long_task": "test-queue"
-# }
 # task_track_started = True
 
-# worker_concurrency = 1
-# worker_prefetch_multiplier = 3
 # worker_max_tasks_per_child = 10000
@@ -3,24 +3,38 @@ Entrypoint for backend. Here incoming document requests are processed
 and eventually a final document produced.
 """
 
+import hashlib
+import json
+import os
 import re
 import smtplib
 import subprocess
+import tempfile
 import time
 
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from glob import glob
 from email.encoders import encode_base64
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from os.path import basename, exists, join
 from pathlib import Path
-from typing import Any, Mapping, Optional, Sequence, cast
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence, cast
 
 import jinja2
-from celery import current_task
+from celery import current_task, states
+from celery.signals import task_postrun, task_prerun, worker_process_init
 from document.config import settings
-from document.domain import parsing, resource_lookup, worker
+from document.domain import (
+    parsing,
+    pdf_rendering,
+    pdf_sections,
+    request_coalescing,
+    resource_lookup,
+    worker,
+)
 from document.domain.bible_books import BOOK_NAMES
 
 from document.domain.assembly_strategies.assembly_strategies_book_then_lang_by_chapter import (
@@ -53,6 +67,7 @@ from document.domain.model import (
     USFMBook,
 )
 from document.utils.file_utils import file_needs_update, write_file
+from document.utils.word_matcher import WordMatcher
 from docx import Document  # type: ignore
 from docx.enum.section import WD_SECTION  # type: ignore
 from docx.oxml import OxmlElement  # type: ignore
@@ -77,6 +92,22 @@ TEMPLATE_PATHS_MAP: Mapping[str, str] = {
     "email": "backend/templates/text/email.txt",
 }
 
+# The names, as shown to the user, and the MIME types of the document
+# formats, keyed by their file suffix.
+DOCUMENT_FORMAT_NAMES: Mapping[str, str] = {
+    "pdf": "PDF",
+    "epub": "ePub",
+    "docx": "Docx",
+}
+DOCUMENT_FORMAT_MIME_TYPES: Mapping[str, tuple[str, str]] = {
+    "pdf": ("application", "pdf"),
+    "epub": ("application", "epub+zip"),
+    "docx": (
+        "application",
+        "vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ),
+}
+
 
 def contains_tw(resource_request: ResourceRequest, tw_regex: str = "tw.*") -> bool:
     """Return True if the resource_request describes a TW resource."""
@@ -84,68 +115,252 @@ def contains_tw(resource_request: ResourceRequest, tw_regex: str = "tw.*") -> bo
     return value
 
 
-def document_request_key(
+def contains_tn(resource_request: ResourceRequest, tn_regex: str = "tn.*") -> bool:
+    """Return True if the resource_request describes a TN resource."""
+    return bool(re.compile(tn_regex).match(resource_request.resource_type))
+
+
+def canonical_document_request(
     resource_requests: Sequence[ResourceRequest],
     assembly_strategy_kind: AssemblyStrategyEnum,
     assembly_layout_kind: AssemblyLayoutEnum,
     chunk_size: ChunkSizeEnum,
     limit_words: bool,
-    max_filename_len: int = 240,
+    include_tn_book_intros: bool = False,
+    usfm_resource_types: Sequence[str] = settings.USFM_RESOURCE_TYPES,
+) -> dict[str, Any]:
+    """
+    Return the canonical form of a document request: only what
+    determines the document's content, with the resource requests
+    sorted and de-duplicated, since the assembly strategies order the
+    content themselves, and without the flags which don't apply to the
+    resources requested.
+
+    The one exception is the order of USFM resources which share a
+    language and book: the assembly strategies take the first one
+    requested as the primary USFM and the next as the secondary, so,
+    when there is more than one, their order is kept under
+    usfm_order.
+    """
+    usfm_types_by_lang_and_book: dict[tuple[str, str], list[str]] = {}
+    for resource_request in resource_requests:
+        if resource_request.resource_type in usfm_resource_types:
+            usfm_types = usfm_types_by_lang_and_book.setdefault(
+                (resource_request.lang_code, resource_request.book_code), []
+            )
+            if resource_request.resource_type not in usfm_types:
+                usfm_types.append(resource_request.resource_type)
+    canonical_document_request_: dict[str, Any] = {
+        "resource_requests": sorted(
+            {
+                (
+                    resource_request.lang_code,
+                    resource_request.resource_type,
+                    resource_request.book_code,
+                )
+                for resource_request in resource_requests
+            }
+        ),
+        "assembly_strategy_kind": assembly_strategy_kind.value,
+        "assembly_layout_kind": assembly_layout_kind.value,
+        "chunk_size": chunk_size.value,
+    }
+    if any(contains_tw(resource_request) for resource_request in resource_requests):
+        canonical_document_request_["limit_words"] = limit_words
+    if any(contains_tn(resource_request) for resource_request in resource_requests):
+        canonical_document_request_["include_tn_book_intros"] = include_tn_book_intros
+    usfm_order = [
+        (lang_code, book_code, usfm_types)
+        for (lang_code, book_code), usfm_types in sorted(
+            usfm_types_by_lang_and_book.items()
+        )
+        if len(usfm_types) > 1
+    ]
+    if usfm_order:
+        canonical_document_request_["usfm_order"] = usfm_order
+    return canonical_document_request_
+
+
+def document_request_description(
+    canonical_document_request_: Mapping[str, Any],
     underscore: str = "_",
     hyphen: str = "-",
+) -> str:
+    """
+    Return the human readable description of the canonical document
+    request, which document request keys used to be.
+
+    >>> document_request_description({"resource_requests": [("en", "tn", "col"), ("en", "ulb", "col")], "assembly_strategy_kind": "lbo", "assembly_layout_kind": "1c", "chunk_size": "chapter", "include_tn_book_intros": False})
+    'en-tn-col_en-ulb-col_lbo_1c_chapter_tbif'
+    """
+    flags = []
+    if "limit_words" in canonical_document_request_:
+        flags.append("ltwt" if canonical_document_request_["limit_words"] else "ltwf")
+    if "include_tn_book_intros" in canonical_document_request_:
+        flags.append(
+            "tbit" if canonical_document_request_["include_tn_book_intros"] else "tbif"
+        )
+    return underscore.join(
+        [
+            underscore.join(
+                hyphen.join(resource_request)
+                for resource_request in canonical_document_request_["resource_requests"]
+            ),
+            canonical_document_request_["assembly_strategy_kind"],
+            canonical_document_request_["assembly_layout_kind"],
+            canonical_document_request_["chunk_size"],
+            *flags,
+        ]
+    )
+
+
+def document_request_key(
+    resource_requests: Sequence[ResourceRequest],
+    assembly_strategy_kind: AssemblyStrategyEnum,
+    assembly_layout_kind: AssemblyLayoutEnum,
+    chunk_size: ChunkSizeEnum,
+    limit_words: bool,
+    include_tn_book_intros: bool = False,
 ) -> str:
     """
     Create and return the document_request_key. The
     document_request_key uniquely identifies a document request.
 
-    If the document request key is max_filename_len or more characters
-    in length, then switch to using a shorter string that is based on the
-    current time. The reason for this is that the document request key is
-    used as the file name (with suffix appended) and each OS has a limit
-    to how long a file name may be. max_filename_len should make room for
-    the file suffix, e.g., ".html", to be appended.
+    It is the SHA-256 hash of the canonical document request, see
+    canonical_document_request, so that requests for the same document
+    share a key, and so its cached output, whatever order their
+    resources were requested in, and so that the key of a request for
+    any number of resources is short enough to use as a file name. The
+    human readable description of the document request is recorded
+    alongside the document, see record_document_request_metadata.
+    """
+    return hashlib.sha256(
+        json.dumps(
+            canonical_document_request(
+                resource_requests,
+                assembly_strategy_kind,
+                assembly_layout_kind,
+                chunk_size,
+                limit_words,
+                include_tn_book_intros,
+            ),
+            sort_keys=True,
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def requested_formats(document_request: DocumentRequest) -> list[str]:
+    """
+    Return the file suffixes of the document formats, other than HTML,
+    which the document request asks for.
+    """
+    return [
+        format_
+        for format_, requested in [
+            ("pdf", document_request.generate_pdf),
+            ("epub", document_request.generate_epub),
+            ("docx", document_request.generate_docx),
+        ]
+        if requested
+    ]
+
 
-    It is really useful to have filenames with semantic meaning and so
-    those are preferred when possible, i.e., when the file name is not
-    too long.
+def task_formats(task_name: str, document_request: DocumentRequest) -> list[str]:
     """
-    resource_request_keys = underscore.join(
-        [
-            hyphen.join(
-                [
-                    resource_request.lang_code,
-                    resource_request.resource_type,
-                    resource_request.book_code,
-                ]
-            )
-            for resource_request in resource_requests
+    Return the file suffixes of the document formats which the task,
+    named task_name, produces for the document request.
+    """
+    if task_name == generate_docx_document.name:
+        return [
+            format_
+            for format_ in requested_formats(document_request)
+            if format_ == "docx"
+        ]
+    if task_name == generate_document.name:
+        return [
+            "html",
+            *(
+                format_
+                for format_ in requested_formats(document_request)
+                if format_ != "docx"
+            ),
         ]
+    return ["html", *requested_formats(document_request)]
+
+
+def canonical_document_request_of(
+    document_request: DocumentRequest,
+) -> dict[str, Any]:
+    """Return the canonical form of the document request."""
+    return canonical_document_request(
+        document_request.resource_requests,
+        document_request.assembly_strategy_kind,
+        select_assembly_layout_kind(document_request),
+        document_request.chunk_size,
+        document_request.limit_words,
+        document_request.include_tn_book_intros,
     )
-    if any(contains_tw(resource_request) for resource_request in resource_requests):
-        document_request_key = "{}_{}_{}_{}_{}".format(
-            resource_request_keys,
-            assembly_strategy_kind.value,
-            assembly_layout_kind.value,
-            chunk_size.value,
-            "ltwt" if limit_words else "ltwf",
-        )
-    else:
-        document_request_key = "{}_{}_{}_{}".format(
-            resource_request_keys,
-            assembly_strategy_kind.value,
-            assembly_layout_kind.value,
-            chunk_size.value,
-        )
-    if len(document_request_key) >= max_filename_len:
-        # Likely the generated filename was too long for the OS where this is
-        # running. In that case, use the current time as a document_request_key
-        # value as doing so results in an acceptably short length.
-        timestamp_components = str(time.time()).split(".")
-        return "{}_{}".format(timestamp_components[0], timestamp_components[1])
-    else:
-        # Use the semantic filename which declaratively describes the
-        # document request components.
-        return document_request_key
+
+
+def document_request_key_of(document_request: DocumentRequest) -> str:
+    """Return the document request key of the document request."""
+    return document_request_key(
+        document_request.resource_requests,
+        document_request.assembly_strategy_kind,
+        select_assembly_layout_kind(document_request),
+        document_request.chunk_size,
+        document_request.limit_words,
+        document_request.include_tn_book_intros,
+    )
+
+
+def in_flight_key(task_name: str, document_request: DocumentRequest) -> str:
+    """
+    Return the key under which request_coalescing records the task,
+    named task_name, which fulfills the document request, and
+    identical document requests, while it is in flight.
+    """
+    return request_coalescing.in_flight_key(
+        task_name,
+        document_request_key_of(document_request),
+        requested_formats(document_request),
+    )
+
+
+def missing_formats(
+    document_request: DocumentRequest, formats: Sequence[str]
+) -> list[str]:
+    """
+    Return those of the formats, given by file suffix, in which the
+    document has yet to be generated or which are too stale to serve
+    from the output cache.
+    """
+    document_request_key_ = document_request_key_of(document_request)
+    filepaths = {
+        "html": html_filepath,
+        "pdf": pdf_filepath,
+        "epub": epub_filepath,
+        "docx": docx_filepath,
+    }
+    return [
+        format_
+        for format_ in formats
+        if file_needs_update(filepaths[format_](document_request_key_))
+    ]
+
+
+def cached_document_request_key(
+    document_request: DocumentRequest, formats: Sequence[str]
+) -> Optional[str]:
+    """
+    Return the document request key of the document request if the
+    document has been generated in each of the formats, given by file
+    suffix, and they are fresh enough to serve from the output cache,
+    else None.
+    """
+    if missing_formats(document_request, formats):
+        return None
+    return document_request_key_of(document_request)
 
 
 def template_path(
@@ -269,20 +484,27 @@ def translation_words_section(
     limit_words: bool,
     resource_requests: Sequence[ResourceRequest],
     resource_type_name_fmt_str: str = settings.RESOURCE_TYPE_NAME_FMT_STR,
+    update_task_state: bool = True,
 ) -> str:
     """
     Build and return the translation words definition section, i.e.,
     the list of all translation words for this language, book combination.
     Limit the translation words to only those that appear in the USFM
     resouce chosen if limit_words is True and a USFM resource was also
-    chosen.
+    chosen. The current task's state is only updated if
+    update_task_state, i.e., if this is called from the task's own
+    thread.
     """
 
     content = []
     if tw_book.name_content_pairs:
         content.append(resource_type_name_fmt_str.format(tw_book.resource_type_name))
     selected_name_content_pairs = get_selected_name_content_pairs(
-        tw_book, usfm_books, limit_words, resource_requests
+        tw_book,
+        usfm_books,
+        limit_words,
+        resource_requests,
+        update_task_state=update_task_state,
     )
     for name_content_pair in selected_name_content_pairs:
         content.append(name_content_pair_content(name_content_pair, tw_book))
@@ -295,12 +517,13 @@ def get_selected_name_content_pairs(
     limit_words: bool,
     resource_requests: Sequence[ResourceRequest],
     usfm_resource_types: Sequence[str] = settings.USFM_RESOURCE_TYPES,
+    update_task_state: bool = True,
 ) -> list[TWNameContentPair]:
     selected_name_content_pairs = []
     if usfm_books and limit_words:
         selected_name_content_pairs = filter_name_content_pairs(tw_book, usfm_books)
     elif not usfm_books and limit_words:
-        usfm_books = fetch_usfm_book_content_units(resource_requests)
+        usfm_books = fetch_usfm_book_content_units(resource_requests, update_task_state)
         selected_name_content_pairs = filter_name_content_pairs(tw_book, usfm_books)
     else:
         selected_name_content_pairs = tw_book.name_content_pairs
@@ -308,26 +531,54 @@ def get_selected_name_content_pairs(
 
 
 def filter_name_content_pairs(
-    tw_book: TWBook, usfm_books: Optional[Sequence[USFMBook]]
+    tw_book: TWBook,
+    usfm_books: Optional[Sequence[USFMBook]],
+    chapter_separator: str = "\0",
 ) -> list[TWNameContentPair]:
+    """
+    Return the name content pairs of tw_book whose localized word
+    occurs in a chapter of a USFM book, once for each such USFM book.
+    """
     selected_name_content_pairs = []
     if usfm_books:
+        t0 = time.time()
+        word_matcher = WordMatcher(
+            name_content_pair.localized_word
+            for name_content_pair in tw_book.name_content_pairs
+        )
+        # Scan each book's chapters in one pass. The separator, which
+        # no localized word contains, keeps words from matching across
+        # chapters.
+        words_by_usfm_book = [
+            (
+                word_matcher.present_words(
+                    chapter_separator.join(
+                        chapter.content for chapter in usfm_book.chapters.values()
+                    )
+                )
+                if usfm_book.chapters
+                else set()
+            )
+            for usfm_book in usfm_books
+        ]
         for name_content_pair in tw_book.name_content_pairs:
-            for usfm_book in usfm_books:
-                for chapter in usfm_book.chapters.values():
-                    if re.search(
-                        re.escape(name_content_pair.localized_word),
-                        chapter.content,
-                    ):
-                        selected_name_content_pairs.append(name_content_pair)
-                        break
+            for words in words_by_usfm_book:
+                if name_content_pair.localized_word in words:
+                    selected_name_content_pairs.append(name_content_pair)
+        t1 = time.time()
+        logger.debug("Time to filter translation words: %s", t1 - t0)
     return selected_name_content_pairs
 
 
-def fetch_usfm_book_content_units(
+def found_usfm_resource_lookup_dtos(
     resource_requests: Sequence[ResourceRequest],
     usfm_resource_types: Sequence[str] = settings.USFM_RESOURCE_TYPES,
-) -> list[USFMBook]:
+) -> list[ResourceLookupDto]:
+    """
+    Return the resource lookup DTOs of the USFM resources, of any USFM
+    resource type, available for the languages and books of
+    resource_requests.
+    """
     usfm_resource_lookup_dtos = []
     for resource_request in resource_requests:
         for usfm_type in usfm_resource_types:
@@ -339,23 +590,40 @@ def fetch_usfm_book_content_units(
             if resource_lookup_dto:
                 usfm_resource_lookup_dtos.append(resource_lookup_dto)
     # Determine which resource URLs were actually found.
-    found_usfm_resource_lookup_dtos = [
+    return [
         resource_lookup_dto
         for resource_lookup_dto in usfm_resource_lookup_dtos
         if resource_lookup_dto.url is not None
     ]
-    current_task.update_state(state="Provisioning USFM asset files for TW resource")
+
+
+def fetch_usfm_book_content_units(
+    resource_requests: Sequence[ResourceRequest],
+    update_task_state: bool = True,
+) -> list[USFMBook]:
+    """
+    Provision and parse the USFM books of the languages and books of
+    resource_requests so that translation words can be limited to those
+    which appear in them. The current task's state is only updated if
+    update_task_state, i.e., if this is called from the task's own
+    thread, since Celery's current_task is None in other threads.
+    """
+    found_usfm_resource_lookup_dtos_ = found_usfm_resource_lookup_dtos(
+        resource_requests
+    )
+    if update_task_state:
+        current_task.update_state(state="Provisioning USFM asset files for TW resource")
     t0 = time.time()
-    resource_dirs = [
-        resource_lookup.provision_asset_files(dto)
-        for dto in found_usfm_resource_lookup_dtos
-    ]
+    resource_dirs = resource_lookup.provision_asset_files_concurrently(
+        found_usfm_resource_lookup_dtos_
+    )
     t1 = time.time()
     logger.debug(
         "Time to provision USFM asset files (acquire and write to disk) for TW resource: %s",
         t1 - t0,
     )
-    current_task.update_state(state="Parsing USFM asset files for TW resource")
+    if update_task_state:
+        current_task.update_state(state="Parsing USFM asset files for TW resource")
     # Initialize found resources from their provisioned assets.
     usfm_book_content_units = [
         parsing.usfm_book_content(
@@ -365,7 +633,7 @@ def fetch_usfm_book_content_units(
             False,
         )
         for resource_lookup_dto, resource_dir in zip(
-            found_usfm_resource_lookup_dtos, resource_dirs
+            found_usfm_resource_lookup_dtos_, resource_dirs
         )
     ]
     return usfm_book_content_units
@@ -414,80 +682,72 @@ def assemble_content(
     tw_books: Sequence[TWBook],
     bc_books: Sequence[BCBook],
     found_resource_lookup_dtos: Sequence[ResourceLookupDto],
-) -> str:
+    book_boundary_html: str = settings.BOOK_BOUNDARY_HTML,
+) -> Iterator[str]:
     """
-    Assemble and return the content from all requested resources according to the
-    assembly_strategy requested.
+    Assemble and yield, fragment by fragment, the content from all
+    requested resources according to the assembly_strategy requested.
     """
-    t0 = time.time()
-    content = ""
     if (
         document_request.assembly_strategy_kind
         == AssemblyStrategyEnum.LANGUAGE_BOOK_ORDER
     ):
-        content = "".join(
-            assemble_content_by_lang_then_book(
-                usfm_books,
-                tn_books,
-                tq_books,
-                tw_books,
-                bc_books,
-                cast(AssemblyLayoutEnum, document_request.assembly_layout_kind),
-            )
+        yield from assemble_content_by_lang_then_book(
+            usfm_books,
+            tn_books,
+            tq_books,
+            tw_books,
+            bc_books,
+            cast(AssemblyLayoutEnum, document_request.assembly_layout_kind),
         )
     elif (
         document_request.assembly_strategy_kind
         == AssemblyStrategyEnum.BOOK_LANGUAGE_ORDER
     ):
-        content = "".join(
-            assemble_content_by_book_then_lang(
-                usfm_books,
-                tn_books,
-                tq_books,
-                tw_books,
-                bc_books,
-                cast(AssemblyLayoutEnum, document_request.assembly_layout_kind),
-            )
+        yield from assemble_content_by_book_then_lang(
+            usfm_books,
+            tn_books,
+            tq_books,
+            tw_books,
+            bc_books,
+            cast(AssemblyLayoutEnum, document_request.assembly_layout_kind),
         )
-    t1 = time.time()
-    logger.debug("Time for interleaving document: %s", t1 - t0)
-    t0 = time.time()
     # Add the translation words definition section for each language requested.
     unique_lang_codes = set()
     for tw_book in tw_books:
         if tw_book.lang_code not in unique_lang_codes:
             unique_lang_codes.add(tw_book.lang_code)
-            content = "{}{}<hr/>".format(
-                content,
-                translation_words_section(
-                    tw_book,
-                    usfm_books,
-                    document_request.limit_words,
-                    document_request.resource_requests,
-                ),
+            t0 = time.time()
+            translation_words_section_ = translation_words_section(
+                tw_book,
+                usfm_books,
+                document_request.limit_words,
+                document_request.resource_requests,
             )
-    t1 = time.time()
-    logger.debug("Time for add TW content to document: %s", t1 - t0)
-    return content
+            t1 = time.time()
+            logger.debug("Time for add TW content to document: %s", t1 - t0)
+            yield book_boundary_html
+            yield translation_words_section_
+            yield "<hr/>"
 
 
-def create_title_page_and_wrap_in_template(
-    content: str,
+def title_page_html_header(
     document_request: DocumentRequest,
     found_resource_lookup_dtos: Sequence[ResourceLookupDto],
 ) -> str:
-
+    """
+    Return the HTML header, including the title page, which encloses
+    the content of the document.
+    """
     title1, title2 = get_languages_title_page_strings(found_resource_lookup_dtos)
     title3 = "Formatted for Translators"
-    header = document_html_header(
+    return document_html_header(
         document_request.assembly_layout_kind,
         document_request.generate_docx,
         title1,
         title2,
         title3,
     )
-    content = enclose_html_content(content, document_html_header=header)
-    return content
 
 
 def filter_unique_by_lang_code(tw_books: Sequence[TWBook]) -> list[TWBook]:
@@ -509,10 +769,12 @@ def assemble_docx_content(
     tq_books: Sequence[TQBook],
     tw_books: Sequence[TWBook],
     bc_books: Sequence[BCBook],
+    update_task_state: bool = True,
 ) -> Composer:
     """
     Assemble and return the content from all requested resources according to the
-    assembly_strategy requested.
+    assembly_strategy requested. The current task's state is only
+    updated if update_task_state, see write_docx_document.
     """
     t0 = time.time()
     composer = None
@@ -557,6 +819,7 @@ def assemble_docx_content(
                     usfm_books,
                     document_request.limit_words,
                     document_request.resource_requests,
+                    update_task_state=update_task_state,
                 )
             )
             if tw_subdoc.paragraphs:
@@ -664,13 +927,43 @@ def convert_html_to_pdf(
     html_filepath: str,
     pdf_filepath: str,
     document_request_key: str,
+    use_persistent_pdf_renderer: bool = settings.USE_PERSISTENT_PDF_RENDERER,
+    render_pdf_in_sections: bool = settings.RENDER_PDF_IN_SECTIONS,
 ) -> None:
     """
-    Generate PDF from HTML and copy it to output directory.
+    Generate PDF from HTML and copy it to output directory. The PDF is
+    rendered by one of this process's long-lived WeasyPrint processes,
+    or, if render_pdf_in_sections, by several of them in parallel, one
+    section of the document at a time, falling back to the weasyprint
+    CLI if that fails.
     """
     assert exists(html_filepath)
     logger.info("Generating PDF %s...", pdf_filepath)
     t0 = time.time()
+    if use_persistent_pdf_renderer:
+        try:
+            if render_pdf_in_sections:
+                rendering = pdf_sections.render_pdf_in_sections(
+                    html_filepath, pdf_filepath, pdf_rendering.pdf_renderer_pool()
+                )
+            else:
+                rendering = pdf_rendering.pdf_renderer_pool().render(
+                    html_filepath, pdf_filepath
+                )
+        except Exception:
+            logger.exception(
+                "PDF rendering process failed to render %s, falling back to weasyprint CLI",
+                html_filepath,
+            )
+        else:
+            t1 = time.time()
+            logger.debug(
+                "Time for converting HTML to PDF: %s (rendering: %s, peak memory of rendering process: %.1f MiB)",
+                t1 - t0,
+                rendering.seconds,
+                rendering.peak_rss_bytes / (1024 * 1024),
+            )
+            return
     # command = [
     #     "ebook-convert",
     #     html_filepath,
@@ -826,6 +1119,130 @@ def cover_filepath(
     return join(output_dir, "{}_cover.html".format(document_request_key))
 
 
+def repo_dependencies_filepath(
+    document_request_key: str, output_dir: str = settings.DOCUMENT_OUTPUT_DIR
+) -> str:
+    """
+    Given document_request_key, return the path of the file which
+    records the resource asset repos the document was generated from.
+    """
+    return join(output_dir, "{}_repos.json".format(document_request_key))
+
+
+def metadata_filepath(
+    document_request_key: str, output_dir: str = settings.DOCUMENT_OUTPUT_DIR
+) -> str:
+    """
+    Given document_request_key, return the path of the file which
+    records the human readable description of the document request.
+    """
+    return join(output_dir, "{}_metadata.json".format(document_request_key))
+
+
+def record_document_request_metadata(
+    document_request_key: str,
+    document_request: DocumentRequest,
+    output_dir: str = settings.DOCUMENT_OUTPUT_DIR,
+) -> None:
+    """
+    Record the human readable description, and the canonical form, of
+    the document request identified by document_request_key, since the
+    key itself is a hash.
+    """
+    canonical_document_request_ = canonical_document_request_of(document_request)
+    write_file(
+        metadata_filepath(document_request_key, output_dir),
+        {
+            "description": document_request_description(canonical_document_request_),
+            **canonical_document_request_,
+        },
+    )
+
+
+def document_repo_dependencies(
+    document_request: DocumentRequest,
+    found_resource_lookup_dtos: Sequence[ResourceLookupDto],
+) -> list[ResourceLookupDto]:
+    """
+    Return the resource lookup DTOs of all the resource asset repos
+    that the document for document_request is generated from. Besides
+    the requested resources this includes the USFM resources used to
+    limit translation words.
+    """
+    if document_request.limit_words and any(
+        contains_tw(resource_request)
+        for resource_request in document_request.resource_requests
+    ):
+        return [
+            *found_resource_lookup_dtos,
+            *found_usfm_resource_lookup_dtos(document_request.resource_requests),
+        ]
+    return list(found_resource_lookup_dtos)
+
+
+def record_repo_dependencies(
+    document_request_key: str,
+    resource_lookup_dtos: Sequence[ResourceLookupDto],
+    output_dir: str = settings.DOCUMENT_OUTPUT_DIR,
+) -> None:
+    """
+    Record the resource asset repos, and their commit hashes, that the
+    document identified by document_request_key was generated from so
+    that the document can be invalidated when one of them changes.
+    """
+    resource_dirs = {
+        resource_lookup.resource_filepath(resource_lookup_dto)
+        for resource_lookup_dto in resource_lookup_dtos
+    }
+    write_file(
+        repo_dependencies_filepath(document_request_key, output_dir),
+        {
+            basename(resource_dir): resource_lookup.recorded_commit_hash(resource_dir)
+            for resource_dir in resource_dirs
+        },
+    )
+
+
+def invalidate_documents_depending_on(
+    repo_names: Sequence[str],
+    output_dir: str = settings.DOCUMENT_OUTPUT_DIR,
+    repo_dependencies_suffix: str = "_repos.json",
+) -> list[str]:
+    """
+    Delete the generated documents, in every output format, which
+    depend on any of the resource asset repos named repo_names so that
+    they are generated anew from the refreshed repos. Return the
+    document request keys of the deleted documents.
+    """
+    invalidated_document_request_keys = []
+    for repo_dependencies_filepath_ in glob(
+        join(output_dir, "*{}".format(repo_dependencies_suffix))
+    ):
+        try:
+            with open(repo_dependencies_filepath_) as fin:
+                dependencies = json.load(fin)
+        except (OSError, ValueError):
+            logger.exception("Could not read %s", repo_dependencies_filepath_)
+            continue
+        if not set(repo_names) & dependencies.keys():
+            continue
+        document_request_key_ = basename(repo_dependencies_filepath_)[
+            : -len(repo_dependencies_suffix)
+        ]
+        for filepath_ in (
+            html_filepath(document_request_key_, output_dir),
+            pdf_filepath(document_request_key_, output_dir),
+            epub_filepath(document_request_key_, output_dir),
+            docx_filepath(document_request_key_, output_dir),
+            cover_filepath(document_request_key_, output_dir),
+            repo_dependencies_filepath_,
+        ):
+            if exists(filepath_):
+                os.remove(filepath_)
+        invalidated_document_request_keys.append(document_request_key_)
+    return invalidated_document_request_keys
+
+
 def select_assembly_layout_kind(
     document_request: DocumentRequest,
     usfm_resource_types: Sequence[str] = settings.USFM_RESOURCE_TYPES,
@@ -881,18 +1298,57 @@ def select_assembly_layout_kind(
 
 
 def write_html_content_to_file(
-    content: str,
+    content: Iterable[str],
     output_filename: str,
+    document_html_header: str,
+    document_html_footer: str = template("footer_enclosing"),
+    check_for_verses: bool = False,
+    verse_marker: str = 'class="verse"',
 ) -> None:
     """
-    Write HTML content to file.
+    Write the HTML content, as it is assembled, to file enclosed in
+    the document's HTML header and footer so that the whole document
+    need never be held in memory. The file is written under a
+    temporary name and then moved into place so that readers never
+    see a partial document.
+
+    If check_for_verses is True and no verse is found in the content
+    then the file's content is replaced as check_content_for_issues
+    describes.
     """
     logger.debug("About to write HTML to %s", output_filename)
-    # Write the HTML file to disk.
-    write_file(
-        output_filename,
-        content,
-    )
+    t0 = time.time()
+    output_dir = os.path.dirname(output_filename)
+    os.makedirs(output_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, prefix=".tmp-", suffix=".html")
+    try:
+        verse_found = False
+        # Tail of the previous fragment in case the verse marker spans
+        # two fragments.
+        tail = ""
+        with os.fdopen(fd, "w", encoding="utf-8") as fout:
+            fout.write(document_html_header)
+            for fragment in content:
+                fout.write(fragment)
+                if not verse_found:
+                    verse_found = verse_marker in tail + fragment
+                    tail = fragment[-(len(verse_marker) - 1) :]
+            fout.write(document_html_footer)
+        if check_for_verses and not verse_found:
+            with open(tmp_path, "r", encoding="utf-8") as fin:
+                written_content = fin.read()[
+                    len(document_html_header) : -len(document_html_footer) or None
+                ]
+            with open(tmp_path, "w", encoding="utf-8") as fout:
+                fout.write(document_html_header)
+                fout.write(check_content_for_issues(written_content))
+                fout.write(document_html_footer)
+        os.replace(tmp_path, output_filename)
+    finally:
+        if exists(tmp_path):
+            os.remove(tmp_path)
+    t1 = time.time()
+    logger.debug("Time to assemble and write HTML to file: %s", t1 - t0)
 
 
 def check_content_for_issues(
@@ -922,6 +1378,195 @@ def check_content_for_issues(
     return content
 
 
+def consumes_pdf_queue(worker_queues: Optional[str]) -> bool:
+    """
+    Return True if a worker started to consume worker_queues, its
+    CELERY_WORKER_QUEUES, i.e., its --queues option, if any, consumes
+    the pdf queue, see task_routing.PDF_QUEUE. A worker started without
+    it consumes each of the queues.
+
+    >>> consumes_pdf_queue(None)
+    True
+    >>> consumes_pdf_queue("pdf")
+    True
+    >>> consumes_pdf_queue("light,pdf")
+    True
+    >>> consumes_pdf_queue("docx")
+    False
+    """
+    if not worker_queues:
+        return True
+    return "pdf" in [queue.strip() for queue in worker_queues.split(",")]
+
+
+@worker_process_init.connect
+def warm_pdf_renderer_pool(
+    use_persistent_pdf_renderer: bool = settings.USE_PERSISTENT_PDF_RENDERER,
+    **kwargs: Any,
+) -> None:
+    """
+    Start each Celery worker process's long-lived WeasyPrint processes
+    as soon as it starts so that the first PDF it renders doesn't wait
+    for WeasyPrint to load. Only workers which consume the pdf queue do
+    so. Those of the other queues, which seldom render PDFs, e.g., when
+    generate_document_in_all_formats is routed to the docx queue, start
+    them on first use rather than holding them for nothing.
+    """
+    if use_persistent_pdf_renderer and consumes_pdf_queue(
+        os.environ.get("CELERY_WORKER_QUEUES")
+    ):
+        pdf_rendering.pdf_renderer_pool().warm()
+
+
+def parsed_books(
+    document_request: DocumentRequest,
+) -> tuple[
+    list[ResourceLookupDto],
+    tuple[
+        Sequence[USFMBook],
+        Sequence[TNBook],
+        Sequence[TQBook],
+        Sequence[TWBook],
+        Sequence[BCBook],
+    ],
+]:
+    """
+    Locate, provision and parse the assets of the document request's
+    resource requests. Return the resource lookup DTOs of the resources
+    which were found and the books parsed from them.
+    """
+    # Update the state of the worker process. This is used by the
+    # UI to report status.
+    current_task.update_state(state="Locating assets")
+    # Start by getting the resource lookup DTOs for each resource
+    # request in the document request.
+    resource_lookup_dtos = []
+    for resource_request in document_request.resource_requests:
+        resource_lookup_dto = resource_lookup.resource_lookup_dto(
+            resource_request.lang_code,
+            resource_request.resource_type,
+            resource_request.book_code,
+        )
+        if resource_lookup_dto:
+            resource_lookup_dtos.append(resource_lookup_dto)
+    # Determine which resource URLs were actually found.
+    found_resource_lookup_dtos = [
+        resource_lookup_dto
+        for resource_lookup_dto in resource_lookup_dtos
+        if resource_lookup_dto.url is not None
+    ]
+    # if not found_resource_lookup_dtos:
+    #     raise exceptions.ResourceAssetFileNotFoundError(
+    #         message="No supported resource assets were found"
+    #     )
+    current_task.update_state(state="Provisioning asset files")
+    t0 = time.time()
+    resource_dirs = resource_lookup.provision_asset_files_concurrently(
+        found_resource_lookup_dtos
+    )
+    t1 = time.time()
+    logger.debug(
+        "Time to provision asset files (acquire and write to disk): %s", t1 - t0
+    )
+    current_task.update_state(state="Parsing asset files")
+    # Initialize found resources from their provisioned assets.
+    t0 = time.time()
+    books = parsing.books(
+        found_resource_lookup_dtos,
+        resource_dirs,
+        document_request.resource_requests,
+        document_request.layout_for_print,
+    )
+    t1 = time.time()
+    logger.debug("Time to parse all resource content: %s", t1 - t0)
+    return found_resource_lookup_dtos, books
+
+
+def write_html_document(
+    document_request_key: str,
+    document_request: DocumentRequest,
+    found_resource_lookup_dtos: Sequence[ResourceLookupDto],
+    usfm_books: Sequence[USFMBook],
+    tn_books: Sequence[TNBook],
+    tq_books: Sequence[TQBook],
+    tw_books: Sequence[TWBook],
+    bc_books: Sequence[BCBook],
+) -> None:
+    """Assemble the document's content and write it to its HTML file."""
+    write_html_content_to_file(
+        assemble_content(
+            document_request_key,
+            document_request,
+            usfm_books,
+            tn_books,
+            tq_books,
+            tw_books,
+            bc_books,
+            found_resource_lookup_dtos,
+        ),
+        html_filepath(document_request_key),
+        title_page_html_header(document_request, found_resource_lookup_dtos),
+        check_for_verses=bool(usfm_books),
+    )
+    record_repo_dependencies(
+        document_request_key,
+        document_repo_dependencies(document_request, found_resource_lookup_dtos),
+    )
+    record_document_request_metadata(document_request_key, document_request)
+
+
+def write_docx_document(
+    document_request_key: str,
+    document_request: DocumentRequest,
+    found_resource_lookup_dtos: Sequence[ResourceLookupDto],
+    usfm_books: Sequence[USFMBook],
+    tn_books: Sequence[TNBook],
+    tq_books: Sequence[TQBook],
+    tw_books: Sequence[TWBook],
+    bc_books: Sequence[BCBook],
+    update_task_state: bool = False,
+) -> None:
+    """
+    Assemble the document's content as Docx and write it to its Docx
+    file. The current task's state is only updated if
+    update_task_state, i.e., if this is called from the task's own
+    thread.
+    """
+    composer = assemble_docx_content(
+        document_request_key,
+        document_request,
+        usfm_books,
+        tn_books,
+        tq_books,
+        tw_books,
+        bc_books,
+        update_task_state,
+    )
+    # TODO At this point, like in generate_document, we should check the
+    # underlying HTML content to see if it contains verses and display a
+    # message in the document to the end user if it does not (so that they
+    # get some indication of why the scripture is missing).
+
+    # Construct sensical phrases to display for title1 and title2 on first
+    # page of Word document.
+    title1, title2 = get_languages_title_page_strings(found_resource_lookup_dtos)
+    if update_task_state:
+        current_task.update_state(state="Converting to Docx")
+    convert_html_to_docx(
+        html_filepath(document_request_key),
+        docx_filepath(document_request_key),
+        composer,
+        document_request.layout_for_print,
+        title1,
+        title2,
+    )
+    record_repo_dependencies(
+        document_request_key,
+        document_repo_dependencies(document_request, found_resource_lookup_dtos),
+    )
+    record_document_request_metadata(document_request_key, document_request)
+
+
 # @worker.app.task(
 #     autoretry_for=(Exception,),
 #     retry_backoff=True,
@@ -948,82 +1593,20 @@ def generate_document(
     )
     # Generate the document request key that identifies this and
     # identical document requests.
-    document_request_key_ = document_request_key(
-        document_request.resource_requests,
-        document_request.assembly_strategy_kind,
-        document_request.assembly_layout_kind,
-        document_request.chunk_size,
-        document_request.limit_words,
-    )
+    document_request_key_ = document_request_key_of(document_request)
     html_filepath_ = html_filepath(document_request_key_)
     pdf_filepath_ = pdf_filepath(document_request_key_)
     epub_filepath_ = epub_filepath(document_request_key_)
     if file_needs_update(html_filepath_):
-        # Update the state of the worker process. This is used by the
-        # UI to report status.
-        current_task.update_state(state="Locating assets")
-        # HTML didn't exist in cache so go ahead and start by getting the
-        # resource lookup DTOs for each resource request in the document
-        # request.
-        resource_lookup_dtos = []
-        for resource_request in document_request.resource_requests:
-            resource_lookup_dto = resource_lookup.resource_lookup_dto(
-                resource_request.lang_code,
-                resource_request.resource_type,
-                resource_request.book_code,
-            )
-            if resource_lookup_dto:
-                resource_lookup_dtos.append(resource_lookup_dto)
-        # Determine which resource URLs were actually found.
-        found_resource_lookup_dtos = [
-            resource_lookup_dto
-            for resource_lookup_dto in resource_lookup_dtos
-            if resource_lookup_dto.url is not None
-        ]
-        # if not found_resource_lookup_dtos:
-        #     raise exceptions.ResourceAssetFileNotFoundError(
-        #         message="No supported resource assets were found"
-        #     )
-        current_task.update_state(state="Provisioning asset files")
-        t0 = time.time()
-        resource_dirs = [
-            resource_lookup.provision_asset_files(dto)
-            for dto in found_resource_lookup_dtos
-        ]
-        t1 = time.time()
-        logger.debug(
-            "Time to provision asset files (acquire and write to disk): %s", t1 - t0
-        )
-        current_task.update_state(state="Parsing asset files")
-        # Initialize found resources from their provisioned assets.
-        t0 = time.time()
-        usfm_books, tn_books, tq_books, tw_books, bc_books = parsing.books(
-            found_resource_lookup_dtos,
-            resource_dirs,
-            document_request.resource_requests,
-            document_request.layout_for_print,
-        )
-        t1 = time.time()
-        logger.debug("Time to parse all resource content: %s", t1 - t0)
+        # HTML didn't exist in cache so go ahead and start by locating,
+        # provisioning and parsing the resources' assets.
+        found_resource_lookup_dtos, books = parsed_books(document_request)
         current_task.update_state(state="Assembling content")
-        content = assemble_content(
+        write_html_document(
             document_request_key_,
             document_request,
-            usfm_books,
-            tn_books,
-            tq_books,
-            tw_books,
-            bc_books,
             found_resource_lookup_dtos,
-        )
-        if usfm_books:
-            content = check_content_for_issues(content)
-        content = create_title_page_and_wrap_in_template(
-            content, document_request, found_resource_lookup_dtos
-        )
-        write_html_content_to_file(
-            content,
-            html_filepath_,
+            *books,
         )
     else:
         logger.debug("Cache hit for %s", html_filepath_)
@@ -1086,84 +1669,19 @@ def generate_docx_document(
     )
     # Generate the document request key that identifies this and
     # identical document requests.
-    document_request_key_ = document_request_key(
-        document_request.resource_requests,
-        document_request.assembly_strategy_kind,
-        document_request.assembly_layout_kind,
-        document_request.chunk_size,
-        document_request.limit_words,
-    )
-    html_filepath_ = html_filepath(document_request_key_)
+    document_request_key_ = document_request_key_of(document_request)
     docx_filepath_ = docx_filepath(document_request_key_)
     if document_request.generate_docx and file_needs_update(docx_filepath_):
-        # Update the state of the worker process. This is used by the
-        # UI to report status.
-        current_task.update_state(state="Locating assets")
-        # Docx didn't exist in cache so go ahead and start by getting the
-        # resource lookup DTOs for each resource request in the document
-        # request.
-        resource_lookup_dtos = []
-        for resource_request in document_request.resource_requests:
-            resource_lookup_dto = resource_lookup.resource_lookup_dto(
-                resource_request.lang_code,
-                resource_request.resource_type,
-                resource_request.book_code,
-            )
-            if resource_lookup_dto:
-                resource_lookup_dtos.append(resource_lookup_dto)
-        # Determine which resource URLs were actually found.
-        found_resource_lookup_dtos = [
-            resource_lookup_dto
-            for resource_lookup_dto in resource_lookup_dtos
-            if resource_lookup_dto.url is not None
-        ]
-        current_task.update_state(state="Provisioning asset files")
-        t0 = time.time()
-        resource_dirs = [
-            resource_lookup.provision_asset_files(dto)
-            for dto in found_resource_lookup_dtos
-        ]
-        t1 = time.time()
-        logger.debug(
-            "Time to provision asset files (acquire and write to disk): %s", t1 - t0
-        )
-        current_task.update_state(state="Parsing asset files")
-        # Initialize found resources from their provisioned assets.
-        t0 = time.time()
-        usfm_books, tn_books, tq_books, tw_books, bc_books = parsing.books(
-            found_resource_lookup_dtos,
-            resource_dirs,
-            document_request.resource_requests,
-            document_request.layout_for_print,
-        )
-        t1 = time.time()
-        logger.debug("Time to parse all resource content: %s", t1 - t0)
+        # Docx didn't exist in cache so go ahead and start by locating,
+        # provisioning and parsing the resources' assets.
+        found_resource_lookup_dtos, books = parsed_books(document_request)
         current_task.update_state(state="Assembling content")
-        composer = assemble_docx_content(
+        write_docx_document(
             document_request_key_,
             document_request,
-            usfm_books,
-            tn_books,
-            tq_books,
-            tw_books,
-            bc_books,
-        )
-        # TODO At this point, like in generate_document, we should check the
-        # underlying HTML content to see if it contains verses and display a
-        # message in the document to the end user if it does not (so that they
-        # get some indication of why the scripture is missing).
-
-        # Construct sensical phrases to display for title1 and title2 on first
-        # page of Word document.
-        title1, title2 = get_languages_title_page_strings(found_resource_lookup_dtos)
-        current_task.update_state(state="Converting to Docx")
-        convert_html_to_docx(
-            html_filepath_,
-            docx_filepath_,
-            composer,
-            document_request.layout_for_print,
-            title1,
-            title2,
+            found_resource_lookup_dtos,
+            *books,
+            update_task_state=True,
         )
         if should_send_email(document_request.email_address):
             attachments = [
@@ -1186,6 +1704,229 @@ def generate_docx_document(
     return document_request_key_
 
 
+@worker.app.task
+def generate_document_in_all_formats(
+    document_request_json: Json[Any], output_dir: str = settings.DOCUMENT_OUTPUT_DIR
+) -> Json[Any]:
+    """
+    This is the entry point for generating a document in each of the
+    formats requested, PDF, ePub and Docx, in one job. The resources'
+    assets are parsed once, the HTML is assembled once and then the
+    formats are produced concurrently. Each format is reported as soon
+    as it is done, see the task's state meta, finished_formats, and
+    emailed on its own so that the fastest format reaches the user
+    first.
+    """
+    logger.debug(
+        "document_request_json: %s",
+        document_request_json,
+    )
+    current_task.update_state(state="Receiving request")
+    document_request = DocumentRequest.parse_raw(document_request_json)
+    document_request.assembly_layout_kind = select_assembly_layout_kind(
+        document_request
+    )
+    # Generate the document request key that identifies this and
+    # identical document requests.
+    document_request_key_ = document_request_key_of(document_request)
+    html_filepath_ = html_filepath(document_request_key_)
+    requested_formats_ = requested_formats(document_request)
+    filepaths = {
+        "pdf": pdf_filepath(document_request_key_),
+        "epub": epub_filepath(document_request_key_),
+        "docx": docx_filepath(document_request_key_),
+    }
+    # Formats which were generated previously and are fresh enough are
+    # finished from the start.
+    finished_formats = [
+        format_
+        for format_ in requested_formats_
+        if not file_needs_update(filepaths[format_])
+    ]
+    formats_to_generate = [
+        format_ for format_ in requested_formats_ if format_ not in finished_formats
+    ]
+    errors: list[Exception] = []
+    with ThreadPoolExecutor(max_workers=max(len(formats_to_generate), 1)) as executor:
+        futures: dict[Future[None], str] = {}
+        html_needs_update = file_needs_update(html_filepath_)
+        if html_needs_update or "docx" in formats_to_generate:
+            found_resource_lookup_dtos, books = parsed_books(document_request)
+            current_task.update_state(state="Assembling content")
+            if "docx" in formats_to_generate:
+                futures[
+                    executor.submit(
+                        write_docx_document,
+                        document_request_key_,
+                        document_request,
+                        found_resource_lookup_dtos,
+                        *books,
+                    )
+                ] = "docx"
+            if html_needs_update:
+                # The HTML, unlike the Docx, is laid out by its CSS.
+                write_html_document(
+                    document_request_key_,
+                    document_request.model_copy(update={"generate_docx": False}),
+                    found_resource_lookup_dtos,
+                    *books,
+                )
+        else:
+            logger.debug("Cache hit for %s", html_filepath_)
+        if "pdf" in formats_to_generate:
+            futures[
+                executor.submit(
+                    convert_html_to_pdf,
+                    html_filepath_,
+                    filepaths["pdf"],
+                    document_request_key_,
+                )
+            ] = "pdf"
+        if "epub" in formats_to_generate:
+            futures[
+                executor.submit(
+                    convert_html_to_epub,
+                    html_filepath_,
+                    filepaths["epub"],
+                    document_request_key_,
+                )
+            ] = "epub"
+        current_task.update_state(
+            state="Converting",
+            meta={
+                "document_request_key": document_request_key_,
+                "finished_formats": finished_formats,
+            },
+        )
+        # The task's state can only be updated from this thread so the
+        # formats are reported here as they finish.
+        for future in as_completed(futures):
+            format_ = futures[future]
+            try:
+                future.result()
+            except Exception as exc:
+                logger.exception("Could not generate %s", filepaths[format_])
+                errors.append(exc)
+                continue
+            finished_formats.append(format_)
+            logger.debug("Finished %s", filepaths[format_])
+            current_task.update_state(
+                state="Finished {}".format(DOCUMENT_FORMAT_NAMES[format_]),
+                meta={
+                    "document_request_key": document_request_key_,
+                    "finished_formats": finished_formats,
+                },
+            )
+            if should_send_email(document_request.email_address):
+                send_email_with_attachment(
+                    document_request.email_address,
+                    [
+                        Attachment(
+                            filepath=filepaths[format_],
+                            mime_type=DOCUMENT_FORMAT_MIME_TYPES[format_],
+                        )
+                    ],
+                    document_request_key_,
+                )
+    if errors:
+        raise errors[0]
+    return document_request_key_
+
+
+@task_prerun.connect
+def clear_stale_lookup_caches(**kwargs: Any) -> None:
+    """
+    Before each task, clear this worker process's lookup caches if the
+    resource asset repos have been refreshed since it last looked.
+    """
+    resource_lookup.clear_lookup_caches_if_refreshed()
+
+
+@task_postrun.connect
+def release_in_flight_document_request(
+    task_id: str,
+    task: Any,
+    args: Sequence[Any],
+    retval: Any,
+    state: str,
+    coalesce_document_requests: bool = settings.COALESCE_DOCUMENT_REQUESTS,
+    **kwargs: Any,
+) -> None:
+    """
+    Once a document request's task has finished, release it so that
+    subsequent identical document requests get a task of their own,
+    and send its documents to the email addresses of the identical
+    document requests which were coalesced into it, see
+    request_coalescing.
+    """
+    if not coalesce_document_requests or task.name not in {
+        generate_document.name,
+        generate_docx_document.name,
+        generate_document_in_all_formats.name,
+    }:
+        return
+    email_addresses = request_coalescing.release(task_id)
+    if state != states.SUCCESS or not email_addresses:
+        return
+    document_request = DocumentRequest.parse_raw(args[0])
+    filepaths = {
+        "pdf": pdf_filepath(retval),
+        "epub": epub_filepath(retval),
+        "docx": docx_filepath(retval),
+    }
+    attachments = [
+        Attachment(
+            filepath=filepaths[format_],
+            mime_type=DOCUMENT_FORMAT_MIME_TYPES[format_],
+        )
+        for format_ in requested_formats(document_request)
+        if exists(filepaths[format_])
+    ]
+    for email_address in email_addresses:
+        # The task sent its documents to its own document request's
+        # email address.
+        if attachments and email_address != document_request.email_address:
+            logger.debug(
+                "Sending %s to coalesced document request's %s",
+                retval,
+                email_address,
+            )
+            if should_send_email(email_address):
+                send_email_with_attachment(email_address, attachments, retval)
+
+
+@worker.app.task
+def refresh_resource_assets(
+    working_dir: str = settings.RESOURCE_ASSETS_DIR,
+    output_dir: str = settings.DOCUMENT_OUTPUT_DIR,
+) -> list[str]:
+    """
+    Periodically scheduled task, see celeryconfig, which fetches the
+    latest commits of the stale resource asset repos and invalidates
+    the generated documents that depend on the repos which changed.
+    Rendered content caches are keyed by the content itself so they
+    need no invalidation. Return the names of the changed repos.
+    """
+    t0 = time.time()
+    changed_repos = resource_lookup.refresh_stale_repos(working_dir)
+    if changed_repos:
+        invalidated_document_request_keys = invalidate_documents_depending_on(
+            changed_repos, output_dir
+        )
+        logger.info(
+            "Repos %s changed, invalidated documents: %s",
+            changed_repos,
+            invalidated_document_request_keys,
+        )
+        # Lookups which inspect the cloned repos must see their new
+        # content. Other processes clear theirs when they see the
+        # refresh, see resource_lookup.clear_lookup_caches_if_refreshed.
+        resource_lookup.clear_lookup_caches()
+    t1 = time.time()
+    logger.debug("Time to refresh resource assets: %s", t1 - t0)
+    return changed_repos
+
+
 def get_languages_title_page_strings(
     resource_lookup_dtos: Sequence[ResourceLookupDto],
 ) -> tuple[str, str]:
@@ -39,3 +39,19 @@ class MissingChapterMarkerError(Exception):
 
     def __init__(self, message: str):
         self.message: str = message
+
+
+@final
+class USFMRendererError(Exception):
+    """Raised when the USFM parser driver reports that it could not render USFM."""
+
+    def __init__(self, message: str):
+        self.message: str = message
+
+
+@final
+class PdfRendererError(Exception):
+    """Raised when a WeasyPrint rendering process reports that it could not render a PDF."""
+
+    def __init__(self, message: str):
+        self.message: str = message
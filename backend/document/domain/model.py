@@ -378,6 +378,18 @@ class TWUse(NamedTuple):
     localized_word: str
 
 
+@final
+class TranslationWord(NamedTuple):
+    """
+    A class to hold a translation word's localized name, the path of
+    its definition file and its category, i.e., kt, names, or other.
+    """
+
+    localized_word: str
+    filepath: str
+    category: str
+
+
 # `content' gets mutated after instantiation therefore we can't subclass NamedTuple
 @final
 class TWNameContentPair:
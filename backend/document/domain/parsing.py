@@ -2,25 +2,33 @@
 This module provides an API for parsing content.
 """
 
+import atexit
 import re
 import subprocess
+import sys
+import threading
 import time
-from glob import glob
-from os import scandir, getenv, walk
+from collections import Counter
+from functools import lru_cache
+from os import scandir, getenv, register_at_fork, stat, walk
 from os.path import exists, join, split
 from pathlib import Path
 
-from typing import Mapping, Optional, Sequence
+from typing import Any, Mapping, Optional, Sequence, Union, final
 
 import mistune
+from billiard.einfo import ExceptionWithTraceback  # type: ignore[attr-defined]
+from billiard.exceptions import WorkerLostError
+from billiard.pool import Pool
 
-from document.config import settings
+from document.config import UsfmRendererKind, settings
+from document.domain import usfm_renderer
 from document.domain.assembly_strategies.assembly_strategy_utils import (
     adjust_commentary_headings,
 )
 
-from document.domain.exceptions import MissingChapterMarkerError
-from document.domain.bible_books import BOOK_NAMES
+from document.domain.exceptions import MissingChapterMarkerError, USFMRendererError
+from document.domain.bible_books import BOOK_CHAPTERS, BOOK_NAMES
 from document.domain.model import (
     BCBook,
     BCChapter,
@@ -37,14 +45,16 @@ from document.domain.model import (
     USFMChapter,
     VerseRef,
 )
+from document.domain.renderer_pool import RendererPool
+from document.domain.resource_context import ResourceContext
 from document.markdown_transforms import markdown_transformer
+from document.utils.content_cache import cached_content
+from document.utils import repo_manifest
 from document.utils.file_utils import read_file
 
 from document.utils.tw_utils import (
     localized_translation_word,
     translation_word_filepaths,
-    tw_resource_dir,
-    translation_words_dict,
 )
 
 
@@ -55,17 +65,19 @@ H1, H2, H3, H4, H5 = "h1", "h2", "h3", "h4", "h5"
 
 def find_usfm_files(
     resource_dir: str,
-    usfm_glob_fmt_str: str = "{}**/*.usfm",
-    usfm_ending_in_txt_glob_fmt_str: str = "{}**/*.txt",
-    usfm_ending_in_txt_in_subdirectory_glob_fmt_str: str = "{}**/**/*.txt",
+    usfm_glob_fmt_str: str = "{}/*.usfm",
+    usfm_ending_in_txt_glob_fmt_str: str = "{}/*.txt",
+    usfm_ending_in_txt_in_subdirectory_glob_fmt_str: str = "{}/*/*.txt",
 ) -> list[str]:
-    usfm_files = glob(usfm_glob_fmt_str.format(resource_dir))
+    usfm_files = repo_manifest.glob(usfm_glob_fmt_str.format(resource_dir))
     if not usfm_files:
         # USFM files sometimes have txt suffix instead of usfm
-        usfm_files = glob(usfm_ending_in_txt_glob_fmt_str.format(resource_dir))
+        usfm_files = repo_manifest.glob(
+            usfm_ending_in_txt_glob_fmt_str.format(resource_dir)
+        )
         # Sometimes the txt USFM files live at another location
         if not usfm_files:
-            usfm_files = glob(
+            usfm_files = repo_manifest.glob(
                 usfm_ending_in_txt_in_subdirectory_glob_fmt_str.format(resource_dir)
             )
     return usfm_files
@@ -120,6 +132,7 @@ def print_directory_contents(directory: str) -> None:
 def convert_usfm_chapter_to_html(
     content: str,
     resource_filepath_sans_suffix: str,
+    dll_path: str = settings.USFM_PARSER_DLL_PATH,
 ) -> None:
     """
     Invoke the dotnet USFM parser to parse the USFM file, if it exists,
@@ -127,7 +140,6 @@ def convert_usfm_chapter_to_html(
     """
     content_file = write_usfm_content_to_file(content, resource_filepath_sans_suffix)
     logger.debug("About to convert USFM to HTML")
-    dll_path = "/app/USFMParserDriver/bin/Release/net8.0/USFMParserDriver.dll"
     if not exists(f"{getenv('DOTNET_ROOT')}/dotnet"):
         logger.info("dotnet cli not found!")
         raise Exception("dotnet cli not found")
@@ -153,6 +165,127 @@ def convert_usfm_chapter_to_html(
     )
 
 
+@final
+class USFMRenderer:
+    """
+    A long-lived USFM parser driver process, started in server mode,
+    which renders USFM to HTML over its stdin and stdout.
+
+    Each request is a header line holding the byte length of the UTF-8
+    encoded USFM followed by the USFM itself. Each response is a header
+    line, 'OK <length>' or 'ERR <length>', followed by the UTF-8 encoded
+    HTML or error message respectively.
+
+    The process is killed if it takes longer than timeout seconds to
+    render a request.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        timeout: float = settings.USFM_RENDER_TIMEOUT_SECONDS,
+    ):
+        self._timeout = timeout
+        self._process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+
+    def render(self, content: str) -> str:
+        """
+        Return the HTML rendering of content. Raise USFMRendererError
+        if the driver could not render content, in which case the
+        driver remains usable. Raise TimeoutError, after killing the
+        driver process, if it did not render content in time. Any other
+        exception means that the driver process is no longer usable.
+        """
+        assert self._process.stdin and self._process.stdout
+        body = content.encode("utf-8")
+        self._process.stdin.write(b"%d\n" % len(body))
+        self._process.stdin.write(body)
+        self._process.stdin.flush()
+        timed_out = threading.Event()
+
+        def kill() -> None:
+            timed_out.set()
+            self._process.kill()
+
+        timer = threading.Timer(self._timeout, kill)
+        timer.start()
+        try:
+            header = self._process.stdout.readline()
+            status, length = header.decode("ascii").split() if header else ("", "0")
+            payload = self._process.stdout.read(int(length))
+        finally:
+            timer.cancel()
+        if timed_out.is_set():
+            raise TimeoutError(
+                "USFM parser driver took longer than {} seconds".format(self._timeout)
+            )
+        if not header:
+            raise EOFError("USFM parser driver exited unexpectedly")
+        if len(payload) != int(length):
+            raise EOFError("USFM parser driver exited mid response")
+        if status != "OK":
+            raise USFMRendererError(message=payload.decode("utf-8"))
+        return payload.decode("utf-8")
+
+    def alive(self) -> bool:
+        """Return True if the driver process is still running."""
+        return self._process.poll() is None
+
+    def close(self) -> None:
+        """Ask the driver process to exit and wait for it to do so."""
+        try:
+            if self._process.stdin:
+                self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+
+
+@final
+class USFMRendererPool(RendererPool[USFMRenderer]):
+    """
+    A bounded, thread safe pool of USFMRenderer instances which are
+    started lazily and replaced when their process dies or times out.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        size: int,
+        timeout: float = settings.USFM_RENDER_TIMEOUT_SECONDS,
+    ):
+        super().__init__(
+            lambda: USFMRenderer(command, timeout), size, (USFMRendererError,)
+        )
+
+    def render(self, content: str) -> str:
+        """Return the HTML rendering of content by an idle renderer."""
+        return self.run(lambda renderer: renderer.render(content))
+
+
+@lru_cache(maxsize=1)
+def usfm_renderer_pool(
+    dll_path: str = settings.USFM_PARSER_DLL_PATH,
+    pool_size: int = settings.USFM_RENDERER_POOL_SIZE,
+) -> USFMRendererPool:
+    """
+    Return this process's pool of long-lived USFM parser driver
+    processes. The processes are stopped when this process exits.
+    """
+    pool = USFMRendererPool(
+        [f"{getenv('DOTNET_ROOT')}/dotnet", dll_path, "--server"], pool_size
+    )
+    atexit.register(pool.close)
+    return pool
+
+
+# Forked worker processes, e.g., Celery's, must start their own USFM
+# parser driver processes rather than share their parent's pipes.
+register_at_fork(after_in_child=usfm_renderer_pool.cache_clear)
+
+
 def usfm_asset_file(
     resource_lookup_dto: ResourceLookupDto,
     resource_dir: str,
@@ -181,18 +314,63 @@ def usfm_asset_file(
     return None
 
 
+@lru_cache(maxsize=2)
+def usfm_renderer_version(
+    usfm_renderer_kind: UsfmRendererKind = settings.USFM_RENDERER,
+    dll_path: str = settings.USFM_PARSER_DLL_PATH,
+) -> str:
+    """
+    Return a string which changes whenever the output of the USFM
+    renderer of kind usfm_renderer_kind may change.
+    """
+    if usfm_renderer_kind == "python":
+        return f"python-{usfm_renderer.RENDERER_VERSION}"
+    if exists(dll_path):
+        dll_stat = stat(dll_path)
+        return f"dotnet-{dll_stat.st_size}-{dll_stat.st_mtime_ns}"
+    return "dotnet"
+
+
+def markdown_to_html(markdown: str) -> str:
+    """
+    Render markdown to HTML, reusing the rendering from the content cache
+    when the same markdown has been rendered before.
+    """
+    html = cached_content(
+        "markdown",
+        (mistune.__version__, markdown),
+        lambda: mistune.markdown(markdown),
+    )
+    assert html is not None
+    return html
+
+
 def usfm_chapter_html(
     content: str,
     resource_lookup_dto: ResourceLookupDto,
     chapter_num: int,
     working_dir: str = settings.WORKING_DIR,
+    usfm_renderer_kind: UsfmRendererKind = settings.USFM_RENDERER,
+    use_persistent_usfm_renderer: bool = settings.USE_PERSISTENT_USFM_RENDERER,
 ) -> Optional[str]:
     """
     Parse USFM asset content into HTML and return HTML as string.
+    Renderings are shared, via the content cache, by all documents
+    that include the same chapter.
     """
-    resource_filepath_sans_suffix = f"{working_dir}/{resource_lookup_dto.lang_code}_{resource_lookup_dto.resource_type}_{resource_lookup_dto.book_code}_{chapter_num}"
     t0 = time.time()
-    convert_usfm_chapter_to_html(content, resource_filepath_sans_suffix)
+    html_content = cached_content(
+        "usfm",
+        (usfm_renderer_version(usfm_renderer_kind), content),
+        lambda: render_usfm_chapter(
+            content,
+            resource_lookup_dto,
+            chapter_num,
+            working_dir,
+            usfm_renderer_kind,
+            use_persistent_usfm_renderer,
+        ),
+    )
     t1 = time.time()
     logger.debug(
         "Time to convert USFM to HTML for %s-%s-%s: %s",
@@ -201,10 +379,42 @@ def usfm_chapter_html(
         resource_lookup_dto.book_code,
         t1 - t0,
     )
+    return html_content
+
+
+def render_usfm_chapter(
+    content: str,
+    resource_lookup_dto: ResourceLookupDto,
+    chapter_num: int,
+    working_dir: str,
+    usfm_renderer_kind: UsfmRendererKind,
+    use_persistent_usfm_renderer: bool,
+) -> Optional[str]:
+    """Render USFM content to HTML with the USFM renderer selected."""
+    if usfm_renderer_kind == "python":
+        return usfm_renderer.render_usfm(content)
+    if use_persistent_usfm_renderer:
+        try:
+            return usfm_renderer_pool().render(content)
+        except USFMRendererError as exc:
+            logger.info(
+                "USFM parser could not render %s-%s-%s chapter %s: %s",
+                resource_lookup_dto.lang_code,
+                resource_lookup_dto.resource_type,
+                resource_lookup_dto.book_code,
+                chapter_num,
+                exc.message,
+            )
+            return None
+        except Exception:
+            logger.exception(
+                "Persistent USFM renderer failed, falling back to a dotnet process for this chapter"
+            )
+    resource_filepath_sans_suffix = f"{working_dir}/{resource_lookup_dto.lang_code}_{resource_lookup_dto.resource_type}_{resource_lookup_dto.book_code}_{chapter_num}"
+    convert_usfm_chapter_to_html(content, resource_filepath_sans_suffix)
     html_content_filepath = f"{resource_filepath_sans_suffix}.html"
     if exists(html_content_filepath):
-        html_content = read_file(html_content_filepath)
-        return html_content
+        return read_file(html_content_filepath)
     return None
 
 
@@ -261,12 +471,14 @@ def usfm_book_content(
     resource_dir: str,
     resource_requests: Sequence[ResourceRequest],
     layout_for_print: bool,
+    chapter_nums: Optional[range] = None,
 ) -> USFMBook:
     """
     First produce HTML content from USFM content and then break the
     HTML content returned into a model.USFMBook data structure containing
     chapters, verses, footnotes, for use during interleaving with other
-    resource assets.
+    resource assets. If chapter_nums is given, only those chapters are
+    included.
     """
     content_file = usfm_asset_file(resource_lookup_dto, resource_dir)
     usfm_chapters: dict[ChapterNum, USFMChapter] = {}
@@ -275,6 +487,8 @@ def usfm_book_content(
         updated_chapters = [ensure_chapter_label(chapter) for chapter in chapters_]
         for chapter in updated_chapters:
             chapter_num = get_chapter_num(chapter)
+            if chapter_nums is not None and chapter_num not in chapter_nums:
+                continue
             chapter_html_content = usfm_chapter_html(
                 chapter, resource_lookup_dto, chapter_num
             )
@@ -302,16 +516,20 @@ def glob_chapter_dirs(
     glob_in_subdirs_fmt_str: str = "{}/**/*{}/*[0-9]*",
     glob_fmt_str: str = "{}/*{}/*[0-9]*",
 ) -> list[str]:
-    chapter_dirs = glob(glob_in_subdirs_fmt_str.format(resource_dir, book_code))
+    chapter_dirs = repo_manifest.glob(
+        glob_in_subdirs_fmt_str.format(resource_dir, book_code)
+    )
     # Some languages are organized differently on disk
     if not chapter_dirs:
-        chapter_dirs = glob(
+        chapter_dirs = repo_manifest.glob(
             glob_in_subdirs_fmt_str.format(resource_dir, book_code.upper())
         )
     if not chapter_dirs:
-        chapter_dirs = glob(glob_fmt_str.format(resource_dir, book_code))
+        chapter_dirs = repo_manifest.glob(glob_fmt_str.format(resource_dir, book_code))
     if not chapter_dirs:
-        chapter_dirs = glob(glob_fmt_str.format(resource_dir, book_code.upper()))
+        chapter_dirs = repo_manifest.glob(
+            glob_fmt_str.format(resource_dir, book_code.upper())
+        )
     return sorted(chapter_dirs)
 
 
@@ -320,33 +538,42 @@ def tn_chapter_verses(
     lang_code: str,
     book_code: str,
     resource_requests: Sequence[ResourceRequest],
+    chapter_nums: Optional[range] = None,
+    resource_context: Optional[ResourceContext] = None,
 ) -> dict[int, TNChapter]:
+    if resource_context is None:
+        resource_context = ResourceContext()
     chapter_dirs = sorted(glob_chapter_dirs(resource_dir, book_code))
     chapter_verses = {}
     for chapter_dir in chapter_dirs:
         chapter_num = int(Path(chapter_dir).name)
+        if chapter_nums is not None and chapter_num not in chapter_nums:
+            continue
         chapter_intro = tn_chapter_intro(chapter_dir)
         chapter_intro_html = ""
         if chapter_intro:
-            tw_resource_dir_ = tw_resource_dir(lang_code)
-            translation_words_dict_ = translation_words_dict(tw_resource_dir_)
             chapter_intro = markdown_transformer.transform_tw_links(
                 chapter_intro,
                 lang_code,
                 resource_requests,
-                translation_words_dict_,
+                resource_context.translation_words_index(lang_code),
             )
             chapter_intro = markdown_transformer.transform_ta_and_tn_links(
                 chapter_intro,
                 lang_code,
                 resource_requests,
+                resource_context=resource_context,
             )
             chapter_intro_html = mistune.markdown(chapter_intro)
             chapter_intro_html = markdown_transformer.remove_pagination_symbols(
                 chapter_intro_html
             )
         verses_html = tn_verses_html(
-            chapter_dir, lang_code, book_code, resource_requests
+            chapter_dir,
+            lang_code,
+            book_code,
+            resource_requests,
+            resource_context=resource_context,
         )
         chapter_verses[chapter_num] = TNChapter(
             intro_html=chapter_intro_html, verses=verses_html
@@ -359,16 +586,20 @@ def tn_chapter_intro(
     glob_md_fmt_str: str = "{}/*intro.md",
     glob_txt_fmt_str: str = "{}/*intro.txt",
 ) -> Optional[str]:
-    intro_paths = sorted(glob(glob_md_fmt_str.format(chapter_dir)))
+    intro_paths = sorted(repo_manifest.glob(glob_md_fmt_str.format(chapter_dir)))
     if not intro_paths:
-        intro_paths = sorted(glob(glob_txt_fmt_str.format(chapter_dir)))
+        intro_paths = sorted(repo_manifest.glob(glob_txt_fmt_str.format(chapter_dir)))
     return read_file(intro_paths[0]) if intro_paths else None
 
 
 def book_intro_markdown(resource_dir: str, book_code: str) -> str:
-    book_intro_paths = sorted(glob(f"{resource_dir}/*{book_code}/front/intro.md"))
+    book_intro_paths = sorted(
+        repo_manifest.glob(f"{resource_dir}/*{book_code}/front/intro.md")
+    )
     if not book_intro_paths:
-        book_intro_paths = sorted(glob(f"{resource_dir}/*{book_code}/front/intro.txt"))
+        book_intro_paths = sorted(
+            repo_manifest.glob(f"{resource_dir}/*{book_code}/front/intro.txt")
+        )
     book_intro_markdown_ = read_file(book_intro_paths[0]) if book_intro_paths else ""
     return book_intro_markdown_
 
@@ -384,10 +615,11 @@ def tn_verses_html(
     glob_txt_fmt_str: str = "{}/*[0-9]*.txt",
     h1: str = H1,
     h5: str = H5,
+    resource_context: Optional[ResourceContext] = None,
 ) -> dict[VerseRef, str]:
-    verse_paths = sorted(glob(glob_md_fmt_str.format(chapter_dir)))
+    verse_paths = sorted(repo_manifest.glob(glob_md_fmt_str.format(chapter_dir)))
     if not verse_paths:
-        verse_paths = sorted(glob(glob_txt_fmt_str.format(chapter_dir)))
+        verse_paths = sorted(repo_manifest.glob(glob_txt_fmt_str.format(chapter_dir)))
     verses_html = {}
     for filepath in verse_paths:
         verse_ref = Path(filepath).stem
@@ -396,8 +628,9 @@ def tn_verses_html(
             verse_md_content,
             lang_code,
             resource_requests,
+            resource_context=resource_context,
         )
-        verse_html_content = mistune.markdown(verse_md_content)
+        verse_html_content = markdown_to_html(verse_md_content)
         adjusted_verse_html_content = re.sub(h1, h5, verse_html_content)
         verses_html[verse_ref] = verse_fmt_str.format(
             book_names[book_code],
@@ -414,12 +647,16 @@ def tn_book_content(
     resource_requests: Sequence[ResourceRequest],
     layout_for_print: bool,
     include_tn_book_intros: bool = False,
+    chapter_nums: Optional[range] = None,
+    resource_context: Optional[ResourceContext] = None,
 ) -> TNBook:
     chapter_verses = tn_chapter_verses(
         resource_dir,
         resource_lookup_dto.lang_code,
         resource_lookup_dto.book_code,
         resource_requests,
+        chapter_nums,
+        resource_context,
     )
     book_intro = ""
     if include_tn_book_intros:
@@ -430,6 +667,7 @@ def tn_book_content(
                 book_intro,
                 resource_lookup_dto.lang_code,
                 resource_requests,
+                resource_context=resource_context,
             )
             book_intro = mistune.markdown(book_intro)
     return TNBook(
@@ -453,12 +691,18 @@ def tq_chapter_verses(
     h1: str = H1,
     h5: str = H5,
     verse_label_fmt_str: str = "<h4>{} {}:{}</h4>\n{}",
+    chapter_nums: Optional[range] = None,
+    resource_context: Optional[ResourceContext] = None,
 ) -> dict[int, TQChapter]:
     chapter_dirs = sorted(glob_chapter_dirs(resource_dir, book_code))
     chapter_verses = {}
     for chapter_dir in chapter_dirs:
         chapter_num = int(split(chapter_dir)[-1])
-        verse_paths = sorted(glob(verse_paths_glob_fmt_str.format(chapter_dir)))
+        if chapter_nums is not None and chapter_num not in chapter_nums:
+            continue
+        verse_paths = sorted(
+            repo_manifest.glob(verse_paths_glob_fmt_str.format(chapter_dir))
+        )
         verses_html: dict[VerseRef, str] = {}
         for filepath in verse_paths:
             verse_ref = Path(filepath).stem
@@ -467,8 +711,9 @@ def tq_chapter_verses(
                 verse_md_content,
                 lang_code,
                 resource_requests,
+                resource_context=resource_context,
             )
-            verse_html_content = mistune.markdown(verse_md_content)
+            verse_html_content = markdown_to_html(verse_md_content)
             adjusted_verse_html_content = re.sub(h1, h5, verse_html_content)
             verses_html[verse_ref] = verse_label_fmt_str.format(
                 book_names[book_code],
@@ -485,12 +730,16 @@ def tq_book_content(
     resource_dir: str,
     resource_requests: Sequence[ResourceRequest],
     layout_for_print: bool,
+    chapter_nums: Optional[range] = None,
+    resource_context: Optional[ResourceContext] = None,
 ) -> TQBook:
     chapter_verses = tq_chapter_verses(
         resource_dir,
         resource_lookup_dto.lang_code,
         resource_lookup_dto.book_code,
         resource_requests,
+        chapter_nums=chapter_nums,
+        resource_context=resource_context,
     )
     return TQBook(
         lang_code=resource_lookup_dto.lang_code,
@@ -514,6 +763,7 @@ def tw_name_content_pairs(
     h2: str = H2,
     h3: str = H3,
     h4: str = H4,
+    resource_context: Optional[ResourceContext] = None,
 ) -> list[TWNameContentPair]:
     translation_word_filepaths_: list[str] = translation_word_filepaths(resource_dir)
     name_content_pairs: list[TWNameContentPair] = []
@@ -526,9 +776,12 @@ def tw_name_content_pairs(
             translation_word_content
         )
         translation_word_content = markdown_transformer.transform_ta_and_tn_links(
-            translation_word_content, lang_code, resource_requests
+            translation_word_content,
+            lang_code,
+            resource_requests,
+            resource_context=resource_context,
         )
-        html_word_content = mistune.markdown(translation_word_content)
+        html_word_content = markdown_to_html(translation_word_content)
         html_word_content = re.sub(h2, h4, html_word_content)
         html_word_content = re.sub(h1, h3, html_word_content)
         name_content_pairs.append(
@@ -542,9 +795,13 @@ def tw_book_content(
     resource_dir: str,
     resource_requests: Sequence[ResourceRequest],
     layout_for_print: bool,
+    resource_context: Optional[ResourceContext] = None,
 ) -> TWBook:
     name_content_pairs = tw_name_content_pairs(
-        resource_dir, resource_lookup_dto.lang_code, resource_requests
+        resource_dir,
+        resource_lookup_dto.lang_code,
+        resource_requests,
+        resource_context=resource_context,
     )
     return TWBook(
         lang_code=resource_lookup_dto.lang_code,
@@ -561,7 +818,7 @@ def bc_book_intro_content(
     book_code: str,
     book_intro_glob_path_fmt_str: str = "{}/*{}/intro.md",
 ) -> str:
-    book_intro_paths = glob(
+    book_intro_paths = repo_manifest.glob(
         book_intro_glob_path_fmt_str.format(resource_dir, book_code)
     )
     return read_file(book_intro_paths[0]) if book_intro_paths else ""
@@ -601,21 +858,28 @@ def bc_chapters(
     resource_requests: Sequence[ResourceRequest],
     chapter_dirs_glob_fmt_str: str = "{}/*{}/*[0-9]*",
     url_fmt_str: str = settings.BC_ARTICLE_URL_FMT_STR,
+    chapter_nums: Optional[range] = None,
+    resource_context: Optional[ResourceContext] = None,
 ) -> dict[int, BCChapter]:
     chapter_dirs = sorted(
-        glob(chapter_dirs_glob_fmt_str.format(resource_dir, book_code))
+        repo_manifest.glob(chapter_dirs_glob_fmt_str.format(resource_dir, book_code))
     )
     chapters: dict[int, BCChapter] = {}
     for chapter_dir in chapter_dirs:
         chapter_num = int(Path(chapter_dir).stem)
+        if chapter_nums is not None and chapter_num not in chapter_nums:
+            continue
         chapter_commentary_md_content = read_file(chapter_dir)
         chapter_commentary_md_content = markdown_transformer.remove_sections(
             chapter_commentary_md_content
         )
         chapter_commentary_md_content = markdown_transformer.transform_ta_and_tn_links(
-            chapter_commentary_md_content, lang_code, resource_requests
+            chapter_commentary_md_content,
+            lang_code,
+            resource_requests,
+            resource_context=resource_context,
         )
-        chapter_commentary_html_content = mistune.markdown(
+        chapter_commentary_html_content = markdown_to_html(
             chapter_commentary_md_content
         )
         chapter_commentary_html_content = modify_commentary_label(
@@ -645,11 +909,16 @@ def bc_book_content(
     resource_dir: str,
     resource_requests: Sequence[ResourceRequest],
     layout_for_print: bool,
+    chapter_nums: Optional[range] = None,
+    resource_context: Optional[ResourceContext] = None,
 ) -> BCBook:
     book_intro = bc_book_intro_content(resource_dir, resource_lookup_dto.book_code)
     book_intro = markdown_transformer.remove_sections(book_intro)
     book_intro = markdown_transformer.transform_ta_and_tn_links(
-        book_intro, resource_lookup_dto.lang_code, resource_requests
+        book_intro,
+        resource_lookup_dto.lang_code,
+        resource_requests,
+        resource_context=resource_context,
     )
     book_intro_html_content = mistune.markdown(book_intro)
     book_intro_html_content = adjust_commentary_headings(book_intro_html_content)
@@ -668,21 +937,187 @@ def bc_book_content(
             resource_lookup_dto.lang_code,
             resource_lookup_dto.book_code,
             resource_requests,
+            chapter_nums=chapter_nums,
+            resource_context=resource_context,
         ),
     )
 
 
-def books(
-    resource_lookup_dtos: Sequence[ResourceLookupDto],
-    resource_dirs: Sequence[str],
+Book = Union[USFMBook, TNBook, TQBook, TWBook, BCBook]
+
+
+def book_content(
+    resource_lookup_dto: ResourceLookupDto,
+    resource_dir: str,
     resource_requests: Sequence[ResourceRequest],
     layout_for_print: bool,
+    chapter_nums: Optional[range] = None,
+    resource_context: Optional[ResourceContext] = None,
     usfm_resource_types: Sequence[str] = settings.USFM_RESOURCE_TYPES,
     tn_resource_type: str = settings.TN_RESOURCE_TYPE,
     en_tn_condensed_resource_type: str = settings.EN_TN_CONDENSED_RESOURCE_TYPE,
     tq_resource_type: str = settings.TQ_RESOURCE_TYPE,
     tw_resource_type: str = settings.TW_RESOURCE_TYPE,
     bc_resource_type: str = settings.BC_RESOURCE_TYPE,
+) -> Optional[Book]:
+    """
+    Parse the resource's content, or, if chapter_nums is given, only
+    those of its chapters, into the book model for its resource type.
+    Lookups repeated while parsing are memoized in resource_context, if
+    given. Return None if the resource type is not supported.
+    """
+    if resource_lookup_dto.resource_type in usfm_resource_types:
+        return usfm_book_content(
+            resource_lookup_dto,
+            resource_dir,
+            resource_requests,
+            layout_for_print,
+            chapter_nums=chapter_nums,
+        )
+    elif (
+        resource_lookup_dto.resource_type == tn_resource_type
+        # Handle English Condensed TN
+        or resource_lookup_dto.resource_type == en_tn_condensed_resource_type
+    ):
+        return tn_book_content(
+            resource_lookup_dto,
+            resource_dir,
+            resource_requests,
+            layout_for_print,
+            chapter_nums=chapter_nums,
+            resource_context=resource_context,
+        )
+    elif resource_lookup_dto.resource_type == tq_resource_type:
+        return tq_book_content(
+            resource_lookup_dto,
+            resource_dir,
+            resource_requests,
+            layout_for_print,
+            chapter_nums=chapter_nums,
+            resource_context=resource_context,
+        )
+    elif resource_lookup_dto.resource_type == tw_resource_type:
+        return tw_book_content(
+            resource_lookup_dto,
+            resource_dir,
+            resource_requests,
+            layout_for_print,
+            resource_context=resource_context,
+        )
+    elif resource_lookup_dto.resource_type == bc_resource_type:
+        return bc_book_content(
+            resource_lookup_dto,
+            resource_dir,
+            resource_requests,
+            layout_for_print,
+            chapter_nums=chapter_nums,
+            resource_context=resource_context,
+        )
+    return None
+
+
+def chapter_ranges(
+    resource_lookup_dto: ResourceLookupDto,
+    chapters_per_task: int = settings.PARSING_CHAPTERS_PER_TASK,
+    tw_resource_type: str = settings.TW_RESOURCE_TYPE,
+    book_chapters: Mapping[str, int] = BOOK_CHAPTERS,
+) -> list[Optional[range]]:
+    """
+    Return the ranges of chapter numbers into which the resource's
+    book is split for parsing in parallel, or [None] if the book is
+    parsed whole. Together the ranges cover every chapter number, even
+    those beyond the book's usual number of chapters.
+
+    >>> from document.domain.model import LangDirEnum, ResourceLookupDto
+    >>> dto = ResourceLookupDto(lang_code="en", lang_name="English", resource_type="ulb", resource_type_name="Unlocked Literal Bible", book_code="psa", lang_direction=LangDirEnum.LTR, url=None)
+    >>> [chapter_range.stop for chapter_range in chapter_ranges(dto, 60)]
+    [61, 121, 9223372036854775807]
+    >>> chapter_ranges(dto, 0)
+    [None]
+    """
+    num_chapters = book_chapters.get(resource_lookup_dto.book_code, 0)
+    if (
+        resource_lookup_dto.resource_type == tw_resource_type
+        or chapters_per_task <= 0
+        or num_chapters <= chapters_per_task
+    ):
+        return [None]
+    starts = list(range(1, num_chapters + 1, chapters_per_task))
+    return [
+        range(
+            -sys.maxsize if index == 0 else start,
+            starts[index + 1] if index + 1 < len(starts) else sys.maxsize,
+        )
+        for index, start in enumerate(starts)
+    ]
+
+
+def merge_book_parts(book_parts: Sequence[Book]) -> Book:
+    """
+    Merge the books parsed from consecutive ranges of a book's
+    chapters back into one book whose chapters are in order.
+    """
+    book = book_parts[0]
+    if len(book_parts) == 1 or isinstance(book, TWBook):
+        return book
+    chapters: dict[Any, Any] = {}
+    for book_part in book_parts:
+        assert not isinstance(book_part, TWBook)
+        chapters.update(book_part.chapters)
+    return book._replace(chapters=chapters)
+
+
+def _book_content_task(
+    task: tuple[
+        ResourceLookupDto,
+        str,
+        Sequence[ResourceRequest],
+        bool,
+        Optional[range],
+        ResourceContext,
+    ]
+) -> tuple[Optional[Book], Counter[str], Counter[str]]:
+    """
+    Parse the book of task and return it along with the hits and
+    misses of the lookups made through its resource context while
+    doing so.
+    """
+    resource_context = task[-1]
+    hits, misses = resource_context.hits.copy(), resource_context.misses.copy()
+    book = book_content(*task)
+    return book, resource_context.hits - hits, resource_context.misses - misses
+
+
+@lru_cache(maxsize=1)
+def parsing_process_pool(max_workers: int) -> Pool:
+    """
+    Return this process's pool of worker processes which parse
+    resource content. The pool is terminated when this process exits.
+
+    The pool is billiard's, Celery's fork of multiprocessing, which,
+    unlike multiprocessing's, can be started by daemonic processes,
+    i.e., Celery's prefork workers.
+
+    Each parsing process starts its own pool of USFM parser driver
+    processes, see usfm_renderer_pool, when it first renders USFM.
+    """
+    pool = Pool(processes=max_workers)
+    atexit.register(pool.terminate)
+    return pool
+
+
+# Forked processes, e.g., Celery's workers, must start their own
+# parsing processes rather than share their parent's.
+register_at_fork(after_in_child=parsing_process_pool.cache_clear)
+
+
+def books(
+    resource_lookup_dtos: Sequence[ResourceLookupDto],
+    resource_dirs: Sequence[str],
+    resource_requests: Sequence[ResourceRequest],
+    layout_for_print: bool,
+    max_workers: int = settings.PARSING_MAX_WORKERS,
+    resource_context: Optional[ResourceContext] = None,
 ) -> tuple[
     Sequence[USFMBook],
     Sequence[TNBook],
@@ -690,42 +1125,75 @@ def books(
     Sequence[TWBook],
     Sequence[BCBook],
 ]:
-    usfm_books = []
-    tn_books = []
-    tq_books = []
-    tw_books = []
-    bc_books = []
-    for resource_lookup_dto, resource_dir in zip(resource_lookup_dtos, resource_dirs):
-        if resource_lookup_dto.resource_type in usfm_resource_types:
-            usfm_book = usfm_book_content(
-                resource_lookup_dto, resource_dir, resource_requests, layout_for_print
-            )
-            usfm_books.append(usfm_book)
-        elif (
-            resource_lookup_dto.resource_type == tn_resource_type
-            # Handle English Condensed TN
-            or resource_lookup_dto.resource_type == en_tn_condensed_resource_type
-        ):
-            tn_book = tn_book_content(
-                resource_lookup_dto, resource_dir, resource_requests, layout_for_print
-            )
-            tn_books.append(tn_book)
-        elif resource_lookup_dto.resource_type == tq_resource_type:
-            tq_book = tq_book_content(
-                resource_lookup_dto, resource_dir, resource_requests, layout_for_print
-            )
-            tq_books.append(tq_book)
-        elif resource_lookup_dto.resource_type == tw_resource_type:
-            tw_book = tw_book_content(
-                resource_lookup_dto, resource_dir, resource_requests, layout_for_print
-            )
-            tw_books.append(tw_book)
-        elif resource_lookup_dto.resource_type == bc_resource_type:
-            bc_book = bc_book_content(
-                resource_lookup_dto, resource_dir, resource_requests, layout_for_print
+    """
+    Parse each resource's content into the book model for its resource
+    type. Resources, and ranges of chapters of long books, are parsed
+    in parallel by up to max_workers processes. The books are returned
+    in the order of resource_lookup_dtos either way.
+
+    Lookups repeated while parsing, e.g., of a language's translation
+    words, are memoized in resource_context, which is scoped to the
+    document request, if given, otherwise in a new one.
+    """
+    if resource_context is None:
+        resource_context = ResourceContext()
+    # Each task parses one resource, or a range of its chapters, and is
+    # tagged with the index of its resource.
+    indexed_tasks = [
+        (
+            index,
+            (
+                resource_lookup_dto,
+                resource_dir,
+                resource_requests,
+                layout_for_print,
+                chapter_nums,
+                resource_context,
+            ),
+        )
+        for index, (resource_lookup_dto, resource_dir) in enumerate(
+            zip(resource_lookup_dtos, resource_dirs)
+        )
+        for chapter_nums in chapter_ranges(resource_lookup_dto)
+    ]
+    tasks = [task for _, task in indexed_tasks]
+    t0 = time.time()
+    results: Optional[list[Optional[Book]]] = None
+    if max_workers > 1 and len(tasks) > 1:
+        try:
+            task_results = list(
+                parsing_process_pool(max_workers).map(_book_content_task, tasks)
             )
-            bc_books.append(bc_book)
-    return usfm_books, tn_books, tq_books, tw_books, bc_books
+        except (ExceptionWithTraceback, WorkerLostError, OSError):
+            # E.g., a parsing process was killed.
+            logger.exception("Parsing in parallel failed, parsing sequentially")
+            parsing_process_pool(max_workers).terminate()
+            parsing_process_pool.cache_clear()
+        else:
+            results = [result for result, _, _ in task_results]
+            # Each parsing process memoized lookups in its own copies of
+            # resource_context so add their counts to it.
+            for _, hits, misses in task_results:
+                resource_context.add_counts(hits, misses)
+    if results is None:
+        results = [_book_content_task(task)[0] for task in tasks]
+    t1 = time.time()
+    logger.debug("Time to parse %s parsing tasks: %s", len(tasks), t1 - t0)
+    logger.debug(
+        "Resource context lookup (hits, misses): %s", resource_context.counts()
+    )
+    book_parts: dict[int, list[Book]] = {}
+    for (index, _), result in zip(indexed_tasks, results):
+        if result is not None:
+            book_parts.setdefault(index, []).append(result)
+    books_ = [merge_book_parts(book_parts_) for book_parts_ in book_parts.values()]
+    return (
+        [book for book in books_ if isinstance(book, USFMBook)],
+        [book for book in books_ if isinstance(book, TNBook)],
+        [book for book in books_ if isinstance(book, TQBook)],
+        [book for book in books_ if isinstance(book, TWBook)],
+        [book for book in books_ if isinstance(book, BCBook)],
+    )
 
 
 def ensure_paragraph_before_verses(
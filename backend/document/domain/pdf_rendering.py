@@ -0,0 +1,278 @@
+"""
+This module provides a pool of long-lived WeasyPrint processes which
+render HTML files to PDF so that each document doesn't pay for starting
+Python, importing WeasyPrint and loading the font configuration, as it
+does when the weasyprint CLI is launched for it.
+
+Each process is started with serve as its entry point and takes one
+JSON request per line on its stdin, {"html_filepath": ...,
+"pdf_filepath": ...}, and answers each with one JSON line on its
+stdout, {"ok": ..., "seconds": ..., "peak_rss_bytes": ..., "error":
+...}. A process which doesn't answer within its timeout is killed and
+replaced, see renderer_pool.RendererPool.
+"""
+
+import atexit
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from functools import lru_cache
+from os import register_at_fork
+from os.path import abspath, dirname
+from typing import IO, NamedTuple, Sequence, final
+
+from document.config import settings
+from document.domain.exceptions import PdfRendererError
+from document.domain.renderer_pool import RendererPool
+
+logger = settings.logger(__name__)
+
+# The directory holding the document package which the rendering
+# processes must be able to import.
+BACKEND_DIR = dirname(dirname(dirname(abspath(__file__))))
+
+SERVE_COMMAND = [
+    sys.executable,
+    "-c",
+    "from document.domain.pdf_rendering import serve; serve()",
+]
+
+
+@final
+class PdfRendering(NamedTuple):
+    """
+    The wall clock time, in seconds, a rendering process took to render
+    a PDF and its peak resident set size, in bytes, while doing so.
+    """
+
+    seconds: float
+    peak_rss_bytes: int
+
+
+def reset_peak_rss() -> None:
+    """
+    Reset this process's peak resident set size, on Linux, so that the
+    next reading of it is the peak since now rather than since the
+    process started.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as fout:
+            fout.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_bytes() -> int:
+    """
+    Return this process's peak resident set size in bytes.
+
+    >>> peak_rss_bytes() > 0
+    True
+    """
+    try:
+        with open("/proc/self/status") as fin:
+            for line in fin:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # Kilobytes on Linux and bytes on macOS.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def serve() -> None:
+    """
+    Render the HTML files requested on stdin to PDF with WeasyPrint,
+    which, along with the font configuration, is loaded once, until
+    stdin is closed.
+    """
+    # Keep the protocol's stdout to ourselves so that anything written
+    # to stdout by WeasyPrint or its dependencies ends up on stderr
+    # instead.
+    responses: IO[str] = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    from weasyprint import HTML  # type: ignore
+    from weasyprint.text.fonts import FontConfiguration  # type: ignore
+
+    font_config = FontConfiguration()
+    # Warm up font matching and layout before the first request.
+    HTML(string="<p>PDF</p>").render(font_config=font_config)
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        reset_peak_rss()
+        t0 = time.time()
+        try:
+            HTML(filename=request["html_filepath"]).write_pdf(
+                request["pdf_filepath"], font_config=font_config
+            )
+        except Exception:
+            response = {"ok": False, "error": traceback.format_exc()}
+        else:
+            response = {
+                "ok": True,
+                "seconds": time.time() - t0,
+                "peak_rss_bytes": peak_rss_bytes(),
+            }
+        responses.write(json.dumps(response) + "\n")
+        responses.flush()
+
+
+@final
+class PdfRenderer:
+    """
+    A long-lived rendering process which renders HTML files to PDF over
+    its stdin and stdout, see serve. The process is killed if it takes
+    longer than timeout seconds to render a PDF.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        timeout: float = settings.PDF_RENDER_TIMEOUT_SECONDS,
+    ):
+        self._timeout = timeout
+        pythonpath = [BACKEND_DIR, os.environ.get("PYTHONPATH", "")]
+        self._process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, pythonpath))},
+        )
+
+    def render(self, html_filepath: str, pdf_filepath: str) -> PdfRendering:
+        """
+        Render the HTML file at html_filepath to the PDF file at
+        pdf_filepath. Raise PdfRendererError if the process could not
+        render it, in which case the process remains usable. Raise
+        TimeoutError, after killing the process, if it did not render it
+        in time. Any other exception means that the process is no longer
+        usable.
+        """
+        assert self._process.stdin and self._process.stdout
+        request = {"html_filepath": html_filepath, "pdf_filepath": pdf_filepath}
+        self._process.stdin.write(json.dumps(request) + "\n")
+        self._process.stdin.flush()
+        timed_out = threading.Event()
+
+        def kill() -> None:
+            timed_out.set()
+            self._process.kill()
+
+        timer = threading.Timer(self._timeout, kill)
+        timer.start()
+        try:
+            line = self._process.stdout.readline()
+        finally:
+            timer.cancel()
+        if timed_out.is_set():
+            raise TimeoutError(
+                "PDF rendering process took longer than {} seconds".format(
+                    self._timeout
+                )
+            )
+        if not line:
+            raise EOFError("PDF rendering process exited unexpectedly")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise PdfRendererError(message=response["error"])
+        return PdfRendering(response["seconds"], response["peak_rss_bytes"])
+
+    def alive(self) -> bool:
+        """Return True if the rendering process is still running."""
+        return self._process.poll() is None
+
+    def close(self) -> None:
+        """Ask the rendering process to exit and wait for it to do so."""
+        try:
+            if self._process.stdin:
+                self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+
+
+@final
+class PdfRendererPool(RendererPool[PdfRenderer]):
+    """
+    A bounded, thread safe pool of PdfRenderer instances which are
+    started lazily, or up front by warm so that they have loaded
+    WeasyPrint by the time the first PDF is requested, and replaced when
+    their process dies or times out.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        size: int,
+        timeout: float = settings.PDF_RENDER_TIMEOUT_SECONDS,
+    ):
+        super().__init__(
+            lambda: PdfRenderer(command, timeout), size, (PdfRendererError,)
+        )
+
+    def render(self, html_filepath: str, pdf_filepath: str) -> PdfRendering:
+        """Render html_filepath to pdf_filepath by an idle renderer."""
+        return self.run(lambda renderer: renderer.render(html_filepath, pdf_filepath))
+
+
+def pdf_renderer_pool_size(
+    pool_size: int = settings.PDF_RENDERER_POOL_SIZE,
+    render_pdf_in_sections: bool = settings.RENDER_PDF_IN_SECTIONS,
+    section_max_workers: int = settings.PDF_SECTION_MAX_WORKERS,
+) -> int:
+    """
+    Return the number of long-lived PDF rendering processes per worker
+    process, which, if PDFs are rendered in sections, is enough to
+    render section_max_workers sections in parallel.
+
+    >>> pdf_renderer_pool_size(1, False, 4)
+    1
+    >>> pdf_renderer_pool_size(1, True, 4)
+    4
+    >>> pdf_renderer_pool_size(6, True, 4)
+    6
+    """
+    if render_pdf_in_sections:
+        return max(pool_size, section_max_workers)
+    return pool_size
+
+
+@lru_cache(maxsize=1)
+def pdf_renderer_pool(
+    pool_size: int = pdf_renderer_pool_size(),
+) -> PdfRendererPool:
+    """
+    Return this process's pool of long-lived PDF rendering processes.
+    The processes are stopped when this process exits.
+    """
+    pool = PdfRendererPool(SERVE_COMMAND, pool_size)
+    atexit.register(pool.close)
+    return pool
+
+
+# Forked worker processes, e.g., Celery's, must start their own PDF
+# rendering processes rather than share their parent's pipes.
+register_at_fork(after_in_child=pdf_renderer_pool.cache_clear)
+
+
+if __name__ == "__main__":
+
+    # To run the doctests in the this module, in the root of the project do:
+    # python backend/document/domain/pdf_rendering.py
+    # or
+    # python backend/document/domain/pdf_rendering.py -v
+    # See https://docs.python.org/3/library/doctest.html
+    # for more details.
+    import doctest
+
+    doctest.testmod()
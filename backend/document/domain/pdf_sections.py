@@ -0,0 +1,305 @@
+"""
+This module provides rendering of a document's assembled HTML to PDF
+in sections, split at the book boundaries which assembly marks, that
+are rendered in parallel by the long-lived WeasyPrint processes of
+pdf_rendering and then merged into one PDF.
+
+Since each section is laid out on its own, the merged PDF is fixed up
+so that it reads as if the document had been laid out as a whole:
+
+- The page numbers, 'Page N of M', are left off the sections' pages
+  and stamped onto the merged PDF's pages from a PDF which is rendered
+  with the document's own page styles but holds only page numbers.
+- Links to anchors in other sections, which WeasyPrint would drop, are
+  rendered as links to SECTION_LINK_SCHEME URIs and then pointed at the
+  merged PDF's named destinations for those anchors.
+- The sections' bookmarks are appended, in order, to the merged PDF's
+  outline.
+
+Running headers, string(chapterstring), are laid out per section. They
+only differ from those of the document laid out as a whole on the pages
+of a section which come before its first chapter label, e.g., a book
+intro, which have no running header rather than the previous book's
+last chapter.
+"""
+
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from os.path import dirname, exists
+from typing import Generator, Iterator, Sequence, cast
+from urllib.parse import unquote
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, DictionaryObject, NameObject, TextStringObject
+
+from document.config import settings
+from document.domain.pdf_rendering import PdfRendererPool, PdfRendering
+
+logger = settings.logger(__name__)
+
+SECTION_LINK_SCHEME = "x-doc-section:"
+
+# Leave the page numbers off the sections' pages.
+SECTION_STYLE_HTML = "<style>@page { @bottom-center { content: none; } }</style>"
+# Leave everything but the page numbers off the page numbers' pages.
+PAGE_NUMBERS_STYLE_HTML = "<style>@page { @top-center { content: none; } @bottom-right { content: none; } }</style>"
+PAGE_BREAK_HTML = '<div style="page-break-after: always;"></div>'
+# Closes each section but the last whose end is the document's end.
+SECTION_END_HTML = "\n  </body>\n</html>"
+
+BODY_START_REGEX = re.compile(r"<body[^>]*>")
+ID_REGEX = re.compile(r'\bid="([^"]+)"')
+INTERNAL_HREF_REGEX = re.compile(r'\bhref="#([^"]+)"')
+
+
+def html_parts(
+    html_filepath: str,
+    book_boundary_html: str = settings.BOOK_BOUNDARY_HTML,
+    chunk_size: int = 1 << 20,
+) -> Generator[str, None, None]:
+    """
+    Yield the parts of the HTML file between book boundaries so that
+    only one part, rather than the whole document, is held in memory
+    at a time.
+    """
+    with open(html_filepath, "r", encoding="utf-8") as fin:
+        buffer = ""
+        while chunk := fin.read(chunk_size):
+            # The part after the last boundary continues in the next
+            # chunk as may a boundary which spans two chunks.
+            *parts, buffer = (buffer + chunk).split(book_boundary_html)
+            yield from parts
+        yield buffer
+
+
+def document_head(html: str) -> str:
+    """
+    Return the head of the HTML document, i.e., everything up to and
+    including its body start tag.
+
+    >>> document_head("<html><head><style></style></head><body class='x'><p>1</p>")
+    "<html><head><style></style></head><body class='x'>"
+    """
+    match = BODY_START_REGEX.search(html)
+    return html[: match.end()] if match else ""
+
+
+def with_style(head: str, style_html: str) -> str:
+    """Return the document head with style_html added last to its styles."""
+    return head.replace("</head>", "{}</head>".format(style_html), 1)
+
+
+def link_to_other_sections(body: str) -> str:
+    """
+    Return the section's body with its links to anchors which aren't in
+    it turned into links to SECTION_LINK_SCHEME URIs.
+
+    >>> link_to_other_sections('<a href="#en-God">God</a><a href="#v1">1</a><p id="v1">')
+    '<a href="x-doc-section:en-God">God</a><a href="#v1">1</a><p id="v1">'
+    """
+    ids = set(ID_REGEX.findall(body))
+    return INTERNAL_HREF_REGEX.sub(
+        lambda match: (
+            match.group(0)
+            if match.group(1) in ids
+            else 'href="{}{}"'.format(SECTION_LINK_SCHEME, match.group(1))
+        ),
+        body,
+    )
+
+
+def html_sections(
+    html_filepath: str,
+    book_boundary_html: str = settings.BOOK_BOUNDARY_HTML,
+) -> Iterator[str]:
+    """
+    Yield each section of the HTML document, split at its book
+    boundaries, as an HTML document in its own right which shares the
+    document's head. The first section holds the document's title page.
+    Sections with no content are left out.
+    """
+    parts = html_parts(html_filepath, book_boundary_html)
+    first_part = next(parts)
+    head = document_head(first_part)
+    section_head = with_style(head, SECTION_STYLE_HTML)
+    # The body of the last section with content seen so far.
+    body = first_part[len(head) :]
+    for part in parts:
+        # Only the last part holds the document's end.
+        if part.strip() and part[: part.rfind("</body>")].strip():
+            yield "{}{}{}".format(
+                section_head, link_to_other_sections(body), SECTION_END_HTML
+            )
+            body = part
+        elif "</body>" in part:
+            body += part
+    yield "{}{}".format(section_head, link_to_other_sections(body))
+
+
+def page_numbers_html(
+    html_filepath: str,
+    num_pages: int,
+    book_boundary_html: str = settings.BOOK_BOUNDARY_HTML,
+) -> str:
+    """
+    Return an HTML document of num_pages empty pages which only have
+    the HTML document's page numbers.
+    """
+    parts = html_parts(html_filepath, book_boundary_html)
+    head = document_head(next(parts))
+    parts.close()
+    return "{}{}<div></div>{}".format(
+        with_style(head, PAGE_NUMBERS_STYLE_HTML),
+        PAGE_BREAK_HTML * (num_pages - 1),
+        SECTION_END_HTML,
+    )
+
+
+def merged_pdf(pdf_filepaths: Sequence[str]) -> PdfWriter:
+    """
+    Return the PDFs merged into one whose links to other sections, see
+    link_to_other_sections, are pointed at its named destinations.
+    """
+    writer = PdfWriter()
+    for pdf_filepath in pdf_filepaths:
+        writer.append(pdf_filepath, import_outline=True)
+    named_dest_root = writer.get_named_dest_root()
+    names = {str(name) for name in named_dest_root[::2]}
+    for page in writer.pages:
+        if "/Annots" not in page:
+            continue
+        annotations = ArrayObject()
+        for annotation_ref in cast(ArrayObject, page["/Annots"]):
+            annotation = annotation_ref.get_object()
+            action = annotation.get("/A")
+            uri = str(action.get_object().get("/URI", "")) if action else ""
+            if not uri.startswith(SECTION_LINK_SCHEME):
+                annotations.append(annotation_ref)
+                continue
+            name = unquote(uri[len(SECTION_LINK_SCHEME) :])
+            # Links to anchors which aren't in the document are dropped
+            # as WeasyPrint drops them.
+            if name in names:
+                annotation[NameObject("/A")] = DictionaryObject(
+                    {
+                        NameObject("/S"): NameObject("/GoTo"),
+                        NameObject("/D"): TextStringObject(name),
+                    }
+                )
+                annotations.append(annotation_ref)
+        page[NameObject("/Annots")] = annotations
+    return writer
+
+
+def stamp_pages(writer: PdfWriter, stamp_pdf_filepath: str) -> None:
+    """Stamp each page of the stamp PDF onto the same page of writer's PDF."""
+    stamp_pages_ = PdfReader(stamp_pdf_filepath).pages
+    if len(stamp_pages_) != len(writer.pages):
+        logger.warning(
+            "%s has %s pages rather than %s",
+            stamp_pdf_filepath,
+            len(stamp_pages_),
+            len(writer.pages),
+        )
+    for page, stamp_page in zip(writer.pages, stamp_pages_):
+        page.merge_page(stamp_page)
+
+
+def render_pdf_in_sections(
+    html_filepath: str,
+    pdf_filepath: str,
+    pdf_renderer_pool: PdfRendererPool,
+    max_workers: int = settings.PDF_SECTION_MAX_WORKERS,
+    book_boundary_html: str = settings.BOOK_BOUNDARY_HTML,
+) -> PdfRendering:
+    """
+    Render the HTML file to the PDF file in sections, split at its book
+    boundaries, up to max_workers at a time, and merge them. Return the
+    wall clock time taken and the largest peak resident set size of
+    the rendering processes while rendering.
+    """
+    t0 = time.time()
+    html_dir = dirname(html_filepath) or "."
+    pdf_dir = dirname(pdf_filepath) or "."
+    tmp_paths: list[str] = []
+
+    def tmp_path(dir_path: str, suffix: str) -> str:
+        # Sections are written next to the HTML file so that relative
+        # URLs resolve as they do for the whole document.
+        fd, path = tempfile.mkstemp(dir=dir_path, prefix=".tmp-", suffix=suffix)
+        os.close(fd)
+        tmp_paths.append(path)
+        return path
+
+    try:
+        section_pdf_filepaths: list[str] = []
+        futures: list[Future[PdfRendering]] = []
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            try:
+                for section_html in html_sections(html_filepath, book_boundary_html):
+                    section_html_filepath = tmp_path(html_dir, ".html")
+                    with open(section_html_filepath, "w", encoding="utf-8") as fout:
+                        fout.write(section_html)
+                    section_pdf_filepaths.append(tmp_path(pdf_dir, ".pdf"))
+                    futures.append(
+                        executor.submit(
+                            pdf_renderer_pool.render,
+                            section_html_filepath,
+                            section_pdf_filepaths[-1],
+                        )
+                    )
+                renderings = [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        t1 = time.time()
+        logger.debug(
+            "Time for rendering %s sections to PDF: %s", len(renderings), t1 - t0
+        )
+        writer = merged_pdf(section_pdf_filepaths)
+        page_numbers_html_filepath = tmp_path(html_dir, ".html")
+        with open(page_numbers_html_filepath, "w", encoding="utf-8") as fout:
+            fout.write(page_numbers_html(html_filepath, len(writer.pages)))
+        page_numbers_pdf_filepath = tmp_path(pdf_dir, ".pdf")
+        renderings.append(
+            pdf_renderer_pool.render(
+                page_numbers_html_filepath, page_numbers_pdf_filepath
+            )
+        )
+        stamp_pages(writer, page_numbers_pdf_filepath)
+        merged_pdf_filepath = tmp_path(pdf_dir, ".pdf")
+        with open(merged_pdf_filepath, "wb") as pdf_fout:
+            writer.write(pdf_fout)
+        os.replace(merged_pdf_filepath, pdf_filepath)
+        t2 = time.time()
+        logger.debug(
+            "Time for merging %s sections into PDF of %s pages: %s",
+            len(section_pdf_filepaths),
+            len(writer.pages),
+            t2 - t1,
+        )
+    finally:
+        for path in tmp_paths:
+            if exists(path):
+                os.remove(path)
+    return PdfRendering(
+        time.time() - t0,
+        max(rendering.peak_rss_bytes for rendering in renderings),
+    )
+
+
+if __name__ == "__main__":
+
+    # To run the doctests in the this module, in the root of the project do:
+    # python backend/document/domain/pdf_sections.py
+    # or
+    # python backend/document/domain/pdf_sections.py -v
+    # See https://docs.python.org/3/library/doctest.html
+    # for more details.
+    import doctest
+
+    doctest.testmod()
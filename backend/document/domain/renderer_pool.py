@@ -0,0 +1,126 @@
+"""
+This module provides a bounded, thread safe pool of long-lived renderer
+processes, e.g., parsing.USFMRenderer and pdf_rendering.PdfRenderer,
+which are started lazily, or up front by warm, and replaced when their
+process dies.
+
+Callers waiting for a renderer when the pool is full are woken whenever
+a renderer is returned to the pool or discarded, in which case they
+start its replacement, so that renderers dying never leaves a caller
+waiting forever.
+"""
+
+import threading
+from typing import Callable, Generic, Protocol, TypeVar
+
+from document.config import settings
+
+logger = settings.logger(__name__)
+
+
+class Renderer(Protocol):
+    """A long-lived renderer process."""
+
+    def alive(self) -> bool:
+        """Return True if the renderer's process is still running."""
+        ...
+
+    def close(self) -> None:
+        """Stop the renderer's process."""
+        ...
+
+
+R = TypeVar("R", bound=Renderer)
+T = TypeVar("T")
+
+
+class RendererPool(Generic[R]):
+    """
+    A bounded, thread safe pool of at most size renderers, each started
+    by calling start. A renderer which raises one of recoverable_errors
+    is returned to the pool if its process is still running. A renderer
+    which raises any other exception is discarded.
+    """
+
+    def __init__(
+        self,
+        start: Callable[[], R],
+        size: int,
+        recoverable_errors: tuple[type[Exception], ...] = (),
+    ):
+        self._start = start
+        self._size = max(size, 1)
+        self._recoverable_errors = recoverable_errors
+        self._num_started = 0
+        self._idle: list[R] = []
+        self._condition = threading.Condition()
+
+    def warm(self) -> None:
+        """Start the rest of the pool's renderers now."""
+        with self._condition:
+            num_to_start = self._size - self._num_started
+            self._num_started = self._size
+        for _ in range(num_to_start):
+            try:
+                renderer = self._start()
+            except Exception:
+                logger.exception("Could not start renderer process")
+                self._discarded()
+            else:
+                self._release(renderer, usable=True)
+
+    def run(self, task: Callable[[R], T]) -> T:
+        """Return the result of calling task with an idle renderer."""
+        renderer = self._acquire()
+        try:
+            result = task(renderer)
+        except self._recoverable_errors:
+            self._release(renderer, usable=True)
+            raise
+        except BaseException:
+            self._release(renderer, usable=False)
+            raise
+        self._release(renderer, usable=True)
+        return result
+
+    def close(self) -> None:
+        """Stop all idle renderers."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._num_started -= len(idle)
+            self._condition.notify_all()
+        for renderer in idle:
+            renderer.close()
+
+    def _acquire(self) -> R:
+        with self._condition:
+            self._condition.wait_for(
+                lambda: bool(self._idle) or self._num_started < self._size
+            )
+            if self._idle:
+                return self._idle.pop()
+            self._num_started += 1
+        try:
+            return self._start()
+        except BaseException:
+            self._discarded()
+            raise
+
+    def _release(self, renderer: R, usable: bool) -> None:
+        """
+        Return the renderer to the pool if it is usable and its process
+        is still running, else stop it so that it is replaced.
+        """
+        if usable and renderer.alive():
+            with self._condition:
+                self._idle.append(renderer)
+                self._condition.notify()
+        else:
+            renderer.close()
+            self._discarded()
+
+    def _discarded(self) -> None:
+        """Make room in the pool for a renderer to replace one discarded."""
+        with self._condition:
+            self._num_started -= 1
+            self._condition.notify()
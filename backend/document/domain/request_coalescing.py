@@ -0,0 +1,194 @@
+"""
+This module provides the coalescing of identical document requests
+whose task is in flight, i.e., queued or running. The first request
+for a document records the id of its task in Redis under a key made
+from the task, the document request key and the formats requested.
+Identical requests submitted while that task is in flight get its id
+back rather than queuing a task of their own which would redo the same
+work into the same files. Their email addresses are recorded so that
+the worker can send them the documents too when the task finishes, see
+document_generator.release_in_flight_document_request. Requests
+submitted after the task has finished get a task of their own which
+serves the documents from the output cache.
+"""
+
+from functools import cache
+from typing import Any, Optional, Sequence, cast
+
+import celery.states
+import redis
+from celery import Task, uuid
+from celery.result import AsyncResult
+from document.config import settings
+from document.domain import worker
+
+logger = settings.logger(__name__)
+
+IN_FLIGHT_KEY_FMT_STR = "doc:in-flight:{}:{}:{}"
+EMAIL_ADDRESSES_KEY_FMT_STR = "{}:email-addresses"
+TASK_KEY_FMT_STR = "doc:in-flight-task:{}"
+
+# Record an email address to send the documents to if the in-flight
+# task, KEYS[1]'s value, is still the task ARGV[1].
+ATTACH_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if ARGV[2] ~= '' then
+    redis.call('SADD', KEYS[2], ARGV[2])
+end
+return 1
+"""
+
+# Forget the in-flight task ARGV[1] and return the email addresses
+# recorded for it.
+RELEASE_SCRIPT = """
+redis.call('DEL', KEYS[3])
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return {}
+end
+local email_addresses = redis.call('SMEMBERS', KEYS[2])
+redis.call('DEL', KEYS[1], KEYS[2])
+return email_addresses
+"""
+
+
+@cache
+def redis_client() -> redis.Redis:
+    """Return a client of the Redis which Celery uses as its broker."""
+    return redis.Redis.from_url(worker.app.conf.broker_url)
+
+
+def in_flight_key(
+    task_name: str, document_request_key: str, formats: Sequence[str]
+) -> str:
+    """
+    Return the key under which the task producing the formats of the
+    document is recorded while it is in flight.
+
+    >>> in_flight_key("document.domain.document_generator.generate_document", "en-ulb-col_lbo_1c_chapter", ["pdf"])
+    'doc:in-flight:document.domain.document_generator.generate_document:en-ulb-col_lbo_1c_chapter:pdf'
+    """
+    return IN_FLIGHT_KEY_FMT_STR.format(
+        task_name, document_request_key, "-".join(formats) or "html"
+    )
+
+
+def in_flight_task_id(
+    in_flight_key: str,
+    coalesce: bool = settings.COALESCE_DOCUMENT_REQUESTS,
+) -> Optional[str]:
+    """
+    Return the id of the task recorded under in_flight_key if it is
+    queued or running, else None. A task which has finished, but has
+    yet to be released, isn't in flight since it has already sent its
+    documents.
+    """
+    if not coalesce:
+        return None
+    try:
+        task_id = cast(Optional[bytes], redis_client().get(in_flight_key))
+    except redis.RedisError:
+        logger.exception("Unable to look up document request %s", in_flight_key)
+        return None
+    if task_id is None:
+        return None
+    if AsyncResult(task_id.decode()).state in celery.states.READY_STATES:
+        return None
+    return str(task_id.decode())
+
+
+def apply_async(
+    task: "Task[Any, Any]",
+    document_request_json: str,
+    in_flight_key: str,
+    email_address: Optional[str],
+    coalesce: bool = settings.COALESCE_DOCUMENT_REQUESTS,
+    ttl: int = settings.DOCUMENT_REQUEST_IN_FLIGHT_TTL,
+) -> str:
+    """
+    Queue the task for the document request unless an identical
+    document request's task is in flight, in which case record
+    email_address to send its documents to. Return the id of the task
+    which fulfills the document request.
+    """
+    if coalesce:
+        try:
+            client = redis_client()
+            task_id = uuid()
+            # The task is recorded before it is queued so that it is
+            # recorded by the time it finishes.
+            client.set(TASK_KEY_FMT_STR.format(task_id), in_flight_key, ex=ttl)
+            if client.set(in_flight_key, task_id, nx=True, ex=ttl):
+                try:
+                    return str(
+                        task.apply_async(
+                            args=(document_request_json,), task_id=task_id
+                        ).id
+                    )
+                except Exception:
+                    release(task_id)
+                    raise
+            client.delete(TASK_KEY_FMT_STR.format(task_id))
+            # Otherwise, a task of the request's own serves the
+            # documents from the output cache.
+            in_flight_task_id_ = in_flight_task_id(in_flight_key)
+            if in_flight_task_id_ is not None and client.eval(
+                ATTACH_SCRIPT,
+                2,
+                in_flight_key,
+                EMAIL_ADDRESSES_KEY_FMT_STR.format(in_flight_key),
+                in_flight_task_id_,
+                email_address or "",
+            ):
+                logger.info(
+                    "Coalesced document request %s into task %s",
+                    in_flight_key,
+                    in_flight_task_id_,
+                )
+                return in_flight_task_id_
+        except redis.RedisError:
+            logger.exception("Unable to coalesce document request %s", in_flight_key)
+    return str(task.apply_async(args=(document_request_json,)).id)
+
+
+def release(task_id: str) -> list[str]:
+    """
+    Forget the in-flight task, if it was recorded, so that subsequent
+    identical document requests get a task of their own, and return
+    the email addresses of the document requests which were coalesced
+    into it.
+    """
+    try:
+        client = redis_client()
+        in_flight_key: Optional[Any] = client.get(TASK_KEY_FMT_STR.format(task_id))
+        if in_flight_key is None:
+            return []
+        email_addresses = cast(
+            list[bytes],
+            client.eval(
+                RELEASE_SCRIPT,
+                3,
+                in_flight_key,
+                EMAIL_ADDRESSES_KEY_FMT_STR.format(in_flight_key.decode()),
+                TASK_KEY_FMT_STR.format(task_id),
+                task_id,
+            ),
+        )
+    except redis.RedisError:
+        logger.exception("Unable to release in-flight task %s", task_id)
+        return []
+    return sorted(email_address.decode() for email_address in email_addresses)
+
+
+if __name__ == "__main__":
+
+    # To run the doctests in the this module, in the root of the project do:
+    # python backend/document/domain/request_coalescing.py
+    # or
+    # python backend/document/domain/request_coalescing.py -v
+    # See https://docs.python.org/3/library/doctest.html
+    # for more details.
+    import doctest
+
+    doctest.testmod()
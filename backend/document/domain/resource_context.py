@@ -0,0 +1,170 @@
+"""
+This module provides a context which memoizes, for the duration of one
+document request, the lookups that parsing repeats for each chapter
+and verse of each book, e.g., finding a language's TW resource asset
+directory, building its translation words index or checking whether a
+translation note exists.
+"""
+
+from collections import Counter, OrderedDict
+from os import scandir
+from os.path import basename, dirname, relpath
+from typing import Any, Callable, Mapping, Optional, TypeVar, final
+from uuid import uuid4
+
+from document.config import settings
+from document.domain.model import TranslationWord
+from document.utils import repo_manifest, tw_utils
+from document.utils.repo_manifest import RepoManifest
+
+T = TypeVar("T")
+
+# The lookups memoized in this process, by the id of the context they
+# were made through, for the contexts most recently unpickled in it.
+_process_lookups: OrderedDict[str, dict[tuple[str, str], Any]] = OrderedDict()
+MAX_PROCESS_LOOKUPS = 4
+
+
+def process_lookups(context_id: str) -> dict[tuple[str, str], Any]:
+    """
+    Return the lookups memoized in this process through copies of the
+    context whose id is context_id.
+    """
+    try:
+        _process_lookups.move_to_end(context_id)
+    except KeyError:
+        _process_lookups[context_id] = {}
+        while len(_process_lookups) > MAX_PROCESS_LOOKUPS:
+            _process_lookups.popitem(last=False)
+    return _process_lookups[context_id]
+
+
+@final
+class ResourceContext:
+    """
+    Memoize per language, per directory, etc., lookups over the
+    resource assets of one document request and count how often each
+    kind of lookup was a hit, i.e., served from memory, or a miss,
+    i.e., went to the filesystem.
+
+    The context is picklable so that it can be handed to the processes
+    which parse resources in parallel. Only its id and counts are
+    pickled. The copies unpickled in the same process share their
+    lookups, see process_lookups, so that each process memoizes each
+    lookup once across all the tasks it is handed for the context,
+    rather than once per task. The copies' counts are merged back with
+    add_counts.
+
+    >>> resource_context = ResourceContext()
+    >>> resource_context.file_exists("/nonexistent/01.md")
+    False
+    >>> resource_context.file_exists("/nonexistent/02.md")
+    False
+    >>> resource_context.counts()
+    {'dir_entries': (1, 1)}
+    """
+
+    def __init__(self) -> None:
+        self._id = uuid4().hex
+        self._lookups: dict[tuple[str, str], Any] = {}
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"id": self._id, "hits": self.hits, "misses": self.misses}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._id = state["id"]
+        self._lookups = process_lookups(self._id)
+        self.hits = state["hits"]
+        self.misses = state["misses"]
+
+    def _lookup(self, kind: str, key: str, look_up: Callable[[], T]) -> T:
+        try:
+            value: T = self._lookups[(kind, key)]
+        except KeyError:
+            self.misses[kind] += 1
+            value = self._lookups[(kind, key)] = look_up()
+            return value
+        self.hits[kind] += 1
+        return value
+
+    def tw_resource_dir(self, lang_code: str) -> Optional[str]:
+        """See tw_utils.tw_resource_dir."""
+        return self._lookup(
+            "tw_resource_dir",
+            lang_code,
+            lambda: tw_utils.tw_resource_dir(lang_code),
+        )
+
+    def translation_words_index(self, lang_code: str) -> Mapping[str, TranslationWord]:
+        """
+        Return the translation words index, see
+        tw_utils.translation_words_index, of lang_code's TW resource
+        asset directory.
+        """
+        return self._lookup(
+            "translation_words_index",
+            lang_code,
+            lambda: tw_utils.translation_words_index(self.tw_resource_dir(lang_code)),
+        )
+
+    def dir_entries(self, dir_path: str) -> frozenset[str]:
+        """
+        Return the names of the entries of the directory at dir_path,
+        or no names if it doesn't exist.
+        """
+
+        def look_up() -> frozenset[str]:
+            try:
+                with scandir(dir_path) as entries:
+                    return frozenset(entry.name for entry in entries)
+            except OSError:
+                return frozenset()
+
+        return self._lookup("dir_entries", dir_path, look_up)
+
+    def repo_manifest(self, repo_dir: str) -> RepoManifest:
+        """See repo_manifest.repo_manifest."""
+        return self._lookup(
+            "repo_manifest", repo_dir, lambda: repo_manifest.repo_manifest(repo_dir)
+        )
+
+    def file_exists(
+        self, path: str, working_dir: str = settings.RESOURCE_ASSETS_DIR
+    ) -> bool:
+        """
+        Return True if path exists. Like os.path.exists but looked up
+        in the manifest of the repo cloned in working_dir which path is
+        in, if any, otherwise in the listing of its directory, which is
+        only listed once.
+        """
+        repo_dir = repo_manifest.repo_root(dirname(path), working_dir)
+        if repo_dir is not None:
+            return self.repo_manifest(repo_dir).exists(relpath(path, repo_dir))
+        return basename(path) in self.dir_entries(dirname(path))
+
+    def counts(self) -> dict[str, tuple[int, int]]:
+        """Return the (hits, misses) of each kind of lookup."""
+        return {
+            kind: (self.hits[kind], self.misses[kind])
+            for kind in sorted(self.hits.keys() | self.misses.keys())
+        }
+
+    def add_counts(self, hits: Counter[str], misses: Counter[str]) -> None:
+        """Add the counts of lookups made through a copy of this context."""
+        self.hits.update(hits)
+        self.misses.update(misses)
+
+
+if __name__ == "__main__":
+
+    # To run the doctests in the this module, in the root of the project do:
+    # python backend/document/domain/resource_context.py
+    # or
+    # python backend/document/domain/resource_context.py -v
+    # See https://docs.python.org/3/library/doctest.html
+    # for more details.
+    import doctest
+
+    doctest.testmod()
@@ -5,21 +5,28 @@ assets.
 """
 
 import json
+import os
 import re
+import shutil
 import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from os import scandir
-from os.path import exists, isdir, join
+from os.path import basename, dirname, exists, isdir, join
 from pathlib import Path
-from typing import Any, Mapping, Optional, Sequence
+from typing import Any, Mapping, NamedTuple, Optional, Sequence, final
 from urllib.parse import urlparse
 
 import requests
 from document.config import settings
 from document.domain import parsing
 from document.domain.bible_books import BOOK_NAMES
-from document.domain.model import ResourceLookupDto
-from document.utils.file_utils import file_needs_update, read_file
+from document.domain.model import LangDirEnum, ResourceLookupDto
+from document.utils import repo_manifest, tw_utils
+from document.utils.file_utils import file_lock, file_needs_update, read_file
 from fastapi import HTTPException, status
 from pydantic import HttpUrl
 
@@ -229,37 +236,11 @@ def lang_codes_and_names(
     gateway_languages_ = get_gateway_languages()
     if not gateway_languages_:
         gateway_languages_ = gateway_languages
-    data = fetch_source_data()
-    values = []
-    if "git_repo" not in data:
-        raise Exception("Data API is down!")
-    try:
-        repos_info = data["git_repo"]
-        for repo_info in repos_info:
-            language_info = repo_info["content"]
-            language = language_info["language"]
-            ietf_code = language["ietf_code"]
-            english_name = (
-                language["english_name"] if "english_name" in language else ""
-            )
-            national_name = language["national_name"]
-            is_gateway = ietf_code in gateway_languages_
-            # if ietf_code not in lang_code_filter_list:
-            if english_name in national_name:
-                values.append((ietf_code, national_name, is_gateway))
-            else:
-                values.append(
-                    (ietf_code, f"{national_name} ({english_name})", is_gateway)
-                )
-    except:
-        logger.exception("Failed due to the following exception.")
-    unique_values = []
-    seen_values = set()
-    for value in values:
-        if value[0] not in seen_values:
-            unique_values.append(value)
-            seen_values.add(value[0])
-    return sorted(unique_values, key=lambda value: value[1])
+    values = [
+        (lang_code, lang_name, lang_code in gateway_languages_)
+        for lang_code, lang_name in resource_catalog().lang_codes_and_names
+    ]
+    return sorted(values, key=lambda value: value[1])
 
 
 # This can be expanded to include any additional types (if
@@ -305,55 +286,48 @@ def resource_types(
     if book_codes and book_codes[0] == "all":
         # Add all OT and NT books
         book_codes = list(book_names.keys())
-    data = fetch_source_data()
     resource_types = []
     try:
-        repos_info = data["git_repo"]
-        augmented_repos_info = add_data_not_supplied_by_data_api(repos_info)
-        for repo_info in augmented_repos_info:
-            content = repo_info["content"]
-            language_info = content["language"]
-            if language_info["ietf_code"] == lang_code:
-                resource_type = content["resource_type"]
-                if resource_type in resource_type_codes_and_names:
-                    url = repo_info["repo_url"]
-                    last_segment = get_last_segment(url, lang_code)
-                    resource_filepath = f"{resource_assets_dir}/{last_segment}"
-                    clone_git_repo(url, resource_filepath)
-                    logger.debug("resource_filepath: %s", resource_filepath)
-                    # Check repo on disk to see if at least one of the books
-                    # chosen by the user is there
-                    book_assets = []
-                    if resource_type in ["tq", "tn", "tn-condensed"]:
-                        book_assets = [
-                            file.name
-                            for file in scandir(resource_filepath)
-                            if file.is_dir() and file.name.lower() in book_codes
-                        ]
-                    elif resource_type == "bc":
-                        book_assets = [
-                            file.name
-                            for file in scandir(resource_filepath)
-                            if file.is_dir()
-                            and re.search(bc_book_asset_pattern, file.name)
-                            and file.name.split("-")[1].lower() in book_codes
-                        ]
-                    elif resource_type in usfm_resource_types:
-                        book_assets = parsing.find_usfm_files(resource_filepath)
-                    # Checking if at least one of the books chosen by the user in the prior
-                    # user step is included in the repo. For example, the user may have
-                    # chosen an Old Testament book and there is no English bible commentary
-                    # for OT books so in that case we should not show the user 'bc' as a
-                    # choosable resource type. Also, TW resource is language specific and
-                    # not book specific so it can be added here if the user chose it.
-                    if book_assets or resource_type == "tw":
-                        logger.debug("About to add resource type: %s", resource_type)
-                        resource_types.append(
-                            (
-                                resource_type,
-                                resource_type_codes_and_names[resource_type],
-                            )
+        for entry in resource_catalog().entries_by_lang.get(lang_code, ()):
+            resource_type = entry.resource_type
+            if resource_type in resource_type_codes_and_names:
+                url = entry.url
+                resource_filepath = f"{resource_assets_dir}/{entry.last_segment}"
+                clone_git_repo(url, resource_filepath)
+                logger.debug("resource_filepath: %s", resource_filepath)
+                # Check repo on disk to see if at least one of the books
+                # chosen by the user is there
+                book_assets = []
+                if resource_type in ["tq", "tn", "tn-condensed"]:
+                    book_assets = [
+                        file.name
+                        for file in scandir(resource_filepath)
+                        if file.is_dir() and file.name.lower() in book_codes
+                    ]
+                elif resource_type == "bc":
+                    book_assets = [
+                        file.name
+                        for file in scandir(resource_filepath)
+                        if file.is_dir()
+                        and re.search(bc_book_asset_pattern, file.name)
+                        and file.name.split("-")[1].lower() in book_codes
+                    ]
+                elif resource_type in usfm_resource_types:
+                    book_assets = parsing.find_usfm_files(resource_filepath)
+                # Checking if at least one of the books chosen by the user in the prior
+                # user step is included in the repo. For example, the user may have
+                # chosen an Old Testament book and there is no English bible commentary
+                # for OT books so in that case we should not show the user 'bc' as a
+                # choosable resource type. Also, TW resource is language specific and
+                # not book specific so it can be added here if the user chose it.
+                if book_assets or resource_type == "tw":
+                    logger.debug("About to add resource type: %s", resource_type)
+                    resource_types.append(
+                        (
+                            resource_type,
+                            resource_type_codes_and_names[resource_type],
                         )
+                    )
     except:
         pass
     unique_values = []
@@ -431,67 +405,163 @@ def update_repo_components(repo_components: list[str]) -> list[str]:
     return repo_components
 
 
-def add_data_not_supplied_by_data_api(repos_info: Any) -> Any:
+@lru_cache(maxsize=1)
+def supplemental_repos_info(
+    supplemental_repos_file_path: str = settings.SUPPLEMENTAL_REPOS_FILE_PATH,
+) -> tuple[Any, ...]:
     """
-    DOC needs to support en/tn_condensed, id/ayt, id/tq, and id/tw none of which are supplied by the data API so we augment the data returned from the data API to include them here.
+    Return the git repos which DOC supports but which the data API does
+    not supply, e.g., en/tn_condensed, id/ayt, id/tq, and id/tw, as read
+    from supplemental_repos_file_path.
     """
-    # The data API only provides id_tn repo for id, we have to
-    # add the other repos for id that are available for DOC's use.
-    id_ayt = {
-        "repo_url": "https://content.bibletranslationtools.org/WA-Catalog/id_ayt",
-        "content": {
-            "resource_type": "ayt",
-            "language": {
-                "english_name": "Indonesian",
-                "ietf_code": "id",
-                "national_name": "Bahasa Indonesian",
-                "direction": "ltr",
-            },
-        },
-    }
-    repos_info.append(id_ayt)
-    id_tq = {
-        "repo_url": "https://content.bibletranslationtools.org/WA-Catalog/id_tq",
-        "content": {
-            "resource_type": "tq",
-            "language": {
-                "english_name": "Indonesian",
-                "ietf_code": "id",
-                "national_name": "Bahasa Indonesian",
-                "direction": "ltr",
-            },
-        },
-    }
-    repos_info.append(id_tq)
-    id_tw = {
-        "repo_url": "https://content.bibletranslationtools.org/WA-Catalog/id_tw",
-        "content": {
-            "resource_type": "tw",
-            "language": {
-                "english_name": "Indonesian",
-                "ietf_code": "id",
-                "national_name": "Bahasa Indonesian",
-                "direction": "ltr",
-            },
-        },
-    }
-    repos_info.append(id_tw)
-    # data API does not provide tn_condensed for en, but DOC needs to support it
-    en_tn_condensed = {
-        "repo_url": "https://content.bibletranslationtools.org/WycliffeAssociates/en_tn_condensed",
-        "content": {
-            "resource_type": "tn-condensed",
-            "language": {
-                "english_name": "English",
-                "ietf_code": "en",
-                "national_name": "English",
-                "direction": "ltr",
-            },
-        },
-    }
-    repos_info.append(en_tn_condensed)
-    # logger.debug("repos_info[-4:]: %s", repos_info[-4:])
-    return repos_info
+    with open(supplemental_repos_file_path, "r") as fin:
+        return tuple(json.load(fin)["git_repo"])
+
+
+def add_data_not_supplied_by_data_api(repos_info: Sequence[Any]) -> tuple[Any, ...]:
+    """
+    Return the repos supplied by the data API, repos_info, overlaid
+    with the supplemental repos that the data API doesn't supply. Neither
+    repos_info, which is cached by fetch_source_data, nor the
+    supplemental repos are modified.
+    """
+    return (*repos_info, *supplemental_repos_info())
+
+
+@final
+class CatalogEntry(NamedTuple):
+    """
+    A git repo from the data API along with the values derived from its
+    URL that lookups need.
+    """
+
+    url: str
+    lang_code: str
+    lang_name: str
+    national_name: str
+    lang_direction: LangDirEnum
+    resource_type: str
+    last_segment: str
+    repo_components: tuple[str, ...]
+
+
+@final
+class ResourceCatalog:
+    """
+    Indexes of the git repos provided by the data API so that lookups
+    by language, by (language, resource type, book) and by repo URL
+    don't have to scan every repo.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[CatalogEntry],
+        zmq_git_username: str = "faustin_azaza",
+    ):
+        self.entries = tuple(entries)
+        self.entries_by_lang: dict[str, list[CatalogEntry]] = {}
+        self.entries_by_url: dict[str, CatalogEntry] = {}
+        # Repos which provide a single book, e.g., en_mat_ulb, keyed by
+        # (lang_code, resource_type, book_code).
+        self.book_entries: dict[tuple[str, str, str], CatalogEntry] = {}
+        # Repos which provide many books, e.g., en_ulb, keyed by
+        # (lang_code, resource_type).
+        self.multi_book_entries: dict[tuple[str, str], CatalogEntry] = {}
+        # Language codes and display names in the order first seen.
+        lang_names: dict[str, str] = {}
+        for entry in self.entries:
+            self.entries_by_lang.setdefault(entry.lang_code, []).append(entry)
+            self.entries_by_url.setdefault(entry.url, entry)
+            if len(entry.repo_components) > 2:
+                book_code = entry.repo_components[1]
+                if book_code in entry.url or zmq_git_username in entry.url:
+                    self.book_entries.setdefault(
+                        (entry.lang_code, entry.resource_type, book_code), entry
+                    )
+            elif len(entry.repo_components) == 2:
+                # Here we handle cases like es-419_ulb, es-419_tn, en_ulb, etc.
+                self.multi_book_entries.setdefault(
+                    (entry.lang_code, entry.resource_type), entry
+                )
+            if entry.lang_code not in lang_names:
+                if entry.lang_name in entry.national_name:
+                    lang_names[entry.lang_code] = entry.national_name
+                else:
+                    lang_names[entry.lang_code] = (
+                        f"{entry.national_name} ({entry.lang_name})"
+                    )
+        self.lang_codes_and_names: tuple[tuple[str, str], ...] = tuple(
+            lang_names.items()
+        )
+
+    def lookup(
+        self, lang_code: str, resource_type: str, book_code: str
+    ) -> Optional[CatalogEntry]:
+        """
+        Return the repo providing book_code for lang_code and
+        resource_type, preferring single book repos to multi-book repos.
+        """
+        return self.book_entries.get(
+            (lang_code, resource_type, book_code)
+        ) or self.multi_book_entries.get((lang_code, resource_type))
+
+
+def catalog_entry(repo_info: Any) -> CatalogEntry:
+    """Return the CatalogEntry for a git repo from the data API."""
+    url = repo_info["repo_url"]
+    content = repo_info["content"]
+    language = content["language"]
+    lang_code = language["ietf_code"]
+    last_segment = get_last_segment(url, lang_code)
+    return CatalogEntry(
+        url=url,
+        lang_code=lang_code,
+        lang_name=language.get("english_name") or "",
+        national_name=language["national_name"],
+        lang_direction=LangDirEnum(language["direction"]),
+        resource_type=content["resource_type"],
+        last_segment=last_segment,
+        repo_components=tuple(update_repo_components(last_segment.split("_"))),
+    )
+
+
+def build_resource_catalog(data: Any) -> ResourceCatalog:
+    """Build a ResourceCatalog from the data API's source data."""
+    if not data or "git_repo" not in data:
+        raise Exception("Data API is down!")
+    entries = []
+    for repo_info in add_data_not_supplied_by_data_api(data["git_repo"]):
+        try:
+            entries.append(catalog_entry(repo_info))
+        except (KeyError, TypeError, ValueError):
+            logger.debug("Skipping malformed repo info: %s", repo_info)
+    return ResourceCatalog(entries)
+
+
+_catalog: Optional[ResourceCatalog] = None
+_catalog_source_data: Any = None
+_catalog_lock = threading.Lock()
+
+
+def resource_catalog() -> ResourceCatalog:
+    """
+    Return the ResourceCatalog for the current source data. The catalog
+    is built once each time the source data is (re)fetched.
+    """
+    global _catalog, _catalog_source_data
+    data = fetch_source_data()
+    with _catalog_lock:
+        if _catalog is None or data is not _catalog_source_data:
+            t0 = time.time()
+            _catalog = build_resource_catalog(data)
+            _catalog_source_data = data
+            t1 = time.time()
+            logger.debug(
+                "Time to build resource catalog of %s repos: %s",
+                len(_catalog.entries),
+                t1 - t0,
+            )
+        return _catalog
 
 
 @lru_cache(maxsize=100)
@@ -509,59 +579,55 @@ def book_codes_for_lang(
     >>> result[0]
     ('gen', 'Genesis')
     """
-    data = fetch_source_data()
     book_codes_and_names = []
     book_codes_and_names2: list[tuple[str, str]] = []
     try:
-        repos_info = data["git_repo"]
-        augmented_repos_info = add_data_not_supplied_by_data_api(repos_info)
-        for repo_info in augmented_repos_info:
-            content = repo_info["content"]
-            language_info = content["language"]
-            url = repo_info["repo_url"]
-            if language_info["ietf_code"] == lang_code:
-                last_segment = get_last_segment(url, lang_code)
-                repo_components = last_segment.split("_")
-                if dcs_mirror_git_username in url:
-                    repo_components = update_repo_components(repo_components)
-                logger.debug("url: %s, repo_components: %s", url, repo_components)
-                if len(repo_components) > 2:
-                    book_code = repo_components[1]
-                    if book_code in book_names:
-                        book_codes_and_names.append((book_code, book_names[book_code]))
-                elif (
-                    len(repo_components) == 2 and not book_codes_and_names
-                ):  # e.g., amo_reg, id_tn
+        for entry in resource_catalog().entries_by_lang.get(lang_code, ()):
+            url = entry.url
+            last_segment = entry.last_segment
+            repo_components = (
+                list(entry.repo_components)
+                if dcs_mirror_git_username in url
+                else last_segment.split("_")
+            )
+            logger.debug("url: %s, repo_components: %s", url, repo_components)
+            if len(repo_components) > 2:
+                book_code = repo_components[1]
+                if book_code in book_names:
+                    book_codes_and_names.append((book_code, book_names[book_code]))
+            elif (
+                len(repo_components) == 2 and not book_codes_and_names
+            ):  # e.g., amo_reg, id_tn
+                if not book_codes_and_names2:
+                    resource_filepath = f"{resource_assets_dir}/{last_segment}"
+                    clone_git_repo(url, resource_filepath)
+                    # Check repo's layout on disk to determine which books it provides.
+                    # First look at USFM assets.
+                    if repo_components[-1] in usfm_resource_types:
+                        usfm_files = parsing.find_usfm_files(resource_filepath)
+                        for usfm_file in usfm_files:
+                            book_code = Path(usfm_file).stem.lower().split("-")[1]
+                            book_codes_and_names2.append(
+                                (book_code, book_names[book_code])
+                            )
+                    # If no USFM assets found, look for others
                     if not book_codes_and_names2:
-                        resource_filepath = f"{resource_assets_dir}/{last_segment}"
-                        clone_git_repo(url, resource_filepath)
-                        # Check repo's layout on disk to determine which books it provides.
-                        # First look at USFM assets.
-                        if repo_components[-1] in usfm_resource_types:
-                            usfm_files = parsing.find_usfm_files(resource_filepath)
-                            for usfm_file in usfm_files:
-                                book_code = Path(usfm_file).stem.lower().split("-")[1]
+                        # Search for book directories amongst a subset of non-USFM repo assets
+                        if repo_components[-1] in ["tn", "tq"]:
+                            subdirs = [
+                                file
+                                for file in scandir(resource_filepath)
+                                if file.is_dir() and file.name in book_names
+                            ]
+                            # logger.debug("subdirs (as book codes): %s", subdirs)
+                            for subdir in subdirs:
                                 book_codes_and_names2.append(
-                                    (book_code, book_names[book_code])
-                                )
-                        # If no USFM assets found, look for others
-                        if not book_codes_and_names2:
-                            # Search for book directories amongst a subset of non-USFM repo assets
-                            if repo_components[-1] in ["tn", "tq"]:
-                                subdirs = [
-                                    file
-                                    for file in scandir(resource_filepath)
-                                    if file.is_dir() and file.name in book_names
-                                ]
-                                # logger.debug("subdirs (as book codes): %s", subdirs)
-                                for subdir in subdirs:
-                                    book_codes_and_names2.append(
-                                        (
-                                            subdir.name.lower(),
-                                            book_names[subdir.name.lower()],
-                                        )
+                                    (
+                                        subdir.name.lower(),
+                                        book_names[subdir.name.lower()],
                                     )
-                        # logger.debug("book_codes_and_names2: %s", book_codes_and_names2)
+                                )
+                    # logger.debug("book_codes_and_names2: %s", book_codes_and_names2)
     except:
         pass
     # Keep book codes unique and sorted by canonical bible book order
@@ -585,8 +651,7 @@ def resource_lookup_dto(
     lang_code: str,
     resource_type: str,
     book_code: str,
-    dcs_mirror_git_username: str = "DCS-Mirror",
-    zmq_git_username: str = "faustin_azaza",
+    resource_type_codes_and_names: Mapping[str, str] = RESOURCE_TYPE_CODES_AND_NAMES,
 ) -> Optional[ResourceLookupDto]:
     """
     >>> from document.domain import resource_lookup
@@ -595,62 +660,19 @@ def resource_lookup_dto(
     >>> data
     ResourceLookupDto(lang_code='pt-br', lang_name='Brazilian Portuguese', resource_type='ulb', resource_type_name='Unlocked Literal Bible', book_code='mat', url='https://content.bibletranslationtools.org/WA-Catalog/pt-br_blv')
     """
-    data = fetch_source_data()
     resource_lookup_dto = None
-    two_component_url_resource_lookup_dtos = []
-    more_than_two_component_url_resource_lookup_dtos = []
     try:
-        repos_info = data["git_repo"]
-        augmented_repos_info = add_data_not_supplied_by_data_api(repos_info)
-        for repo_info in augmented_repos_info:
-            content = repo_info["content"]
-            language_info = content["language"]
-            resource_type_ = content["resource_type"]
-            url = repo_info["repo_url"]
-            if language_info["ietf_code"] == lang_code:
-                last_segment = get_last_segment(url, lang_code)
-                repo_components = last_segment.split("_")
-                repo_components = update_repo_components(repo_components)
-                logger.debug(
-                    "url: %s, repo_components: %s, resource_type: %s",
-                    url,
-                    repo_components,
-                    resource_type_,
-                )
-                if len(repo_components) > 2:
-                    book_code_ = repo_components[1]
-                    if (
-                        (book_code_ in url or zmq_git_username in url)
-                        and resource_type == resource_type_
-                        and book_code_ == book_code
-                    ):
-                        resource_lookup_dto = ResourceLookupDto(
-                            lang_code=lang_code,
-                            lang_name=language_info["english_name"],
-                            resource_type=resource_type,
-                            resource_type_name=RESOURCE_TYPE_CODES_AND_NAMES[
-                                resource_type
-                            ],
-                            book_code=book_code,
-                            lang_direction=language_info["direction"],
-                            url=url,
-                        )
-                        more_than_two_component_url_resource_lookup_dtos.append(
-                            resource_lookup_dto
-                        )
-                elif (
-                    len(repo_components) == 2 and resource_type == resource_type_
-                ):  # Here we handle cases like es-419_ulb, es-419_tn, en_ulb, etc.
-                    resource_lookup_dto = ResourceLookupDto(
-                        lang_code=lang_code,
-                        lang_name=language_info["english_name"],
-                        resource_type=resource_type,
-                        resource_type_name=RESOURCE_TYPE_CODES_AND_NAMES[resource_type],
-                        book_code=book_code,
-                        lang_direction=language_info["direction"],
-                        url=url,
-                    )
-                    two_component_url_resource_lookup_dtos.append(resource_lookup_dto)
+        entry = resource_catalog().lookup(lang_code, resource_type, book_code)
+        if entry and resource_type in resource_type_codes_and_names:
+            resource_lookup_dto = ResourceLookupDto(
+                lang_code=lang_code,
+                lang_name=entry.lang_name,
+                resource_type=resource_type,
+                resource_type_name=resource_type_codes_and_names[resource_type],
+                book_code=book_code,
+                lang_direction=entry.lang_direction,
+                url=entry.url,
+            )
     except:
         logger.debug(
             "Problem creating ResourceLookupDto instance for %s, %s, %s, likely a data problem",
@@ -658,18 +680,6 @@ def resource_lookup_dto(
             resource_type,
             book_code,
         )
-    # logger.debug(
-    #     "two_component_url_resource_lookup_dtos: %s",
-    #     two_component_url_resource_lookup_dtos,
-    # )
-    # logger.debug(
-    #     "more_than_two_component_url_resource_lookup_dtos: %s",
-    #     more_than_two_component_url_resource_lookup_dtos,
-    # )
-    if more_than_two_component_url_resource_lookup_dtos:
-        resource_lookup_dto = more_than_two_component_url_resource_lookup_dtos[0]
-    elif two_component_url_resource_lookup_dtos:
-        resource_lookup_dto = two_component_url_resource_lookup_dtos[0]
     logger.debug("resource_lookup_dto: %s", resource_lookup_dto)
     return resource_lookup_dto
 
@@ -682,6 +692,70 @@ def provision_asset_files(resource_lookup_dto: ResourceLookupDto) -> str:
     return acquire_resource_assets(resource_lookup_dto)
 
 
+def provision_asset_files_concurrently(
+    resource_lookup_dtos: Sequence[ResourceLookupDto],
+    max_workers: int = settings.ASSET_PROVISIONING_MAX_WORKERS,
+    working_dir: str = settings.RESOURCE_ASSETS_DIR,
+) -> list[str]:
+    """
+    Provision the asset files of all resource_lookup_dtos at once,
+    cloning each distinct missing repo, at most max_workers at a time,
+    exactly once. Return each resource_lookup_dto's resource_dir in the
+    same order as resource_lookup_dtos.
+    """
+    resource_dirs = [
+        resource_filepath(resource_lookup_dto, working_dir)
+        for resource_lookup_dto in resource_lookup_dtos
+    ]
+    # Many resource lookup DTOs, e.g., one per book, can share a repo.
+    urls_by_resource_dir: dict[str, str] = {}
+    for resource_lookup_dto, resource_dir in zip(resource_lookup_dtos, resource_dirs):
+        if resource_lookup_dto.url is not None:
+            urls_by_resource_dir.setdefault(resource_dir, resource_lookup_dto.url)
+
+    def provision(resource_dir_and_url: tuple[str, str]) -> tuple[str, float]:
+        resource_dir, url = resource_dir_and_url
+        t0 = time.time()
+        clone_git_repo(url, resource_dir)
+        return resource_dir, time.time() - t0
+
+    if urls_by_resource_dir:
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(urls_by_resource_dir)))
+        ) as executor:
+            for resource_dir, elapsed in executor.map(
+                provision, urls_by_resource_dir.items()
+            ):
+                logger.info("Time to provision %s: %s", resource_dir, elapsed)
+    return resource_dirs
+
+
+def resource_filepath(
+    resource_lookup_dto: ResourceLookupDto,
+    working_dir: str = settings.RESOURCE_ASSETS_DIR,
+) -> str:
+    """Return the path of the resource's git repo clone."""
+    # We know that resource_url is not None because of how we got
+    # here, but mypy isn't convinced. Let's convince mypy.
+    assert resource_lookup_dto.url is not None
+    try:
+        entry = resource_catalog().entries_by_url.get(resource_lookup_dto.url)
+    except Exception:
+        # The repo's directory can still be derived from its URL.
+        logger.debug("Resource catalog unavailable for %s", resource_lookup_dto.url)
+        entry = None
+    return join(
+        working_dir,
+        (
+            entry.last_segment
+            if entry
+            else get_last_segment(
+                resource_lookup_dto.url, resource_lookup_dto.lang_code
+            )
+        ),
+    )
+
+
 def acquire_resource_assets(
     resource_lookup_dto: ResourceLookupDto,
     working_dir: str = settings.RESOURCE_ASSETS_DIR,
@@ -690,15 +764,10 @@ def acquire_resource_assets(
     git clone resource asset.
     Return the resource's cloned filepath.
     """
-    if (
-        resource_lookup_dto.url is not None
-    ):  # We know that resource_url is not None because of how we got here, but mypy isn't convinced. Let's convince mypy.
-        resource_filepath = join(
-            working_dir,
-            get_last_segment(resource_lookup_dto.url, resource_lookup_dto.lang_code),
-        )
-        clone_git_repo(resource_lookup_dto.url, resource_filepath)
-    return resource_filepath
+    resource_filepath_ = resource_filepath(resource_lookup_dto, working_dir)
+    assert resource_lookup_dto.url is not None
+    clone_git_repo(resource_lookup_dto.url, resource_filepath_)
+    return resource_filepath_
 
 
 def clone_git_repo(
@@ -707,33 +776,254 @@ def clone_git_repo(
     branch: Optional[str] = None,
 ) -> None:
     """
-    Clone the git repo. If the repo was previously cloned but
-    the ASSET_CACHING_PERIOD has expired then delete the repo and
-    clone it again to get updates.
+    Clone the git repo into resource_filepath unless it has already
+    been cloned there.
+
+    Concurrent callers, e.g., Celery workers sharing the assets
+    volume, serialize on a per repo lock file so that each repo is
+    cloned only once. The repo is cloned into a temporary directory
+    next to resource_filepath and then renamed into place so that
+    readers never see a partially cloned repo.
     """
-    if branch:  # CLient specified a particular branch
-        command = "git clone --depth=1 --branch '{}' '{}' '{}'".format(
-            branch, url, resource_filepath
-        )
-    else:
-        command = "git clone --depth=1 '{}' '{}'".format(url, resource_filepath)
     if isdir(resource_filepath):
         logger.info(
             "No need to clone repo as it already exists: %s.", resource_filepath
         )
-    else:
+        return
+    with file_lock("{}.lock".format(resource_filepath)):
+        # Another process may have cloned the repo while we waited for
+        # the lock.
+        if isdir(resource_filepath):
+            logger.info(
+                "Repo was cloned by another worker meanwhile: %s.", resource_filepath
+            )
+            return
+        tmp_filepath = tempfile.mkdtemp(
+            dir=dirname(resource_filepath) or ".",
+            prefix=".tmp-{}-".format(basename(resource_filepath)),
+        )
+        command = ["git", "clone", "--depth=1"]
+        if branch:  # Client specified a particular branch
+            command.extend(["--branch", branch])
+        command.extend([url, tmp_filepath])
         logger.debug("Attempting to clone into %s ...", resource_filepath)
+        logger.debug("git command: %s", " ".join(command))
         try:
-            subprocess.call(command, shell=True)
-            logger.debug("git command: %s", command)
-            logger.debug("git clone succeeded.")
-        except subprocess.SubprocessError:
-            logger.debug("git command: %s", command)
-            logger.debug("git clone failed!")
+            returncode = subprocess.call(command)
+            if returncode == 0:
+                os.rename(tmp_filepath, resource_filepath)
+        except (OSError, subprocess.SubprocessError):
+            logger.exception("git clone of %s failed!", url)
+            shutil.rmtree(tmp_filepath, ignore_errors=True)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="git clone failed",
             )
+        if returncode != 0:
+            # Leave nothing behind so that a later request retries the
+            # clone rather than parsing partial content.
+            logger.error("git clone of %s exited with %s!", url, returncode)
+            shutil.rmtree(tmp_filepath, ignore_errors=True)
+        else:
+            logger.debug("git clone succeeded.")
+            record_commit_hash(resource_filepath)
+            repo_manifest.record_manifest(resource_filepath)
+
+
+def commit_hash_filepath(resource_filepath: str) -> str:
+    """
+    Return the path of the file which records the commit hash of the
+    repo cloned at resource_filepath. The file's modification time is
+    when the repo was last cloned or refreshed.
+    """
+    return "{}.commit".format(resource_filepath)
+
+
+def repo_commit_hash(resource_filepath: str) -> Optional[str]:
+    """Return the commit hash of the repo's HEAD, if any."""
+    try:
+        return subprocess.run(
+            ["git", "-C", resource_filepath, "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        logger.exception("Could not get commit hash of %s", resource_filepath)
+        return None
+
+
+def record_commit_hash(resource_filepath: str) -> Optional[str]:
+    """
+    Record and return the commit hash of the repo cloned at
+    resource_filepath.
+    """
+    commit_hash = repo_commit_hash(resource_filepath)
+    if commit_hash:
+        with open(commit_hash_filepath(resource_filepath), "w") as fout:
+            fout.write(commit_hash)
+    return commit_hash
+
+
+def recorded_commit_hash(resource_filepath: str) -> Optional[str]:
+    """
+    Return the commit hash recorded when the repo at resource_filepath
+    was last cloned or refreshed, if any.
+    """
+    try:
+        with open(commit_hash_filepath(resource_filepath)) as fin:
+            return fin.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def refresh_git_repo(
+    resource_filepath: str,
+    asset_caching_period: int = settings.ASSET_CACHING_PERIOD,
+) -> bool:
+    """
+    If the repo cloned at resource_filepath was last cloned or
+    refreshed more than asset_caching_period hours ago, clone its
+    latest commit and, if the commit changed, swap the new clone into
+    place. Return True if the repo's commit changed.
+
+    As in clone_git_repo, the latest commit is cloned into a temporary
+    directory next to resource_filepath and renamed into place so that
+    readers, which don't take the repo's lock, never see a half updated
+    working tree. Updating the clone in place, e.g., by git fetch and
+    git reset, would leave readers parsing a mix of the old and new
+    commit's files while it ran.
+    """
+    if not isdir(resource_filepath) or not file_needs_update(
+        commit_hash_filepath(resource_filepath), asset_caching_period
+    ):
+        return False
+    with file_lock("{}.lock".format(resource_filepath)):
+        # Another process may have refreshed the repo while we waited
+        # for the lock.
+        if not file_needs_update(
+            commit_hash_filepath(resource_filepath), asset_caching_period
+        ):
+            return False
+        old_commit_hash = recorded_commit_hash(resource_filepath)
+        tmp_filepath = tempfile.mkdtemp(
+            dir=dirname(resource_filepath) or ".",
+            prefix=".tmp-{}-".format(basename(resource_filepath)),
+        )
+        try:
+            url = subprocess.run(
+                ["git", "-C", resource_filepath, "remote", "get-url", "origin"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+            subprocess.run(
+                ["git", "clone", "--depth=1", url, tmp_filepath],
+                check=True,
+            )
+        except (OSError, subprocess.SubprocessError):
+            # Leave the commit hash record stale so that the refresh is
+            # retried next time.
+            logger.exception("git clone of %s failed!", resource_filepath)
+            shutil.rmtree(tmp_filepath, ignore_errors=True)
+            return False
+        new_commit_hash = repo_commit_hash(tmp_filepath)
+        if new_commit_hash == old_commit_hash:
+            shutil.rmtree(tmp_filepath, ignore_errors=True)
+            # Restart the caching period.
+            record_commit_hash(resource_filepath)
+            return False
+        # A directory can't be renamed over a non-empty one so the old
+        # clone is first renamed aside, into an empty directory, and
+        # removed once the new clone is in place.
+        old_filepath = tempfile.mkdtemp(
+            dir=dirname(resource_filepath) or ".",
+            prefix=".old-{}-".format(basename(resource_filepath)),
+        )
+        os.rename(resource_filepath, old_filepath)
+        os.rename(tmp_filepath, resource_filepath)
+        shutil.rmtree(old_filepath, ignore_errors=True)
+        record_commit_hash(resource_filepath)
+        repo_manifest.record_manifest(resource_filepath)
+    logger.info(
+        "Refreshed %s from %s to %s",
+        resource_filepath,
+        old_commit_hash,
+        new_commit_hash,
+    )
+    return True
+
+
+def refresh_stamp_filepath(working_dir: str = settings.RESOURCE_ASSETS_DIR) -> str:
+    """
+    Return the path of the file which is touched whenever a refresh
+    changes any of the repos cloned in working_dir, see
+    clear_lookup_caches_if_refreshed.
+    """
+    return join(working_dir, ".refreshed")
+
+
+def refresh_stale_repos(
+    working_dir: str = settings.RESOURCE_ASSETS_DIR,
+    asset_caching_period: int = settings.ASSET_CACHING_PERIOD,
+) -> list[str]:
+    """
+    Refresh each repo cloned in working_dir which was last cloned or
+    refreshed more than asset_caching_period hours ago. Return the
+    names of the repos whose commit changed.
+    """
+    changed_repos = []
+    t0 = time.time()
+    for entry in scandir(working_dir):
+        if (
+            entry.is_dir()
+            and not entry.name.startswith(".")
+            and isdir(join(entry.path, ".git"))
+            and refresh_git_repo(entry.path, asset_caching_period)
+        ):
+            changed_repos.append(entry.name)
+    if changed_repos:
+        Path(refresh_stamp_filepath(working_dir)).touch()
+    t1 = time.time()
+    logger.debug("Time to refresh stale repos: %s", t1 - t0)
+    return changed_repos
+
+
+def clear_lookup_caches() -> None:
+    """
+    Clear the caches of the lookups which inspect the cloned repos so
+    that they see the repos' new content.
+    """
+    book_codes_for_lang.cache_clear()
+    resource_types.cache_clear()
+    tw_utils.translation_words_index.cache_clear()
+
+
+_refresh_stamp: Optional[int] = None
+_refresh_stamp_lock = threading.Lock()
+
+
+def clear_lookup_caches_if_refreshed(
+    working_dir: str = settings.RESOURCE_ASSETS_DIR,
+) -> None:
+    """
+    Clear this process's lookup caches if a refresh, likely run by
+    another process, e.g., the worker running celery beat's
+    refresh_resource_assets, has changed the repos since this process
+    last looked. Call this before serving lookups, e.g., in the API's
+    endpoints and before each worker task.
+    """
+    global _refresh_stamp
+    try:
+        refresh_stamp = os.stat(refresh_stamp_filepath(working_dir)).st_mtime_ns
+    except FileNotFoundError:
+        return
+    with _refresh_stamp_lock:
+        if refresh_stamp != _refresh_stamp:
+            if _refresh_stamp is not None:
+                logger.info("Resource asset repos were refreshed, clearing caches")
+            clear_lookup_caches()
+            _refresh_stamp = refresh_stamp
 
 
 if __name__ == "__main__":
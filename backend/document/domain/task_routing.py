@@ -0,0 +1,115 @@
+"""
+This module provides the routing of tasks to Celery queues by class of
+work so that workers can be sized per class and a long running task,
+e.g., converting a whole Bible to Docx, doesn't hold up the short ones
+queued behind it, e.g., converting one book to PDF. A document task is
+routed by the slowest of the formats it has yet to produce for its
+document request:
+
+* light: the document is in the output cache in each of the formats,
+  and tasks other than document tasks, e.g., refresh_resource_assets,
+  see celeryconfig.task_default_queue,
+* html: the HTML is assembled but no conversion is needed,
+* pdf, epub and docx: the document is converted to that format.
+
+The router is called in the process which queues the task, i.e., the
+API or beat, see celeryconfig.task_routes.
+"""
+
+from typing import Any, Optional, Sequence
+
+from document.config import settings
+from document.domain import document_generator
+from document.domain.model import DocumentRequest
+
+logger = settings.logger(__name__)
+
+LIGHT_QUEUE = "light"
+HTML_QUEUE = "html"
+PDF_QUEUE = "pdf"
+EPUB_QUEUE = "epub"
+DOCX_QUEUE = "docx"
+
+# The queue of each format, slowest to produce first.
+FORMAT_QUEUES = [
+    ("docx", DOCX_QUEUE),
+    ("epub", EPUB_QUEUE),
+    ("pdf", PDF_QUEUE),
+    ("html", HTML_QUEUE),
+]
+
+
+def document_queue(
+    missing_formats: Sequence[str], light_queue: str = LIGHT_QUEUE
+) -> str:
+    """
+    Return the queue of a document task whose formats, given by file
+    suffix, missing_formats are not in the output cache.
+
+    >>> document_queue(["html", "pdf"])
+    'pdf'
+    >>> document_queue(["html"])
+    'html'
+    >>> document_queue(["pdf", "docx"])
+    'docx'
+    >>> document_queue([])
+    'light'
+    """
+    for format_, queue in FORMAT_QUEUES:
+        if format_ in missing_formats:
+            return queue
+    return light_queue
+
+
+def document_request_queue(task_name: str, document_request: DocumentRequest) -> str:
+    """
+    Return the queue of the document task, named task_name, for the
+    document request.
+    """
+    return document_queue(
+        document_generator.missing_formats(
+            document_request,
+            document_generator.task_formats(task_name, document_request),
+        )
+    )
+
+
+def route_task(
+    name: str,
+    args: Sequence[Any],
+    kwargs: dict[str, Any],
+    options: dict[str, Any],
+    task: Optional[Any] = None,
+    **kw: Any,
+) -> Optional[dict[str, str]]:
+    """
+    Celery router which routes the document tasks by their document
+    request, passed as their first argument, and leaves the other tasks
+    to celeryconfig.task_default_queue.
+    """
+    if (
+        name
+        not in [
+            document_generator.generate_document.name,
+            document_generator.generate_docx_document.name,
+            document_generator.generate_document_in_all_formats.name,
+        ]
+        or not args
+    ):
+        return None
+    queue = document_request_queue(name, DocumentRequest.parse_raw(args[0]))
+    logger.debug("Routing task %s to queue %s", name, queue)
+    return {"queue": queue}
+
+
+if __name__ == "__main__":
+
+    # To run the doctests in the this module, in the root of the project do:
+    # python backend/document/domain/task_routing.py
+    # or
+    # python backend/document/domain/task_routing.py -v
+    # See https://docs.python.org/3/library/doctest.html
+    # for more details.
+    import doctest
+
+    doctest.testmod()
@@ -0,0 +1,402 @@
+"""
+This module provides a pure Python USFM to HTML renderer which emits
+the same markup, i.e., elements and CSS classes, as the .NET
+USFMToolsSharp HtmlRenderer (configured with partialHTML) which the
+USFMParserDriver uses. It lets USFM be rendered without launching
+any external processes.
+"""
+
+import re
+from html import escape
+from typing import Optional, final
+
+# Bump this whenever a change to this module changes its output.
+RENDERER_VERSION = "2"
+
+MARKER_RE = re.compile(r"\\(\+?[A-Za-z0-9]+\*?)")
+MARKER_NUM_RE = re.compile(r"^([a-z]+?)(\d*)$")
+
+# Book level markers whose content is not part of the rendered text.
+IGNORED_LINE_MARKERS = {
+    "id",
+    "ide",
+    "rem",
+    "sts",
+    "toc",
+    "toca",
+    "usfm",
+}
+
+# Paragraph level markers whose text, including any character markers,
+# runs to the end of the line.
+HEADING_MARKERS = {
+    "cd": "descriptive-text",
+    "d": "descriptive-text",
+    "h": "header",
+    "mr": "section-reference",
+    "ms": "majortitle",
+    "mt": "majortitle",
+    "r": "section-reference",
+    "s": "sectionhead",
+    "sp": "descriptive-text",
+}
+
+# Paragraph level markers which enclose subsequent verses and text.
+PARAGRAPH_MARKERS = {"m", "nb", "p", "pi", "pm", "pmo", "pc", "mi", "cls"}
+POETRY_MARKERS = {"q", "qm"}
+LIST_MARKERS = {"li"}
+
+# Character markers mapped to their opening and closing tags.
+CHARACTER_MARKERS = {
+    "add": ('<span class="additions">', "</span>"),
+    "bd": ("<b>", "</b>"),
+    "bdit": ("<b><i>", "</i></b>"),
+    "bk": ('<span class="quoted-book">', "</span>"),
+    "em": ("<em>", "</em>"),
+    "it": ("<i>", "</i>"),
+    "nd": ('<span class="tetragrammaton">', "</span>"),
+    "qs": ('<span class="selah-text">', "</span>"),
+    "sc": ('<span class="small-caps">', "</span>"),
+    "tl": ('<span class="transliterated">', "</span>"),
+}
+
+# Footnote content markers mapped to their opening and closing tags.
+FOOTNOTE_CONTENT_MARKERS = {
+    "fqa": ('<span class="footnote-alternate-translation">', "</span>"),
+}
+
+
+def _split_marker(marker: str) -> tuple[str, Optional[int]]:
+    """
+    Split a marker like q2 into its name and level. Levels default to
+    None when absent.
+    """
+    name = marker.lstrip("+").rstrip("*")
+    if match := MARKER_NUM_RE.match(name):
+        return match.group(1), int(match.group(2)) if match.group(2) else None
+    return name, None
+
+
+def _tokens(usfm: str) -> list[tuple[str, str]]:
+    """
+    Return the USFM source as a list of (marker, text) pairs where text
+    is the text between marker and the next marker.
+    """
+    parts = MARKER_RE.split(usfm)
+    tokens = [("", parts[0])]
+    tokens.extend(zip(parts[1::2], parts[2::2]))
+    return tokens
+
+
+def _take_word(text: str) -> tuple[str, str]:
+    """Split text into its first word and the remaining text."""
+    stripped = text.lstrip()
+    word, _, rest = stripped.partition(" ")
+    if "\n" in word:
+        word, _, remainder = word.partition("\n")
+        rest = "\n" + remainder + (" " + rest if rest else "")
+    return word, rest
+
+
+def _take_line(text: str) -> tuple[str, str]:
+    """Split text into its first line and the remaining text."""
+    line, newline, rest = text.lstrip(" ").partition("\n")
+    return line.strip(), newline + rest
+
+
+def _text(text: str) -> str:
+    """Escape text and collapse its whitespace as USFM requires."""
+    return escape(re.sub(r"\s+", " ", text), quote=False)
+
+
+@final
+class _Renderer:
+    """Single use renderer holding the state of one rendering."""
+
+    def __init__(self) -> None:
+        self.output: list[str] = []
+        self.footnotes: list[str] = []
+        # Stack of closing tags of open paragraph level elements,
+        # chapter first.
+        self.blocks: list[str] = []
+        self.in_chapter = False
+        self.in_verse = False
+        # Closing tags of open character level elements.
+        self.characters: list[str] = []
+        # Footnote being collected, if any, and its callers.
+        self.footnote: Optional[list[str]] = None
+        self.footnote_characters: list[str] = []
+        self.in_cross_reference = False
+        self.pending_chapter_num: Optional[str] = None
+        # Heading being collected, if any, and its CSS class.
+        self.heading: Optional[list[str]] = None
+        self.heading_class = ""
+
+    def emit(self, html: str) -> None:
+        if self.in_cross_reference:
+            return
+        if self.footnote is not None:
+            self.footnote.append(html)
+        elif self.heading is not None:
+            self.heading.append(html)
+        else:
+            self.output.append(html)
+
+    def close_characters(self) -> None:
+        while self.characters:
+            self.emit(self.characters.pop())
+
+    def close_verse(self) -> None:
+        self.close_characters()
+        if self.in_verse:
+            self.output.append("</span>\n")
+            self.in_verse = False
+
+    def close_paragraph(self) -> None:
+        """Close the open paragraph level elements, but not the chapter."""
+        self.close_verse()
+        num_to_keep = 1 if self.in_chapter else 0
+        while len(self.blocks) > num_to_keep:
+            self.output.append(self.blocks.pop())
+
+    def open_block(self, opening: str, closing: str) -> None:
+        self.flush_chapter_marker()
+        self.close_paragraph()
+        self.output.append(opening)
+        self.blocks.append(closing)
+
+    def close_chapter(self) -> None:
+        self.flush_chapter_marker()
+        self.close_verse()
+        while self.blocks:
+            self.output.append(self.blocks.pop())
+        self.in_chapter = False
+        self.flush_footnotes()
+
+    def flush_chapter_marker(self) -> None:
+        """Emit the chapter marker when the chapter has no label."""
+        if self.pending_chapter_num is not None:
+            self.output.append(
+                '<span class="chaptermarker">{}</span>\n'.format(
+                    self.pending_chapter_num
+                )
+            )
+            self.pending_chapter_num = None
+
+    def flush_footnotes(self) -> None:
+        if self.footnotes:
+            self.output.append('<div class="footnotes">\n')
+            self.output.append('<hr class="footnotes-hr"/>\n')
+            for footnote in self.footnotes:
+                self.output.append('<div class="footnote">{}</div>\n'.format(footnote))
+            self.output.append("</div>\n")
+            self.footnotes = []
+
+    def start_footnote(self, text: str) -> str:
+        caller, rest = _take_word(text)
+        footnote_id = str(len(self.footnotes) + 1) if caller in ("+", "") else caller
+        if caller == "-":
+            footnote_id = ""
+        self.emit(
+            '<span id="footnote-caller-{0}" class="caller"><a href="#footnote-target-{0}">{0}</a></span>'.format(
+                footnote_id
+            )
+        )
+        self.footnote = [
+            '<span id="footnote-target-{0}" class="footnotecaller"><a href="#footnote-caller-{0}">{0}</a></span>'.format(
+                footnote_id
+            )
+        ]
+        return rest
+
+    def continue_heading(self, text: str) -> str:
+        """
+        Add the text, up to the end of its line, to the heading being
+        collected, ending the heading at the end of the line, and
+        return the rest of the text.
+        """
+        assert self.heading is not None
+        line, newline, rest = text.partition("\n")
+        self.heading.append(_text(line))
+        if not newline:
+            return ""
+        self.close_characters()
+        self.output.append(
+            '<div class="{}">{}</div>\n'.format(
+                self.heading_class, "".join(self.heading).strip()
+            )
+        )
+        self.heading = None
+        return newline + rest
+
+    def end_footnote(self) -> None:
+        if self.footnote is not None:
+            while self.footnote_characters:
+                self.footnote.append(self.footnote_characters.pop())
+            self.footnotes.append("".join(self.footnote))
+            self.footnote = None
+
+    def render(self, usfm: str) -> str:
+        for marker, text in _tokens(usfm):
+            if marker and not marker.endswith("*") and text.startswith(" "):
+                # The space after a marker belongs to the marker.
+                text = text[1:]
+            text = self.handle_marker(marker, text)
+            if self.heading is not None and self.footnote is None:
+                text = self.continue_heading(text)
+            if text.strip():
+                self.flush_chapter_marker()
+                self.emit(_text(text))
+            elif text and (self.in_verse or self.footnote is not None):
+                self.emit(" ")
+        self.end_footnote()
+        if self.heading is not None:
+            self.continue_heading("\n")
+        self.close_chapter()
+        return "".join(self.output)
+
+    def handle_marker(self, marker: str, text: str) -> str:
+        """Render marker and return the text which follows it."""
+        if not marker:
+            return text
+        name, level = _split_marker(marker)
+        is_end = marker.endswith("*")
+        if name in ("f", "fe"):
+            if is_end:
+                self.end_footnote()
+                return text
+            return self.start_footnote(text)
+        if name == "x":
+            self.in_cross_reference = not is_end
+            return text
+        if self.in_cross_reference:
+            return ""
+        if self.footnote is not None:
+            return self.handle_footnote_marker(name, is_end, text)
+        if name == "w":
+            # Word level attributes, e.g., \w grace|strong="G5485"\w*, are
+            # not rendered.
+            return text if is_end else text.split("|")[0]
+        if name in CHARACTER_MARKERS:
+            opening, closing = CHARACTER_MARKERS[name]
+            if is_end:
+                if closing in self.characters:
+                    while self.characters:
+                        tag = self.characters.pop()
+                        self.emit(tag)
+                        if tag == closing:
+                            break
+            else:
+                self.flush_chapter_marker()
+                self.emit(opening)
+                self.characters.append(closing)
+            return text
+        if name == "c":
+            self.close_chapter()
+            chapter_num, rest = _take_word(text)
+            self.output.append('<div class="chapter">\n')
+            self.blocks.append("</div>\n")
+            self.in_chapter = True
+            self.pending_chapter_num = chapter_num
+            return rest
+        if name == "cl":
+            label, rest = _take_line(text)
+            self.pending_chapter_num = None
+            self.output.append(
+                '<span class="chapterlabel">{}</span>\n'.format(_text(label))
+            )
+            return rest
+        if name == "v":
+            self.flush_chapter_marker()
+            self.close_verse()
+            verse_num, rest = _take_word(text)
+            self.output.append('<span class="verse">\n')
+            self.output.append('<sup class="versemarker">{}</sup>\n'.format(verse_num))
+            self.in_verse = True
+            return rest
+        if name in IGNORED_LINE_MARKERS:
+            return _take_line(text)[1]
+        if name in HEADING_MARKERS:
+            self.flush_chapter_marker()
+            self.close_paragraph()
+            self.heading = []
+            self.heading_class = (
+                HEADING_MARKERS[name]
+                if name in ("cd", "d", "h", "mr", "r", "sp")
+                else "{}-{}".format(HEADING_MARKERS[name], level or 1)
+            )
+            return text.lstrip(" ")
+        if name in PARAGRAPH_MARKERS:
+            self.open_block("<p>\n", "</p>\n")
+            return text
+        if name in POETRY_MARKERS:
+            self.open_block('<div class="poetry-{}">'.format(level or 1), "</div>\n")
+            return text
+        if name in LIST_MARKERS:
+            self.open_block('<div class="list-{}">'.format(level or 1), "</div>\n")
+            return text
+        if name == "qc":
+            self.open_block('<div class="center-paragraph">', "</div>\n")
+            return text
+        if name == "b":
+            self.flush_chapter_marker()
+            self.close_paragraph()
+            self.output.append("<br/>\n")
+            return text
+        # Markers which are not supported are dropped while their text is
+        # kept.
+        return text
+
+    def handle_footnote_marker(self, name: str, is_end: bool, text: str) -> str:
+        """Render a marker inside a footnote and return its text."""
+        assert self.footnote is not None
+        if name in FOOTNOTE_CONTENT_MARKERS:
+            opening, closing = FOOTNOTE_CONTENT_MARKERS[name]
+            if is_end:
+                if closing in self.footnote_characters:
+                    self.footnote_characters.remove(closing)
+                    self.footnote.append(closing)
+            else:
+                self.footnote.append(opening)
+                self.footnote_characters.append(closing)
+            return text
+        if name in ("fr", "fv"):
+            # Footnote origin references, e.g., 1:1, are not rendered.
+            return "" if not is_end else text
+        if name in ("ft", "fq", "fk", "fp", "fw", "fdc", "fl"):
+            # These markers end any open footnote content markers.
+            while self.footnote_characters:
+                self.footnote.append(self.footnote_characters.pop())
+            return text
+        return text
+
+
+def render_usfm(usfm: str) -> str:
+    """
+    Render USFM source, e.g., one chapter, to HTML.
+
+    >>> print(render_usfm("\\\\c 1\\n\\\\cl Chapter 1\\n\\\\p\\n\\\\v 1 In the beginning"))
+    <div class="chapter">
+    <span class="chapterlabel">Chapter 1</span>
+    <p>
+    <span class="verse">
+    <sup class="versemarker">1</sup>
+    In the beginning</span>
+    </p>
+    </div>
+    <BLANKLINE>
+    """
+    return _Renderer().render(usfm)
+
+
+if __name__ == "__main__":
+
+    # To run the doctests in the this module, in the root of the project do:
+    # python backend/document/domain/usfm_renderer.py
+    # or
+    # python backend/document/domain/usfm_renderer.py -v
+    # See https://docs.python.org/3/library/doctest.html
+    # for more details.
+    import doctest
+
+    doctest.testmod()
@@ -1,16 +1,27 @@
 """This module provides the FastAPI API definition."""
 
 
-from typing import Sequence
+import json
+from typing import Any, AsyncIterator, Sequence, cast
 
 import celery.states
+import redis.asyncio
+from celery import Task
+from celery.backends.base import KeyValueStoreBackend
 from celery.result import AsyncResult
 from document.config import settings
-from document.domain import document_generator, exceptions, model, resource_lookup
+from document.domain import (
+    document_generator,
+    exceptions,
+    model,
+    request_coalescing,
+    resource_lookup,
+    worker,
+)
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 app = FastAPI()
 
@@ -69,16 +80,49 @@ async def validation_exception_handler(
     )
 
 
+def cached_or_queued_document(
+    task: "Task[Any, Any]",
+    document_request: model.DocumentRequest,
+) -> dict[str, str]:
+    """
+    If the document has been generated in each of the formats which
+    the task produces, and they are fresh enough, and no identical
+    document request's task, which could be writing them, is in flight,
+    return the finished result as task_status would without involving
+    a worker. Otherwise queue the task for the document request, or
+    coalesce it into the in-flight identical document request's, and
+    return the task's id.
+    """
+    in_flight_key = document_generator.in_flight_key(task.name, document_request)
+    if request_coalescing.in_flight_task_id(in_flight_key) is None:
+        document_request_key = document_generator.cached_document_request_key(
+            document_request,
+            document_generator.task_formats(task.name, document_request),
+        )
+        if document_request_key is not None:
+            logger.debug("Cache hit for %s", document_request_key)
+            return {"state": celery.states.SUCCESS, "result": document_request_key}
+    task_id = request_coalescing.apply_async(
+        task, document_request.json(), in_flight_key, document_request.email_address
+    )
+    logger.debug("task_id: %s", task_id)
+    return {"task_id": task_id}
+
+
 @app.post("/documents")
 async def generate_document(document_request: model.DocumentRequest) -> JSONResponse:
     """
     Get the document request and hand it off to the document_generator
-    module for processing.
+    module for processing, or, if an identical document request is
+    already being processed, return the id of its task. If the
+    document is in the output cache, return it as task_status returns
+    a finished task's.
     """
     # Top level exception handler
     try:
-        task = document_generator.generate_document.apply_async(
-            args=(document_request.json(),)
+        response = cached_or_queued_document(
+            document_generator.generate_document,
+            document_request,
         )
     except HTTPException as exc:
         raise exc
@@ -92,8 +136,7 @@ async def generate_document(document_request: model.DocumentRequest) -> JSONResp
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
         )
     else:
-        logger.debug("task_id: %s", task.id)
-        return JSONResponse({"task_id": task.id})
+        return JSONResponse(response)
 
 
 @app.post("/documents_docx")
@@ -102,12 +145,16 @@ async def generate_docx_document(
 ) -> JSONResponse:
     """
     Get the document request and hand it off to the document_generator
-    module for processing.
+    module for processing, or, if an identical document request is
+    already being processed, return the id of its task. If the
+    document is in the output cache, return it as task_status returns
+    a finished task's.
     """
     # Top level exception handler
     try:
-        task = document_generator.generate_docx_document.apply_async(
-            args=(document_request.json(),)
+        response = cached_or_queued_document(
+            document_generator.generate_docx_document,
+            document_request,
         )
     except HTTPException as exc:
         raise exc
@@ -121,19 +168,115 @@ async def generate_docx_document(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
         )
     else:
-        logger.debug("task_id: %s", task.id)
-        return JSONResponse({"task_id": task.id})
+        return JSONResponse(response)
+
+
+@app.post("/documents_all_formats")
+async def generate_document_in_all_formats(
+    document_request: model.DocumentRequest,
+) -> JSONResponse:
+    """
+    Get the document request and hand it off to the document_generator
+    module for producing each of the formats it requests concurrently.
+    If the document is in the output cache in each of the formats,
+    return it as task_status returns a finished task's.
+    """
+    # Top level exception handler
+    try:
+        response = cached_or_queued_document(
+            document_generator.generate_document_in_all_formats,
+            document_request,
+        )
+    except HTTPException as exc:
+        raise exc
+    except Exception as exc:  # catch any exceptions we weren't expecting, handlers handle the ones we do expect.
+        logger.exception(
+            "There was an error while attempting to fulfill the document "
+            "request. Likely reason is the following exception:"
+        )
+        # Handle exceptions that aren't handled otherwise
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)
+        )
+    else:
+        return JSONResponse(response)
+
+
+def task_status_content(state: str, info: Any) -> dict[str, Any]:
+    """
+    Return the content of the task's status, given its state and its
+    result or state meta, as task_status and task_events return it.
+    """
+    if state == celery.states.SUCCESS:
+        return {"state": celery.states.SUCCESS, "result": info}
+    # Tasks which produce several formats report the key of the document
+    # and the formats finished so far, see
+    # document_generator.generate_document_in_all_formats.
+    if isinstance(info, dict):
+        return {"state": state, **info}
+    return {
+        "state": state,
+    }
 
 
 @app.get("/task_status/{task_id}")
 async def task_status(task_id: str) -> JSONResponse:
     res: AsyncResult[dict[str, str]] = AsyncResult(task_id)
-    if res.state == celery.states.SUCCESS:
-        return JSONResponse({"state": celery.states.SUCCESS, "result": res.result})
-    return JSONResponse(
-        {
-            "state": res.state,
-        }
+    return JSONResponse(task_status_content(res.state, res.info))
+
+
+async def task_status_events(
+    task_id: str,
+    request: Request,
+    heartbeat_seconds: int = settings.TASK_EVENTS_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """
+    Yield the task's status as a Server-Sent Event now and each time
+    the task's state changes, as published by Celery's Redis result
+    backend, until the task has finished or the client has gone.
+    """
+    client = redis.asyncio.Redis.from_url(worker.app.conf.result_backend)
+    pubsub = client.pubsub()
+    try:
+        # Subscribe before reading the task's state so that no change
+        # is missed in between.
+        await pubsub.subscribe(
+            cast(KeyValueStoreBackend, worker.app.backend).get_key_for_task(task_id)
+        )
+        res: AsyncResult[dict[str, str]] = AsyncResult(task_id)
+        state = res.state
+        yield "data: {}\n\n".format(json.dumps(task_status_content(state, res.info)))
+        while state not in celery.states.READY_STATES:
+            if await request.is_disconnected():
+                break
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=heartbeat_seconds
+            )
+            if message is None:
+                # Keep the connection, and any proxy's, from timing out.
+                yield ": keep-alive\n\n"
+                continue
+            meta = worker.app.backend.decode_result(message["data"])
+            state = meta["status"]
+            yield "data: {}\n\n".format(
+                json.dumps(task_status_content(state, meta["result"]))
+            )
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
+
+
+@app.get("/task_events/{task_id}")
+async def task_events(task_id: str, request: Request) -> StreamingResponse:
+    """
+    Stream the task's status, as task_status returns it, as Server-Sent
+    Events each time it changes until the task has finished so that
+    clients needn't poll task_status.
+    """
+    return StreamingResponse(
+        task_status_events(task_id, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -152,6 +295,7 @@ async def shared_book_codes(
     """
     Return list of available resource codes common to both lang0_code and lang1_code.
     """
+    resource_lookup.clear_lookup_caches_if_refreshed()
     return resource_lookup.shared_book_codes(lang0_code, lang1_code)
 
 
@@ -164,12 +308,14 @@ async def resource_types(
     Return the list of available resource types tuples for lang_code
     with book_codes.
     """
+    resource_lookup.clear_lookup_caches_if_refreshed()
     return resource_lookup.resource_types(lang_code, book_codes)
 
 
 @app.get("/book_codes_for_lang/{lang_code}")
 async def book_codes_for_lang(lang_code: str) -> Sequence[tuple[str, str]]:
     """Return list of all available resource codes."""
+    resource_lookup.clear_lookup_caches_if_refreshed()
     return resource_lookup.book_codes_for_lang(lang_code)
 
 
@@ -173,3 +173,54 @@ TN_OBS_MARKDOWN_LINK_RE = re.compile(
 BC_MARKDOWN_LINK_RE = re.compile(
     r"\[(?P<link_text>.+?)\] *\(\.\.\/(?P<link_ref>articles.+?)\)"
 )
+
+
+# NOTE(id:single_pass_link_rewriting) The regexes below are variants of
+# those above which let one scanner find, in a single pass over the
+# source, the same links that the transformations ordered as described
+# in id:regex_transformation_order find one regex at a time. Like those
+# above, each begins with a literal character so that the scanner,
+# which combines them, can skip quickly to where a link could start.
+
+# TW rc wikilink with an explicit, i.e., not *, language code. These
+# are transformed before the TW prefixed rc wikilinks so the latter
+# only ever match * language codes.
+# e.g., [[rc://en/tw/dict/bible/kt/reveal]]
+TW_WIKI_LANG_RC_LINK_RE = re.compile(
+    r"\[\[(?P<url>rc:\/\/(?P<lang_code>[^\[\]\(\)*]+?)\/tw\/dict\/bible\/(?:kt|names|other)\/(?P<word>[^\[\]\(\)]+?))\]\]"
+)
+
+# TW prefixed rc wikilink regex for * language codes.
+# e.g., (See: [[rc://*/tw/dict/bible/kt/reveal]])
+TW_WIKI_PREFIXED_STAR_RC_LINK_RE = re.compile(
+    r"\((?P<prefix_text>.+?):* *\[\[rc://(?P<lang_code>\*)\/tw\/dict\/bible\/(?:kt|names|other)\/(?P<word>[^\[\]]+?)\]\]\)*"
+)
+
+# TW markdown link preceded by a dot which is removed along with the
+# link when the link is removed.
+# e.g., · [foo](../kt/foo.md)
+TW_MARKDOWN_LINK_AFTER_DOT_RE = re.compile(r"· " + TW_MARKDOWN_LINK_RE.pattern)
+
+# TA_WIKI_RC_LINK_RE split by what it starts with: commas, spaces, or
+# the link itself.
+TA_WIKI_RC_LINK_AFTER_COMMAS_RE = re.compile(
+    r",,* *\[\[rc://(?P<lang_code>[^\[\]\(\)]+?)\/ta\/man\/\w+?\/(?P<word>[^\[\]]+?)\]\]\)*"
+)
+TA_WIKI_RC_LINK_AFTER_SPACES_RE = re.compile(
+    r"  *\[\[rc://(?P<lang_code>[^\[\]\(\)]+?)\/ta\/man\/\w+?\/(?P<word>[^\[\]]+?)\]\]\)*"
+)
+TA_WIKI_BARE_RC_LINK_RE = re.compile(
+    r"\[\[rc://(?P<lang_code>[^\[\]\(\)]+?)\/ta\/man\/\w+?\/(?P<word>[^\[\]]+?)\]\]\)*"
+)
+
+# TN markdown relative file path scripture link regexes for links
+# enclosed in an extra pair of parentheses. When the translation note
+# doesn't exist such links are replaced, along with the extra
+# parentheses, by their scripture reference.
+# e.g., (([Colossians 1:24](../../col/01/24.md)))
+TN_MARKDOWN_RELATIVE_SCRIPTURE_LINK_IN_PARENS_RE = re.compile(
+    r"\(" + TN_MARKDOWN_RELATIVE_SCRIPTURE_LINK_RE.pattern + r"\)"
+)
+TN_MARKDOWN_RELATIVE_TO_CURRENT_BOOK_SCRIPTURE_LINK_IN_PARENS_RE = re.compile(
+    r"\(" + TN_MARKDOWN_RELATIVE_TO_CURRENT_BOOK_SCRIPTURE_LINK_RE.pattern + r"\)"
+)
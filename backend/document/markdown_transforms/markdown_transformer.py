@@ -1,22 +1,29 @@
-from os.path import exists, join
+from os.path import join
 import re
 from re import finditer, search
-from typing import Sequence
+from typing import Callable, Mapping, Optional, Sequence, cast, final
 
 from document.config import settings
 from document.domain.bible_books import BOOK_NUMBERS
 from document.domain.model import (
     ResourceRequest,
+    TranslationWord,
     WikiLink,
 )
+from document.domain.resource_context import ResourceContext
 from document.markdown_transforms.link_regexes import (
     TA_MARKDOWN_HTTPS_LINK_RE,
     TA_PREFIXED_MARKDOWN_HTTPS_LINK_RE,
     TA_PREFIXED_MARKDOWN_LINK_RE,
     TA_WIKI_PREFIXED_RC_LINK_RE,
+    TA_WIKI_BARE_RC_LINK_RE,
+    TA_WIKI_RC_LINK_AFTER_COMMAS_RE,
+    TA_WIKI_RC_LINK_AFTER_SPACES_RE,
     TA_WIKI_RC_LINK_RE,
     TA_STAR_RC_LINK_RE,
+    TN_MARKDOWN_RELATIVE_SCRIPTURE_LINK_IN_PARENS_RE,
     TN_MARKDOWN_RELATIVE_SCRIPTURE_LINK_RE,
+    TN_MARKDOWN_RELATIVE_TO_CURRENT_BOOK_SCRIPTURE_LINK_IN_PARENS_RE,
     TN_MARKDOWN_RELATIVE_TO_CURRENT_BOOK_SCRIPTURE_LINK_RE,
     TN_MARKDOWN_RELATIVE_TO_CURRENT_BOOK_SCRIPTURE_LINK_RE_NO_PARENS,
     TN_MARKDOWN_SCRIPTURE_LINK_RE,
@@ -27,10 +34,12 @@ from document.markdown_transforms.link_regexes import (
     TW_WIKI_PREFIXED_RC_LINK_RE,
     TW_WIKI_RC_LINK_RE,
     TW_WIKI_RC_LINK_RE2,
+    TW_MARKDOWN_LINK_AFTER_DOT_RE,
+    TW_WIKI_LANG_RC_LINK_RE,
+    TW_WIKI_PREFIXED_STAR_RC_LINK_RE,
     WIKI_LINK_RE,
 )
-from document.utils.file_utils import read_file
-from document.utils.tw_utils import localized_translation_word
+from document.utils import repo_manifest
 
 logger = settings.logger(__name__)
 
@@ -72,12 +81,430 @@ def remove_sections(
     return source
 
 
+class OverlappingLinksError(Exception):
+    """
+    Raised when the links matched by a LinkScanner overlap in a way
+    that makes the result depend on the order in which its regexes are
+    applied.
+    """
+
+
+def combined_regex(regexes: Sequence[re.Pattern[str]]) -> re.Pattern[str]:
+    """
+    Combine regexes into one regex which, at each position of the
+    source, tries each regex in turn. Regex i is followed by an empty
+    group named _i which marks that regex i matched and regex i's own
+    named groups are renamed with the prefix _i_ so that they don't
+    collide with those of the other regexes. If each regex begins with
+    a literal character then so does each alternative of the combined
+    regex which lets the regex engine skip quickly to the positions
+    where one of them could match.
+
+    >>> regex = combined_regex([re.compile(r"a(?P<word>a*)"), re.compile(r"b(?P<word>b*)")])
+    >>> [(link_kind(match), link_group(match, "word")) for match in regex.finditer("aab")]
+    [(0, 'a'), (1, '')]
+    """
+    return re.compile(
+        "|".join(
+            "{}(?P<_{}>)".format(
+                re.sub(r"\(\?P<(\w+)>", r"(?P<_{}_\1>".format(index), regex.pattern),
+                index,
+            )
+            for index, regex in enumerate(regexes)
+        )
+    )
+
+
+@final
+class LinkScanner:
+    """
+    Rewrite, in one pass over the source, the links matched by an
+    ordered sequence of regexes. The result is the same as that of
+    applying each regex in turn to the whole source as long as no link
+    matched by a regex overlaps a link matched by an earlier regex. In
+    that case OverlappingLinksError is raised so that the caller can
+    fall back to applying each regex in turn.
+    """
+
+    def __init__(self, regexes: Sequence[re.Pattern[str]]) -> None:
+        self.regex = combined_regex(regexes)
+        # For each regex, the regexes which come before it, if any.
+        self._earlier_regexes = [
+            combined_regex(regexes[:index]) if index else None
+            for index in range(len(regexes))
+        ]
+
+    def sub(self, rewrite: Callable[[re.Match[str]], str], source: str) -> str:
+        """
+        Return source with each link replaced by the result of calling
+        rewrite on its match.
+        """
+        output = []
+        end = 0
+        # For each regex, the position from which the regexes before it
+        # were last searched and the first match found. Matches are
+        # found left to right so that each search can be reused until a
+        # later match starts at or beyond the match it found.
+        earlier_searches: dict[int, tuple[int, Optional[re.Match[str]]]] = {}
+        for match in self.regex.finditer(source):
+            kind = link_kind(match)
+            earlier_regex = self._earlier_regexes[kind]
+            if earlier_regex is not None and match.end() - match.start() > 1:
+                pos = match.start() + 1
+                searched_pos, earlier_match = earlier_searches.get(kind, (-1, None))
+                if searched_pos < 0 or (
+                    earlier_match is not None and earlier_match.start() < pos
+                ):
+                    earlier_match = earlier_regex.search(source, pos)
+                    earlier_searches[kind] = (pos, earlier_match)
+                if earlier_match and earlier_match.start() < match.end():
+                    raise OverlappingLinksError(match.group(0))
+            output.append(source[end : match.start()])
+            output.append(rewrite(match))
+            end = match.end()
+        output.append(source[end:])
+        return "".join(output)
+
+
+def link_kind(match: re.Match[str]) -> int:
+    """
+    Return the index of the regex, among those combined by
+    combined_regex, which matched.
+    """
+    return int(cast(str, match.lastgroup)[1:])
+
+
+def link_group(match: re.Match[str], name: str) -> Optional[str]:
+    """
+    Return the named group of the regex, among those combined by
+    combined_regex, which matched.
+    """
+    return match.group("{}_{}".format(match.lastgroup, name))
+
+
+# The order of these regexes matters, see
+# id:single_pass_link_rewriting.
+TW_LINK_SCANNER = LinkScanner(
+    [
+        TW_WIKI_PREFIXED_STAR_RC_LINK_RE,
+        TW_WIKI_LANG_RC_LINK_RE,
+        TW_WIKI_RC_LINK_RE,
+        TW_WIKI_RC_LINK_RE2,
+        TW_MARKDOWN_LINK_AFTER_DOT_RE,
+        TW_MARKDOWN_LINK_RE,
+    ]
+)
+
+
 def transform_tw_links(
     source: str,
     lang_code: str,
     resource_requests: Sequence[ResourceRequest],
-    translation_words_dict: dict[str, str],
+    translation_words_index: Mapping[str, TranslationWord],
+    tw: str = "tw",
+    fmt_str: str = settings.TRANSLATION_WORD_ANCHOR_LINK_FMT_STR,
+    prefix_fmt_str: str = settings.TRANSLATION_WORD_PREFIX_ANCHOR_LINK_FMT_STR,
+) -> str:
+    """
+    Transform the links pointing at TW resource assets in one pass
+    over source. Each link is transformed as it is by
+    transform_tw_links_sequentially, see
+    id:single_pass_link_rewriting, which this falls back to when links
+    overlap.
+    """
+    # Determine if resource_type TW was one of the requested
+    # resources.
+    tw_requested = any(
+        tw in resource_request.resource_type for resource_request in resource_requests
+    )
+
+    def localized_word(match: re.Match[str]) -> Optional[str]:
+        filename_sans_suffix = cast(str, link_group(match, "word"))
+        if filename_sans_suffix in translation_words_index and tw_requested:
+            return translation_words_index[filename_sans_suffix].localized_word
+        logger.debug(
+            "TW file for filename_sans_suffix: %s not found for lang_code: %s",
+            filename_sans_suffix,
+            lang_code,
+        )
+        return None
+
+    def prefixed_rc_link(match: re.Match[str]) -> str:
+        localized_word_ = localized_word(match)
+        if localized_word_ is None:
+            return ""
+        # The prefix text can itself contain links which are transformed
+        # before the prefixed links are when transformed sequentially.
+        prefix_text = TW_LINK_SCANNER.sub(
+            rewrite, cast(str, link_group(match, "prefix_text"))
+        )
+        return prefix_fmt_str.format(
+            prefix_text, localized_word_, lang_code, localized_word_
+        )
+
+    def lang_rc_link(match: re.Match[str]) -> str:
+        # transform_tw_rc_link searches for the link using its URL as a
+        # regex. Leave the link as is when the URL doesn't match itself.
+        if not re.fullmatch(
+            r"\[\[{}\]\]".format(link_group(match, "url")), match.group(0)
+        ):
+            return match.group(0)
+        localized_word_ = localized_word(match)
+        if localized_word_ is None:
+            return cast(str, link_group(match, "word"))
+        return fmt_str.format(localized_word_, lang_code, localized_word_)
+
+    def rc_link(match: re.Match[str]) -> str:
+        localized_word_ = localized_word(match)
+        if localized_word_ is None:
+            return ""
+        return fmt_str.format(localized_word_, lang_code, localized_word_)
+
+    def markdown_link_after_dot(match: re.Match[str]) -> str:
+        localized_word_ = localized_word(match)
+        if localized_word_ is None:
+            # Remove the link along with the dot preceding it.
+            return ""
+        return "· {}".format(
+            fmt_str.format(localized_word_, lang_code, localized_word_)
+        )
+
+    def markdown_link(match: re.Match[str]) -> str:
+        localized_word_ = localized_word(match)
+        if localized_word_ is None:
+            # Only links preceded by a dot are removed.
+            return match.group(0)
+        return fmt_str.format(localized_word_, lang_code, localized_word_)
+
+    handlers: Sequence[Callable[[re.Match[str]], str]] = [
+        prefixed_rc_link,
+        lang_rc_link,
+        rc_link,
+        rc_link,
+        markdown_link_after_dot,
+        markdown_link,
+    ]
+
+    def rewrite(match: re.Match[str]) -> str:
+        return handlers[link_kind(match)](match)
+
+    try:
+        return TW_LINK_SCANNER.sub(rewrite, source)
+    except OverlappingLinksError as exc:
+        logger.debug("Overlapping TW links, e.g., %s, found in: %s", exc, source)
+        return transform_tw_links_sequentially(
+            source, lang_code, resource_requests, translation_words_index
+        )
+
+
+# The order of these regexes matters, see
+# id:single_pass_link_rewriting.
+TA_AND_TN_LINK_SCANNER = LinkScanner(
+    [
+        TA_WIKI_PREFIXED_RC_LINK_RE,
+        TA_WIKI_RC_LINK_AFTER_COMMAS_RE,
+        TA_WIKI_RC_LINK_AFTER_SPACES_RE,
+        TA_WIKI_BARE_RC_LINK_RE,
+        TA_STAR_RC_LINK_RE,
+        TA_PREFIXED_MARKDOWN_HTTPS_LINK_RE,
+        TA_PREFIXED_MARKDOWN_LINK_RE,
+        TA_MARKDOWN_HTTPS_LINK_RE,
+        TN_MARKDOWN_SCRIPTURE_LINK_RE,
+        TN_MARKDOWN_RELATIVE_SCRIPTURE_LINK_IN_PARENS_RE,
+        TN_MARKDOWN_RELATIVE_SCRIPTURE_LINK_RE,
+        TN_MARKDOWN_RELATIVE_TO_CURRENT_BOOK_SCRIPTURE_LINK_IN_PARENS_RE,
+        TN_MARKDOWN_RELATIVE_TO_CURRENT_BOOK_SCRIPTURE_LINK_RE,
+        TN_MARKDOWN_RELATIVE_TO_CURRENT_BOOK_SCRIPTURE_LINK_RE_NO_PARENS,
+        TN_OBS_MARKDOWN_LINK_RE,
+    ]
+)
+
+
+def tn_note_anchor_link(
+    scripture_ref: str,
+    tn_resource_request: ResourceRequest,
+    chapter_num: str,
+    verse_ref: str,
+    working_dir: str = settings.RESOURCE_ASSETS_DIR,
+    resource_context: Optional[ResourceContext] = None,
+    tn: str = "tn",
+    fmt_str: str = settings.TRANSLATION_NOTE_ANCHOR_LINK_FMT_STR,
+) -> Optional[str]:
+    """
+    Return the anchor link to the translation note for the chapter
+    verse reference if the note exists. If resource_context is given
+    it memoizes the check for the note.
+    """
+    # Build a file path to the TN note being requested.
+    path = "{}.md".format(
+        join(
+            working_dir,
+            "{}_{}".format(
+                tn_resource_request.lang_code, tn_resource_request.resource_type
+            ),
+            "{}_{}".format(tn_resource_request.lang_code, tn),
+            tn_resource_request.book_code,
+            chapter_num,
+            verse_ref,
+        )
+    )
+    if not (
+        resource_context.file_exists(path, working_dir)
+        if resource_context
+        else repo_manifest.exists(path, working_dir)
+    ):
+        return None
+    return fmt_str.format(
+        scripture_ref,
+        tn_resource_request.lang_code,
+        BOOK_NUMBERS[tn_resource_request.book_code].zfill(3),
+        chapter_num.zfill(3),
+        verse_ref.zfill(3),
+    )
+
+
+def transform_ta_and_tn_links(
+    source: str,
+    lang_code: str,
+    resource_requests: Sequence[ResourceRequest],
+    working_dir: str = settings.RESOURCE_ASSETS_DIR,
+    resource_context: Optional[ResourceContext] = None,
+    tn: str = "tn",
 ) -> str:
+    """
+    Transform the links pointing at TA and TN resource assets in one
+    pass over source. Each link is transformed as it is by
+    transform_ta_and_tn_links_sequentially, see
+    id:single_pass_link_rewriting, which this falls back to when links
+    overlap. If resource_context is given it memoizes the lookups of
+    the translation notes linked to.
+    """
+
+    def tn_resource_request(
+        lang_code: str, book_code: Optional[str] = None
+    ) -> Optional[ResourceRequest]:
+        # NOTE See id:check_for_resource_request below
+        for resource_request in resource_requests:
+            if (
+                resource_request.lang_code == lang_code
+                and tn in resource_request.resource_type
+                and (book_code is None or resource_request.book_code == book_code)
+            ):
+                return resource_request
+        return None
+
+    def removed_link(match: re.Match[str]) -> str:
+        # FIXME When TA gets implemented we'll need to actually build
+        # the anchor link.
+        return ""
+
+    def scripture_link(
+        match: re.Match[str], tn_resource_request_: Optional[ResourceRequest]
+    ) -> Optional[str]:
+        if tn_resource_request_ is None:
+            return None
+        new_link = tn_note_anchor_link(
+            cast(str, link_group(match, "scripture_ref")),
+            tn_resource_request_,
+            cast(str, link_group(match, "chapter_num")),
+            cast(str, link_group(match, "verse_ref")),
+            working_dir,
+            resource_context,
+        )
+        return None if new_link is None else "({})".format(new_link)
+
+    def tn_scripture_link(match: re.Match[str]) -> str:
+        new_link = scripture_link(
+            match,
+            tn_resource_request(
+                cast(str, link_group(match, "lang_code")),
+                link_group(match, "book_code"),
+            ),
+        )
+        # Otherwise replace link with link text only.
+        return new_link or cast(str, link_group(match, "scripture_ref"))
+
+    def relative_scripture_link(
+        match: re.Match[str],
+        tn_resource_request_: Optional[ResourceRequest],
+        in_parens: bool,
+    ) -> str:
+        new_link = scripture_link(match, tn_resource_request_)
+        if new_link is not None:
+            return "({})".format(new_link) if in_parens else new_link
+        if in_parens:
+            # Replace the link and the extra parentheses enclosing it
+            # with the link text only so that it is not clickable.
+            return cast(str, link_group(match, "scripture_ref"))
+        # Otherwise the link is left as is.
+        return match.group(0)
+
+    def tn_relative_scripture_link_in_parens(match: re.Match[str]) -> str:
+        return relative_scripture_link(
+            match,
+            tn_resource_request(lang_code, link_group(match, "book_code")),
+            True,
+        )
+
+    def tn_relative_scripture_link(match: re.Match[str]) -> str:
+        return relative_scripture_link(
+            match,
+            tn_resource_request(lang_code, link_group(match, "book_code")),
+            False,
+        )
+
+    def tn_current_book_scripture_link_in_parens(match: re.Match[str]) -> str:
+        return relative_scripture_link(match, tn_resource_request(lang_code), True)
+
+    def tn_current_book_scripture_link(match: re.Match[str]) -> str:
+        return relative_scripture_link(match, tn_resource_request(lang_code), False)
+
+    def scripture_ref(match: re.Match[str]) -> str:
+        return cast(str, link_group(match, "scripture_ref"))
+
+    def tn_obs_link(match: re.Match[str]) -> str:
+        # FIXME Actually create a meaningful link rather than just
+        # link text
+        return cast(str, link_group(match, "link_text"))
+
+    handlers: Sequence[Callable[[re.Match[str]], str]] = [
+        removed_link,
+        removed_link,
+        removed_link,
+        removed_link,
+        removed_link,
+        removed_link,
+        removed_link,
+        removed_link,
+        tn_scripture_link,
+        tn_relative_scripture_link_in_parens,
+        tn_relative_scripture_link,
+        tn_current_book_scripture_link_in_parens,
+        tn_current_book_scripture_link,
+        scripture_ref,
+        tn_obs_link,
+    ]
+    try:
+        return TA_AND_TN_LINK_SCANNER.sub(
+            lambda match: handlers[link_kind(match)](match), source
+        )
+    except OverlappingLinksError as exc:
+        logger.debug("Overlapping TA or TN links, e.g., %s, found in: %s", exc, source)
+        return transform_ta_and_tn_links_sequentially(
+            source, lang_code, resource_requests, working_dir
+        )
+
+
+def transform_tw_links_sequentially(
+    source: str,
+    lang_code: str,
+    resource_requests: Sequence[ResourceRequest],
+    translation_words_index: Mapping[str, TranslationWord],
+) -> str:
+    """
+    Transform the links pointing at TW resource assets one regex at a
+    time. This is the reference implementation of transform_tw_links.
+    """
     # Transform the '...PREFIXED...' version of regexes in each
     # resource_type group first before its non-'...PREFIXED...' version
     # of regex otherwise we could orphan the prefix portion of the
@@ -85,32 +512,38 @@ def transform_tw_links(
     # (Blah blah blah: ).
     for wiki_link in wiki_link_parser(source):
         source = transform_tw_rc_link(
-            wiki_link, source, lang_code, resource_requests, translation_words_dict
+            wiki_link, source, lang_code, resource_requests, translation_words_index
         )
         source = transform_tw_star_rc_link(
-            wiki_link, source, lang_code, resource_requests, translation_words_dict
+            wiki_link, source, lang_code, resource_requests, translation_words_index
         )
     # Handle links pointing at TW resource assets
     source = transform_tw_wiki_prefixed_rc_links(
-        source, lang_code, resource_requests, translation_words_dict
+        source, lang_code, resource_requests, translation_words_index
     )
     source = transform_tw_wiki_rc_links(
-        source, lang_code, resource_requests, translation_words_dict
+        source, lang_code, resource_requests, translation_words_index
     )
     source = transform_tw_wiki_rc_links2(
-        source, lang_code, resource_requests, translation_words_dict
+        source, lang_code, resource_requests, translation_words_index
     )
     source = transform_tw_markdown_links(
-        source, lang_code, resource_requests, translation_words_dict
+        source, lang_code, resource_requests, translation_words_index
     )
     return source
 
 
-def transform_ta_and_tn_links(
+def transform_ta_and_tn_links_sequentially(
     source: str,
     lang_code: str,
     resource_requests: Sequence[ResourceRequest],
+    working_dir: str = settings.RESOURCE_ASSETS_DIR,
 ) -> str:
+    """
+    Transform the links pointing at TA and TN resource assets one regex
+    at a time. This is the reference implementation of
+    transform_ta_and_tn_links.
+    """
     # Transform the '...PREFIXED...' version of regexes in each
     # resource_type group first before its non-'...PREFIXED...' version
     # of regex otherwise we could orphan the prefix portion of the
@@ -124,15 +557,19 @@ def transform_ta_and_tn_links(
     source = transform_ta_markdown_links(source)
     source = transform_ta_markdown_https_links(source)
     # Handle links pointing at TN resource assets
-    source = transform_tn_prefixed_markdown_links(source, resource_requests)
-    source = transform_tn_markdown_links(source, lang_code, resource_requests)
+    source = transform_tn_prefixed_markdown_links(
+        source, resource_requests, working_dir
+    )
+    source = transform_tn_markdown_links(
+        source, lang_code, resource_requests, working_dir=working_dir
+    )
     # NOTE Haven't decided yet if we should use this next method or instead
     # have human translators use more explicit scripture reference that
     # includes the book_code, e.g., col, rather than leave it out. If
     # they did provide the book_code then this case would be picked up
     # by self.transform_tn_markdown_links.
     source = transform_tn_missing_book_code_markdown_links(
-        source, lang_code, resource_requests
+        source, lang_code, resource_requests, working_dir=working_dir
     )
     source = transform_tn_missing_book_code_markdown_links_no_paren(source)
     source = transform_tn_obs_markdown_links(source)
@@ -144,7 +581,7 @@ def transform_tw_rc_link(
     source: str,
     lang_code: str,
     resource_requests: Sequence[ResourceRequest],
-    translation_words_dict: dict[str, str],
+    translation_words_index: Mapping[str, TranslationWord],
     tw: str = "tw",
     fmt_str: str = settings.TRANSLATION_WORD_ANCHOR_LINK_FMT_STR,
 ) -> str:
@@ -173,11 +610,11 @@ def transform_tw_rc_link(
         # - if it hasn't requested the TW resource in this document request then
         # we should not make links to TW word definitions. Hence the need to
         # also check tw_resources_requests.
-        if filename_sans_suffix in translation_words_dict and tw_resources_requests:
-            # Localize the translation word.
-            file_content = read_file(translation_words_dict[filename_sans_suffix])
+        if filename_sans_suffix in translation_words_index and tw_resources_requests:
             # Get the localized name for the translation word.
-            localized_translation_word_ = localized_translation_word(file_content)
+            localized_translation_word_ = translation_words_index[
+                filename_sans_suffix
+            ].localized_word
             # Build the anchor link.
             url = url.replace(
                 match.group(0),  # The whole match
@@ -205,7 +642,7 @@ def transform_tw_markdown_links(
     source: str,
     lang_code: str,
     resource_requests: Sequence[ResourceRequest],
-    translation_words_dict: dict[str, str],
+    translation_words_index: Mapping[str, TranslationWord],
     tw: str = "tw",
     fmt_str: str = settings.TRANSLATION_WORD_ANCHOR_LINK_FMT_STR,
 ) -> str:
@@ -224,11 +661,11 @@ def transform_tw_markdown_links(
     for match in finditer(TW_MARKDOWN_LINK_RE, source):
         match_text = match.group(0)
         filename_sans_suffix = match.group("word")
-        if filename_sans_suffix in translation_words_dict and tw_resources_requests:
-            # Localize non-English languages.
-            file_content = read_file(translation_words_dict[filename_sans_suffix])
-            # Get the localized name for the translation word
-            localized_translation_word_ = localized_translation_word(file_content)
+        if filename_sans_suffix in translation_words_index and tw_resources_requests:
+            # Get the localized name for the translation word.
+            localized_translation_word_ = translation_words_index[
+                filename_sans_suffix
+            ].localized_word
             # Build the anchor links
             source = source.replace(
                 match_text,
@@ -259,7 +696,7 @@ def transform_tw_wiki_rc_links(
     source: str,
     lang_code: str,
     resource_requests: Sequence[ResourceRequest],
-    translation_words_dict: dict[str, str],
+    translation_words_index: Mapping[str, TranslationWord],
     tw: str = "tw",
     fmt_str: str = settings.TRANSLATION_WORD_ANCHOR_LINK_FMT_STR,
 ) -> str:
@@ -277,11 +714,11 @@ def transform_tw_wiki_rc_links(
     ]
     for match in finditer(TW_WIKI_RC_LINK_RE, source):
         filename_sans_suffix = match.group("word")
-        if filename_sans_suffix in translation_words_dict and tw_resources_requests:
-            # Localize non-English languages.
-            file_content = read_file(translation_words_dict[filename_sans_suffix])
-            # Get the localized name for the translation word
-            localized_translation_word_ = localized_translation_word(file_content)
+        if filename_sans_suffix in translation_words_index and tw_resources_requests:
+            # Get the localized name for the translation word.
+            localized_translation_word_ = translation_words_index[
+                filename_sans_suffix
+            ].localized_word
             # Build the anchor links
             source = source.replace(
                 match.group(0),  # The whole match
@@ -311,7 +748,7 @@ def transform_tw_wiki_rc_links2(
     source: str,
     lang_code: str,
     resource_requests: Sequence[ResourceRequest],
-    translation_words_dict: dict[str, str],
+    translation_words_index: Mapping[str, TranslationWord],
     tw: str = "tw",
     fmt_str: str = settings.TRANSLATION_WORD_ANCHOR_LINK_FMT_STR,
 ) -> str:
@@ -329,11 +766,11 @@ def transform_tw_wiki_rc_links2(
     ]
     for match in finditer(TW_WIKI_RC_LINK_RE2, source):
         filename_sans_suffix = match.group("word")
-        if filename_sans_suffix in translation_words_dict and tw_resources_requests:
-            # Localize non-English languages.
-            file_content = read_file(translation_words_dict[filename_sans_suffix])
-            # Get the localized name for the translation word
-            localized_translation_word_ = localized_translation_word(file_content)
+        if filename_sans_suffix in translation_words_index and tw_resources_requests:
+            # Get the localized name for the translation word.
+            localized_translation_word_ = translation_words_index[
+                filename_sans_suffix
+            ].localized_word
             # Build the anchor links
             source = source.replace(
                 match.group(0),  # The whole match
@@ -364,7 +801,7 @@ def transform_tw_star_rc_link(
     source: str,
     lang_code: str,
     resource_requests: Sequence[ResourceRequest],
-    translation_words_dict: dict[str, str],
+    translation_words_index: Mapping[str, TranslationWord],
     tw: str = "tw",
     fmt_str: str = settings.TRANSLATION_WORD_ANCHOR_LINK_FMT_STR,
 ) -> str:
@@ -393,11 +830,11 @@ def transform_tw_star_rc_link(
         # - if it hasn't requested the TW resource in this document request then
         # we should not make links to TW word definitions. Hence the need to
         # also check tw_resources_requests.
-        if filename_sans_suffix in translation_words_dict and tw_resources_requests:
-            # Localize the translation word.
-            file_content = read_file(translation_words_dict[filename_sans_suffix])
+        if filename_sans_suffix in translation_words_index and tw_resources_requests:
             # Get the localized name for the translation word.
-            localized_translation_word_ = localized_translation_word(file_content)
+            localized_translation_word_ = translation_words_index[
+                filename_sans_suffix
+            ].localized_word
             # Build the anchor link.
             url = url.replace(
                 match.group(0),  # The whole match
@@ -471,7 +908,7 @@ def transform_tw_wiki_prefixed_rc_links(
     source: str,
     lang_code: str,
     resource_requests: Sequence[ResourceRequest],
-    translation_words_dict: dict[str, str],
+    translation_words_index: Mapping[str, TranslationWord],
     tw: str = "tw",
     fmt_str: str = settings.TRANSLATION_WORD_PREFIX_ANCHOR_LINK_FMT_STR,
 ) -> str:
@@ -489,11 +926,11 @@ def transform_tw_wiki_prefixed_rc_links(
     ]
     for match in finditer(TW_WIKI_PREFIXED_RC_LINK_RE, source):
         filename_sans_suffix = match.group("word")
-        if filename_sans_suffix in translation_words_dict and tw_resources_requests:
-            # Need to localize non-English languages.
-            file_content = read_file(translation_words_dict[filename_sans_suffix])
-            # Get the localized name for the translation word
-            localized_translation_word_ = localized_translation_word(file_content)
+        if filename_sans_suffix in translation_words_index and tw_resources_requests:
+            # Get the localized name for the translation word.
+            localized_translation_word_ = translation_words_index[
+                filename_sans_suffix
+            ].localized_word
             # Build the anchor links
             source = source.replace(
                 match.group(0),  # The whole match
@@ -649,7 +1086,8 @@ def transform_tn_prefixed_markdown_links(
                     verse_ref,
                 )
             )
-            if exists(path):  # file path to TN note exists
+            # File path to TN note exists
+            if repo_manifest.exists(path, working_dir):
                 # Create anchor link to translation note
                 new_link = fmt_str.format(
                     scripture_ref,
@@ -720,7 +1158,8 @@ def transform_tn_markdown_links(
                     verse_ref,
                 )
             )
-            if exists(path):  # file path to TN note exists
+            # File path to TN note exists
+            if repo_manifest.exists(path, working_dir):
                 # Create anchor link to translation note
                 new_link = fmt_str.format(
                     scripture_ref,
@@ -796,7 +1235,8 @@ def transform_tn_missing_book_code_markdown_links(
                     verse_ref,
                 )
             )
-            if exists(path):  # file path to TN note exists
+            # File path to TN note exists
+            if repo_manifest.exists(path, working_dir):
                 # Create anchor link to translation note
                 new_link = fmt_str.format(
                     scripture_ref,
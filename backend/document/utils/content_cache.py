@@ -0,0 +1,172 @@
+"""
+This module provides a content addressed, size bounded, on disk cache
+for rendered content, e.g., USFM chapters or Markdown rendered to
+HTML. Entries are keyed by a hash of the source content and of the
+version of whatever renders it so that stale entries are never
+served, and the least recently used entries are evicted once the
+cache grows beyond its size limit.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Callable, Optional
+
+from document.config import settings
+
+logger = settings.logger(__name__)
+
+# Bytes written to each cache directory by this process since the
+# last time eviction was considered for it.
+_bytes_written_since_eviction: dict[str, int] = {}
+_eviction_lock = threading.Lock()
+
+
+def content_key(*parts: str) -> str:
+    """
+    Return a hash which uniquely identifies the sequence of parts.
+
+    >>> content_key("a", "bc") == content_key("ab", "c")
+    False
+    """
+    hasher = hashlib.sha256()
+    for part in parts:
+        encoded_part = part.encode("utf-8")
+        hasher.update(b"%d:" % len(encoded_part))
+        hasher.update(encoded_part)
+    return hasher.hexdigest()
+
+
+def entry_path(key: str, cache_dir: str = settings.CONTENT_CACHE_DIR) -> str:
+    """Return the path of the cache entry for key."""
+    return os.path.join(cache_dir, key[:2], key)
+
+
+def read_entry(path: str) -> Optional[str]:
+    """
+    Return the content of the cache entry at path, if it exists, and
+    mark the entry as recently used.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as fin:
+            content = fin.read()
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        # Entry was evicted by another process in the meantime.
+        pass
+    return content
+
+
+def write_entry(
+    path: str,
+    content: str,
+    cache_dir: str = settings.CONTENT_CACHE_DIR,
+    max_bytes: int = settings.CONTENT_CACHE_MAX_BYTES,
+) -> None:
+    """
+    Atomically write content to the cache entry at path so that
+    concurrent readers never see a partial entry, then evict least
+    recently used entries if the cache may have outgrown max_bytes.
+    """
+    entry_dir = os.path.dirname(path)
+    os.makedirs(entry_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=entry_dir, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fout:
+            fout.write(content)
+        os.replace(tmp_path, path)
+    except OSError:
+        logger.exception("Could not write cache entry %s", path)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    with _eviction_lock:
+        # Always consider eviction on this process's first write, after
+        # that only once another tenth of max_bytes has been written.
+        bytes_written = _bytes_written_since_eviction.get(cache_dir, max_bytes)
+        bytes_written += len(content)
+        should_evict = bytes_written >= max_bytes // 10
+        _bytes_written_since_eviction[cache_dir] = 0 if should_evict else bytes_written
+    if should_evict:
+        evict_least_recently_used(cache_dir, max_bytes)
+
+
+def evict_least_recently_used(
+    cache_dir: str = settings.CONTENT_CACHE_DIR,
+    max_bytes: int = settings.CONTENT_CACHE_MAX_BYTES,
+    low_water_mark: float = 0.9,
+) -> int:
+    """
+    If the entries in cache_dir take more than max_bytes, remove the
+    least recently used entries until they take no more than
+    low_water_mark of max_bytes. Return the number of bytes removed.
+    """
+    entries: list[tuple[float, int, str]] = []
+    total_bytes = 0
+    for dirpath, _, filenames in os.walk(cache_dir):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+    if total_bytes <= max_bytes:
+        return 0
+    bytes_removed = 0
+    for _, size, path in sorted(entries):
+        if total_bytes - bytes_removed <= max_bytes * low_water_mark:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Evicted by another process in the meantime.
+            continue
+        bytes_removed += size
+    logger.debug("Evicted %s bytes from content cache %s", bytes_removed, cache_dir)
+    return bytes_removed
+
+
+def cached_content(
+    namespace: str,
+    key_parts: tuple[str, ...],
+    render: Callable[[], Optional[str]],
+    content_cache_enabled: bool = settings.CONTENT_CACHE_ENABLED,
+    cache_dir: str = settings.CONTENT_CACHE_DIR,
+    max_bytes: int = settings.CONTENT_CACHE_MAX_BYTES,
+) -> Optional[str]:
+    """
+    Return the cached content keyed by namespace and key_parts, if any,
+    otherwise call render and cache and return its result. Results of
+    None are not cached.
+
+    key_parts must include everything that render's result depends on,
+    e.g., the source content and the version of the renderer.
+    """
+    if not content_cache_enabled:
+        return render()
+    path = entry_path(content_key(namespace, *key_parts), cache_dir)
+    content = read_entry(path)
+    if content is None:
+        content = render()
+        if content is not None:
+            write_entry(path, content, cache_dir, max_bytes)
+    return content
+
+
+if __name__ == "__main__":
+
+    # To run the doctests in the this module, in the root of the project do:
+    # python backend/document/utils/content_cache.py
+    # or
+    # python backend/document/utils/content_cache.py -v
+    # See https://docs.python.org/3/library/doctest.html
+    # for more details.
+    import doctest
+
+    doctest.testmod()
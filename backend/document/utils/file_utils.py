@@ -1,7 +1,8 @@
 """This module provides various file utilities."""
 
-from contextlib import closing
+from contextlib import closing, contextmanager
 import codecs
+import fcntl
 import json
 import os
 import pathlib
@@ -9,7 +10,7 @@ import urllib
 import zipfile
 import shutil
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Iterator, Optional, Union
 from urllib.request import urlopen
 
 import yaml
@@ -29,6 +30,23 @@ def delete_tree(dir: str) -> None:
         logger.exception("Caught exception: ")
 
 
+@contextmanager
+def file_lock(lock_file_path: str) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on lock_file_path, creating it if
+    need be, for the duration of the with block. The lock is held
+    across processes, e.g., Celery workers, which share the file
+    system and is released should the holder die.
+    """
+    make_dir(os.path.dirname(lock_file_path) or ".")
+    with open(lock_file_path, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
 def download_file(
     url: str, outfile: str, user_agent: str = settings.USER_AGENT
 ) -> None:
@@ -0,0 +1,247 @@
+"""
+This module provides a manifest of the paths in each cloned resource
+repo so that finding a repo's books, chapters and verses, and checking
+whether a file exists in it, are lookups in memory rather than globs
+and stats over the file system.
+
+The manifest of a repo is built once, after it is cloned or refreshed,
+and persisted next to the clone in a sidecar file so that every process
+sharing the clone loads it rather than walking the repo itself.
+"""
+
+import fnmatch
+import glob as glob_
+import json
+import os
+import tempfile
+import time
+from functools import lru_cache
+from os.path import basename, dirname, isdir, join, normpath, relpath
+from typing import Iterable, Optional, final
+
+from document.config import settings
+
+logger = settings.logger(__name__)
+
+# Bump this whenever a change to this module changes the manifest's
+# format.
+MANIFEST_VERSION = 1
+
+MAGIC_CHARS = frozenset("*?[")
+
+
+@final
+class RepoManifest:
+    """
+    The relative paths, using / as separator, of the files and
+    directories in a repo. Hidden ones, e.g., .git, are left out as
+    glob leaves them out too.
+
+    >>> manifest = RepoManifest(["gen", "gen/01", "gen/01/01.md", "gen/01/intro.md"])
+    >>> manifest.glob("*gen/*[0-9]*")
+    ['gen/01']
+    >>> manifest.glob("gen/01/*[0-9]*.md")
+    ['gen/01/01.md']
+    >>> manifest.exists("gen/01/02.md")
+    False
+    """
+
+    def __init__(self, paths: Iterable[str]) -> None:
+        self.paths = frozenset(paths)
+        # The paths' components grouped by their number of components
+        # since a glob pattern only matches paths with as many
+        # components as it has.
+        self._paths_by_depth: dict[int, list[tuple[str, ...]]] = {}
+        for path in sorted(self.paths):
+            components = tuple(path.split("/"))
+            self._paths_by_depth.setdefault(len(components), []).append(components)
+
+    def exists(self, path: str) -> bool:
+        """Return True if the relative path exists in the repo."""
+        return normpath(path) in self.paths
+
+    def glob(self, pattern: str) -> list[str]:
+        """
+        Return, sorted, the relative paths which match the relative
+        glob pattern. Like glob.glob, which is not recursive unless
+        asked to be, ** matches like *.
+        """
+        pattern_components = normpath(pattern).split("/")
+        return [
+            "/".join(components)
+            for components in self._paths_by_depth.get(len(pattern_components), [])
+            if all(
+                fnmatch.fnmatchcase(component, pattern_component)
+                for component, pattern_component in zip(components, pattern_components)
+            )
+        ]
+
+
+def manifest_filepath(repo_dir: str) -> str:
+    """Return the path of the sidecar file of the repo's manifest."""
+    return "{}.manifest.json".format(normpath(repo_dir))
+
+
+def build_manifest(repo_dir: str) -> RepoManifest:
+    """Walk the repo cloned at repo_dir and return its manifest."""
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(repo_dir):
+        dirnames[:] = [
+            dirname_ for dirname_ in dirnames if not dirname_.startswith(".")
+        ]
+        relative_dirpath = relpath(dirpath, repo_dir)
+        for name in dirnames + filenames:
+            if not name.startswith("."):
+                paths.append(
+                    name if relative_dirpath == "." else join(relative_dirpath, name)
+                )
+    return RepoManifest(paths)
+
+
+def record_manifest(repo_dir: str) -> RepoManifest:
+    """
+    Build the manifest of the repo cloned at repo_dir and atomically
+    write it to its sidecar file so that concurrent readers never see
+    a partial manifest. Call this whenever the clone changes, e.g.,
+    after it is cloned or refreshed.
+    """
+    t0 = time.time()
+    manifest = build_manifest(repo_dir)
+    filepath = manifest_filepath(repo_dir)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=dirname(filepath) or ".", prefix=".tmp-{}-".format(basename(filepath))
+    )
+    try:
+        with os.fdopen(fd, "w") as fout:
+            json.dump(
+                {"version": MANIFEST_VERSION, "paths": sorted(manifest.paths)}, fout
+            )
+        os.replace(tmp_path, filepath)
+    except OSError:
+        logger.exception("Could not write manifest of %s", repo_dir)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    t1 = time.time()
+    logger.debug(
+        "Time to record manifest of %s with %s paths: %s",
+        repo_dir,
+        len(manifest.paths),
+        t1 - t0,
+    )
+    return manifest
+
+
+@lru_cache(maxsize=256)
+def _loaded_manifest(repo_dir: str, mtime_ns: int) -> RepoManifest:
+    """
+    Return the repo's manifest loaded from its sidecar file as of
+    mtime_ns, the sidecar's modification time, which keys the cache so
+    that a refreshed repo's manifest is reloaded.
+    """
+    try:
+        with open(manifest_filepath(repo_dir)) as fin:
+            data = json.load(fin)
+        if data.get("version") == MANIFEST_VERSION:
+            return RepoManifest(data["paths"])
+    except (OSError, ValueError, KeyError):
+        logger.exception("Could not load manifest of %s", repo_dir)
+    return record_manifest(repo_dir)
+
+
+def repo_manifest(repo_dir: str) -> RepoManifest:
+    """
+    Return the manifest of the repo cloned at repo_dir, recording it
+    first if it was cloned before manifests were.
+    """
+    try:
+        mtime_ns = os.stat(manifest_filepath(repo_dir)).st_mtime_ns
+    except FileNotFoundError:
+        return record_manifest(repo_dir)
+    return _loaded_manifest(normpath(repo_dir), mtime_ns)
+
+
+# Directories, and the working directory, within cloned repos mapped to
+# the repo they are in. Directories not (yet) within one aren't cached
+# as they may be cloned later.
+_repo_roots: dict[tuple[str, str], str] = {}
+
+
+def repo_root(
+    dir_path: str, working_dir: str = settings.RESOURCE_ASSETS_DIR
+) -> Optional[str]:
+    """
+    Return the directory of the repo cloned in working_dir which
+    contains dir_path, if any.
+    """
+    try:
+        return _repo_roots[(dir_path, working_dir)]
+    except KeyError:
+        pass
+    path = normpath(dir_path)
+    relative_path = relpath(path, normpath(working_dir))
+    if relative_path == "." or relative_path.split("/")[0] == "..":
+        return None
+    # Repos are cloned into working_dir's subdirectories.
+    root = path
+    for _ in range(relative_path.count("/")):
+        root = dirname(root)
+    if not isdir(join(root, ".git")):
+        return None
+    _repo_roots[(dir_path, working_dir)] = root
+    return root
+
+
+def literal_prefix(pattern: str) -> str:
+    """
+    Return the directories at the start of the glob pattern which
+    contain no glob magic characters.
+
+    >>> literal_prefix("assets/en_tn/*gen/*[0-9]*")
+    'assets/en_tn'
+    """
+    components = normpath(pattern).split("/")
+    literal_components = []
+    for component in components[:-1]:
+        if MAGIC_CHARS & set(component):
+            break
+        literal_components.append(component)
+    return "/".join(literal_components) or "."
+
+
+def glob(pattern: str, working_dir: str = settings.RESOURCE_ASSETS_DIR) -> list[str]:
+    """
+    Like glob.glob, but if the pattern is within a repo cloned in
+    working_dir, look the matching paths up in the repo's manifest. The
+    paths are sorted.
+    """
+    root = repo_root(literal_prefix(pattern), working_dir)
+    if root is None:
+        return sorted(glob_.glob(pattern))
+    return [
+        join(root, path)
+        for path in repo_manifest(root).glob(relpath(normpath(pattern), root))
+    ]
+
+
+def exists(path: str, working_dir: str = settings.RESOURCE_ASSETS_DIR) -> bool:
+    """
+    Like os.path.exists, but if path is within a repo cloned in
+    working_dir, look it up in the repo's manifest.
+    """
+    root = repo_root(dirname(normpath(path)), working_dir)
+    if root is None:
+        return os.path.exists(path)
+    return repo_manifest(root).exists(relpath(normpath(path), root))
+
+
+if __name__ == "__main__":
+
+    # To run the doctests in the this module, in the root of the project do:
+    # python backend/document/utils/repo_manifest.py
+    # or
+    # python backend/document/utils/repo_manifest.py -v
+    # See https://docs.python.org/3/library/doctest.html
+    # for more details.
+    import doctest
+
+    doctest.testmod()
@@ -5,10 +5,14 @@ resources that we use in multiple places.
 
 import os
 import pathlib
+from functools import lru_cache
 from glob import glob
-from typing import Optional
+from typing import Mapping, Optional
 
 from document.config import settings
+from document.domain.model import TranslationWord
+from document.utils import repo_manifest
+from document.utils.file_utils import read_file
 
 
 logger = settings.logger(__name__)
@@ -21,9 +25,9 @@ def translation_word_filepaths(resource_dir: str) -> list[str]:
     Get the file paths to the translation word files located
     recursively in resource_dir.
     """
-    filepaths = glob("{}/bible/kt/*.md".format(resource_dir))
-    filepaths.extend(glob("{}/bible/names/*.md".format(resource_dir)))
-    filepaths.extend(glob("{}/bible/other/*.md".format(resource_dir)))
+    filepaths = repo_manifest.glob("{}/bible/kt/*.md".format(resource_dir))
+    filepaths.extend(repo_manifest.glob("{}/bible/names/*.md".format(resource_dir)))
+    filepaths.extend(repo_manifest.glob("{}/bible/other/*.md".format(resource_dir)))
     return filepaths
 
 
@@ -104,3 +108,25 @@ def translation_words_dict(tw_resource_dir: Optional[str]) -> dict[str, str]:
             for word_filepath in filepaths
         }
     return translation_words_dict
+
+
+@lru_cache(maxsize=32)
+def translation_words_index(
+    tw_resource_dir: Optional[str],
+) -> Mapping[str, TranslationWord]:
+    """
+    Given the path to the TW resource asset files, return a mapping of
+    each translation word's filename sans suffix to its localized name,
+    definition filepath and category, otherwise return an empty
+    mapping. Each definition file is read once here so that rewriting
+    links to translation words is a lookup. Callers must not mutate
+    the mapping as it is shared.
+    """
+    translation_words_index: dict[str, TranslationWord] = {}
+    for word, word_filepath in translation_words_dict(tw_resource_dir).items():
+        translation_words_index[word] = TranslationWord(
+            localized_word=localized_translation_word(read_file(word_filepath)),
+            filepath=word_filepath,
+            category=pathlib.Path(word_filepath).parent.name,
+        )
+    return translation_words_index
@@ -0,0 +1,110 @@
+"""
+This module provides a matcher which finds which of many words occur
+in a text in a single pass over the text, e.g., which translation
+words occur in a chapter of scripture.
+"""
+
+import re
+from typing import Any, Iterable, final
+
+
+def _trie(words: Iterable[str]) -> dict[str, Any]:
+    """
+    Return a character trie of words. The empty string key marks the
+    end of a word.
+    """
+    trie: dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return trie
+
+
+def _trie_pattern(node: dict[str, Any]) -> str:
+    """
+    Return a regular expression which, matched greedily, matches the
+    longest word in the trie node which starts where it is matched.
+
+    >>> _trie_pattern(_trie(["god", "godly", "good"]))
+    'go(?:d(?:ly)?|od)'
+    """
+    is_end = "" in node
+    children = sorted((char, child) for char, child in node.items() if char)
+    if not children:
+        return ""
+    alternatives = []
+    for char, child in children:
+        # Collapse chains of single children, e.g., l -> y, into one
+        # literal.
+        literal = char
+        while len(child) == 1 and "" not in child:
+            ((next_char, child),) = child.items()
+            literal += next_char
+        alternatives.append(re.escape(literal) + _trie_pattern(child))
+    pattern = (
+        alternatives[0]
+        if len(alternatives) == 1
+        else "(?:{})".format("|".join(alternatives))
+    )
+    if is_end:
+        return "(?:{})?".format(pattern)
+    return pattern
+
+
+@final
+class WordMatcher:
+    """
+    Find which of a fixed set of words occur, as substrings, in texts.
+
+    The words are compiled into one regular expression structured as a
+    trie which is tried, in C, at each position of the text. At each
+    position it reports the longest word starting there. Every shorter
+    word which is a prefix of that word occurs there too, so the words
+    found are closed over their prefixes. Thus each text is scanned
+    once no matter how many words there are.
+
+    >>> matcher = WordMatcher(["God", "Godly", "good", "Lord"])
+    >>> sorted(matcher.present_words("the Godly man is good"))
+    ['God', 'Godly', 'good']
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.words = set(words)
+        non_empty_words = {word for word in self.words if word}
+        # Like re.search, the empty word occurs in every text.
+        self._empty_words = self.words - non_empty_words
+        # For each word, the words, itself included, which are its
+        # prefixes.
+        self._prefixes = {
+            word: {word[:length] for length in range(1, len(word) + 1)}
+            & non_empty_words
+            for word in non_empty_words
+        }
+        self._pattern = (
+            re.compile("(?=({}))".format(_trie_pattern(_trie(non_empty_words))))
+            if non_empty_words
+            else None
+        )
+
+    def present_words(self, text: str) -> set[str]:
+        """Return the words which occur in text."""
+        present_words = set(self._empty_words)
+        if self._pattern is not None:
+            for longest_word in set(self._pattern.findall(text)):
+                present_words |= self._prefixes[longest_word]
+        return present_words
+
+
+if __name__ == "__main__":
+
+    # To run the doctests in the this module, in the root of the project do:
+    # python backend/document/utils/word_matcher.py
+    # or
+    # python backend/document/utils/word_matcher.py -v
+    # See https://docs.python.org/3/library/doctest.html
+    # for more details.
+    import doctest
+
+    doctest.testmod()
@@ -1,5 +1,6 @@
 ﻿using System;
 using System.IO;
+using System.Text;
 using System.Collections.Generic;
 using USFMToolsSharp;
 using USFMToolsSharp.Renderers.HTML;
@@ -12,9 +13,16 @@ namespace USFMParserDriver
         static void Main(string[] args)
         {
 
+                if (args.Length == 1 && args[0] == "--server")
+                {
+                    Serve();
+                    return;
+                }
+
                 if (args.Length < 2)
                 {
                     Console.WriteLine("Please provide both the input file name and the output file path as command line arguments.");
+                    Console.WriteLine("Alternatively, pass --server to render USFM read from stdin until it is closed.");
                     return;
                 }
 
@@ -30,14 +38,7 @@ namespace USFMParserDriver
                 try
                 {
                     string contents = File.ReadAllText(inputFile);
-                    USFMToolsSharp.USFMParser parser = new USFMParser();
-                    USFMDocument document = parser.ParseFromString(contents);
-                    // Console.WriteLine("contents");
-                    // Console.WriteLine(contents);
-                    HTMLConfig configHTML = new HTMLConfig(new List<string>(), partialHTML: true);
-                    HtmlRenderer renderer = new HtmlRenderer(configHTML);
-                    string html = renderer.Render(document);
-                    // Console.WriteLine(html);
+                    string html = Render(contents);
                     File.WriteAllText(outputFile, html);
                     Console.WriteLine("Conversion completed successfully. Output written to: " + outputFile);
                 }
@@ -47,6 +48,101 @@ namespace USFMParserDriver
                 }
             }
 
+        static string Render(string contents)
+        {
+            USFMToolsSharp.USFMParser parser = new USFMParser();
+            USFMDocument document = parser.ParseFromString(contents);
+            HTMLConfig configHTML = new HTMLConfig(new List<string>(), partialHTML: true);
+            HtmlRenderer renderer = new HtmlRenderer(configHTML);
+            return renderer.Render(document);
+        }
+
+        /// <summary>
+        /// Render USFM documents read from stdin until stdin is closed.
+        ///
+        /// Each request is a header line holding the byte length of the
+        /// UTF-8 encoded USFM that follows it. Each response is a header
+        /// line, "OK <length>" or "ERR <length>", followed by that many
+        /// bytes of UTF-8 encoded HTML or error message respectively.
+        /// Nothing else is ever written to stdout in this mode.
+        /// </summary>
+        static void Serve()
+        {
+            Stream input = Console.OpenStandardInput();
+            Stream output = Console.OpenStandardOutput();
+            string? header;
+            while ((header = ReadLine(input)) != null)
+            {
+                if (header.Trim().Length == 0)
+                {
+                    continue;
+                }
+                string status = "OK";
+                string payload;
+                try
+                {
+                    int length = int.Parse(header.Trim());
+                    byte[] body = ReadExactly(input, length);
+                    try
+                    {
+                        payload = Render(Encoding.UTF8.GetString(body));
+                    }
+                    catch (Exception ex)
+                    {
+                        status = "ERR";
+                        payload = ex.Message;
+                    }
+                }
+                catch (Exception ex)
+                {
+                    // Framing is lost, so report the error and stop.
+                    Write(output, "ERR", ex.Message);
+                    return;
+                }
+                Write(output, status, payload);
+            }
+        }
+
+        static void Write(Stream output, string status, string payload)
+        {
+            byte[] body = Encoding.UTF8.GetBytes(payload);
+            byte[] header = Encoding.ASCII.GetBytes($"{status} {body.Length}\n");
+            output.Write(header, 0, header.Length);
+            output.Write(body, 0, body.Length);
+            output.Flush();
+        }
+
+        static string? ReadLine(Stream input)
+        {
+            List<byte> bytes = new List<byte>();
+            int b;
+            while ((b = input.ReadByte()) != -1)
+            {
+                if (b == '\n')
+                {
+                    return Encoding.ASCII.GetString(bytes.ToArray());
+                }
+                bytes.Add((byte)b);
+            }
+            return bytes.Count > 0 ? Encoding.ASCII.GetString(bytes.ToArray()) : null;
+        }
+
+        static byte[] ReadExactly(Stream input, int length)
+        {
+            byte[] buffer = new byte[length];
+            int offset = 0;
+            while (offset < length)
+            {
+                int read = input.Read(buffer, offset, length - offset);
+                if (read == 0)
+                {
+                    throw new EndOfStreamException("stdin closed mid-request");
+                }
+                offset += read;
+            }
+            return buffer;
+        }
+
 
     }
 }
@@ -56,6 +56,76 @@ def test_en_ulb_col_en_tn_col_language_book_order_with_no_email_1c_docx() -> Non
         check_result(response, suffix="docx")
 
 
+@pytest.mark.docx
+def test_en_ulb_col_en_tn_col_language_book_order_with_no_email_1c_all_formats() -> None:
+    with TestClient(app=app, base_url=settings.api_test_url()) as client:
+        response = client.post(
+            "/documents_all_formats",
+            json={
+                # "email_address": settings.TO_EMAIL_ADDRESS,
+                "assembly_strategy_kind": model.AssemblyStrategyEnum.LANGUAGE_BOOK_ORDER,
+                "assembly_layout_kind": model.AssemblyLayoutEnum.ONE_COLUMN,
+                "layout_for_print": False,
+                "chunk_size": model.ChunkSizeEnum.CHAPTER,
+                "generate_pdf": True,
+                "generate_epub": True,
+                "generate_docx": True,
+                "resource_requests": [
+                    {
+                        "lang_code": "en",
+                        "resource_type": "ulb",
+                        "book_code": "col",
+                    },
+                    {
+                        "lang_code": "en",
+                        "resource_type": "tn",
+                        "book_code": "col",
+                    },
+                ],
+            },
+        )
+        finished_document_request_key = check_result(response, suffix="pdf")
+        for suffix in ["html", "epub", "docx"]:
+            assert os.path.exists(
+                os.path.join(
+                    settings.DOCUMENT_OUTPUT_DIR,
+                    "{}.{}".format(finished_document_request_key, suffix),
+                )
+            )
+
+
+def test_identical_document_requests_are_coalesced() -> None:
+    document_request = {
+        "email_address": settings.TO_EMAIL_ADDRESS,
+        "assembly_strategy_kind": model.AssemblyStrategyEnum.LANGUAGE_BOOK_ORDER,
+        "assembly_layout_kind": model.AssemblyLayoutEnum.ONE_COLUMN,
+        "layout_for_print": False,
+        "chunk_size": model.ChunkSizeEnum.CHAPTER,
+        "generate_pdf": True,
+        "generate_epub": False,
+        "generate_docx": False,
+        "resource_requests": [
+            {
+                "lang_code": "en",
+                "resource_type": "ulb",
+                "book_code": "phm",
+            },
+            {
+                "lang_code": "en",
+                "resource_type": "tn",
+                "book_code": "phm",
+            },
+        ],
+    }
+    with TestClient(app=app, base_url=settings.api_test_url()) as client:
+        response = client.post("/documents", json=document_request)
+        duplicate_response = client.post("/documents", json=document_request)
+        # Either the same task id or, if the document was cached, the
+        # same finished result.
+        assert duplicate_response.json() == response.json()
+        check_result(response, suffix="pdf")
+
+
 # @pytest.mark.skip
 @pytest.mark.skip
 def test_en_ulb_col_en_tn_col_language_book_order_with_no_email_1c_c() -> None:
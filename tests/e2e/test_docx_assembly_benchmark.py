@@ -0,0 +1,87 @@
+"""
+This module provides a benchmark of assembling the Docx of en ULB and
+TN for the whole NT with each HTML fragment converted into a Document
+of its own and merged by Composer versus converted straight into the
+document's body, see assembly_strategy_utils.append_html, by
+HtmlToDocx and by ooxml_writer.
+"""
+
+import functools
+import time
+
+import pytest
+from document.config import settings
+from document.domain import bible_books, model, parsing, resource_lookup
+from document.domain.assembly_strategies_docx import (
+    assembly_strategies_lang_then_book_by_chapter as asd_lang_then_book,
+)
+from document.domain.assembly_strategies_docx.assembly_strategy_utils import (
+    append_html,
+)
+
+logger = settings.logger(__name__)
+
+NT_BOOK_CODES = list(bible_books.BOOK_NAMES.keys())[39:]
+
+
+@pytest.mark.slow
+@pytest.mark.docx
+def test_nt_docx_assembly_benchmark(monkeypatch: pytest.MonkeyPatch) -> None:
+    resource_requests = [
+        model.ResourceRequest(
+            lang_code="en", resource_type=resource_type, book_code=book_code
+        )
+        for book_code in NT_BOOK_CODES
+        for resource_type in ["ulb", "tn"]
+    ]
+    resource_lookup_dtos = [
+        resource_lookup_dto
+        for resource_request in resource_requests
+        if (
+            resource_lookup_dto := resource_lookup.resource_lookup_dto(
+                resource_request.lang_code,
+                resource_request.resource_type,
+                resource_request.book_code,
+            )
+        )
+        and resource_lookup_dto.url is not None
+    ]
+    resource_dirs = resource_lookup.provision_asset_files_concurrently(
+        resource_lookup_dtos
+    )
+    usfm_books, tn_books, tq_books, tw_books, bc_books = parsing.books(
+        resource_lookup_dtos, resource_dirs, resource_requests, False
+    )
+    seconds = {}
+    num_paragraphs = {}
+    modes = [(False, False), (True, False), (True, True)]
+    for append_html_directly, use_ooxml_writer in modes:
+        monkeypatch.setattr(
+            asd_lang_then_book,
+            "append_html",
+            functools.partial(
+                append_html,
+                append_html_directly=append_html_directly,
+                use_ooxml_writer=use_ooxml_writer,
+            ),
+        )
+        t0 = time.time()
+        composer = asd_lang_then_book.assemble_content_by_lang_then_book(
+            usfm_books,
+            tn_books,
+            tq_books,
+            tw_books,
+            bc_books,
+            model.AssemblyLayoutEnum.ONE_COLUMN,
+            model.ChunkSizeEnum.CHAPTER,
+        )
+        seconds[append_html_directly, use_ooxml_writer] = time.time() - t0
+        num_paragraphs[append_html_directly, use_ooxml_writer] = len(
+            composer.doc.paragraphs
+        )
+    logger.info(
+        "NT Docx assembly: composing subdocuments %.1fs, appending directly %.1fs, appending directly with ooxml_writer %.1fs, speedup %.2fx",
+        *(seconds[mode] for mode in modes),
+        seconds[modes[0]] / seconds[modes[-1]],
+    )
+    assert len(set(num_paragraphs.values())) == 1
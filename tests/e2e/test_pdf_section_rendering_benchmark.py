@@ -0,0 +1,91 @@
+"""
+This module provides a benchmark of rendering documents of 1, 5 and
+27 NT books to PDF as one WeasyPrint job versus in sections, one per
+book, rendered in parallel and merged, see pdf_sections.
+"""
+
+import os
+import pathlib
+import time
+
+import pytest
+from document.config import settings
+from document.domain import bible_books, model, pdf_sections
+from document.domain.pdf_rendering import SERVE_COMMAND, PdfRendererPool
+from document.entrypoints.app import app
+from fastapi.testclient import TestClient
+from pypdf import PdfReader
+from tests.shared.utils import check_result
+
+logger = settings.logger(__name__)
+
+NT_BOOK_CODES = list(bible_books.BOOK_NAMES.keys())[39:]
+
+NUM_SECTION_RENDERERS = 4
+
+
+def html_document(book_codes: list[str]) -> str:
+    """Request the HTML document of en ULB and TN for the books and return its path."""
+    with TestClient(app=app, base_url=settings.api_test_url()) as client:
+        response = client.post(
+            "/documents",
+            json={
+                "email_address": settings.TO_EMAIL_ADDRESS,
+                "assembly_strategy_kind": model.AssemblyStrategyEnum.LANGUAGE_BOOK_ORDER,
+                "assembly_layout_kind": model.AssemblyLayoutEnum.ONE_COLUMN,
+                "layout_for_print": False,
+                "chunk_size": model.ChunkSizeEnum.CHAPTER,
+                "generate_pdf": False,
+                "generate_epub": False,
+                "generate_docx": False,
+                "resource_requests": [
+                    {
+                        "lang_code": "en",
+                        "resource_type": resource_type,
+                        "book_code": book_code,
+                    }
+                    for book_code in book_codes
+                    for resource_type in ["ulb", "tn"]
+                ],
+            },
+        )
+    document_request_key = check_result(response, suffix="html")
+    return os.path.join(
+        settings.DOCUMENT_OUTPUT_DIR, "{}.html".format(document_request_key)
+    )
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("num_books", [1, 5, 27])
+def test_sectioned_pdf_rendering_benchmark(
+    num_books: int, tmp_path: pathlib.Path
+) -> None:
+    html_filepath = html_document(NT_BOOK_CODES[:num_books])
+    pool = PdfRendererPool(SERVE_COMMAND, NUM_SECTION_RENDERERS)
+    pool.warm()
+    try:
+        single_pdf_filepath = str(tmp_path / "single.pdf")
+        t0 = time.time()
+        pool.render(html_filepath, single_pdf_filepath)
+        t1 = time.time()
+        sectioned_pdf_filepath = str(tmp_path / "sectioned.pdf")
+        pdf_sections.render_pdf_in_sections(
+            html_filepath, sectioned_pdf_filepath, pool, NUM_SECTION_RENDERERS
+        )
+        t2 = time.time()
+    finally:
+        pool.close()
+    single_num_pages = len(PdfReader(single_pdf_filepath).pages)
+    sectioned_num_pages = len(PdfReader(sectioned_pdf_filepath).pages)
+    logger.info(
+        "%s books: single job %.1fs (%s pages), %s sections in parallel %.1fs (%s pages), speedup %.2fx",
+        num_books,
+        t1 - t0,
+        single_num_pages,
+        NUM_SECTION_RENDERERS,
+        t2 - t1,
+        sectioned_num_pages,
+        (t1 - t0) / (t2 - t1),
+    )
+    # Each book starts on a new page when rendered in sections.
+    assert sectioned_num_pages >= single_num_pages
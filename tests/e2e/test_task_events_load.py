@@ -0,0 +1,128 @@
+"""
+This module provides a load test of N clients concurrently watching a
+document request's task by streaming its state changes from
+task_events versus polling task_status, as the UI used to. It compares
+the CPU time spent, and the requests made, while the task runs. The
+API is served in this process, as the other e2e tests serve it, so the
+CPU time is this process's, clients included.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import celery.states
+import httpx
+import pytest
+from document.config import settings
+from document.domain import document_generator, model
+from document.entrypoints.app import app
+
+logger = settings.logger(__name__)
+
+# How often each polling client polls task_status.
+POLL_SECONDS = 1.0
+
+DOCUMENT_REQUEST = model.DocumentRequest(
+    email_address=None,
+    assembly_strategy_kind=model.AssemblyStrategyEnum.LANGUAGE_BOOK_ORDER,
+    assembly_layout_kind=model.AssemblyLayoutEnum.ONE_COLUMN,
+    layout_for_print=False,
+    chunk_size=model.ChunkSizeEnum.CHAPTER,
+    generate_pdf=True,
+    generate_epub=False,
+    generate_docx=False,
+    resource_requests=[
+        model.ResourceRequest(lang_code="en", resource_type="ulb", book_code="rom"),
+        model.ResourceRequest(lang_code="en", resource_type="tn", book_code="rom"),
+    ],
+)
+
+
+async def queue_document_request(client: httpx.AsyncClient) -> str:
+    """
+    Remove the requested document, so that a task generates it rather
+    than the API answering from the output cache, request it and
+    return its task's id.
+    """
+    document_request_key = document_generator.document_request_key_of(DOCUMENT_REQUEST)
+    for filepath in [
+        document_generator.html_filepath(document_request_key),
+        document_generator.pdf_filepath(document_request_key),
+    ]:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+    response = await client.post(
+        "/documents", json=DOCUMENT_REQUEST.model_dump(mode="json")
+    )
+    return str(response.json()["task_id"])
+
+
+async def poll_task_status(client: httpx.AsyncClient, task_id: str) -> int:
+    """Poll the task's status until it has finished and return the number of requests."""
+    num_requests = 0
+    while True:
+        response = await client.get("/task_status/{}".format(task_id))
+        num_requests += 1
+        if response.json()["state"] in celery.states.READY_STATES:
+            return num_requests
+        await asyncio.sleep(POLL_SECONDS)
+
+
+async def stream_task_events(client: httpx.AsyncClient, task_id: str) -> int:
+    """Stream the task's status until it has finished and return the number of requests."""
+    async with client.stream("GET", "/task_events/{}".format(task_id)) as response:
+        async for line in response.aiter_lines():
+            if (
+                line.startswith("data: ")
+                and json.loads(line[len("data: ") :])["state"]
+                in celery.states.READY_STATES
+            ):
+                break
+    return 1
+
+
+async def watch(num_watchers: int, stream: bool) -> tuple[float, float, int]:
+    """
+    Have num_watchers clients watch a document request's task until it
+    has finished and return the wall clock and CPU seconds it took and
+    the number of requests made.
+    """
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url=settings.api_test_url(),
+        timeout=None,
+    ) as client:
+        task_id = await queue_document_request(client)
+        watch_task = stream_task_events if stream else poll_task_status
+        t0, cpu0 = time.time(), time.process_time()
+        num_requests = await asyncio.gather(
+            *(watch_task(client, task_id) for _ in range(num_watchers))
+        )
+        t1, cpu1 = time.time(), time.process_time()
+    return t1 - t0, cpu1 - cpu0, sum(num_requests)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("num_watchers", [10, 100])
+def test_task_events_load(num_watchers: int) -> None:
+    polling_seconds, polling_cpu_seconds, polling_num_requests = asyncio.run(
+        watch(num_watchers, stream=False)
+    )
+    streaming_seconds, streaming_cpu_seconds, streaming_num_requests = asyncio.run(
+        watch(num_watchers, stream=True)
+    )
+    logger.info(
+        "%s watchers: polling every %ss %.1fs, %.2f CPU seconds, %s requests; streaming %.1fs, %.2f CPU seconds, %s requests",
+        num_watchers,
+        POLL_SECONDS,
+        polling_seconds,
+        polling_cpu_seconds,
+        polling_num_requests,
+        streaming_seconds,
+        streaming_cpu_seconds,
+        streaming_num_requests,
+    )
+    assert streaming_num_requests == num_watchers
+    assert polling_num_requests >= num_watchers
@@ -27,10 +27,21 @@ def check_result(
     failure_state: str = "FAILURE",
 ) -> str:
     logger.debug("response.json(): {}".format(response.json()))
+    finished_document_request_key: str
+    if response.json().get("state") == success_state:
+        # The document was in the output cache so the API answered
+        # with the finished result rather than a task to poll.
+        finished_document_request_key = str(response.json()["result"])
+        assert os.path.exists(
+            os.path.join(
+                settings.DOCUMENT_OUTPUT_DIR,
+                "{}.{}".format(finished_document_request_key, suffix),
+            )
+        )
+        return finished_document_request_key
     task_id = response.json()["task_id"]
     assert task_id
     logger.debug("task_id: %s", task_id)
-    finished_document_request_key: str
     while True:
         with TestClient(app=app, base_url=settings.api_test_url()) as client:
             response2 = client.get(
@@ -39,7 +50,7 @@ def check_result(
             json_data = response2.json()
             logger.debug("json task status data: {}".format(json_data))
             if json_data["state"] == success_state:
-                finished_document_request_key = json_data["result"]
+                finished_document_request_key = str(json_data["result"])
                 finished_document_path = os.path.join(
                     settings.DOCUMENT_OUTPUT_DIR,
                     "{}.{}".format(finished_document_request_key, suffix),
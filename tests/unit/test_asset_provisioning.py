@@ -0,0 +1,201 @@
+import multiprocessing
+import os
+import pathlib
+import subprocess
+import time
+
+import pytest
+
+from document.domain import resource_lookup
+from document.domain.model import LangDirEnum, ResourceLookupDto
+
+
+def commit(repo_dir: pathlib.Path) -> None:
+    subprocess.run(["git", "add", "."], cwd=repo_dir, check=True)
+    subprocess.run(
+        [
+            "git",
+            "-c",
+            "user.name=test",
+            "-c",
+            "user.email=test@example.com",
+            "commit",
+            "-q",
+            "-m",
+            "update",
+        ],
+        cwd=repo_dir,
+        check=True,
+    )
+
+
+@pytest.fixture
+def source_repos(tmp_path: pathlib.Path) -> dict[str, str]:
+    """Local git repos standing in for the remote resource repos."""
+    urls = {}
+    for name in ("en_ulb", "en_tn"):
+        repo_dir = tmp_path / "remote" / name
+        repo_dir.mkdir(parents=True)
+        (repo_dir / "manifest.yaml").write_text("name: {}\n".format(name))
+        subprocess.run(["git", "init", "-q"], cwd=repo_dir, check=True)
+        commit(repo_dir)
+        urls[name] = repo_dir.as_uri()
+    return urls
+
+
+def dto(url: str, resource_type: str, book_code: str) -> ResourceLookupDto:
+    return ResourceLookupDto(
+        lang_code="en",
+        lang_name="English",
+        resource_type=resource_type,
+        resource_type_name=resource_type,
+        book_code=book_code,
+        lang_direction=LangDirEnum.LTR,
+        url=url,
+    )
+
+
+def test_provision_asset_files_concurrently(
+    source_repos: dict[str, str], tmp_path: pathlib.Path
+) -> None:
+    working_dir = tmp_path / "assets"
+    working_dir.mkdir()
+    dtos = [
+        dto(source_repos["en_ulb"], "ulb", "gen"),
+        dto(source_repos["en_tn"], "tn", "gen"),
+        dto(source_repos["en_ulb"], "ulb", "exo"),
+    ]
+    resource_dirs = resource_lookup.provision_asset_files_concurrently(
+        dtos, max_workers=4, working_dir=str(working_dir)
+    )
+    assert resource_dirs == [
+        str(working_dir / "en_ulb"),
+        str(working_dir / "en_tn"),
+        str(working_dir / "en_ulb"),
+    ]
+    for resource_dir in resource_dirs:
+        assert (pathlib.Path(resource_dir) / "manifest.yaml").exists()
+    assert sorted(path.name for path in working_dir.iterdir() if path.is_dir()) == [
+        "en_tn",
+        "en_ulb",
+    ]
+
+
+def test_resource_filepath_is_looked_up_in_catalog(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    url = "https://content.bibletranslationtools.org/WA-Catalog/en_ulb"
+    catalog = resource_lookup.ResourceCatalog(
+        [
+            resource_lookup.CatalogEntry(
+                url=url,
+                lang_code="en",
+                lang_name="English",
+                national_name="English",
+                lang_direction=LangDirEnum.LTR,
+                resource_type="ulb",
+                last_segment="en_ulb_from_catalog",
+                repo_components=("en", "ulb"),
+            )
+        ]
+    )
+    monkeypatch.setattr(resource_lookup, "resource_catalog", lambda: catalog)
+    assert resource_lookup.resource_filepath(
+        dto(url, "ulb", "gen"), "assets"
+    ) == os.path.join("assets", "en_ulb_from_catalog")
+    assert resource_lookup.resource_filepath(
+        dto(url.replace("en_ulb", "en_tn"), "tn", "gen"), "assets"
+    ) == os.path.join("assets", "en_tn")
+
+
+def test_concurrent_clones_of_same_repo_clone_once(
+    source_repos: dict[str, str], tmp_path: pathlib.Path
+) -> None:
+    working_dir = tmp_path / "assets"
+    working_dir.mkdir()
+    resource_filepath = str(working_dir / "en_ulb")
+    num_workers = 4
+    with multiprocessing.get_context("fork").Pool(num_workers) as pool:
+        pool.starmap(
+            resource_lookup.clone_git_repo,
+            [(source_repos["en_ulb"], resource_filepath)] * num_workers,
+        )
+    assert (pathlib.Path(resource_filepath) / "manifest.yaml").exists()
+    # No temporary clone directories are left behind.
+    assert sorted(path.name for path in working_dir.iterdir()) == [
+        "en_ulb",
+        "en_ulb.commit",
+        "en_ulb.lock",
+        "en_ulb.manifest.json",
+    ]
+
+
+def test_failed_clone_leaves_nothing_behind(tmp_path: pathlib.Path) -> None:
+    resource_filepath = tmp_path / "en_missing"
+    resource_lookup.clone_git_repo(
+        (tmp_path / "does_not_exist").as_uri(), str(resource_filepath)
+    )
+    assert not resource_filepath.exists()
+    assert [path.name for path in tmp_path.iterdir()] == ["en_missing.lock"]
+
+
+def test_refresh_fetches_only_stale_repos(
+    source_repos: dict[str, str], tmp_path: pathlib.Path
+) -> None:
+    working_dir = tmp_path / "assets"
+    working_dir.mkdir()
+    resource_filepath = str(working_dir / "en_ulb")
+    resource_lookup.clone_git_repo(source_repos["en_ulb"], resource_filepath)
+    first_commit_hash = resource_lookup.recorded_commit_hash(resource_filepath)
+    assert first_commit_hash
+    remote_dir = tmp_path / "remote" / "en_ulb"
+    (remote_dir / "manifest.yaml").write_text("name: en_ulb v2\n")
+    commit(remote_dir)
+    # The repo was just cloned so it is still fresh.
+    assert resource_lookup.refresh_stale_repos(str(working_dir), 1) == []
+    # Age the repo beyond the caching period.
+    commit_hash_filepath = resource_lookup.commit_hash_filepath(resource_filepath)
+    two_hours_ago = time.time() - 2 * 60 * 60
+    os.utime(commit_hash_filepath, (two_hours_ago, two_hours_ago))
+    assert resource_lookup.refresh_stale_repos(str(working_dir), 1) == ["en_ulb"]
+    assert (pathlib.Path(resource_filepath) / "manifest.yaml").read_text() == (
+        "name: en_ulb v2\n"
+    )
+    assert resource_lookup.recorded_commit_hash(resource_filepath) not in (
+        None,
+        first_commit_hash,
+    )
+    # The new clone was swapped into place leaving no temporary
+    # directories behind, and the refresh was stamped.
+    assert sorted(path.name for path in working_dir.iterdir()) == [
+        ".refreshed",
+        "en_ulb",
+        "en_ulb.commit",
+        "en_ulb.lock",
+        "en_ulb.manifest.json",
+    ]
+    # Aged again, but nothing changed upstream.
+    os.utime(commit_hash_filepath, (two_hours_ago, two_hours_ago))
+    assert resource_lookup.refresh_stale_repos(str(working_dir), 1) == []
+
+
+def test_lookup_caches_are_cleared_when_repos_are_refreshed(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cleared = []
+    monkeypatch.setattr(
+        resource_lookup, "clear_lookup_caches", lambda: cleared.append(True)
+    )
+    monkeypatch.setattr(resource_lookup, "_refresh_stamp", None)
+    # Nothing has been refreshed yet.
+    resource_lookup.clear_lookup_caches_if_refreshed(str(tmp_path))
+    assert cleared == []
+    stamp_filepath = pathlib.Path(resource_lookup.refresh_stamp_filepath(str(tmp_path)))
+    stamp_filepath.touch()
+    resource_lookup.clear_lookup_caches_if_refreshed(str(tmp_path))
+    resource_lookup.clear_lookup_caches_if_refreshed(str(tmp_path))
+    assert cleared == [True]
+    an_hour_from_now = time.time() + 60 * 60
+    os.utime(stamp_filepath, (an_hour_from_now, an_hour_from_now))
+    resource_lookup.clear_lookup_caches_if_refreshed(str(tmp_path))
+    assert cleared == [True, True]
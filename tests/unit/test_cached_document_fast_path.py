@@ -0,0 +1,86 @@
+import os
+from typing import Any, Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from document.config import settings
+from document.domain import document_generator, model, request_coalescing
+from document.entrypoints.app import app
+
+DOCUMENT_REQUEST = model.DocumentRequest(
+    assembly_strategy_kind=model.AssemblyStrategyEnum.LANGUAGE_BOOK_ORDER,
+    assembly_layout_kind=model.AssemblyLayoutEnum.ONE_COLUMN,
+    layout_for_print=False,
+    chunk_size=model.ChunkSizeEnum.CHAPTER,
+    generate_pdf=True,
+    generate_epub=False,
+    generate_docx=False,
+    resource_requests=[
+        model.ResourceRequest(lang_code="en", resource_type="ulb", book_code="jud"),
+        model.ResourceRequest(lang_code="en", resource_type="tn", book_code="jud"),
+    ],
+)
+
+
+@pytest.fixture
+def queued_tasks(monkeypatch: pytest.MonkeyPatch) -> list[Any]:
+    """Record the tasks which the API queues rather than queuing them."""
+    tasks: list[Any] = []
+
+    def apply_async(task: Any, *args: Any) -> str:
+        tasks.append(task)
+        return "task-{}".format(len(tasks))
+
+    monkeypatch.setattr(request_coalescing, "apply_async", apply_async)
+    monkeypatch.setattr(request_coalescing, "in_flight_task_id", lambda key: None)
+    return tasks
+
+
+@pytest.fixture
+def document_request_key() -> Iterator[str]:
+    """Yield the key of the document, removing any of its files after."""
+    document_request_key = document_generator.document_request_key_of(DOCUMENT_REQUEST)
+    yield document_request_key
+    for suffix in ["html", "pdf"]:
+        filepath = os.path.join(
+            settings.DOCUMENT_OUTPUT_DIR, "{}.{}".format(document_request_key, suffix)
+        )
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+
+def write_document(document_request_key: str, suffix: str) -> None:
+    os.makedirs(settings.DOCUMENT_OUTPUT_DIR, exist_ok=True)
+    with open(
+        os.path.join(
+            settings.DOCUMENT_OUTPUT_DIR, "{}.{}".format(document_request_key, suffix)
+        ),
+        "w",
+    ) as fout:
+        fout.write(suffix)
+
+
+def test_cached_document_is_returned_without_a_task(
+    queued_tasks: list[Any], document_request_key: str
+) -> None:
+    write_document(document_request_key, "html")
+    write_document(document_request_key, "pdf")
+    with TestClient(app=app, base_url=settings.api_test_url()) as client:
+        response = client.post(
+            "/documents", json=DOCUMENT_REQUEST.model_dump(mode="json")
+        )
+    assert response.json() == {"state": "SUCCESS", "result": document_request_key}
+    assert queued_tasks == []
+
+
+def test_document_missing_a_format_is_queued(
+    queued_tasks: list[Any], document_request_key: str
+) -> None:
+    write_document(document_request_key, "html")
+    with TestClient(app=app, base_url=settings.api_test_url()) as client:
+        response = client.post(
+            "/documents", json=DOCUMENT_REQUEST.model_dump(mode="json")
+        )
+    assert response.json() == {"task_id": "task-1"}
+    assert queued_tasks == [document_generator.generate_document]
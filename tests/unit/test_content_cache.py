@@ -0,0 +1,56 @@
+import os
+import pathlib
+
+from document.utils import content_cache
+
+
+def test_cached_content_renders_once_per_source(tmp_path: pathlib.Path) -> None:
+    renders = []
+
+    def render() -> str:
+        renders.append(1)
+        return "<p>In the beginning</p>"
+
+    for _ in range(3):
+        assert (
+            content_cache.cached_content(
+                "usfm", ("v1", "\\v 1 In the beginning"), render, True, str(tmp_path)
+            )
+            == "<p>In the beginning</p>"
+        )
+    assert len(renders) == 1
+    # A different renderer version is a different entry.
+    content_cache.cached_content(
+        "usfm", ("v2", "\\v 1 In the beginning"), render, True, str(tmp_path)
+    )
+    assert len(renders) == 2
+
+
+def test_failed_renderings_are_not_cached(tmp_path: pathlib.Path) -> None:
+    renders = []
+
+    def render() -> None:
+        renders.append(1)
+        return None
+
+    for _ in range(2):
+        assert (
+            content_cache.cached_content(
+                "usfm", ("v1", "bad"), render, True, str(tmp_path)
+            )
+            is None
+        )
+    assert len(renders) == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: pathlib.Path) -> None:
+    cache_dir = str(tmp_path)
+    keys = [content_cache.content_key(str(num)) for num in range(4)]
+    paths = [content_cache.entry_path(key, cache_dir) for key in keys]
+    for num, path in enumerate(paths):
+        content_cache.write_entry(path, "x" * 100, cache_dir, 10_000)
+        os.utime(path, (num, num))
+    # Reading an entry makes it the most recently used.
+    assert content_cache.read_entry(paths[0]) == "x" * 100
+    assert content_cache.evict_least_recently_used(cache_dir, 300) == 200
+    assert [os.path.exists(path) for path in paths] == [True, False, False, True]
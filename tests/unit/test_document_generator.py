@@ -1,15 +1,28 @@
+import json
 import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
 
 from document.config import settings
 
-from document.domain import document_generator, model
+from document.domain import document_generator, model, pdf_rendering, resource_lookup
+from document.domain.assembly_strategies.assembly_strategies_lang_then_book_by_chapter import (
+    assemble_content_by_lang_then_book,
+)
 
 
-def test_document_request_key_too_long_for_semantic_result() -> None:
+def test_document_request_key_of_large_request_is_stable() -> None:
     """
     Use enough resource requests that a semantic name built from them
-    will be too long which will cause the document request key algorithm
-    to use a timestamp-based, non-semantic, name.
+    would be too long for a file name and check that the key is still
+    a short hash which is the same for each ordering of them which
+    keeps the order of the USFM resources which share a language and
+    book.
     """
     components = [
         (
@@ -92,4 +105,358 @@ def test_document_request_key_too_long_for_semantic_result() -> None:
         chunk_size,
         limit_words,
     )
-    assert re.search(r"[0-9]+_[0-9]+", key)
+    assert re.fullmatch(r"[0-9a-f]{64}", key)
+    assert key == document_generator.document_request_key(
+        resource_requests[7:] + resource_requests[:7] + resource_requests[:3],
+        assembly_strategy_kind,
+        assembly_layout_kind,
+        chunk_size,
+        limit_words,
+    )
+
+
+def test_document_request_key_ignores_flags_which_do_not_apply() -> None:
+    def key(
+        resource_types: list[str], limit_words: bool, include_tn_book_intros: bool
+    ) -> str:
+        return document_generator.document_request_key(
+            [
+                model.ResourceRequest(
+                    lang_code="en", resource_type=resource_type, book_code="col"
+                )
+                for resource_type in resource_types
+            ],
+            model.AssemblyStrategyEnum.LANGUAGE_BOOK_ORDER,
+            model.AssemblyLayoutEnum.ONE_COLUMN,
+            model.ChunkSizeEnum.CHAPTER,
+            limit_words,
+            include_tn_book_intros,
+        )
+
+    assert key(["ulb"], True, True) == key(["ulb"], False, False)
+    assert key(["ulb", "tw"], True, False) != key(["ulb", "tw"], False, False)
+    assert key(["ulb", "tn"], False, True) != key(["ulb", "tn"], False, False)
+
+
+def test_document_request_key_keeps_the_order_of_usfm_resources() -> None:
+    def key(resource_types: list[str]) -> str:
+        return document_generator.document_request_key(
+            [
+                model.ResourceRequest(
+                    lang_code="en", resource_type=resource_type, book_code="col"
+                )
+                for resource_type in resource_types
+            ],
+            model.AssemblyStrategyEnum.LANGUAGE_BOOK_ORDER,
+            model.AssemblyLayoutEnum.ONE_COLUMN,
+            model.ChunkSizeEnum.CHAPTER,
+            False,
+        )
+
+    # The first USFM requested is the primary USFM, so their order
+    # determines the document's content, ...
+    assert key(["ulb", "f10", "tn"]) != key(["f10", "ulb", "tn"])
+    # ... but not the order of the other resources.
+    assert key(["ulb", "f10", "tn"]) == key(["tn", "ulb", "f10"])
+    assert key(["ulb", "tn"]) == key(["tn", "ulb"])
+
+
+def test_document_request_metadata_describes_document_request(
+    tmp_path: Any,
+) -> None:
+    document_request = model.DocumentRequest(
+        assembly_strategy_kind=model.AssemblyStrategyEnum.LANGUAGE_BOOK_ORDER,
+        resource_requests=[
+            model.ResourceRequest(lang_code="en", resource_type="ulb", book_code="col"),
+            model.ResourceRequest(lang_code="en", resource_type="tn", book_code="col"),
+        ],
+    )
+    document_request_key = document_generator.document_request_key_of(document_request)
+    document_generator.record_document_request_metadata(
+        document_request_key, document_request, str(tmp_path)
+    )
+    with open(
+        document_generator.metadata_filepath(document_request_key, str(tmp_path))
+    ) as fin:
+        metadata = json.load(fin)
+    assert metadata["description"] == "en-tn-col_en-ulb-col_lbo_1c_chapter_tbif"
+    assert metadata["resource_requests"] == [["en", "tn", "col"], ["en", "ulb", "col"]]
+
+
+def test_invalidate_documents_depending_on_changed_repos(tmp_path: Any) -> None:
+    output_dir = str(tmp_path)
+    for key, repos in (
+        ("en-ulb-gen_en-tn-gen", {"en_ulb": "a1", "en_tn": "b1"}),
+        ("fr-f10-mat", {"fr_f10": "c1"}),
+    ):
+        for filepath in (
+            document_generator.html_filepath(key, output_dir),
+            document_generator.pdf_filepath(key, output_dir),
+        ):
+            with open(filepath, "w") as fout:
+                fout.write("content")
+        with open(
+            document_generator.repo_dependencies_filepath(key, output_dir), "w"
+        ) as fout:
+            json.dump(repos, fout)
+    assert document_generator.invalidate_documents_depending_on(
+        ["en_tn"], output_dir
+    ) == ["en-ulb-gen_en-tn-gen"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "fr-f10-mat.html",
+        "fr-f10-mat.pdf",
+        "fr-f10-mat_repos.json",
+    ]
+
+
+def usfm_book(num_chapters: int) -> model.USFMBook:
+    return model.USFMBook(
+        lang_code="en",
+        lang_name="English",
+        book_code="gen",
+        resource_type_name="Unlocked Literal Bible",
+        chapters={
+            chapter_num: model.USFMChapter(
+                content='<div class="chapter"><span class="verse">{}</span></div>'.format(
+                    chapter_num
+                )
+            )
+            for chapter_num in range(1, num_chapters + 1)
+        },
+        lang_direction=model.LangDirEnum.LTR,
+    )
+
+
+def test_write_html_content_to_file_streams_assembled_content(tmp_path: Any) -> None:
+    usfm_books = [usfm_book(50)]
+    content = assemble_content_by_lang_then_book(
+        usfm_books, [], [], [], [], model.AssemblyLayoutEnum.ONE_COLUMN
+    )
+    output_filename = str(tmp_path / "en-ulb-gen.html")
+    document_generator.write_html_content_to_file(
+        content,
+        output_filename,
+        "<header>",
+        "<footer>",
+        check_for_verses=True,
+    )
+    expected_content = "".join(
+        assemble_content_by_lang_then_book(
+            usfm_books, [], [], [], [], model.AssemblyLayoutEnum.ONE_COLUMN
+        )
+    )
+    with open(output_filename) as fin:
+        assert fin.read() == "<header>{}<footer>".format(expected_content)
+    # Only the finished document remains.
+    assert [path.name for path in tmp_path.iterdir()] == ["en-ulb-gen.html"]
+
+
+def test_write_html_content_to_file_checks_for_verses(tmp_path: Any) -> None:
+    output_filename = str(tmp_path / "en-ulb-gen.html")
+    # The verse marker spans two fragments.
+    document_generator.write_html_content_to_file(
+        iter(['<span class="ve', 'rse">1</span>']),
+        output_filename,
+        "<header>",
+        "<footer>",
+        check_for_verses=True,
+    )
+    with open(output_filename) as fin:
+        assert fin.read() == '<header><span class="verse">1</span><footer>'
+    document_generator.write_html_content_to_file(
+        iter(["<p>", "No verses", "</p>"]),
+        output_filename,
+        "<header>",
+        "<footer>",
+        check_for_verses=True,
+    )
+    with open(output_filename) as fin:
+        content = fin.read()
+    assert content.startswith("<header>NOTE: There are issues")
+    assert content.endswith("<footer>")
+
+
+class FakeTask:
+    """Stands in for celery's current_task and records its states."""
+
+    def __init__(self) -> None:
+        self.states: list[tuple[str, Any]] = []
+        self.reported: defaultdict[str, threading.Event] = defaultdict(threading.Event)
+
+    def update_state(self, state: str, meta: Any = None) -> None:
+        # Copy the finished formats which the task goes on to mutate.
+        self.states.append((state, json.loads(json.dumps(meta))))
+        self.reported[state].set()
+
+
+def all_formats_document_request() -> model.DocumentRequest:
+    return model.DocumentRequest(
+        assembly_strategy_kind=model.AssemblyStrategyEnum.LANGUAGE_BOOK_ORDER,
+        assembly_layout_kind=model.AssemblyLayoutEnum.ONE_COLUMN,
+        layout_for_print=False,
+        chunk_size=model.ChunkSizeEnum.CHAPTER,
+        generate_pdf=True,
+        generate_epub=True,
+        generate_docx=True,
+        resource_requests=[
+            model.ResourceRequest(lang_code="en", resource_type="ulb", book_code="jud"),
+        ],
+    )
+
+
+def test_generate_document_in_all_formats_reports_formats_as_they_finish(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_task = FakeTask()
+    monkeypatch.setattr(document_generator, "current_task", fake_task)
+    monkeypatch.setattr(document_generator, "file_needs_update", lambda path: True)
+    monkeypatch.setattr(
+        document_generator, "parsed_books", lambda request: ([], ([],) * 5)
+    )
+    html_written = threading.Event()
+
+    def write_html_document(*args: Any) -> None:
+        html_written.set()
+
+    def convert_html_to_epub(*args: Any) -> None:
+        pass
+
+    # The formats finish in the order ePub, Docx and PDF.
+    def write_docx_document(*args: Any) -> None:
+        # The Docx is written concurrently with the HTML.
+        assert html_written.wait(5)
+        assert fake_task.reported["Finished ePub"].wait(5)
+
+    def convert_html_to_pdf(*args: Any) -> None:
+        assert fake_task.reported["Finished Docx"].wait(5)
+        raise RuntimeError("PDF rendering failed")
+
+    monkeypatch.setattr(document_generator, "write_html_document", write_html_document)
+    monkeypatch.setattr(document_generator, "write_docx_document", write_docx_document)
+    monkeypatch.setattr(document_generator, "convert_html_to_pdf", convert_html_to_pdf)
+    monkeypatch.setattr(
+        document_generator, "convert_html_to_epub", convert_html_to_epub
+    )
+    document_request = all_formats_document_request()
+    with pytest.raises(RuntimeError, match="PDF rendering failed"):
+        document_generator.generate_document_in_all_formats(document_request.json())
+    document_request_key = document_generator.document_request_key_of(document_request)
+    assert [state for state, _ in fake_task.states] == [
+        "Receiving request",
+        "Assembling content",
+        "Converting",
+        "Finished ePub",
+        "Finished Docx",
+    ]
+    # Each format is reported, in the order it finished, along with
+    # those which finished before it. The failed PDF never is.
+    assert [meta for _, meta in fake_task.states[2:]] == [
+        {"document_request_key": document_request_key, "finished_formats": formats}
+        for formats in [[], ["epub"], ["epub", "docx"]]
+    ]
+
+
+def test_generate_docx_document_reports_conversion(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_task = FakeTask()
+    monkeypatch.setattr(document_generator, "current_task", fake_task)
+    monkeypatch.setattr(document_generator, "file_needs_update", lambda path: True)
+    monkeypatch.setattr(
+        document_generator, "parsed_books", lambda request: ([], ([],) * 5)
+    )
+    for name in [
+        "assemble_docx_content",
+        "convert_html_to_docx",
+        "record_repo_dependencies",
+        "record_document_request_metadata",
+    ]:
+        monkeypatch.setattr(document_generator, name, lambda *args: None)
+    monkeypatch.setattr(
+        document_generator,
+        "get_languages_title_page_strings",
+        lambda dtos: ("English", "Jude"),
+    )
+    document_generator.generate_docx_document(all_formats_document_request().json())
+    assert [state for state, _ in fake_task.states] == [
+        "Assembling content",
+        "Converting to Docx",
+    ]
+
+
+def test_pdf_renderer_pool_is_only_warmed_by_pdf_workers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    warmed: list[str] = []
+    monkeypatch.setattr(
+        pdf_rendering,
+        "pdf_renderer_pool",
+        lambda: SimpleNamespace(warm=lambda: warmed.append("pdf")),
+    )
+    for worker_queues in ["light", "html", "epub", "docx"]:
+        monkeypatch.setenv("CELERY_WORKER_QUEUES", worker_queues)
+        document_generator.warm_pdf_renderer_pool(True)
+    assert warmed == []
+    monkeypatch.setenv("CELERY_WORKER_QUEUES", "pdf")
+    document_generator.warm_pdf_renderer_pool(True)
+    assert warmed == ["pdf"]
+
+
+def test_translation_words_are_limited_outside_of_the_task_thread(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # The Docx of generate_document_in_all_formats is assembled in a
+    # thread of its own where celery's current_task is None.
+    monkeypatch.setattr(document_generator, "current_task", None)
+    monkeypatch.setattr(
+        document_generator, "found_usfm_resource_lookup_dtos", lambda requests: []
+    )
+    monkeypatch.setattr(
+        resource_lookup,
+        "provision_asset_files_concurrently",
+        lambda dtos: [],
+    )
+    tw_book = model.TWBook(
+        lang_code="en",
+        lang_name="English",
+        book_code="jud",
+        resource_type_name="Translation Words",
+        lang_direction=model.LangDirEnum.LTR,
+    )
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        section = executor.submit(
+            document_generator.translation_words_section,
+            tw_book,
+            None,
+            True,
+            [],
+            update_task_state=False,
+        ).result()
+    assert section == ""
+
+
+def test_write_docx_document_only_updates_task_state_when_asked(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    update_task_states: list[bool] = []
+
+    def assemble_docx_content(*args: Any) -> None:
+        update_task_states.append(args[-1])
+
+    monkeypatch.setattr(
+        document_generator, "assemble_docx_content", assemble_docx_content
+    )
+    for name in [
+        "convert_html_to_docx",
+        "record_repo_dependencies",
+        "record_document_request_metadata",
+    ]:
+        monkeypatch.setattr(document_generator, name, lambda *args: None)
+    monkeypatch.setattr(
+        document_generator,
+        "get_languages_title_page_strings",
+        lambda dtos: ("English", "Jude"),
+    )
+    document_request = all_formats_document_request()
+    document_generator.write_docx_document("key", document_request, [], *([],) * 5)
+    assert update_task_states == [False]
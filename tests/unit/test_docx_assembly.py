@@ -0,0 +1,79 @@
+import pytest
+from docx import Document  # type: ignore
+from docxcompose.composer import Composer  # type: ignore
+
+from document.domain.assembly_strategies_docx.assembly_strategy_utils import (
+    add_hr,
+    add_one_column_section,
+    add_page_break,
+    add_two_column_section,
+    append_html,
+)
+
+# (HTML, language code, is RTL) of fragments which exercise what
+# create_docx_subdoc and Composer.append do to each fragment: language
+# tagging, RTL runs, horizontal rulers, restarted numbered lists, links
+# and tables.
+FRAGMENTS = [
+    (
+        "<h1>Genesis</h1><p>In the <b>beginning</b> <i>God</i></p><ol><li>one</li><li>two</li></ol>",
+        "en",
+        False,
+    ),
+    (
+        "<h2>1</h2><p>Verse <span style='color:#ff0000'>red</span></p><ul><li>b</li></ul><hr/><p>after</p>",
+        "fr",
+        False,
+    ),
+    (
+        "<p>مرحبا <a href='https://example.org'>link</a></p><ol><li>a</li><li>b</li></ol>",
+        "ar-sa",
+        True,
+    ),
+    ("", "en", False),
+    ("<table><tr><td>c1</td><td>c2</td></tr></table>", "xx", False),
+    ("<ol><li>again</li></ol><p>pt</p>", "pt", False),
+]
+
+
+def assembled_document(
+    append_html_directly: bool, use_ooxml_writer: bool = False
+) -> Document:
+    doc = Document()
+    composer = Composer(doc)
+    for index, (html, lang_code, is_rtl) in enumerate(FRAGMENTS):
+        if index % 2:
+            add_two_column_section(doc)
+        else:
+            add_one_column_section(doc)
+        append_html(
+            composer,
+            html,
+            lang_code,
+            is_rtl,
+            add_hr_p=index != 1,
+            append_html_directly=append_html_directly,
+            use_ooxml_writer=use_ooxml_writer,
+        )
+        add_hr(doc.add_paragraph())
+        add_page_break(doc)
+    return composer.doc
+
+
+@pytest.mark.parametrize("use_ooxml_writer", [False, True])
+def test_append_html_directly_is_same_as_composing_subdocs(
+    use_ooxml_writer: bool,
+) -> None:
+    composed = assembled_document(append_html_directly=False)
+    appended = assembled_document(
+        append_html_directly=True, use_ooxml_writer=use_ooxml_writer
+    )
+    assert appended.element.body.xml == composed.element.body.xml
+    assert (
+        appended.part.numbering_part.element.xml
+        == composed.part.numbering_part.element.xml
+    )
+    assert appended.styles.element.xml == composed.styles.element.xml
+    assert [(rel.reltype, rel.target_ref) for rel in appended.part.rels.values()] == [
+        (rel.reltype, rel.target_ref) for rel in composed.part.rels.values()
+    ]
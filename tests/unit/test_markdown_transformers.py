@@ -1,10 +1,16 @@
+import glob
 import os
+import pathlib
+import re
+from typing import Any
 
 import mistune
 
 import pytest
 
+from document.config import settings
 from document.domain import model
+from document.domain.bible_books import BOOK_NAMES
 from document.markdown_transforms import markdown_transformer
 from document.utils import tw_utils
 
@@ -85,14 +91,37 @@ def test_translation_word_link_alt(datafiles: list[str]) -> None:
     resource_requests = [
         model.ResourceRequest(lang_code="en", resource_type="ulb", book_code="gen")
     ]
-    translation_words_dict = tw_utils.translation_words_dict(tw_resource_dir)
+    translation_words_index = tw_utils.translation_words_index(tw_resource_dir)
     source = markdown_transformer.remove_sections(source)
     source = markdown_transformer.transform_tw_links(
-        source, "en", resource_requests, translation_words_dict
+        source, "en", resource_requests, translation_words_index
     )
     assert expected == source
 
 
+@pytest.mark.datafiles(EN_TW_RESOURCE_DIR)
+def test_translation_words_index(datafiles: list[str]) -> None:
+    tw_resource_dir = str(datafiles)
+    translation_words_index = tw_utils.translation_words_index(tw_resource_dir)
+    assert translation_words_index["moses"] == model.TranslationWord(
+        localized_word="Moses",
+        filepath=os.path.join(tw_resource_dir, "bible", "names", "moses.md"),
+        category="names",
+    )
+    assert translation_words_index["adoption"].category == "kt"
+    assert tw_utils.translation_words_index(tw_resource_dir) is translation_words_index
+    source = "(See also: [[rc://*/tw/dict/bible/names/moses]])"
+    resource_requests = [
+        model.ResourceRequest(lang_code="en", resource_type="tw", book_code="gen")
+    ]
+    assert (
+        markdown_transformer.transform_tw_links(
+            source, "en", resource_requests, translation_words_index
+        )
+        == "(See also: [Moses](#en-Moses))"
+    )
+
+
 @pytest.mark.datafiles(GU_TW_RESOURCE_DIR)
 def test_translation_word_link_alt_gu(datafiles: list[str]) -> None:
     tw_resource_dir = str(datafiles)
@@ -101,10 +130,10 @@ def test_translation_word_link_alt_gu(datafiles: list[str]) -> None:
     resource_requests = [
         model.ResourceRequest(lang_code="en", resource_type="ulb", book_code="gen")
     ]
-    translation_words_dict = tw_utils.translation_words_dict(tw_resource_dir)
+    translation_words_index = tw_utils.translation_words_index(tw_resource_dir)
     source = markdown_transformer.remove_sections(source)
     source = markdown_transformer.transform_tw_links(
-        source, "gu", resource_requests, translation_words_dict
+        source, "gu", resource_requests, translation_words_index
     )
     assert expected == source
 
@@ -153,3 +182,106 @@ def test_remove_pagination_symbols_from_commentary() -> None:
 """
     source = markdown_transformer.remove_pagination_symbols(source)
     assert expected == source
+
+
+def corpus_filepaths() -> list[tuple[str, str]]:
+    """
+    Return (lang_code, filepath) pairs for the markdown files of the TW
+    test data and of any TN, TQ, or TW resources provisioned in
+    settings.RESOURCE_ASSETS_DIR.
+    """
+    resource_dirs = [EN_TW_RESOURCE_DIR, GU_TW_RESOURCE_DIR]
+    for resource_type in ["tn", "tq", "tw"]:
+        resource_dirs.extend(
+            glob.glob(
+                os.path.join(
+                    settings.RESOURCE_ASSETS_DIR,
+                    "*_{}*".format(resource_type),
+                    "*_{}".format(resource_type),
+                )
+            )
+        )
+    return [
+        (os.path.basename(resource_dir).split("_")[0], filepath)
+        for resource_dir in resource_dirs
+        for filepath in sorted(
+            glob.glob(os.path.join(resource_dir, "**", "*.md"), recursive=True)
+        )
+    ]
+
+
+def test_single_pass_link_transformation_matches_sequential(tmp_path: Any) -> None:
+    """
+    Transform the links in real TN, TQ, and TW markdown in one pass and
+    one regex at a time and check that the results are the same.
+    """
+    working_dir = str(tmp_path)
+    corpus = [
+        (lang_code, open(filepath).read()) for lang_code, filepath in corpus_filepaths()
+    ]
+    # Provision every other TN note that the corpus links to so that
+    # links are both built and removed.
+    tn_links = (
+        match
+        for _, source in corpus
+        for match in re.finditer(
+            r"rc://(?P<lang_code>[^/)\]]+)/tn/help/(?P<book_code>\w+)/(?P<chapter_num>\d+)/(?P<verse_ref>\w+)",
+            source,
+        )
+    )
+    for index, match in enumerate(tn_links):
+        if index % 2:
+            note_dir = os.path.join(
+                working_dir,
+                "{}_tn".format(match.group("lang_code")),
+                "{}_tn".format(match.group("lang_code")),
+                match.group("book_code"),
+                match.group("chapter_num"),
+            )
+            os.makedirs(note_dir, exist_ok=True)
+            pathlib.Path(note_dir, "{}.md".format(match.group("verse_ref"))).touch()
+    translation_words_indices = {
+        "en": tw_utils.translation_words_index(EN_TW_RESOURCE_DIR),
+        "gu": tw_utils.translation_words_index(GU_TW_RESOURCE_DIR),
+    }
+    for lang_code, source in corpus:
+        translation_words_index = translation_words_indices.get(lang_code, {})
+        for resource_requests in [
+            [
+                model.ResourceRequest(
+                    lang_code=lang_code, resource_type="ulb", book_code="gen"
+                )
+            ],
+            [
+                model.ResourceRequest(
+                    lang_code=lang_code,
+                    resource_type=resource_type,
+                    book_code=book_code,
+                )
+                for resource_type in ["tn", "tw"]
+                for book_code in BOOK_NAMES
+            ],
+        ]:
+            for source_ in [source, markdown_transformer.remove_sections(source)]:
+                assert markdown_transformer.transform_tw_links(
+                    source_, lang_code, resource_requests, translation_words_index
+                ) == markdown_transformer.transform_tw_links_sequentially(
+                    source_, lang_code, resource_requests, translation_words_index
+                )
+                assert markdown_transformer.transform_ta_and_tn_links(
+                    source_, lang_code, resource_requests, working_dir
+                ) == markdown_transformer.transform_ta_and_tn_links_sequentially(
+                    source_, lang_code, resource_requests, working_dir
+                )
+
+
+def test_overlapping_links_fall_back_to_sequential_transformation() -> None:
+    source = "· [God](../kt/god.md)([Matthew 1:11](../01/11.md))"
+    resource_requests = [
+        model.ResourceRequest(lang_code="en", resource_type="tn", book_code="mat")
+    ]
+    assert markdown_transformer.transform_ta_and_tn_links(
+        source, "en", resource_requests
+    ) == markdown_transformer.transform_ta_and_tn_links_sequentially(
+        source, "en", resource_requests
+    )
@@ -0,0 +1,116 @@
+import pathlib
+
+import mistune
+import pytest
+from docx import Document  # type: ignore
+from docx.oxml.ns import qn  # type: ignore
+
+from document.config import settings
+from document.domain.assembly_strategies_docx.assembly_strategy_utils import (
+    create_docx_subdoc,
+)
+from document.domain.usfm_renderer import render_usfm
+
+USFM_TEST_DATA_DIR = pathlib.Path(__file__).parent / "test_data" / "usfm"
+USFM_FIXTURES = sorted(USFM_TEST_DATA_DIR.glob("*.usfm"))
+
+TN_MARKDOWN = """# Matthew 1
+
+## 1:1
+
+### The book of the genealogy
+
+This is a *title* for the **whole** book. See [genealogy](https://example.org/genealogy?a=1&b=2).
+
+#### Translation Words
+
+* [Jesus](#en-jesus)
+* Christ
+    1. nested one
+    2. nested two
+
+1. first
+2. second
+
+##### Footnote
+
+Some text which
+wraps.
+
+---
+
+    preformatted   text
+    keeps	whitespace
+"""
+
+HTML_FRAGMENTS = [
+    settings.BOOK_NAME_FMT_STR.format("Matthew"),
+    settings.CHAPTER_HEADER_FMT_STR.format(1),
+    settings.TN_VERSE_NOTES_ENCLOSING_DIV_FMT_STR.format(mistune.markdown(TN_MARKDOWN)),
+    "Leading text<p>then a paragraph</p> trailing text",
+    "<p>A <span style='color: #ff0000'>red <span style='background-color: yellow'>highlighted</span></span> word<br>on two lines</p>",
+    "<div style='margin-left: 40px; text-align: right'><p style='text-align: justify'>indented</p></div>",
+    "<ol><li>one<ul><li>bullet</li></ul></li><li>two</li></ol><li>loose item</li>",
+    "<h1>One</h1><h6>Six</h6><p><s>struck</s> <strike>out</strike> <em>em</em> <strong>strong</strong> <sub>2</sub></p>",
+    "<p>sup<sup>1</sup> <code>code</code> <u>underline</u> <tt>tt</tt></p>",
+    "<p><a href='https://example.org'>a <b>bold</b> link</a> and <a>no href</a></p>",
+    "",
+]
+
+
+def htmldocx_subdoc(content: str, lang_code: str, is_rtl: bool) -> Document:
+    return create_docx_subdoc(content, lang_code, is_rtl, use_ooxml_writer=False)
+
+
+def ooxml_writer_subdoc(content: str, lang_code: str, is_rtl: bool) -> Document:
+    return create_docx_subdoc(content, lang_code, is_rtl, use_ooxml_writer=True)
+
+
+def summary(doc: Document) -> list[tuple[str, str, list[str]]]:
+    """
+    Return each paragraph's style, text and the XML of its runs'
+    properties.
+    """
+    return [
+        (
+            paragraph.style.name,
+            paragraph.text,
+            [
+                "" if (rPr := r.find(qn("w:rPr"))) is None else rPr.xml
+                for r in paragraph._p.iter(qn("w:r"))
+            ],
+        )
+        for paragraph in doc.paragraphs
+    ]
+
+
+def assert_same_document(content: str, lang_code: str, is_rtl: bool) -> None:
+    expected = htmldocx_subdoc(content, lang_code, is_rtl)
+    actual = ooxml_writer_subdoc(content, lang_code, is_rtl)
+    assert summary(actual) == summary(expected)
+    assert actual.element.body.xml == expected.element.body.xml
+    assert [(rel.reltype, rel.target_ref) for rel in actual.part.rels.values()] == [
+        (rel.reltype, rel.target_ref) for rel in expected.part.rels.values()
+    ]
+
+
+@pytest.mark.parametrize("usfm_filepath", USFM_FIXTURES, ids=lambda path: path.stem)
+def test_usfm_chapter_is_same_as_htmldocx(usfm_filepath: pathlib.Path) -> None:
+    assert_same_document(render_usfm(usfm_filepath.read_text()), "en", False)
+
+
+@pytest.mark.parametrize("content", HTML_FRAGMENTS)
+def test_html_fragment_is_same_as_htmldocx(content: str) -> None:
+    assert_same_document(content, "en", False)
+
+
+def test_rtl_is_same_as_htmldocx() -> None:
+    assert_same_document(
+        "<h2>مرقس</h2><p>الآية <b>الأولى</b></p><ul><li>بند</li></ul>", "ar-sa", True
+    )
+
+
+def test_tables_are_left_to_htmldocx() -> None:
+    content = "<table><tr><td>c1</td><td>c2</td></tr></table>"
+    assert_same_document(content, "en", False)
+    assert len(ooxml_writer_subdoc(content, "en", False).tables) == 1
@@ -0,0 +1,176 @@
+import multiprocessing
+import pathlib
+from typing import Any
+
+import pytest
+from document.config import settings
+from document.domain import parsing
+from document.domain.model import LangDirEnum, ResourceLookupDto, ResourceRequest
+from document.domain.resource_context import ResourceContext
+
+
+def tq_dto(book_code: str, resource_type: str = "tq") -> ResourceLookupDto:
+    return ResourceLookupDto(
+        lang_code="en",
+        lang_name="English",
+        resource_type=resource_type,
+        resource_type_name="Translation Questions",
+        book_code=book_code,
+        lang_direction=LangDirEnum.LTR,
+        url=None,
+    )
+
+
+def make_tq_book(resource_dir: pathlib.Path, book_code: str, num_chapters: int) -> None:
+    for chapter_num in range(1, num_chapters + 1):
+        chapter_dir = resource_dir / book_code / "{:03d}".format(chapter_num)
+        chapter_dir.mkdir(parents=True)
+        for verse_num in (1, 2):
+            (chapter_dir / "{:02d}.md".format(verse_num)).write_text(
+                "# Question {} {}?\n\nAnswer.\n".format(chapter_num, verse_num)
+            )
+
+
+def test_parallel_parsing_matches_sequential_parsing(tmp_path: pathlib.Path) -> None:
+    resource_dir = tmp_path / "en_tq"
+    make_tq_book(resource_dir, "psa", 150)
+    make_tq_book(resource_dir, "jud", 1)
+    dtos = [tq_dto("psa"), tq_dto("jud"), tq_dto("psa")]
+    resource_dirs = [str(resource_dir)] * len(dtos)
+    resource_requests = [
+        ResourceRequest(lang_code="en", resource_type="tq", book_code=dto.book_code)
+        for dto in dtos
+    ]
+    # Psalms is split into several chapter ranges.
+    assert len(parsing.chapter_ranges(dtos[0])) > 1
+    sequential_books = parsing.books(
+        dtos, resource_dirs, resource_requests, False, max_workers=1
+    )
+    parallel_books = parsing.books(
+        dtos, resource_dirs, resource_requests, False, max_workers=3
+    )
+    assert parallel_books == sequential_books
+    tq_books = parallel_books[2]
+    assert [tq_book.book_code for tq_book in tq_books] == ["psa", "jud", "psa"]
+    assert list(tq_books[0].chapters) == list(range(1, 151))
+    assert "Question 150 2?" in tq_books[0].chapters[150].verses["02"]
+
+
+def make_tn_book(resource_dir: pathlib.Path, book_code: str, num_chapters: int) -> None:
+    for chapter_num in range(1, num_chapters + 1):
+        chapter_dir = resource_dir / book_code / "{:02d}".format(chapter_num)
+        chapter_dir.mkdir(parents=True)
+        (chapter_dir / "intro.md").write_text(
+            "# Chapter {}\n\nSee [[rc://*/tw/dict/bible/kt/god]].\n".format(chapter_num)
+        )
+        for verse_num in (1, 2):
+            (chapter_dir / "{:02d}.md".format(verse_num)).write_text(
+                "# Note\n\nSee [Genesis 1:{0}](rc://en/tn/help/gen/01/{0:02d}).\n".format(
+                    verse_num
+                )
+            )
+
+
+def test_resource_context_memoizes_lookups_across_chapters(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # TW resource dirs are looked up under RESOURCE_ASSETS_DIR.
+    monkeypatch.setattr(settings, "RESOURCE_ASSETS_DIR", "tests/unit/test_data")
+    resource_dir = tmp_path / "en_tn"
+    make_tn_book(resource_dir, "gen", 50)
+    resource_requests = [
+        ResourceRequest(lang_code="en", resource_type="tn", book_code="gen"),
+        ResourceRequest(lang_code="en", resource_type="tw", book_code="gen"),
+    ]
+    resource_context = ResourceContext()
+    chapters = parsing.tn_chapter_verses(
+        str(resource_dir),
+        "en",
+        "gen",
+        resource_requests,
+        resource_context=resource_context,
+    )
+    assert 'href="#en-God"' in chapters[50].intro_html
+    counts = resource_context.counts()
+    # The TW resource dir is globbed, and its words indexed, once
+    # rather than once per chapter.
+    assert counts["tw_resource_dir"] == (0, 1)
+    assert counts["translation_words_index"] == (49, 1)
+    # The existence of linked notes is checked in their repo's
+    # manifest, or their directory's listing, which is looked up once.
+    (note_lookups,) = [
+        counts[kind] for kind in ("dir_entries", "repo_manifest") if kind in counts
+    ]
+    assert note_lookups == (99, 1)
+
+
+def test_parallel_parsing_counts_resource_context_lookups(
+    tmp_path: pathlib.Path,
+) -> None:
+    resource_dir = tmp_path / "en_tn"
+    make_tn_book(resource_dir, "psa", 150)
+    dtos = [tq_dto("psa", resource_type="tn")]
+    resource_requests = [
+        ResourceRequest(lang_code="en", resource_type="tn", book_code="psa")
+    ]
+    sequential_context = ResourceContext()
+    sequential_books = parsing.books(
+        dtos,
+        [str(resource_dir)],
+        resource_requests,
+        False,
+        max_workers=1,
+        resource_context=sequential_context,
+    )
+    parallel_context = ResourceContext()
+    parallel_books = parsing.books(
+        dtos,
+        [str(resource_dir)],
+        resource_requests,
+        False,
+        max_workers=3,
+        resource_context=parallel_context,
+    )
+    assert parallel_books == sequential_books
+    # Each parsing process memoizes lookups separately, once across
+    # all the tasks it is handed, but every lookup is counted.
+    assert sequential_context.counts()["translation_words_index"] == (149, 1)
+    hits, misses = parallel_context.counts()["translation_words_index"]
+    assert hits + misses == 150
+    assert 1 <= misses <= 3
+
+
+def parse_in_daemonic_process(
+    dtos: list[ResourceLookupDto],
+    resource_dirs: list[str],
+    resource_requests: list[ResourceRequest],
+    results: "multiprocessing.Queue[Any]",
+) -> None:
+    books = parsing.books(dtos, resource_dirs, resource_requests, False, max_workers=3)
+    # The pool is forgotten if parsing in parallel failed.
+    results.put((books, parsing.parsing_process_pool.cache_info().currsize))
+
+
+def test_daemonic_processes_parse_in_parallel(tmp_path: pathlib.Path) -> None:
+    resource_dir = tmp_path / "en_tq"
+    make_tq_book(resource_dir, "psa", 150)
+    dtos = [tq_dto("psa")]
+    resource_requests = [
+        ResourceRequest(lang_code="en", resource_type="tq", book_code="psa")
+    ]
+    sequential_books = parsing.books(
+        dtos, [str(resource_dir)], resource_requests, False, max_workers=1
+    )
+    # Celery's prefork workers are daemonic processes, which
+    # multiprocessing doesn't allow to have children.
+    results: "multiprocessing.Queue[Any]" = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=parse_in_daemonic_process,
+        args=(dtos, [str(resource_dir)], resource_requests, results),
+        daemon=True,
+    )
+    process.start()
+    daemonic_books, num_pools = results.get(timeout=60)
+    process.join()
+    assert daemonic_books == sequential_books
+    assert num_pools == 1
@@ -0,0 +1,107 @@
+import pathlib
+import sys
+from typing import Iterator
+
+import pytest
+
+from document.domain.exceptions import PdfRendererError
+from document.domain.pdf_rendering import SERVE_COMMAND, PdfRendererPool
+
+# Stands in for pdf_rendering.serve so that the protocol and pooling
+# can be exercised without WeasyPrint. It copies the HTML file to the
+# PDF file, rejects HTML files whose name contains 'bad', exits when
+# asked to render one whose name contains 'die' and hangs when asked to
+# render one whose name contains 'hang'.
+FAKE_SERVER = r"""
+import json, shutil, sys, time
+for line in sys.stdin:
+    request = json.loads(line)
+    if "die" in request["html_filepath"]:
+        sys.exit(1)
+    if "hang" in request["html_filepath"]:
+        time.sleep(60)
+    if "bad" in request["html_filepath"]:
+        response = {"ok": False, "error": "bad HTML"}
+    else:
+        shutil.copy(request["html_filepath"], request["pdf_filepath"])
+        response = {"ok": True, "seconds": 0.5, "peak_rss_bytes": 1024}
+    print(json.dumps(response), flush=True)
+"""
+
+
+@pytest.fixture
+def pool() -> Iterator[PdfRendererPool]:
+    renderer_pool = PdfRendererPool([sys.executable, "-c", FAKE_SERVER], 2)
+    yield renderer_pool
+    renderer_pool.close()
+
+
+def make_html(tmp_path: pathlib.Path, name: str) -> tuple[str, str]:
+    html_filepath = tmp_path / "{}.html".format(name)
+    html_filepath.write_text("<h1>{}</h1>".format(name))
+    return str(html_filepath), str(tmp_path / "{}.pdf".format(name))
+
+
+def test_renders_over_persistent_process(
+    pool: PdfRendererPool, tmp_path: pathlib.Path
+) -> None:
+    pool.warm()
+    assert pool._num_started == 2
+    for name in ["gen", "exo"]:
+        html_filepath, pdf_filepath = make_html(tmp_path, name)
+        rendering = pool.render(html_filepath, pdf_filepath)
+        assert (rendering.seconds, rendering.peak_rss_bytes) == (0.5, 1024)
+        assert pathlib.Path(pdf_filepath).read_text() == "<h1>{}</h1>".format(name)
+    assert pool._num_started == 2
+
+
+def test_render_error_leaves_renderer_usable(
+    pool: PdfRendererPool, tmp_path: pathlib.Path
+) -> None:
+    with pytest.raises(PdfRendererError):
+        pool.render(*make_html(tmp_path, "bad"))
+    html_filepath, pdf_filepath = make_html(tmp_path, "good")
+    pool.render(html_filepath, pdf_filepath)
+    assert pathlib.Path(pdf_filepath).exists()
+
+
+def test_dead_renderer_is_replaced(
+    pool: PdfRendererPool, tmp_path: pathlib.Path
+) -> None:
+    with pytest.raises(Exception):
+        pool.render(*make_html(tmp_path, "die"))
+    assert pool._num_started == 0
+    html_filepath, pdf_filepath = make_html(tmp_path, "alive")
+    pool.render(html_filepath, pdf_filepath)
+    assert pathlib.Path(pdf_filepath).exists()
+
+
+def test_renderer_which_times_out_is_killed_and_replaced(
+    tmp_path: pathlib.Path,
+) -> None:
+    renderer_pool = PdfRendererPool([sys.executable, "-c", FAKE_SERVER], 1, 0.5)
+    try:
+        with pytest.raises(TimeoutError):
+            renderer_pool.render(*make_html(tmp_path, "hang"))
+        assert renderer_pool._num_started == 0
+        html_filepath, pdf_filepath = make_html(tmp_path, "alive")
+        renderer_pool.render(html_filepath, pdf_filepath)
+    finally:
+        renderer_pool.close()
+    assert pathlib.Path(pdf_filepath).exists()
+
+
+def test_renders_pdf_with_weasyprint(tmp_path: pathlib.Path) -> None:
+    try:
+        import weasyprint  # type: ignore # noqa: F401
+    except (ImportError, OSError):
+        # WeasyPrint, or the Pango library it loads, isn't installed.
+        pytest.skip("WeasyPrint is not available")
+    renderer_pool = PdfRendererPool(SERVE_COMMAND, 1)
+    try:
+        html_filepath, pdf_filepath = make_html(tmp_path, "mat")
+        rendering = renderer_pool.render(html_filepath, pdf_filepath)
+    finally:
+        renderer_pool.close()
+    assert pathlib.Path(pdf_filepath).read_bytes().startswith(b"%PDF")
+    assert rendering.peak_rss_bytes > 0
@@ -0,0 +1,148 @@
+import pathlib
+import sys
+from typing import cast
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.annotations import Link
+from pypdf.generic import ArrayObject, Destination
+
+from document.domain import pdf_sections
+from document.domain.pdf_rendering import PdfRendererPool
+
+BOUNDARY = "<!-- book boundary -->"
+HEAD = "<html><head><style>@page { size: letter; }</style></head><body>"
+TAIL = "\n  </body>\n</html>"
+
+# Stands in for pdf_rendering.serve so that sectioned rendering can be
+# exercised without WeasyPrint. It renders each HTML file to a PDF
+# with a blank page per forced page break plus one.
+FAKE_SERVER = r"""
+import json, sys
+from pypdf import PdfWriter
+for line in sys.stdin:
+    request = json.loads(line)
+    with open(request["html_filepath"], encoding="utf-8") as fin:
+        html = fin.read()
+    writer = PdfWriter()
+    for _ in range(html.count("page-break-after") + 1):
+        writer.add_blank_page(612, 792)
+    writer.write(request["pdf_filepath"])
+    response = {"ok": True, "seconds": 0.1, "peak_rss_bytes": len(html)}
+    print(json.dumps(response), flush=True)
+"""
+
+
+def write_document(tmp_path: pathlib.Path) -> pathlib.Path:
+    html_filepath = tmp_path / "en-ulb-gen-exo.html"
+    html_filepath.write_text(
+        "".join(
+            [
+                HEAD,
+                "<h1>Title page</h1>",
+                BOUNDARY,
+                '<h1 id="gen">Genesis</h1><a href="#en-God">God</a><a href="#gen">Genesis</a>',
+                BOUNDARY,
+                # A book with no content.
+                BOUNDARY,
+                '<h1 id="exo">Exodus</h1><a href="#gen">Genesis</a>',
+                BOUNDARY,
+                '<h1 id="en-God">God</h1>',
+                BOUNDARY,
+                TAIL,
+            ]
+        )
+    )
+    return html_filepath
+
+
+def test_html_parts_spanning_chunks(tmp_path: pathlib.Path) -> None:
+    html_filepath = write_document(tmp_path)
+    assert list(
+        pdf_sections.html_parts(str(html_filepath), BOUNDARY, chunk_size=7)
+    ) == html_filepath.read_text().split(BOUNDARY)
+
+
+def test_html_sections_are_documents_linking_to_each_other(
+    tmp_path: pathlib.Path,
+) -> None:
+    sections = list(pdf_sections.html_sections(str(write_document(tmp_path)), BOUNDARY))
+    section_head = HEAD.replace(
+        "</head>", "{}</head>".format(pdf_sections.SECTION_STYLE_HTML)
+    )
+    assert sections == [
+        section_head + "<h1>Title page</h1>" + pdf_sections.SECTION_END_HTML,
+        section_head
+        + '<h1 id="gen">Genesis</h1><a href="x-doc-section:en-God">God</a><a href="#gen">Genesis</a>'
+        + pdf_sections.SECTION_END_HTML,
+        section_head
+        + '<h1 id="exo">Exodus</h1><a href="x-doc-section:gen">Genesis</a>'
+        + pdf_sections.SECTION_END_HTML,
+        # The document's end, after the last boundary, ends the last
+        # section.
+        section_head + '<h1 id="en-God">God</h1>' + TAIL,
+    ]
+
+
+def write_section_pdf(
+    pdf_filepath: pathlib.Path, name: str, num_pages: int, link_to: str
+) -> str:
+    writer = PdfWriter()
+    for _ in range(num_pages):
+        writer.add_blank_page(612, 792)
+    writer.add_named_destination(name, 0)
+    writer.add_outline_item(name, 0)
+    writer.add_annotation(
+        num_pages - 1,
+        Link(
+            rect=(72, 72, 144, 90),
+            url="{}{}".format(pdf_sections.SECTION_LINK_SCHEME, link_to),
+        ),
+    )
+    writer.write(str(pdf_filepath))
+    return str(pdf_filepath)
+
+
+def test_merged_pdf_links_sections(tmp_path: pathlib.Path) -> None:
+    writer = pdf_sections.merged_pdf(
+        [
+            write_section_pdf(tmp_path / "gen.pdf", "gen", 2, "en-God"),
+            write_section_pdf(tmp_path / "en-God.pdf", "en-God", 1, "missing"),
+        ]
+    )
+    merged_pdf_filepath = tmp_path / "merged.pdf"
+    writer.write(str(merged_pdf_filepath))
+    reader = PdfReader(str(merged_pdf_filepath))
+    assert len(reader.pages) == 3
+    assert [item.title for item in reader.outline if isinstance(item, Destination)] == [
+        "gen",
+        "en-God",
+    ]
+    assert {
+        name: reader.get_destination_page_number(dest)
+        for name, dest in reader.named_destinations.items()
+    } == {"gen": 0, "en-God": 2}
+    link = cast(ArrayObject, reader.pages[1]["/Annots"])[0].get_object()
+    assert link["/A"]["/S"] == "/GoTo"
+    assert link["/A"]["/D"] == "en-God"
+    # The link to an anchor which isn't in the document was dropped.
+    assert len(cast(ArrayObject, reader.pages[2]["/Annots"])) == 0
+
+
+def test_render_pdf_in_sections(tmp_path: pathlib.Path) -> None:
+    html_filepath = write_document(tmp_path)
+    pdf_filepath = tmp_path / "en-ulb-gen-exo.pdf"
+    pool = PdfRendererPool([sys.executable, "-c", FAKE_SERVER], 2)
+    try:
+        rendering = pdf_sections.render_pdf_in_sections(
+            str(html_filepath), str(pdf_filepath), pool, 2, BOUNDARY
+        )
+    finally:
+        pool.close()
+    # One page per section.
+    assert len(PdfReader(str(pdf_filepath)).pages) == 4
+    assert rendering.peak_rss_bytes > 0
+    # Only the HTML and the merged PDF remain.
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "en-ulb-gen-exo.html",
+        "en-ulb-gen-exo.pdf",
+    ]
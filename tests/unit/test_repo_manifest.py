@@ -0,0 +1,74 @@
+import glob
+import os
+import pathlib
+
+from document.utils import repo_manifest
+
+
+def make_tn_repo(working_dir: pathlib.Path) -> pathlib.Path:
+    repo_dir = working_dir / "en_tn"
+    (repo_dir / ".git").mkdir(parents=True)
+    for book_code in ("gen", "exo"):
+        (repo_dir / book_code / "front").mkdir(parents=True)
+        (repo_dir / book_code / "front" / "intro.md").write_text("# Intro\n")
+        for chapter_num in ("01", "02"):
+            chapter_dir = repo_dir / book_code / chapter_num
+            chapter_dir.mkdir()
+            for name in ("intro.md", "01.md", "02.md"):
+                (chapter_dir / name).write_text("# Note\n")
+    (repo_dir / "manifest.yaml").write_text("dublin_core: {}\n")
+    return repo_dir
+
+
+def test_manifest_lookups_match_file_system(tmp_path: pathlib.Path) -> None:
+    repo_dir = make_tn_repo(tmp_path)
+    working_dir = str(tmp_path)
+    for pattern in [
+        "{}/**/*gen/*[0-9]*",
+        "{}/*gen/*[0-9]*",
+        "{}/*GEN/*[0-9]*",
+        "{}/gen/01/*[0-9]*.md",
+        "{}/gen/01/*intro.md",
+        "{}/*exo/front/intro.md",
+        "{}/*.yaml",
+        "{}/*",
+    ]:
+        pattern = pattern.format(repo_dir)
+        assert repo_manifest.glob(pattern, working_dir) == sorted(glob.glob(pattern))
+    for path in ["gen/02/02.md", "gen/03/01.md", "exo"]:
+        assert repo_manifest.exists(
+            str(repo_dir / path), working_dir
+        ) == os.path.exists(str(repo_dir / path))
+    # The manifest was persisted next to the clone.
+    assert os.path.exists(repo_manifest.manifest_filepath(str(repo_dir)))
+
+
+def test_manifest_is_reloaded_once_recorded_again(tmp_path: pathlib.Path) -> None:
+    repo_dir = make_tn_repo(tmp_path)
+    working_dir = str(tmp_path)
+    path = str(repo_dir / "gen" / "03" / "01.md")
+    assert not repo_manifest.exists(path, working_dir)
+    (repo_dir / "gen" / "03").mkdir()
+    (repo_dir / "gen" / "03" / "01.md").write_text("# Note\n")
+    # Until the repo's manifest is recorded again, e.g., after a
+    # refresh, the manifest is what was in the repo when recorded.
+    assert not repo_manifest.exists(path, working_dir)
+    manifest_filepath = repo_manifest.manifest_filepath(str(repo_dir))
+    stat = os.stat(manifest_filepath)
+    repo_manifest.record_manifest(str(repo_dir))
+    # Make sure the modification time changed on coarse file systems.
+    os.utime(manifest_filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert repo_manifest.exists(path, working_dir)
+
+
+def test_paths_outside_clones_are_looked_up_on_the_file_system(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Not a clone since it has no .git directory.
+    resource_dir = tmp_path / "en_tq"
+    (resource_dir / "gen" / "01").mkdir(parents=True)
+    (resource_dir / "gen" / "01" / "01.md").write_text("# Question?\n")
+    assert repo_manifest.glob("{}/gen/*/*.md".format(resource_dir), str(tmp_path)) == [
+        str(resource_dir / "gen" / "01" / "01.md")
+    ]
+    assert not os.path.exists(repo_manifest.manifest_filepath(str(resource_dir)))
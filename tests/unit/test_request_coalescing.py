@@ -0,0 +1,78 @@
+from typing import Any, NamedTuple, Optional
+
+import pytest
+import redis
+
+from document.domain import document_generator, model, request_coalescing
+
+
+def document_request(
+    email_address: Optional[str] = None, generate_pdf: bool = True
+) -> model.DocumentRequest:
+    return model.DocumentRequest(
+        email_address=email_address,
+        assembly_strategy_kind=model.AssemblyStrategyEnum.LANGUAGE_BOOK_ORDER,
+        assembly_layout_kind=model.AssemblyLayoutEnum.ONE_COLUMN,
+        layout_for_print=False,
+        chunk_size=model.ChunkSizeEnum.CHAPTER,
+        generate_pdf=generate_pdf,
+        generate_epub=False,
+        generate_docx=False,
+        resource_requests=[
+            model.ResourceRequest(lang_code="en", resource_type="ulb", book_code="col"),
+            model.ResourceRequest(lang_code="en", resource_type="tn", book_code="col"),
+        ],
+    )
+
+
+def test_identical_document_requests_share_in_flight_key() -> None:
+    task_name = document_generator.generate_document.name
+    in_flight_key = document_generator.in_flight_key(task_name, document_request())
+    # Who asks for the document doesn't matter.
+    assert in_flight_key == document_generator.in_flight_key(
+        task_name, document_request(email_address="foo@example.com")
+    )
+    # What is asked for and what produces it do.
+    assert in_flight_key != document_generator.in_flight_key(
+        task_name, document_request(generate_pdf=False)
+    )
+    assert in_flight_key != document_generator.in_flight_key(
+        document_generator.generate_document_in_all_formats.name, document_request()
+    )
+
+
+class FakeAsyncResult(NamedTuple):
+    id: str
+
+
+class FakeTask:
+    """Records the tasks queued rather than queuing them."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+
+    def apply_async(self, **kwargs: Any) -> FakeAsyncResult:
+        self.calls.append(kwargs)
+        return FakeAsyncResult(id="task-{}".format(len(self.calls)))
+
+
+def test_document_requests_are_queued_when_redis_is_unavailable(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        request_coalescing,
+        "redis_client",
+        lambda: redis.Redis.from_url("redis://127.0.0.1:1", socket_connect_timeout=1),
+    )
+    task = FakeTask()
+    task_ids = [
+        request_coalescing.apply_async(
+            task,  # type: ignore
+            document_request().json(),
+            "doc:in-flight:test",
+            None,
+        )
+        for _ in range(2)
+    ]
+    assert task_ids == ["task-1", "task-2"]
+    assert request_coalescing.release("task-1") == []
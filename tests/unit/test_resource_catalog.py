@@ -0,0 +1,127 @@
+import copy
+import logging
+import statistics
+import time
+import tracemalloc
+from typing import Any
+
+import pytest
+
+from document.domain import resource_lookup
+from document.domain.model import LangDirEnum
+
+
+def repo(url: str, lang_code: str, resource_type: str) -> dict[str, Any]:
+    return {
+        "repo_url": url,
+        "content": {
+            "resource_type": resource_type,
+            "language": {
+                "english_name": "Brazilian Portuguese",
+                "ietf_code": lang_code,
+                "national_name": "Português",
+                "direction": "ltr",
+            },
+        },
+    }
+
+
+SOURCE_DATA = {
+    "git_repo": [
+        repo(
+            "https://content.bibletranslationtools.org/WA-Catalog/pt-br_ulb",
+            "pt-br",
+            "ulb",
+        ),
+        repo(
+            "https://content.bibletranslationtools.org/WA-Catalog/pt-br_tn",
+            "pt-br",
+            "tn",
+        ),
+        repo(
+            "https://content.bibletranslationtools.org/someone/pt-br_mat_text_ulb",
+            "pt-br",
+            "ulb",
+        ),
+        repo(
+            "https://content.bibletranslationtools.org/someone/pt-br_mat_text_ulb_dup",
+            "pt-br",
+            "ulb",
+        ),
+        repo("https://content.bibletranslationtools.org/WA-Catalog/fr_tn", "fr", "tn"),
+        {"repo_url": "https://example.com/malformed"},
+    ]
+}
+
+
+def test_lookup_prefers_single_book_repo() -> None:
+    catalog = resource_lookup.build_resource_catalog(SOURCE_DATA)
+    entry = catalog.lookup("pt-br", "ulb", "mat")
+    assert entry
+    assert entry.url.endswith("pt-br_mat_text_ulb")
+    entry = catalog.lookup("pt-br", "ulb", "gen")
+    assert entry
+    assert entry.url.endswith("pt-br_ulb")
+    assert catalog.lookup("pt-br", "tq", "gen") is None
+
+
+def test_indexes_by_language_and_url() -> None:
+    catalog = resource_lookup.build_resource_catalog(SOURCE_DATA)
+    assert [entry.resource_type for entry in catalog.entries_by_lang["fr"]] == ["tn"]
+    url = "https://content.bibletranslationtools.org/WA-Catalog/pt-br_tn"
+    assert catalog.entries_by_url[url].last_segment == "pt-br_tn"
+    assert catalog.entries_by_url[url].lang_direction == LangDirEnum.LTR
+    assert ("pt-br", "Português (Brazilian Portuguese)") in catalog.lang_codes_and_names
+    # Malformed repos are skipped rather than failing the whole catalog.
+    assert "https://example.com/malformed" not in catalog.entries_by_url
+
+
+def test_supplemental_repos_are_overlaid() -> None:
+    source_data = copy.deepcopy(SOURCE_DATA)
+    catalog = resource_lookup.build_resource_catalog(source_data)
+    entry = catalog.lookup("en", "tn-condensed", "mat")
+    assert entry
+    assert entry.url.endswith("en_tn_condensed")
+    assert catalog.lookup("id", "ayt", "gen")
+    assert source_data == SOURCE_DATA
+
+
+def test_repeated_lookups_keep_constant_memory_and_latency(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Regression test: augmenting the data API's repos must not grow the
+    cached source data, and therefore memory use and lookup latency,
+    with each lookup.
+    """
+    source_data = copy.deepcopy(SOURCE_DATA)
+    monkeypatch.setattr(resource_lookup, "fetch_source_data", lambda: source_data)
+    lookup = resource_lookup.resource_lookup_dto.__wrapped__
+
+    def timed_lookups(num_lookups: int) -> list[float]:
+        timings = []
+        for _ in range(num_lookups):
+            t0 = time.perf_counter()
+            assert lookup("pt-br", "ulb", "mat")
+            assert resource_lookup.lang_codes_and_names()
+            timings.append(time.perf_counter() - t0)
+        return timings
+
+    # Keep captured log records from being counted.
+    logging.disable(logging.DEBUG)
+    timed_lookups(50)
+    num_repos = len(resource_lookup.resource_catalog().entries)
+    tracemalloc.start()
+    try:
+        early_timings = timed_lookups(200)
+        memory_before, _ = tracemalloc.get_traced_memory()
+        timed_lookups(2000)
+        memory_after, _ = tracemalloc.get_traced_memory()
+        late_timings = timed_lookups(200)
+    finally:
+        tracemalloc.stop()
+        logging.disable(logging.NOTSET)
+    assert len(source_data["git_repo"]) == len(SOURCE_DATA["git_repo"])
+    assert len(resource_lookup.resource_catalog().entries) == num_repos
+    assert memory_after - memory_before < 64 * 1024
+    assert statistics.median(late_timings) < 3 * statistics.median(early_timings)
@@ -0,0 +1,121 @@
+import os
+from typing import Iterator
+
+import pytest
+
+from document.config import settings
+from document.domain import document_generator, model, task_routing
+
+
+def document_request(
+    generate_pdf: bool = True, generate_docx: bool = False
+) -> model.DocumentRequest:
+    return model.DocumentRequest(
+        assembly_strategy_kind=model.AssemblyStrategyEnum.LANGUAGE_BOOK_ORDER,
+        assembly_layout_kind=model.AssemblyLayoutEnum.ONE_COLUMN,
+        layout_for_print=False,
+        chunk_size=model.ChunkSizeEnum.CHAPTER,
+        generate_pdf=generate_pdf,
+        generate_epub=False,
+        generate_docx=generate_docx,
+        resource_requests=[
+            model.ResourceRequest(lang_code="en", resource_type="ulb", book_code="3jn"),
+        ],
+    )
+
+
+@pytest.fixture
+def document_request_key() -> Iterator[str]:
+    """Yield the key of the document, removing any of its files after."""
+    document_request_key = document_generator.document_request_key_of(
+        document_request()
+    )
+    yield document_request_key
+    for suffix in ["html", "pdf"]:
+        filepath = os.path.join(
+            settings.DOCUMENT_OUTPUT_DIR, "{}.{}".format(document_request_key, suffix)
+        )
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+
+def write_document(document_request_key: str, suffix: str) -> None:
+    os.makedirs(settings.DOCUMENT_OUTPUT_DIR, exist_ok=True)
+    with open(
+        os.path.join(
+            settings.DOCUMENT_OUTPUT_DIR, "{}.{}".format(document_request_key, suffix)
+        ),
+        "w",
+    ) as fout:
+        fout.write(suffix)
+
+
+def route(task_name: str, document_request: model.DocumentRequest) -> str:
+    route = task_routing.route_task(task_name, (document_request.json(),), {}, {})
+    assert route is not None
+    return route["queue"]
+
+
+def test_document_tasks_are_routed_by_their_slowest_format(
+    document_request_key: str,
+) -> None:
+    assert (
+        route(document_generator.generate_document.name, document_request())
+        == task_routing.PDF_QUEUE
+    )
+    assert (
+        route(
+            document_generator.generate_document.name,
+            document_request(generate_pdf=False),
+        )
+        == task_routing.HTML_QUEUE
+    )
+    assert (
+        route(
+            document_generator.generate_docx_document.name,
+            document_request(generate_docx=True),
+        )
+        == task_routing.DOCX_QUEUE
+    )
+    assert (
+        route(
+            document_generator.generate_document_in_all_formats.name,
+            document_request(generate_docx=True),
+        )
+        == task_routing.DOCX_QUEUE
+    )
+
+
+def test_cached_documents_are_routed_to_the_light_queue(
+    document_request_key: str,
+) -> None:
+    write_document(document_request_key, "html")
+    assert (
+        route(document_generator.generate_document.name, document_request())
+        == task_routing.PDF_QUEUE
+    )
+    write_document(document_request_key, "pdf")
+    assert (
+        route(document_generator.generate_document.name, document_request())
+        == task_routing.LIGHT_QUEUE
+    )
+
+
+def test_other_tasks_are_left_to_the_default_queue() -> None:
+    assert (
+        task_routing.route_task(
+            document_generator.refresh_resource_assets.name, (), {}, {}
+        )
+        is None
+    )
+    assert (
+        {
+            task_routing.LIGHT_QUEUE,
+            task_routing.HTML_QUEUE,
+            task_routing.PDF_QUEUE,
+            task_routing.EPUB_QUEUE,
+            task_routing.DOCX_QUEUE,
+        }
+        == set(settings.WORKER_CONCURRENCY)
+        == set(settings.WORKER_PREFETCH_MULTIPLIER)
+    )
@@ -0,0 +1,144 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Optional, cast
+
+import celery.states
+import pytest
+import redis.asyncio
+from celery.backends.base import KeyValueStoreBackend
+from document.domain import worker
+from document.entrypoints import app
+from document.entrypoints.app import task_status_content
+from fastapi import Request
+
+
+def test_task_status_content() -> None:
+    assert task_status_content("SUCCESS", "key") == {
+        "state": "SUCCESS",
+        "result": "key",
+    }
+    assert task_status_content("Converting", {"finished_formats": ["pdf"]}) == {
+        "state": "Converting",
+        "finished_formats": ["pdf"],
+    }
+    assert task_status_content("Parsing asset files", None) == {
+        "state": "Parsing asset files"
+    }
+    assert task_status_content("FAILURE", ValueError("boom")) == {"state": "FAILURE"}
+
+
+class FakePubSub:
+    """
+    Stands in for a Redis pubsub which has the given messages, None
+    meaning none arrived before the heartbeat, published to it.
+    """
+
+    def __init__(self, messages: list[Optional[bytes]]) -> None:
+        self.messages = messages
+        self.channels: list[Any] = []
+        self.closed = False
+
+    async def subscribe(self, channel: Any) -> None:
+        self.channels.append(channel)
+
+    async def get_message(
+        self, ignore_subscribe_messages: bool, timeout: float
+    ) -> Optional[dict[str, Any]]:
+        data = self.messages.pop(0)
+        return None if data is None else {"type": "message", "data": data}
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class FakeRedis:
+    def __init__(self, pubsub: FakePubSub) -> None:
+        self._pubsub = pubsub
+
+    def pubsub(self) -> FakePubSub:
+        return self._pubsub
+
+    async def aclose(self) -> None:
+        pass
+
+
+class FakeRequest:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def published_state(task_id: str, state: str, result: Any) -> bytes:
+    """Return the task's state as Celery's Redis result backend publishes it."""
+    # The result backend serializes to JSON text which Redis delivers
+    # as bytes.
+    return str(
+        worker.app.backend.encode(
+            {
+                "task_id": task_id,
+                "status": state,
+                "result": result,
+                "traceback": None,
+                "children": [],
+                "date_done": None,
+            }
+        )
+    ).encode("utf-8")
+
+
+async def events(task_id: str) -> list[str]:
+    return [
+        event
+        async for event in app.task_status_events(
+            task_id, cast(Request, FakeRequest()), heartbeat_seconds=1
+        )
+    ]
+
+
+def test_task_status_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    task_id = "task-1"
+    pubsub = FakePubSub(
+        [
+            published_state(task_id, "Assembling content", None),
+            None,
+            published_state(
+                task_id,
+                "Finished PDF",
+                {"document_request_key": "key", "finished_formats": ["pdf"]},
+            ),
+            published_state(task_id, celery.states.SUCCESS, "key"),
+        ]
+    )
+    monkeypatch.setattr(redis.asyncio.Redis, "from_url", lambda url: FakeRedis(pubsub))
+    monkeypatch.setattr(
+        app,
+        "AsyncResult",
+        lambda task_id: SimpleNamespace(state=celery.states.PENDING, info=None),
+    )
+    assert asyncio.run(events(task_id)) == [
+        'data: {"state": "PENDING"}\n\n',
+        'data: {"state": "Assembling content"}\n\n',
+        ": keep-alive\n\n",
+        'data: {"state": "Finished PDF", "document_request_key": "key", "finished_formats": ["pdf"]}\n\n',
+        'data: {"state": "SUCCESS", "result": "key"}\n\n',
+    ]
+    # The task's state changes were subscribed to before its state was
+    # read and the subscription ended with the task.
+    assert pubsub.channels == [
+        cast(KeyValueStoreBackend, worker.app.backend).get_key_for_task(task_id)
+    ]
+    assert pubsub.messages == []
+    assert pubsub.closed
+
+
+def test_task_status_events_of_finished_task(monkeypatch: pytest.MonkeyPatch) -> None:
+    pubsub = FakePubSub([])
+    monkeypatch.setattr(redis.asyncio.Redis, "from_url", lambda url: FakeRedis(pubsub))
+    monkeypatch.setattr(
+        app,
+        "AsyncResult",
+        lambda task_id: SimpleNamespace(state=celery.states.SUCCESS, info="key"),
+    )
+    assert asyncio.run(events("task-1")) == [
+        'data: {"state": "SUCCESS", "result": "key"}\n\n'
+    ]
+    assert pubsub.closed
@@ -0,0 +1,201 @@
+import pathlib
+import re
+from os import getenv
+from os.path import exists
+
+import bs4
+import pytest
+
+from document.config import settings
+from document.domain import parsing
+from document.domain.assembly_strategies.assembly_strategy_utils import has_footnotes
+from document.domain.model import LangDirEnum, ResourceLookupDto
+from document.domain.usfm_renderer import render_usfm
+
+USFM_TEST_DATA_DIR = pathlib.Path(__file__).parent / "test_data" / "usfm"
+USFM_FIXTURES = sorted(USFM_TEST_DATA_DIR.glob("*.usfm"))
+
+# The CSS classes, defined in the HTML header templates, that the
+# rest of the system relies on the USFM renderer emitting.
+STRUCTURAL_CLASSES = {
+    "chapter",
+    "chapterlabel",
+    "chaptermarker",
+    "footnotes",
+    "poetry-1",
+    "poetry-2",
+    "sectionhead-1",
+    "verse",
+    "versemarker",
+}
+
+
+def structure(html: str) -> list[tuple[str, str]]:
+    """
+    Return the structurally significant elements of html in document
+    order as (CSS class, normalized text) pairs.
+    """
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    elements = []
+    for element in soup.find_all(class_=True):
+        for class_ in element["class"]:
+            if class_ in STRUCTURAL_CLASSES:
+                text = re.sub(r"\s+", " ", element.get_text()).strip()
+                elements.append((class_, text))
+    return elements
+
+
+def test_chapter_label_and_verses() -> None:
+    html = render_usfm((USFM_TEST_DATA_DIR / "gen_3.usfm").read_text())
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    assert soup.select_one("div.chapter > span.chapterlabel").text == "Chapter 3"
+    assert [sup.text for sup in soup.select("span.verse > sup.versemarker")] == [
+        "1",
+        "2",
+        "3",
+    ]
+    assert 'class="verse"' in html
+    assert soup.select_one("div.sectionhead-1").text == "The Fall"
+
+
+def golden_filepath(usfm_filepath: pathlib.Path, renderer: str) -> pathlib.Path:
+    """
+    Return the path of the rendering, by renderer, "python" or
+    "dotnet", of the USFM fixture, see write_golden_files.
+    """
+    return usfm_filepath.with_suffix(".{}.html".format(renderer))
+
+
+def test_chapter_marker_when_chapter_has_no_label() -> None:
+    html = render_usfm((USFM_TEST_DATA_DIR / "mat_1.usfm").read_text())
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    assert soup.select_one("div.chapter > span.chaptermarker").text == "1"
+    assert soup.select_one("span.chapterlabel") is None
+
+
+def test_footnotes_are_collected_after_chapter() -> None:
+    html = render_usfm((USFM_TEST_DATA_DIR / "mat_1.usfm").read_text())
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    assert has_footnotes(html)
+    assert len(soup.select("span.caller")) == 2
+    footnotes = soup.select("div.footnotes > div.footnote")
+    assert len(footnotes) == 2
+    assert "Some versions read" in footnotes[0].text
+    assert footnotes[1].select_one(".footnote-alternate-translation").text == "Jesus"
+    # Footnote text must not leak into the verse text.
+    assert "Some versions read" not in soup.select("span.verse")[0].text
+
+
+def test_poetry_character_markers_and_word_attributes() -> None:
+    html = render_usfm((USFM_TEST_DATA_DIR / "psa_23.usfm").read_text())
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    assert len(soup.select("div.poetry-1")) == 3
+    assert len(soup.select("div.poetry-2")) == 3
+    assert soup.select_one("span.selah-text").text == "Selah"
+    assert soup.select_one("span.additions").text == "the"
+    gen_html = render_usfm((USFM_TEST_DATA_DIR / "gen_3.usfm").read_text())
+    assert "strong=" not in gen_html
+    assert "more crafty than" in gen_html
+    assert '<span class="tetragrammaton">Yahweh</span>' in gen_html
+
+
+def test_heading_keeps_character_markers_to_end_of_line() -> None:
+    html = render_usfm((USFM_TEST_DATA_DIR / "mat_1.usfm").read_text())
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    heading = soup.select_one("div.sectionhead-1")
+    assert heading.text == "The birth of Jesus"
+    assert heading.select_one("b").text == "Jesus"
+    # Nothing of the heading is left outside of it.
+    assert all(b.find_parent("div", class_="sectionhead-1") for b in soup("b"))
+
+
+def test_text_is_escaped() -> None:
+    html = render_usfm((USFM_TEST_DATA_DIR / "mat_1.usfm").read_text())
+    assert "Isaac, &amp; Isaac" in html
+
+
+def test_chapter_html_selects_python_renderer() -> None:
+    dto = ResourceLookupDto(
+        lang_code="en",
+        lang_name="English",
+        resource_type="ulb",
+        resource_type_name="Unlocked Literal Bible",
+        book_code="gen",
+        lang_direction=LangDirEnum.LTR,
+        url=None,
+    )
+    content = (USFM_TEST_DATA_DIR / "gen_3.usfm").read_text()
+    assert parsing.usfm_chapter_html(
+        content, dto, 3, usfm_renderer_kind="python"
+    ) == render_usfm(content)
+
+
+@pytest.mark.parametrize("usfm_filepath", USFM_FIXTURES, ids=lambda path: path.name)
+def test_matches_python_golden_file(usfm_filepath: pathlib.Path) -> None:
+    """
+    Compare the pure Python renderer's output with its own output for
+    the same USFM, as checked in by write_golden_files, so that any
+    change to the renderer's output is caught wherever the tests run.
+    This is a regression test. Parity with the .NET USFMParserDriver
+    is checked by the tests below.
+    """
+    content = parsing.ensure_chapter_label(usfm_filepath.read_text())
+    assert render_usfm(content) == golden_filepath(usfm_filepath, "python").read_text()
+
+
+@pytest.mark.parametrize("usfm_filepath", USFM_FIXTURES, ids=lambda path: path.name)
+def test_parity_with_dotnet_golden_file(usfm_filepath: pathlib.Path) -> None:
+    """
+    Compare the structure and text of the pure Python renderer's output
+    with that of the .NET USFMParserDriver for the same USFM, as checked
+    in by write_golden_files where the driver is built.
+    """
+    dotnet_golden_filepath = golden_filepath(usfm_filepath, "dotnet")
+    if not dotnet_golden_filepath.exists():
+        pytest.skip("the .NET USFMParserDriver's rendering is not checked in")
+    content = parsing.ensure_chapter_label(usfm_filepath.read_text())
+    assert structure(render_usfm(content)) == structure(
+        dotnet_golden_filepath.read_text()
+    )
+
+
+def dotnet_renderer_is_built() -> bool:
+    return exists(f"{getenv('DOTNET_ROOT')}/dotnet") and exists(
+        settings.USFM_PARSER_DLL_PATH
+    )
+
+
+@pytest.mark.skipif(
+    not dotnet_renderer_is_built(),
+    reason="the .NET USFMParserDriver is not built in this environment",
+)
+@pytest.mark.parametrize("usfm_filepath", USFM_FIXTURES, ids=lambda path: path.name)
+def test_parity_with_dotnet_renderer(usfm_filepath: pathlib.Path) -> None:
+    """
+    Compare the structure and text of the pure Python renderer's output
+    with that of the .NET USFMParserDriver for the same USFM.
+    """
+    content = parsing.ensure_chapter_label(usfm_filepath.read_text())
+    dotnet_html = parsing.usfm_renderer_pool().render(content)
+    assert structure(render_usfm(content)) == structure(dotnet_html)
+
+
+def write_golden_files() -> None:
+    """
+    Write the pure Python renderer's rendering of each USFM fixture
+    next to it and, where the .NET USFMParserDriver is built, i.e., in
+    the Docker image, the driver's rendering too. Run this, e.g., by
+    make local-update-usfm-golden-files, whenever a fixture is added or
+    either renderer changes.
+    """
+    for usfm_filepath in USFM_FIXTURES:
+        content = parsing.ensure_chapter_label(usfm_filepath.read_text())
+        golden_filepath(usfm_filepath, "python").write_text(render_usfm(content))
+        if dotnet_renderer_is_built():
+            golden_filepath(usfm_filepath, "dotnet").write_text(
+                parsing.usfm_renderer_pool().render(content)
+            )
+
+
+if __name__ == "__main__":
+    write_golden_files()
@@ -0,0 +1,108 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+import pytest
+
+from document.domain.exceptions import USFMRendererError
+from document.domain.parsing import USFMRendererPool
+
+# Stands in for the USFM parser driver in --server mode so that the
+# framing and pooling can be exercised without the dotnet toolchain.
+# It upper cases its input, rejects input containing 'bad', exits when
+# it receives input containing 'die', after a second if it contains
+# 'slow', exits mid response when it receives input containing
+# 'truncate' and hangs when it receives input containing 'hang'.
+FAKE_DRIVER = r"""
+import sys, time
+stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+while header := stdin.readline():
+    body = stdin.read(int(header)).decode("utf-8")
+    if "slow" in body:
+        time.sleep(1)
+    if "hang" in body:
+        time.sleep(60)
+    if "die" in body:
+        sys.exit(1)
+    if "truncate" in body:
+        stdout.write(b"ERR 100\nbad")
+        stdout.flush()
+        sys.exit(1)
+    status, payload = ("ERR", "bad input") if "bad" in body else ("OK", body.upper())
+    payload = payload.encode("utf-8")
+    stdout.write(b"%s %d\n" % (status.encode("ascii"), len(payload)))
+    stdout.write(payload)
+    stdout.flush()
+"""
+
+
+@pytest.fixture
+def pool() -> Iterator[USFMRendererPool]:
+    renderer_pool = USFMRendererPool([sys.executable, "-c", FAKE_DRIVER], 2)
+    yield renderer_pool
+    renderer_pool.close()
+
+
+def test_renders_multibyte_content_over_persistent_process(
+    pool: USFMRendererPool,
+) -> None:
+    content = "\\c 1\n\\v 1 ગુજરાતી\n\\v 2 español\n"
+    assert pool.render(content) == content.upper()
+    assert pool.render(content) == content.upper()
+
+
+def test_render_error_leaves_renderer_usable(pool: USFMRendererPool) -> None:
+    with pytest.raises(USFMRendererError):
+        pool.render("bad")
+    assert pool.render("good") == "GOOD"
+
+
+def test_dead_renderer_is_replaced(pool: USFMRendererPool) -> None:
+    with pytest.raises(Exception):
+        pool.render("die")
+    assert pool.render("alive") == "ALIVE"
+
+
+def test_renderer_which_exits_mid_response_is_replaced(
+    pool: USFMRendererPool,
+) -> None:
+    with pytest.raises(EOFError):
+        pool.render("truncate")
+    assert pool.render("alive") == "ALIVE"
+    assert pool._num_started == 1
+
+
+def test_waiter_is_woken_when_in_use_renderer_dies() -> None:
+    renderer_pool = USFMRendererPool([sys.executable, "-c", FAKE_DRIVER], 1)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            dying = executor.submit(renderer_pool.render, "slow die")
+            time.sleep(0.5)
+            waiting = executor.submit(renderer_pool.render, "alive")
+            with pytest.raises(Exception):
+                dying.result(timeout=10)
+            assert waiting.result(timeout=10) == "ALIVE"
+    finally:
+        renderer_pool.close()
+
+
+def test_renderer_which_times_out_is_killed_and_replaced() -> None:
+    renderer_pool = USFMRendererPool([sys.executable, "-c", FAKE_DRIVER], 1, 0.5)
+    try:
+        with pytest.raises(TimeoutError):
+            renderer_pool.render("hang")
+        assert renderer_pool._num_started == 0
+        assert renderer_pool.render("alive") == "ALIVE"
+    finally:
+        renderer_pool.close()
+
+
+def test_concurrent_renders_are_bounded_by_pool_size(
+    pool: USFMRendererPool,
+) -> None:
+    contents = ["\\c {}\n\\v 1 text".format(num) for num in range(50)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(pool.render, contents))
+    assert results == [content.upper() for content in contents]
+    assert pool._num_started <= 2
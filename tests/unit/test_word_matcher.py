@@ -0,0 +1,160 @@
+import logging
+import pathlib
+import random
+import re
+import time
+from typing import Sequence
+
+import pytest
+
+from document.domain import document_generator
+from document.domain.model import (
+    LangDirEnum,
+    TWBook,
+    TWNameContentPair,
+    USFMBook,
+    USFMChapter,
+)
+from document.domain.usfm_renderer import render_usfm
+from document.utils import tw_utils
+from document.utils.word_matcher import WordMatcher
+
+TEST_DATA_DIR = pathlib.Path(__file__).parent / "test_data"
+EN_TW_RESOURCE_DIR = TEST_DATA_DIR / "en_tw-wa" / "en_tw"
+
+
+def filter_name_content_pairs_by_searching(
+    tw_book: TWBook, usfm_books: Sequence[USFMBook]
+) -> list[TWNameContentPair]:
+    """The search per word, book and chapter that WordMatcher replaces."""
+    selected_name_content_pairs = []
+    for name_content_pair in tw_book.name_content_pairs:
+        for usfm_book in usfm_books:
+            for chapter in usfm_book.chapters.values():
+                if re.search(
+                    re.escape(name_content_pair.localized_word), chapter.content
+                ):
+                    selected_name_content_pairs.append(name_content_pair)
+                    break
+    return selected_name_content_pairs
+
+
+def tw_book(words: Sequence[str]) -> TWBook:
+    return TWBook(
+        lang_code="en",
+        lang_name="English",
+        book_code="psa",
+        resource_type_name="Translation Words",
+        lang_direction=LangDirEnum.LTR,
+        name_content_pairs=[TWNameContentPair(word, "") for word in words],
+    )
+
+
+def usfm_book(chapter_contents: Sequence[str]) -> USFMBook:
+    return USFMBook(
+        lang_code="en",
+        lang_name="English",
+        book_code="psa",
+        resource_type_name="Unlocked Literal Bible",
+        chapters={
+            chapter_num: USFMChapter(content=content)
+            for chapter_num, content in enumerate(chapter_contents, start=1)
+        },
+        lang_direction=LangDirEnum.LTR,
+    )
+
+
+def test_finds_overlapping_and_nested_words() -> None:
+    matcher = WordMatcher(
+        ["son", "Son of Man", "man", "a.b", "ab", "", "ગુજ", "(x)", "his son"]
+    )
+    assert matcher.present_words("the Son of Man, his son, a.b ગુજરાતી") == {
+        "son",
+        "Son of Man",
+        "",
+        "a.b",
+        "ગુજ",
+        "his son",
+    }
+
+
+def test_agrees_with_searching_for_each_word() -> None:
+    rng = random.Random(7)
+    alphabet = "abc .*"
+    for _ in range(200):
+        words = {
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+            for _ in range(rng.randint(1, 12))
+        }
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert WordMatcher(words).present_words(text) == {
+            word for word in words if re.search(re.escape(word), text)
+        }
+
+
+def test_filter_name_content_pairs_agrees_with_searching() -> None:
+    translation_words_index = tw_utils.translation_words_index(str(EN_TW_RESOURCE_DIR))
+    tw_book_ = tw_book(
+        sorted(
+            translation_word.localized_word
+            for translation_word in translation_words_index.values()
+        )
+    )
+    usfm_books = [
+        usfm_book([render_usfm(usfm_filepath.read_text())])
+        for usfm_filepath in sorted((TEST_DATA_DIR / "usfm").glob("*.usfm"))
+    ]
+    usfm_books.append(usfm_book([]))
+    selected_name_content_pairs = document_generator.filter_name_content_pairs(
+        tw_book_, usfm_books
+    )
+    assert selected_name_content_pairs
+    assert selected_name_content_pairs == filter_name_content_pairs_by_searching(
+        tw_book_, usfm_books
+    )
+
+
+@pytest.mark.slow
+def test_benchmark_filter_name_content_pairs_for_large_book() -> None:
+    """
+    Compare filtering about 1,000 translation words against 150
+    chapters of rendered HTML, i.e., a request for Psalms, by matching
+    all words at once versus by searching for each word.
+    """
+    rng = random.Random(1)
+    vocabulary = [
+        "".join(
+            rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10))
+        )
+        for _ in range(3_000)
+    ]
+    # Most translation words do not occur in any one book.
+    words = vocabulary[:300] + [word.capitalize() for word in vocabulary[300:1_000]]
+    chapter_contents = [
+        '<div class="chapter">\n'
+        + "".join(
+            '<span class="verse">\n<sup class="versemarker">{}</sup>\n{}</span>\n'.format(
+                verse_num, " ".join(rng.choice(vocabulary) for _ in range(25))
+            )
+            for verse_num in range(1, 30)
+        )
+        + "</div>\n"
+        for _ in range(150)
+    ]
+    tw_book_, usfm_books = tw_book(words), [usfm_book(chapter_contents)]
+    logging.disable(logging.DEBUG)
+    try:
+        t0 = time.perf_counter()
+        expected = filter_name_content_pairs_by_searching(tw_book_, usfm_books)
+        t1 = time.perf_counter()
+        selected = document_generator.filter_name_content_pairs(tw_book_, usfm_books)
+        t2 = time.perf_counter()
+    finally:
+        logging.disable(logging.NOTSET)
+    print(
+        "Searching for each word: {:.3f}s, matching all words at once: {:.3f}s".format(
+            t1 - t0, t2 - t1
+        )
+    )
+    assert selected == expected
+    assert t2 - t1 < t1 - t0